@@ -1,9 +1,13 @@
+import asyncio
+import hashlib
+import logging
 import os
 import shutil
 import mimetypes
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from bson import ObjectId
+from PIL import ImageFile
 
 from models.image_data import (
     ImageData,
@@ -15,13 +19,32 @@ from models.image_data import (
     FolderMoveRequest,
     FolderDeleteRequest,
     FolderResponse,
-    create_image_data_with_id,
+    create_image_data_many,
+    find_images_by_content_hashes,
     get_image_data,
     list_image_data_advanced,
     update_image_data,
     delete_image_data,
     bulk_repath_prefix,
     bulk_delete_by_prefix,
+    set_image_derivatives,
+    list_images_missing_derivatives,
+)
+from models.asset_folders import (
+    adjust_file_count,
+    delete_folder_subtree,
+    ensure_folder,
+    get_folder,
+    list_child_folders,
+    merge_folder_into_parent,
+    move_folder_subtree,
+    rebuild_folder_catalog,
+)
+from helpers.image_derivatives import (
+    DERIVATIVE_SOURCE_EXTENSIONS,
+    derivative_files,
+    generate_derivatives,
+    get_derivative_pool,
 )
 
 # -------------------------------------------------------------------
@@ -94,21 +117,141 @@ def _serialize_doc(doc: Dict[str, Any]) -> ImageResponse:
         path=doc["path"],
         public_url=_public_url_for(_id),
         thumb_url=_thumb_url_for(_id),
+        width=doc.get("width"),
+        height=doc.get("height"),
     )
 
-def _list_immediate_subfolders_fs(folder_rel: Optional[str]) -> List[str]:
-    base = _safe_join_root((folder_rel or "").strip("/") or None)
-    if not os.path.isdir(base):
-        return []
-    names: List[str] = []
+def _walk_folders_fs() -> List[str]:
+    """Every folder under ASSETS_ROOT as a relative path; only used to (re)build the catalog."""
+    out: List[str] = []
+    for dirpath, dirnames, _ in os.walk(ASSETS_ROOT):
+        rel = os.path.relpath(dirpath, ASSETS_ROOT).replace("\\", "/")
+        if rel != ".":
+            out.append(rel)
+    return out
+
+async def reindex_folder_catalog() -> Dict[str, Any]:
+    folders = await asyncio.to_thread(_walk_folders_fs)
+    return {"folders": await rebuild_folder_catalog(folders)}
+
+async def ensure_folder_catalog() -> None:
+    """Build the folder catalog on first start (or after it was dropped)."""
+    if await get_folder("") is None:
+        result = await reindex_folder_catalog()
+        logging.info(f"Built asset folder catalog: {result}")
+
+# -------------------------------------------------------------------
+# Derivatives (thumbnail + responsive variants)
+# -------------------------------------------------------------------
+
+# Strong refs so fire-and-forget derivative jobs are not garbage collected mid-flight
+_derivative_tasks: set = set()
+
+async def _build_derivatives(id_str: str, asset_path: str, folder_rel: str, ext: str) -> None:
+    thumb_dir = _safe_join_thumbs(folder_rel if folder_rel != "" else None)
     try:
-        with os.scandir(base) as it:
-            for entry in it:
-                if entry.is_dir():
-                    names.append(entry.name)
-    except FileNotFoundError:
-        return []
-    return sorted(names)
+        loop = asyncio.get_running_loop()
+        derivatives = await loop.run_in_executor(
+            get_derivative_pool(), generate_derivatives, asset_path, thumb_dir, id_str, ext
+        )
+    except Exception as e:
+        logging.error(f"Derivative generation failed for asset {id_str}: {e}")
+        derivatives = None
+    await set_image_derivatives(id_str, derivatives)
+
+def _schedule_derivatives(id_str: str, asset_path: str, folder_rel: str, ext: str) -> None:
+    """Generate derivatives in the process pool without holding up the upload response."""
+    task = asyncio.create_task(_build_derivatives(id_str, asset_path, folder_rel, ext))
+    _derivative_tasks.add(task)
+    task.add_done_callback(_derivative_tasks.discard)
+
+async def rebuild_missing_derivatives(limit: int = 200) -> Dict[str, Any]:
+    """Backfill derivatives for assets uploaded before the pipeline existed (or whose job was lost)."""
+    docs = await list_images_missing_derivatives(limit)
+    jobs = []
+    for doc in docs:
+        folder_rel = _extract_folder_rel(doc["path"])
+        asset_path = os.path.join(_safe_join_root(folder_rel if folder_rel != "" else None),
+                                  os.path.basename(doc["path"])).replace("\\", "/")
+        if not os.path.exists(asset_path):
+            await set_image_derivatives(str(doc["_id"]), None)
+            continue
+        ext = doc.get("extension") or os.path.splitext(asset_path)[1].lstrip(".").lower()
+        jobs.append(_build_derivatives(str(doc["_id"]), asset_path, folder_rel, ext))
+    await asyncio.gather(*jobs)
+    return {"processed": len(docs)}
+
+def _accepted_variant_formats(accept: Optional[str]) -> List[str]:
+    accept = (accept or "").lower()
+    formats = []
+    if "image/avif" in accept:
+        formats.append("avif")
+    if "image/webp" in accept:
+        formats.append("webp")
+    return formats
+
+def select_asset_variant(
+    doc: Dict[str, Any],
+    thumbnail: bool = False,
+    width: Optional[int] = None,
+    accept: Optional[str] = None,
+) -> Tuple[str, Optional[str]]:
+    """
+    Decide which stored file answers a request.
+
+    Returns (variant_key, derivative file name or None for the original). With
+    ?thumbnail=true the generated thumbnail wins; otherwise the best format the
+    client Accepts picks the variant: with ?w= the smallest one at least that wide,
+    without it the largest. The original answers when no variant fits.
+    """
+    derivatives = doc.get("derivatives") or {}
+    if thumbnail:
+        thumb = derivatives.get("thumbnail")
+        if thumb and thumb.get("file"):
+            return f"thumb.{thumb.get('format') or 'webp'}", thumb["file"]
+        return "thumb", None
+
+    for fmt in _accepted_variant_formats(accept):
+        candidates = sorted(
+            (v for v in derivatives.get("variants") or [] if v.get("format") == fmt and v.get("width", 0) >= (width or 0)),
+            key=lambda v: v["width"],
+        )
+        if candidates:
+            chosen = candidates[0] if width else candidates[-1]
+            return f"w{chosen['width']}.{fmt}", chosen["file"]
+
+    return "full", None
+
+def _resolve_asset_file(doc: Dict[str, Any], thumbnail: bool, derivative_file: Optional[str]) -> str:
+    rel_folder = _extract_folder_rel(doc["path"])
+    filename = os.path.basename(doc["path"])
+    if derivative_file:
+        fs_path = os.path.join(_safe_join_thumbs(rel_folder if rel_folder != "" else None), derivative_file)
+        if os.path.exists(fs_path):
+            return fs_path
+
+    if thumbnail:
+        # Legacy thumbnails share the original's file name
+        fs_path = os.path.join(_safe_join_thumbs(rel_folder if rel_folder != "" else None), filename)
+        if os.path.exists(fs_path):
+            return fs_path
+    return os.path.join(_safe_join_root(rel_folder if rel_folder != "" else None), filename)
+
+def _move_derivatives(doc: Dict[str, Any], old_folder_rel: str, new_folder_rel: str) -> None:
+    old_dir = _safe_join_thumbs(old_folder_rel if old_folder_rel != "" else None)
+    new_dir = _safe_join_thumbs(new_folder_rel if new_folder_rel != "" else None)
+    os.makedirs(new_dir, exist_ok=True)
+    for name in derivative_files(doc.get("derivatives")):
+        src = os.path.join(old_dir, name)
+        if os.path.exists(src):
+            shutil.move(src, os.path.join(new_dir, name))
+
+def _remove_derivatives(doc: Dict[str, Any], folder_rel: str) -> None:
+    thumb_dir = _safe_join_thumbs(folder_rel if folder_rel != "" else None)
+    for name in derivative_files(doc.get("derivatives")):
+        fs_path = os.path.join(thumb_dir, name)
+        if os.path.exists(fs_path):
+            os.remove(fs_path)
 
 # -------------------------------------------------------------------
 # Listing / uploads
@@ -122,7 +265,12 @@ async def list_images_and_folders(
     page: int = 1,
     page_size: int = 60,
     scope: str = "current",  # 'current' | 'all'
+    cursor: Optional[str] = None,
 ) -> Dict[str, Any]:
+    """
+    Folder browsing / name search. Pass the previous response's ``next_cursor``
+    to page by keyset; ``page`` alone still works but skips.
+    """
     # Decide folder filtering
     folder_filter: Optional[str]
     if q:
@@ -133,19 +281,26 @@ async def list_images_and_folders(
     if limit and not q:
         page_size = min(page_size, limit)
 
-    docs, total = await list_image_data_advanced(
-        folder_prefix=folder_filter,
+    # Browsing reads the count from the folder catalog instead of counting documents
+    catalog = await get_folder(folder_filter) if not q and folder_filter is not None else None
+
+    # Browsing lists the current level only; searching "current" covers its subfolders too
+    docs, total, next_cursor = await list_image_data_advanced(
+        folder=folder_filter,
         name_q=q,
         page=page,
         page_size=page_size,
+        include_subfolders=bool(q),
+        cursor=cursor,
+        with_total=catalog is None,
     )
+    if catalog is not None:
+        total = max(0, catalog.get("file_count", 0))
 
     files: List[ImageResponse] = [_serialize_doc(d) for d in docs]
 
-    # Browsing: folders visible from filesystem; keep only files in current level
     if not q:
-        folders = _list_immediate_subfolders_fs(folder_filter or "")
-        files = [f for f in files if f.folder == (folder_filter or "")]
+        folders = await list_child_folders(folder_filter or "")
     else:
         folders = []
 
@@ -155,10 +310,71 @@ async def list_images_and_folders(
         "total": total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
     }
 
 async def list_subfolders(folder: Optional[str]) -> List[str]:
-    return _list_immediate_subfolders_fs(_normalize_rel(folder or ""))
+    return await list_child_folders(_normalize_rel(folder or ""))
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Files streamed to disk at once; bounded so a 500-photo import doesn't open 500 threads
+UPLOAD_CONCURRENCY = int(os.getenv("ASSET_UPLOAD_CONCURRENCY", "4"))
+# Raster formats whose header is parsed for width/height while streaming
+DIMENSION_PROBE_EXTENSIONS = DERIVATIVE_SOURCE_EXTENSIONS | {"gif"}
+# Stop looking for an image header after this many bytes; the parser buffers everything it is fed
+DIMENSION_PROBE_MAX_BYTES = 2 * 1024 * 1024
+
+def _should_probe_dimensions(ext: str, content_type: Optional[str]) -> bool:
+    content_type = (content_type or "").lower()
+    if ext in DIMENSION_PROBE_EXTENSIONS:
+        return True
+    return content_type.startswith("image/") and "svg" not in content_type
+
+def _stream_upload_to_disk(src: Any, dest_path: str, probe_dimensions: bool = True) -> Tuple[str, Optional[int], Optional[int]]:
+    """
+    Copy an upload to disk in fixed-size chunks (runs in a worker thread).
+
+    The sha256 and, when ``probe_dimensions`` is set, the pixel dimensions are
+    computed from the same chunks, so the file is only read once. A partial
+    file is removed if the copy fails.
+    """
+    digest = hashlib.sha256()
+    parser: Optional[ImageFile.Parser] = ImageFile.Parser() if probe_dimensions else None
+    size: Optional[Tuple[int, int]] = None
+    probed = 0
+    src.seek(0)
+    try:
+        with open(dest_path, "wb") as out:
+            while True:
+                chunk = src.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+                digest.update(chunk)
+                if parser is not None:
+                    try:
+                        parser.feed(chunk[:DIMENSION_PROBE_MAX_BYTES - probed])
+                        probed += len(chunk)
+                        if parser.image is not None:
+                            size = parser.image.size
+                            parser = None  # header parsed; stop decoding
+                        elif probed >= DIMENSION_PROBE_MAX_BYTES:
+                            parser = None  # no recognizable header; stop buffering
+                    except Exception:
+                        parser = None
+    except BaseException:
+        try:
+            os.remove(dest_path)
+        except OSError:
+            pass
+        raise
+    if parser is not None:
+        try:
+            parser.close()
+        except Exception:
+            pass
+    width, height = size if size else (None, None)
+    return digest.hexdigest(), width, height
 
 async def upload_images(payload: UploadImageRequest, files: List[Any]) -> List[ImageResponse]:
     """
@@ -166,47 +382,77 @@ async def upload_images(payload: UploadImageRequest, files: List[Any]) -> List[I
       - Use uploaded base name (without extension) if available.
       - Fallback to ObjectId.
     Disk filename stays <oid>.<ext>.
+    Files are streamed to disk concurrently. Content already stored in the target
+    folder (same sha256) is not stored twice; the existing asset is returned instead.
     """
     folder_rel = _normalize_rel(payload.folder or "")
     asset_dir, _ = _ensure_dirs(folder_rel if folder_rel != "" else None)
+    sem = asyncio.Semaphore(max(1, UPLOAD_CONCURRENCY))
 
-    out: List[ImageResponse] = []
-    for up in files:
+    async def _store(up: Any) -> Dict[str, Any]:
         oid = ObjectId()
         original = up.filename or ""
         base_without_ext = os.path.splitext(os.path.basename(original))[0].strip() if original else ""
         ext = os.path.splitext(original)[1].lstrip(".").lower() or "bin"
         filename_on_disk = f"{str(oid)}.{ext}"
         asset_path = os.path.join(asset_dir, filename_on_disk).replace("\\", "/")
-
-        with open(asset_path, "wb") as f:
-            f.write(up.file.read())
-
-        rel_folder = folder_rel  # '' allowed
-        db_path = f"data/assets/{rel_folder + '/' if rel_folder else ''}{filename_on_disk}"
-        friendly_name = base_without_ext if base_without_ext else str(oid)
-
-        data = ImageData(
-            name=friendly_name,
-            description=payload.description,
-            extension=ext,
-            path=db_path,
-        )
-        await create_image_data_with_id(oid, data)
-        out.append(
-            ImageResponse(
-                id=str(oid),
-                name=friendly_name,
-                extension=ext,
+        probe = _should_probe_dimensions(ext, getattr(up, "content_type", None))
+        async with sem:
+            content_hash, width, height = await asyncio.to_thread(_stream_upload_to_disk, up.file, asset_path, probe)
+        return {
+            "oid": oid,
+            "asset_path": asset_path,
+            "ext": ext,
+            "data": ImageData(
+                name=base_without_ext if base_without_ext else str(oid),
                 description=payload.description,
-                folder=rel_folder,
-                path=db_path,
-                public_url=_public_url_for(str(oid)),
-                thumb_url=_thumb_url_for(str(oid)),
-            )
-        )
-
-    return out
+                extension=ext,
+                path=f"data/assets/{folder_rel + '/' if folder_rel else ''}{filename_on_disk}",
+                content_hash=content_hash,
+                width=width,
+                height=height,
+            ),
+        }
+
+    outcomes = await asyncio.gather(*(_store(up) for up in files), return_exceptions=True)
+    failures = [o for o in outcomes if isinstance(o, BaseException)]
+    if failures:
+        # No image_data rows exist yet; don't leave the files that did land orphaned on disk
+        for item in outcomes:
+            if not isinstance(item, BaseException):
+                try:
+                    os.remove(item["asset_path"])
+                except OSError:
+                    pass
+        raise failures[0]
+    stored: List[Dict[str, Any]] = list(outcomes)
+
+    existing_by_hash: Dict[str, Dict[str, Any]] = {}
+    for doc in await find_images_by_content_hashes([s["data"].content_hash for s in stored]):
+        if _extract_folder_rel(doc["path"]) == folder_rel:
+            existing_by_hash.setdefault(doc["content_hash"], doc)
+
+    results: List[Dict[str, Any]] = []
+    to_insert: List[Dict[str, Any]] = []
+    for item in stored:
+        content_hash = item["data"].content_hash
+        if content_hash in existing_by_hash:
+            # Duplicate of an asset already in this folder (or earlier in this batch)
+            os.remove(item["asset_path"])
+            results.append(existing_by_hash[content_hash])
+            continue
+        doc = {"_id": item["oid"], **item["data"].model_dump()}
+        existing_by_hash[content_hash] = doc
+        to_insert.append(item)
+        results.append(doc)
+
+    await create_image_data_many([(item["oid"], item["data"]) for item in to_insert])
+    await ensure_folder(folder_rel)
+    await adjust_file_count(folder_rel, len(to_insert))
+    for item in to_insert:
+        _schedule_derivatives(str(item["oid"]), item["asset_path"], folder_rel, item["ext"])
+
+    return [_serialize_doc(doc) for doc in results]
 
 # -------------------------------------------------------------------
 # Image CRUD
@@ -247,11 +493,17 @@ async def update_image_by_id(id_str: str, payload: ImageUpdateRequest) -> Option
         os.makedirs(os.path.dirname(new_fs_path), exist_ok=True)
         if os.path.exists(old_fs_path):
             shutil.move(old_fs_path, new_fs_path)
+        if target_folder_rel != current_folder_rel:
+            _move_derivatives(doc, current_folder_rel, target_folder_rel)
+            await ensure_folder(target_folder_rel)
+            await adjust_file_count(current_folder_rel, -1)
+            await adjust_file_count(target_folder_rel, 1)
 
     await update_image_data(id_str, {
         "name": base_name,
         "description": new_desc,
         "path": new_db_path,
+        "folder": target_folder_rel,
         "extension": current_ext,
         "updated_at": datetime.utcnow(),
     })
@@ -270,7 +522,11 @@ async def delete_image_by_id(id_str: str) -> bool:
     fs_path = os.path.join(fs_dir, os.path.basename(doc["path"]))
     if os.path.exists(fs_path):
         os.remove(fs_path)
-    return await delete_image_data(id_str)
+    _remove_derivatives(doc, folder_rel)
+    deleted = await delete_image_data(id_str)
+    if deleted:
+        await adjust_file_count(folder_rel, -1)
+    return deleted
 
 async def remove_image_by_id(id_str: str) -> bool:
     return await delete_image_by_id(id_str)
@@ -299,6 +555,7 @@ async def create_folder(payload: FolderCreateRequest) -> FolderResponse:
         return FolderResponse(path=rel, action="create", details={"created": False, "reason": "duplicate"})
 
     _ensure_dirs(rel)
+    await ensure_folder(rel)
     return FolderResponse(path=rel, action="create", details={"created": True})
 
 async def rename_folder(payload: FolderRenameRequest) -> FolderResponse:
@@ -325,6 +582,7 @@ async def rename_folder(payload: FolderRenameRequest) -> FolderResponse:
     old_prefix = f"data/assets/{rel}/"
     new_prefix = f"data/assets/{new_rel}/"
     modified = await bulk_repath_prefix(old_prefix, new_prefix)
+    await move_folder_subtree(rel, new_rel)
 
     return FolderResponse(path=new_rel, action="rename", details={"docs_repathed": modified, "renamed": True})
 
@@ -355,6 +613,7 @@ async def move_folder_ctrl(payload: FolderMoveRequest) -> FolderResponse:
     old_prefix = f"data/assets/{rel}/"
     new_prefix = f"data/assets/{new_rel}/" if new_rel else "data/assets/"
     modified = await bulk_repath_prefix(old_prefix, new_prefix)
+    await move_folder_subtree(rel, new_rel)
 
     return FolderResponse(path=new_rel, action="move", details={"docs_repathed": modified, "moved": True})
 
@@ -385,6 +644,7 @@ async def delete_folder_ctrl(payload: FolderDeleteRequest) -> FolderResponse:
         if os.path.isdir(thumbs_dir):
             shutil.rmtree(thumbs_dir, ignore_errors=True)
         deleted = await bulk_delete_by_prefix(f"data/assets/{rel}/")
+        await delete_folder_subtree(rel)
         return FolderResponse(path=rel, action="delete", details={"deleted_docs": deleted})
     else:
         # Move immediate children (files or subfolders) up one level in both trees.
@@ -410,35 +670,57 @@ async def delete_folder_ctrl(payload: FolderDeleteRequest) -> FolderResponse:
         old_prefix = f"data/assets/{rel}/"
         new_prefix = f"data/assets/{parent_rel}/" if parent_rel else "data/assets/"
         modified = await bulk_repath_prefix(old_prefix, new_prefix)
+        await merge_folder_into_parent(rel)
         return FolderResponse(path=parent_rel, action="delete_move_up", details={"docs_repathed": modified})
 
 # -------------------------------------------------------------------
 # Public file serving
 # -------------------------------------------------------------------
 
-async def load_image_bytes_by_id(id_str: str, thumbnail: bool = False) -> Tuple[Optional[bytes], str]:
-    doc = await get_image_data(id_str)
-    if not doc:
-        return None, "application/octet-stream"
-
-    rel_folder = _extract_folder_rel(doc["path"])
-    filename = os.path.basename(doc["path"])
-
-    if thumbnail:
-        folder_path = _safe_join_thumbs(rel_folder if rel_folder != "" else None)
-        fs_path = os.path.join(folder_path, filename)
-        if not os.path.exists(fs_path):
-            folder_path = _safe_join_root(rel_folder if rel_folder != "" else None)
-            fs_path = os.path.join(folder_path, filename)
+def _asset_etag(doc: Dict[str, Any], variant_key: str, st: os.stat_result) -> str:
+    content_hash = doc.get("content_hash")
+    if content_hash:
+        # Files on disk are immutable per id, so the upload-time hash stays valid across renames/moves
+        tag = content_hash[:32] if variant_key == "full" else f"{content_hash[:32]}-{variant_key}"
     else:
-        folder_path = _safe_join_root(rel_folder if rel_folder != "" else None)
-        fs_path = os.path.join(folder_path, filename)
+        # Assets uploaded before hashing: derive from stat instead of hashing the payload per request
+        tag = f"{doc['_id']}-{variant_key}-{st.st_mtime_ns:x}-{st.st_size:x}"
+    return f'"{tag}"'
+
+async def resolve_asset_file_by_id(
+    id_str: str,
+    thumbnail: bool = False,
+    width: Optional[int] = None,
+    accept: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Locate the file that answers a public asset request with a single metadata lookup.
 
-    if not os.path.exists(fs_path):
-        return None, "application/octet-stream"
+    Returns None when the asset or its file is missing; otherwise the filesystem path,
+    stat result, media type, ETag and the friendly download name. Bytes are not read
+    here; the route streams the file.
+    """
+    doc = await get_image_data(id_str)
+    if not doc:
+        return None
 
-    with open(fs_path, "rb") as f:
-        data = f.read()
+    variant_key, derivative_file = select_asset_variant(doc, thumbnail=thumbnail, width=width, accept=accept)
+    fs_path = _resolve_asset_file(doc, thumbnail, derivative_file)
+    if derivative_file and os.path.basename(fs_path) != derivative_file:
+        # Derivative missing on disk; tag the fallback so it never shares the variant's ETag
+        variant_key = "thumb" if thumbnail else "full"
+        derivative_file = None
+    try:
+        st = os.stat(fs_path)
+    except OSError:
+        return None
 
-    media_type = mimetypes.guess_type(fs_path)[0] or "application/octet-stream"
-    return data, media_type
+    # Downloads are named after the bytes served, so a WebP/AVIF variant gets its own extension
+    ext = os.path.splitext(derivative_file)[1].lstrip(".") if derivative_file else (doc.get("extension") or "bin")
+    return {
+        "path": fs_path,
+        "stat": st,
+        "media_type": mimetypes.guess_type(fs_path)[0] or "application/octet-stream",
+        "etag": _asset_etag(doc, variant_key, st),
+        "download_name": f"{doc.get('name') or id_str}.{ext}",
+    }
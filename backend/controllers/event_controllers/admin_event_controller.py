@@ -11,6 +11,7 @@ from pydantic import BaseModel
 from models.event_transaction import get_transaction_by_order_id, append_refund_to_item
 
 from helpers.PayPalHelperV2 import PayPalHelperV2
+from helpers.RefundEmailHelper import send_refund_emails_batch
 
 import logging
 import os
@@ -120,14 +121,14 @@ async def _refund_paypal_lines_for_instance(instance_doc: dict, by_uid: str) ->
     """
     Refund all PayPal-completed lines on a single event instance.
 
-    Returns {success: bool, msg: str, refunded: list[(label, refund_id, amount)]}
+    Returns {success: bool, msg: str, refunded: list[(uid, label, refund_id, amount)]}
     """
     reg_map = (instance_doc or {}).get("registration_details") or {}
     if not isinstance(reg_map, dict) or not reg_map:
         return {"success": True, "msg": "No registrations on instance.", "refunded": []}
 
     # Build candidate list across ALL users on the instance
-    candidates = []  # (label, payment_details)
+    candidates = []  # (uid, label, payment_details)
 
     for uid, details in reg_map.items():
         if not isinstance(details, dict):
@@ -135,7 +136,7 @@ async def _refund_paypal_lines_for_instance(instance_doc: dict, by_uid: str) ->
 
         # SELF
         if details.get("self_registered") and details.get("self_payment_details"):
-            candidates.append((f"SELF (uid:{uid})", details["self_payment_details"]))
+            candidates.append((uid, f"SELF (uid:{uid})", details["self_payment_details"]))
 
         # FAMILY
         fam_ids = details.get("family_registered") or []
@@ -143,7 +144,7 @@ async def _refund_paypal_lines_for_instance(instance_doc: dict, by_uid: str) ->
         for fid in fam_ids:
             pd = fam_pd.get(str(fid)) or fam_pd.get(fid)
             if pd:
-                candidates.append((f"{fid} (uid:{uid})", pd))
+                candidates.append((uid, f"{fid} (uid:{uid})", pd))
 
     if not candidates:
         return {"success": True, "msg": "No refundable PayPal payments.", "refunded": []}
@@ -152,7 +153,7 @@ async def _refund_paypal_lines_for_instance(instance_doc: dict, by_uid: str) ->
     await paypal.start()
 
     refunded = []
-    for label, pd in candidates:
+    for uid, label, pd in candidates:
         try:
             if (pd.get("payment_type") != "paypal") or (not pd.get("payment_complete")):
                 continue
@@ -202,13 +203,44 @@ async def _refund_paypal_lines_for_instance(instance_doc: dict, by_uid: str) ->
                 logging.critical(f"Refund failed for {label}: ledger write failed.")
                 continue
 
-            refunded.append((label, refund_id, round(amount, 2)))
+            refunded.append((uid, label, refund_id, round(amount, 2)))
         except Exception as e:
             return {"success": False, "msg": f"Refund failed for {label}: {e}"}
 
     return {"success": True, "msg": "Refunds processed.", "refunded": refunded}
 
 
+async def _notify_event_refunds(event, refunded_by_uid: Dict[str, float]) -> None:
+    """
+    Queue one refund-completed email per refunded registrant of a deleted event,
+    rendered and enqueued as a single batch.
+    """
+    if not refunded_by_uid:
+        return
+
+    loc = event.localizations.get("en") or next(iter(event.localizations.values()), None)
+    event_name = loc.title if loc else "Event"
+
+    users = await DB.db["users"].find(
+        {"uid": {"$in": list(refunded_by_uid)}},
+        {"uid": 1, "email": 1, "first_name": 1, "last_name": 1},
+    ).to_list(length=None)
+
+    recipients = [
+        {
+            "to_email": user["email"],
+            "user_name": f"{user.get('first_name', '')} {user.get('last_name', '')}".strip(),
+            "event_name": event_name,
+            "amount": round(refunded_by_uid[user["uid"]], 2),
+            "request_id": f"event-deleted:{event.id}",
+        }
+        for user in users
+        if user.get("email")
+    ]
+    if recipients:
+        await send_refund_emails_batch("refund_completed", recipients)
+
+
 async def process_delete_event(event_id: str, request: Request):
     # 0) Load the event we intend to delete
     old_event = await get_event_by_id(event_id)
@@ -221,10 +253,19 @@ async def process_delete_event(event_id: str, request: Request):
     except Exception as e:
         return {"success": False, "msg": f"Failed to scan upcoming instances: {e}"}
 
+    refunded_by_uid: Dict[str, float] = {}
     for inst in (upcoming or []):
         res = await _refund_paypal_lines_for_instance(inst, by_uid=request.state.uid)
         if not res.get("success"):
             logging.critical(f"EVENT REFUND ERROR DETECTED WHILE DELETING EVENT! BE SURE TO MAKE SURE THIS IS AS EXPECTED! ERROR: {res.get('msg','Refund error')}")
+        for uid, _label, _refund_id, amount in res.get("refunded") or []:
+            refunded_by_uid[uid] = refunded_by_uid.get(uid, 0.0) + amount
+
+    # Tell every refunded registrant at once; a mail failure must not block the delete
+    try:
+        await _notify_event_refunds(old_event, refunded_by_uid)
+    except Exception as e:
+        logging.error(f"Failed to queue refund emails for deleted event {event_id}: {e}")
 
     # 2) Gather ALL instance docs now (pre-delete) for snapshot
     try:
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import logging
 from typing import Any, Dict, Optional, List, Literal
 
 from bson import ObjectId
 from fastapi import HTTPException, Request, status
 
 from mongo.database import DB
+from models.event import get_event_by_id
+from models.user import get_user_by_uid
 from models.refund_request import (
     RefundRequestIn,
     RefundRequestAdminUpdate,
@@ -13,8 +16,16 @@ from models.refund_request import (
     create_or_update_refund_request_doc,
     search_refund_requests as _search_refund_requests,
     get_refund_request_by_id as _get_refund_request_by_id,
+    get_refund_request_by_user_and_txn as _get_refund_request_by_user_and_txn,
     update_refund_request_admin as _update_refund_request_admin,
 )
+from helpers.RefundEmailHelper import (
+    ADMIN_EMAIL,
+    send_admin_refund_alert,
+    send_refund_approved_notification,
+    send_refund_rejected_notification,
+    send_refund_request_confirmation,
+)
 from controllers.transactions_controller import (
     UnifiedTransaction,
     _map_event_doc,
@@ -115,6 +126,92 @@ async def _attach_transactions_to_result(
     return result
 
 
+async def _txn_display_name(
+    txn_kind: RefundTxnKind,
+    doc: Dict[str, Any],
+) -> str:
+    if txn_kind == "event":
+        event_id = doc.get("event_id")
+        event = await get_event_by_id(str(event_id)) if event_id else None
+        if event:
+            loc = event.localizations.get("en") or next(iter(event.localizations.values()), None)
+            if loc and loc.title:
+                return loc.title
+        return "Event registration"
+
+    form_id = doc.get("form_id")
+    oid = ObjectId(form_id) if isinstance(form_id, str) and ObjectId.is_valid(form_id) else form_id
+    form = await DB.db["forms"].find_one({"_id": oid}, {"title": 1}) if oid else None
+    return (form or {}).get("title") or "Form payment"
+
+
+async def _refund_email_context(
+    uid: str,
+    txn_kind: RefundTxnKind,
+    txn_id: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Recipient and purchase details shared by the refund notification emails,
+    or None when the user or transaction can no longer be found.
+    """
+    user = await get_user_by_uid(uid)
+    doc = await _load_transaction_doc(txn_kind, txn_id)
+    if not user or not doc:
+        return None
+
+    return {
+        "to_email": user.email,
+        "user_name": f"{user.first_name} {user.last_name}".strip(),
+        "event_name": await _txn_display_name(txn_kind, doc),
+        "amount": _map_txn_to_unified(txn_kind, doc).amount or 0.0,
+    }
+
+
+async def _notify_refund_submitted(uid: str, body: RefundRequestIn) -> None:
+    # Email is best-effort: a failed lookup or enqueue never fails the request itself
+    try:
+        doc = await _get_refund_request_by_user_and_txn(uid, body.txn_kind, body.txn_id)
+        ctx = await _refund_email_context(uid, body.txn_kind, body.txn_id)
+        if not doc or not ctx:
+            return
+
+        request_id = str(doc["_id"])
+        await send_refund_request_confirmation(request_id=request_id, **ctx)
+        await send_admin_refund_alert(
+            [ADMIN_EMAIL],
+            ctx["user_name"],
+            ctx["event_name"],
+            ctx["amount"],
+            request_id,
+            body.message,
+        )
+    except Exception as e:
+        logging.error(f"Failed to queue refund request emails for {body.txn_kind}:{body.txn_id}: {e}")
+
+
+async def _notify_refund_response(body: RefundRequestAdminUpdate) -> None:
+    try:
+        doc = await _get_refund_request_by_id(body.id)
+        if not doc or doc.get("txn_kind") not in ("event", "form"):
+            return
+
+        ctx = await _refund_email_context(doc["uid"], doc["txn_kind"], str(doc["txn_id"]))
+        if not ctx:
+            return
+
+        reason = (body.reason or "").strip()
+        if body.resolved:
+            await send_refund_approved_notification(
+                request_id=body.id,
+                admin_notes=reason or None,
+                **ctx,
+            )
+        else:
+            await send_refund_rejected_notification(request_id=body.id, reason=reason, **ctx)
+    except Exception as e:
+        logging.error(f"Failed to queue refund response email for request {body.id}: {e}")
+
+
 async def create_or_update_refund_request(
     request: Request,
     body: RefundRequestIn,
@@ -150,7 +247,10 @@ async def create_or_update_refund_request(
     )
 
     # Defer actual create/update and history handling to the model layer
-    return await create_or_update_refund_request_doc(uid=uid, payload=body)
+    result = await create_or_update_refund_request_doc(uid=uid, payload=body)
+    if result.get("success"):
+        await _notify_refund_submitted(uid, body)
+    return result
 
 
 async def list_my_refund_requests(
@@ -206,4 +306,8 @@ async def admin_get_refund_request_by_id(id: str) -> Dict[str, Any]:
 async def admin_update_refund_request(
     body: RefundRequestAdminUpdate,
 ) -> Dict[str, Any]:
-    return await _update_refund_request_admin(body)
+    result = await _update_refund_request_admin(body)
+    # Only an actual response (approve/reject) is worth telling the user about
+    if result.get("success") and body.responded:
+        await _notify_refund_response(body)
+    return result
@@ -4,6 +4,7 @@ from mongo.churchuser import UserHandler
 from mongo.roles import RoleHandler
 from pydantic import BaseModel, field_validator
 from mongo.database import DB
+from helpers.keyset_pagination import invalidate_counts
 from fastapi import Request
 from typing import Optional, List, Dict, Literal
 from datetime import datetime
@@ -60,9 +61,12 @@ class UsersSearchParams(BaseModel):
     pageSize: int
     searchField: Literal["email", "name"] = "email"
     searchTerm: str = ""
-    sortBy: Literal["email", "name", "createdOn", "uid"] = "createdOn"
+    sortBy: Literal["email", "name", "createdOn", "uid", "membership"] = "createdOn"
     sortDir: Literal["asc", "desc"] = "asc"
     hasRolesOnly: bool = False
+    # Opaque next_cursor from the previous page; when set, page is ignored
+    cursor: Optional[str] = None
+    countMode: Literal["exact", "cached", "estimated", "none"] = "exact"
 
 AUTOMATIC_REQUEST_REASON = "REQUEST AUTOMATICALLY HANDLED. Reason: Somebody specifically changed the user member status from user detailed view while request was active, therefore it was handled as resolving the request."
 
@@ -112,7 +116,8 @@ async def fetch_users_with_role_id(role_id: str):
 
 
 async def search_users_paged(params: UsersSearchParams):
-    total, users = await UserHandler.search_users_paged(params)
+    result = await UserHandler.search_users_paged(params)
+    users = result["users"]
     # Normalize down to the fields the UI already uses in /get-users
     items = [
         {
@@ -128,9 +133,11 @@ async def search_users_paged(params: UsersSearchParams):
     return {
         "success": True,
         "items": items,
-        "total": total,
+        "total": result["total"],
+        "totalIsEstimate": result["total_is_estimate"],
         "page": params.page,
         "pageSize": params.pageSize,
+        "next_cursor": result["next_cursor"],
     }
 
 async def search_logical_users_paged(params: UsersSearchParams):
@@ -634,6 +641,8 @@ async def delete_user_account(uid: str):
             collection = DB.db[collection_name]
             for field in uid_fields:
                 await collection.delete_many({field: uid})
+            invalidate_counts(collection_name)
+        invalidate_counts("users")
         
         # Delete from Firebase
         auth.delete_user(uid)
@@ -3,7 +3,6 @@ import logging
 import os
 from datetime import datetime, timedelta, time
 from typing import List, Dict, Optional
-from bson import ObjectId
 import pytz
 import firebase_admin
 from firebase_admin import credentials
@@ -11,7 +10,9 @@ from firebase_admin import credentials
 from mongo.database import DB
 from helpers.NotificationHelper import send_push_notification, send_notification_to_user, update_device_notification_preferences
 from mongo.scheduled_notifications import schedule_notification, get_scheduled_notifications
-from models.bible_plan_tracker import get_user_bible_plans
+from mongo.device_tokens import get_user_device_tokens
+from models.bible_plan import get_cached_reading_plan
+from models.bible_plan_tracker import get_user_bible_plans, last_completed_day, progress_state
 
 
 def ensure_firebase_initialized():
@@ -88,26 +89,25 @@ class BiblePlanNotificationManager:
         plan_id = subscription.get('plan_id')
         notification_time = subscription.get('notification_time')
         start_date = subscription.get('start_date')
-        progress = subscription.get('progress', [])
+        progress_bits, _ = progress_state(subscription)
         
         if not all([uid, plan_id, notification_time, start_date]):
             logging.warning(f"Missing required fields for scheduling notification: {subscription}")
             return
         
         # Calculate current day in the plan
-        current_day = BiblePlanNotificationManager._calculate_current_day(start_date, progress)
+        current_day = BiblePlanNotificationManager._calculate_current_day(start_date, progress_bits)
         
-        # Get plan details
-        plan_doc = await DB.db["bible_plans"].find_one({"_id": ObjectId(plan_id)})
-        if not plan_doc:
+        # Get plan details (shared plan cache: one read per plan, not per subscriber)
+        plan = await get_cached_reading_plan(plan_id)
+        if not plan:
             logging.warning(f"Bible plan not found: {plan_id}")
             return
         
-        plan_name = plan_doc.get('name', 'Bible Reading Plan')
-        readings = plan_doc.get('readings', {})
+        plan_name = plan.name or 'Bible Reading Plan'
         
         # Check if there are readings for the current day
-        day_readings = readings.get(str(current_day), [])
+        day_readings = [p.model_dump() for p in plan.readings.get(str(current_day), [])]
         if not day_readings:
             logging.info(f"No readings for day {current_day} in plan {plan_id}")
             return
@@ -150,7 +150,7 @@ class BiblePlanNotificationManager:
             await schedule_notification(DB.db, notification_data)
     
     @staticmethod
-    def _calculate_current_day(start_date: datetime, progress: List[Dict]) -> int:
+    def _calculate_current_day(start_date: datetime, progress_bits: Dict[str, int]) -> int:
         """Calculate the current day number for the Bible plan"""
         # Calculate days since start using local timezone
         now_local = get_local_now()
@@ -164,11 +164,10 @@ class BiblePlanNotificationManager:
         days_since_start = (now_local.date() - start_date.date()).days + 1
         
         # If user has completed days beyond the calculated day, use the next incomplete day
-        completed_days = [p.get('day', 0) for p in progress if p.get('is_completed', False)]
+        max_completed = last_completed_day(progress_bits)
         
-        if completed_days:
+        if max_completed:
             # Find the next day that hasn't been completed
-            max_completed = max(completed_days)
             return max_completed + 1
         
         # Return the calculated day based on start date
@@ -265,13 +264,7 @@ class BiblePlanNotificationManager:
     @staticmethod
     async def _get_user_device_tokens(uid: str) -> List[str]:
         """Get all device tokens for a specific user that have Bible plan notifications enabled"""
-        cursor = DB.db["deviceTokens"].find({
-            "userId": uid,
-            "notification_preferences.Bible Plan Reminders": {"$ne": False}
-        }, {"token": 1, "_id": 0})
-        
-        docs = await cursor.to_list(length=None)
-        return [doc.get('token') for doc in docs if doc.get('token')]
+        return await get_user_device_tokens(DB.db, uid, "bible_plan", limit=None)
     
     @staticmethod
     async def send_immediate_bible_plan_notification(uid: str, plan_id: str, custom_message: str = None):
@@ -290,11 +283,11 @@ class BiblePlanNotificationManager:
                 return {"success": False, "error": "User not subscribed to this plan"}
             
             # Get plan details
-            plan_doc = await DB.db["bible_plans"].find_one({"_id": ObjectId(plan_id)})
-            if not plan_doc:
+            plan = await get_cached_reading_plan(plan_id)
+            if not plan:
                 return {"success": False, "error": "Bible plan not found"}
             
-            plan_name = plan_doc.get('name', 'Bible Reading Plan')
+            plan_name = plan.name or 'Bible Reading Plan'
             
             # Create notification content
             if custom_message:
@@ -303,9 +296,9 @@ class BiblePlanNotificationManager:
             else:
                 current_day = BiblePlanNotificationManager._calculate_current_day(
                     subscription_doc.get('start_date'),
-                    subscription_doc.get('progress', [])
+                    progress_state(subscription_doc)[0]
                 )
-                readings = plan_doc.get('readings', {}).get(str(current_day), [])
+                readings = [p.model_dump() for p in plan.readings.get(str(current_day), [])]
                 title, body = BiblePlanNotificationManager._create_notification_content(
                     plan_name, current_day, readings
                 )
@@ -0,0 +1,344 @@
+import asyncio
+import logging
+import os
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio
+from bson import ObjectId
+
+from mongo.database import DB
+
+# SMTP configuration
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
+FROM_EMAIL = os.getenv("FROM_EMAIL", SMTP_USERNAME)
+FROM_NAME = os.getenv("FROM_NAME", "Your Church")
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "20"))
+
+# Number of authenticated SMTP sessions kept open by the outbox sender
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "3"))
+
+# Most providers cap messages per session (Gmail ~100); recycle before hitting it
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "90"))
+
+OUTBOX_COLLECTION = "email_outbox"
+
+# How often the sender polls when nothing wakes it up, and how many emails it claims per pass
+OUTBOX_POLL_INTERVAL = 5
+OUTBOX_BATCH_SIZE = 50
+
+# Retry policy: exponential backoff from OUTBOX_RETRY_BASE_SECONDS, capped, then give up
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_RETRY_BASE_SECONDS = 30
+OUTBOX_RETRY_MAX_SECONDS = 3600
+
+# A claimed email still "sending" after this long belongs to a crashed worker and is requeued
+OUTBOX_CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+class SMTPConnectionPool:
+    """
+    Thread-safe pool of logged-in SMTP sessions.
+
+    acquire/release are blocking and must be called from a worker thread.
+    """
+
+    def __init__(self, size: int = SMTP_POOL_SIZE):
+        self.size = max(1, size)
+        self._idle: List[Tuple[smtplib.SMTP, int]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _connect() -> smtplib.SMTP:
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+        server.starttls()
+        server.login(SMTP_USERNAME, SMTP_PASSWORD)
+        return server
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def acquire(self) -> Tuple[smtplib.SMTP, int]:
+        """Return (server, messages already sent on it), reusing an idle session when it is still alive."""
+        while True:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                return self._connect(), 0
+            server, sent = entry
+            if self._is_alive(server):
+                return server, sent
+            self._close(server)
+
+    def release(self, server: smtplib.SMTP, sent: int, broken: bool = False):
+        if broken or sent >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+            self._close(server)
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((server, sent))
+                return
+        self._close(server)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+
+def build_mime_message(to_email: str, subject: str, html_body: str, text_body: str) -> MIMEMultipart:
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = f"{FROM_NAME} <{FROM_EMAIL}>"
+    msg['To'] = to_email
+
+    # Add text and HTML parts
+    msg.attach(MIMEText(text_body, 'plain'))
+    msg.attach(MIMEText(html_body, 'html'))
+    return msg
+
+
+def smtp_configured() -> bool:
+    return bool(SMTP_USERNAME and SMTP_PASSWORD)
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(OUTBOX_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1)), OUTBOX_RETRY_MAX_SECONDS))
+
+
+class EmailOutbox:
+    """
+    Durable email queue. Request handlers only enqueue; a single background
+    loop claims due emails and sends them over a small pool of SMTP sessions.
+    """
+
+    pool = SMTPConnectionPool()
+    _wakeup: Optional[asyncio.Event] = None
+
+    @staticmethod
+    def _wake():
+        if EmailOutbox._wakeup is not None:
+            EmailOutbox._wakeup.set()
+
+    @staticmethod
+    def _new_doc(to_email: str, subject: str, html_body: str, text_body: str, provider: str, category: Optional[str]) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        return {
+            "to": to_email,
+            "subject": subject,
+            "html": html_body,
+            "text": text_body,
+            "provider": provider,
+            "category": category,
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+            "last_error": None,
+        }
+
+    @staticmethod
+    async def enqueue(to_email: str, subject: str, html_body: str, text_body: str, provider: str = "smtp", category: Optional[str] = None) -> Dict[str, Any]:
+        doc = EmailOutbox._new_doc(to_email, subject, html_body, text_body, provider, category)
+        result = await DB.db[OUTBOX_COLLECTION].insert_one(doc)
+        EmailOutbox._wake()
+        return {"success": True, "queued": True, "outbox_id": str(result.inserted_id)}
+
+    @staticmethod
+    async def enqueue_many(emails: List[Dict[str, str]], provider: str = "smtp", category: Optional[str] = None) -> Dict[str, Any]:
+        """Queue many emails with one insert. Each item needs to, subject, html and text."""
+        docs = [
+            EmailOutbox._new_doc(e["to"], e["subject"], e["html"], e["text"], provider, category)
+            for e in emails
+        ]
+        if not docs:
+            return {"success": True, "queued": 0, "outbox_ids": []}
+        result = await DB.db[OUTBOX_COLLECTION].insert_many(docs, ordered=False)
+        EmailOutbox._wake()
+        return {"success": True, "queued": len(result.inserted_ids), "outbox_ids": [str(i) for i in result.inserted_ids]}
+
+    @staticmethod
+    async def _claim_batch(limit: int) -> List[Dict[str, Any]]:
+        """Atomically claim up to ``limit`` due emails so concurrent workers never double-send."""
+        coll = DB.db[OUTBOX_COLLECTION]
+        now = datetime.utcnow()
+        claim_id = ObjectId()
+        claimed = []
+        for _ in range(limit):
+            doc = await coll.find_one_and_update(
+                {"status": "pending", "next_attempt_at": {"$lte": now}},
+                {"$set": {"status": "sending", "claim_id": claim_id, "locked_at": now}, "$inc": {"attempts": 1}},
+                sort=[("next_attempt_at", 1)],
+                return_document=True,
+            )
+            if doc is None:
+                break
+            claimed.append(doc)
+        return claimed
+
+    @staticmethod
+    async def _requeue_abandoned():
+        await DB.db[OUTBOX_COLLECTION].update_many(
+            {"status": "sending", "locked_at": {"$lt": datetime.utcnow() - OUTBOX_CLAIM_TIMEOUT}},
+            {"$set": {"status": "pending", "next_attempt_at": datetime.utcnow()}},
+        )
+
+    @staticmethod
+    def _send_chunk_sync(docs: List[Dict[str, Any]]) -> List[Tuple[ObjectId, Optional[str], bool]]:
+        """
+        Send a chunk of emails over one pooled session, back to back.
+        Returns (id, error or None, permanent failure) for each email.
+        """
+        results = []
+        pool = EmailOutbox.pool
+        server, sent = pool.acquire()
+        broken = False
+        try:
+            for doc in docs:
+                msg = build_mime_message(doc["to"], doc["subject"], doc["html"], doc["text"])
+                try:
+                    try:
+                        server.send_message(msg)
+                    except smtplib.SMTPServerDisconnected:
+                        # Session dropped between messages; reconnect once and retry this email
+                        pool.release(server, sent, broken=True)
+                        server, sent = pool.acquire()
+                        server.send_message(msg)
+                    sent += 1
+                    results.append((doc["_id"], None, False))
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused) as e:
+                    results.append((doc["_id"], str(e), True))
+                except Exception as e:
+                    results.append((doc["_id"], str(e), False))
+                    broken = True
+                    break
+        finally:
+            pool.release(server, sent, broken=broken)
+
+        # Anything left after a broken session is retried on the next pass
+        done = {r[0] for r in results}
+        for doc in docs:
+            if doc["_id"] not in done:
+                results.append((doc["_id"], "SMTP session failed before send", False))
+        return results
+
+    @staticmethod
+    async def _send_smtp(docs: List[Dict[str, Any]]) -> List[Tuple[ObjectId, Optional[str], bool]]:
+        size = EmailOutbox.pool.size
+        chunks = [docs[i::size] for i in range(size) if docs[i::size]]
+        results: List[Tuple[ObjectId, Optional[str], bool]] = []
+
+        async def _run(chunk):
+            try:
+                results.extend(await anyio.to_thread.run_sync(EmailOutbox._send_chunk_sync, chunk))
+            except Exception as e:
+                # Could not even open a session (bad credentials, server down)
+                results.extend((doc["_id"], str(e), False) for doc in chunk)
+
+        await asyncio.gather(*(_run(c) for c in chunks))
+        return results
+
+    @staticmethod
+    async def _send_sendgrid(docs: List[Dict[str, Any]]) -> List[Tuple[ObjectId, Optional[str], bool]]:
+        # Local import avoids a cycle: RefundEmailHelper enqueues through this module
+        from helpers.RefundEmailHelper import send_email_sendgrid
+
+        results = []
+        for doc in docs:
+            result = await send_email_sendgrid(doc["to"], doc["subject"], doc["html"], doc["text"])
+            results.append((doc["_id"], None if result.get("success") else result.get("error", "SendGrid error"), False))
+        return results
+
+    @staticmethod
+    async def _record_results(docs: List[Dict[str, Any]], results: List[Tuple[ObjectId, Optional[str], bool]]):
+        coll = DB.db[OUTBOX_COLLECTION]
+        attempts_by_id = {doc["_id"]: doc.get("attempts", 1) for doc in docs}
+        now = datetime.utcnow()
+        sent_ids = [oid for oid, error, _ in results if error is None]
+        if sent_ids:
+            await coll.update_many(
+                {"_id": {"$in": sent_ids}},
+                {"$set": {"status": "sent", "sent_at": now, "last_error": None}, "$unset": {"claim_id": "", "locked_at": ""}},
+            )
+        for oid, error, permanent in results:
+            if error is None:
+                continue
+            attempts = attempts_by_id.get(oid, 1)
+            if permanent or attempts >= OUTBOX_MAX_ATTEMPTS:
+                update = {"status": "failed", "failed_at": now, "last_error": error}
+                logging.error(f"Email {oid} failed permanently after {attempts} attempt(s): {error}")
+            else:
+                update = {"status": "pending", "next_attempt_at": now + _retry_delay(attempts), "last_error": error}
+            await coll.update_one({"_id": oid}, {"$set": update, "$unset": {"claim_id": "", "locked_at": ""}})
+
+    @staticmethod
+    async def process_once(limit: int = OUTBOX_BATCH_SIZE) -> int:
+        """Claim and send one batch of due emails. Returns how many were attempted."""
+        docs = await EmailOutbox._claim_batch(limit)
+        if not docs:
+            return 0
+
+        smtp_docs = [d for d in docs if d.get("provider", "smtp") == "smtp"]
+        sendgrid_docs = [d for d in docs if d.get("provider") == "sendgrid"]
+
+        results = []
+        if smtp_docs:
+            if smtp_configured():
+                results.extend(await EmailOutbox._send_smtp(smtp_docs))
+            else:
+                logging.warning("SMTP credentials not configured")
+                results.extend((d["_id"], "SMTP not configured", True) for d in smtp_docs)
+        if sendgrid_docs:
+            results.extend(await EmailOutbox._send_sendgrid(sendgrid_docs))
+
+        await EmailOutbox._record_results(docs, results)
+        sent = sum(1 for _, error, _ in results if error is None)
+        logging.info(f"Email outbox pass: {sent}/{len(docs)} sent")
+        return len(docs)
+
+    @staticmethod
+    async def runOutboxLoop():
+        EmailOutbox._wakeup = asyncio.Event()
+        logging.info("Email outbox loop started")
+        while True:
+            try:
+                await EmailOutbox._requeue_abandoned()
+                # Drain everything that is due before going back to sleep
+                while await EmailOutbox.process_once() > 0:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Email outbox loop error")
+
+            EmailOutbox._wakeup.clear()
+            try:
+                await asyncio.wait_for(EmailOutbox._wakeup.wait(), timeout=OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    async def close():
+        await anyio.to_thread.run_sync(EmailOutbox.pool.close_all)
@@ -1,13 +1,19 @@
+import asyncio
 import logging
 import re
 import httpx
 import inspect
 from datetime import datetime
+from typing import Dict, List, Optional
+from helpers.ttl_cache import TTLCache
 from mongo.database import DB
 from firebase_admin import messaging
 from mongo.scheduled_notifications import (
-	schedule_notification, get_scheduled_notifications, remove_scheduled_notification, get_notification_history, log_notification
+	schedule_notification, get_scheduled_notifications, remove_scheduled_notification, get_notification_history, log_notification,
+	deliver_to_token
 )
+from mongo.device_tokens import collect_stale_device_tokens, get_user_device_tokens, remove_device_tokens, upsert_device_token
+from mongo.notification_metrics import DeliveryStats, classify_fcm_error, get_delivery_metrics, is_stale_token_error
 
 
 async def update_notification_settings(streamNotificationMessage: str, streamNotificationTitle: str):
@@ -29,18 +35,23 @@ async def notification_history(limit: int = 100):
 			n['_id'] = str(n['_id'])
 	return history
 
+
+async def notification_delivery_metrics(days: int = 7):
+	return await get_delivery_metrics(DB.db, days)
+
+
+async def prune_stale_device_tokens(older_than_days: int):
+	result = await collect_stale_device_tokens(DB.db, older_than_days)
+	return {"success": True, **result}
+
 	
 async def send_push_notification(title, body, data, send_to_all, token, eventId, link, route, actionType):
-	responses = []
 	# Validate link if actionType is 'link'
 	if actionType == "link" and link:
 		error = await validate_link(link)
 		if error:
 			return {"success": False, "error": error}
-		normalized_link = link.strip()
-		if not normalized_link.startswith("http://") and not normalized_link.startswith("https://"):
-			normalized_link = f"https://{normalized_link.lstrip('/')}"
-		link = normalized_link
+		link = normalize_link(link)
 
 	if send_to_all:
 		tokens_cursor = DB.db['deviceTokens'].find({}, {'_id': 0, 'token': 1, 'notification_preferences': 1})
@@ -60,31 +71,21 @@ async def send_push_notification(title, body, data, send_to_all, token, eventId,
 				allow = prefs.get('Bible Plan Reminders', True)
 			if t and allow:
 				filtered_tokens.append(t)
+		enhanced_data = {
+			**{k: str(v) if v is not None else None for k, v in data.items()},
+			**({"eventId": str(eventId)} if eventId is not None else {}),
+			**({"link": str(link)} if link is not None else {}),
+			**({"route": str(route)} if route is not None else {}),
+			**({"actionType": str(actionType)} if actionType is not None else {})
+		}
+		stats = DeliveryStats()
+		if filtered_tokens:
+			stats.start_batch(len(filtered_tokens))
 		for t in filtered_tokens:
-			enhanced_data = {
-				**{k: str(v) if v is not None else None for k, v in data.items()},
-				**({"eventId": str(eventId)} if eventId is not None else {}),
-				**({"link": str(link)} if link is not None else {}),
-				**({"route": str(route)} if route is not None else {}),
-				**({"actionType": str(actionType)} if actionType is not None else {})
-			}
-			message = messaging.Message(
-				notification=messaging.Notification(
-					title=title,
-					body=body,
-				),
-				token=t,
-				data=enhanced_data
-			)
-			try:
-				response = messaging.send(message)
-				responses.append({"token": t, "response": response})
-			except Exception as e:
-				responses.append({"token": t, "error": str(e)})
-				if "not found" in str(e).lower() or "invalid" in str(e).lower() or "expired" in str(e).lower():
-					await DB.db['deviceTokens'].delete_many({"token": t})
-		await log_notification(DB.db, title, body, "mobile", filtered_tokens, actionType, link, route, eventId)
-		return {"success": True, "results": responses, "count": len(filtered_tokens)}
+			await deliver_to_token(DB.db, t, title, body, enhanced_data, stats)
+		delivery = stats.finish().to_doc()
+		await log_notification(DB.db, title, body, "mobile", len(filtered_tokens), actionType, link, route, eventId, delivery)
+		return {"success": True, "delivery": delivery, "count": len(filtered_tokens)}
 	elif token:
 		enhanced_data = {
 			**{k: str(v) if v is not None else None for k, v in data.items()},
@@ -105,8 +106,8 @@ async def send_push_notification(title, body, data, send_to_all, token, eventId,
 			response = messaging.send(message)
 			return {"success": True, "response": response}
 		except Exception as e:
-			if "not found" in str(e).lower() or "invalid" in str(e).lower() or "expired" in str(e).lower():
-				await DB.db['deviceTokens'].delete_many({"token": token})
+			if is_stale_token_error(classify_fcm_error(e), e):
+				await remove_device_tokens(DB.db, [token])
 			return {"success": False, "error": str(e)}
 	else:
 		return {"success": False, "error": "No token provided and send_to_all is False."}
@@ -117,10 +118,7 @@ async def api_schedule_notification(title, body, scheduled_time, send_to_all, to
 		error = await validate_link(link)
 		if error:
 			return {"success": False, "error": error}
-		normalized_link = link.strip()
-		if not normalized_link.startswith("http://") and not normalized_link.startswith("https://"):
-			normalized_link = f"https://{normalized_link.lstrip('/')}"
-		link = normalized_link
+		link = normalize_link(link)
 	enhanced_data = {
 		**{k: str(v) if v is not None else None for k, v in data.items()},
 		**({"eventId": str(eventId)} if eventId is not None else {}),
@@ -158,21 +156,98 @@ async def api_remove_scheduled_notification(notification_id: str):
 	return {"success": success}
 
 
-async def validate_link(link: str) -> str:
+_FILE_EXT_PATTERN = re.compile(r"\.(pdf|docx?|xlsx?|pptx?|zip|rar|jpg|jpeg|png|gif|mp4|mp3|avi|mov|txt|csv|exe|dll|js|css|html|php|py|java|c|cpp|h|json|xml|svg|webp|ico|tar|gz|7z|apk|bin|msi|bat|sh|ps1|rtf|md|log|bak|tmp|dat|db)$", re.IGNORECASE)
+
+# Reachability results per normalized URL. Failures expire sooner so a fixed site is picked up quickly.
+LINK_VALIDATION_TTL_SECONDS = 600
+LINK_VALIDATION_FAILURE_TTL_SECONDS = 60
+LINK_VALIDATION_TIMEOUT_SECONDS = 3.0
+LINK_VALIDATION_CONCURRENCY = 8
+_link_validation_cache = TTLCache(ttl_seconds=LINK_VALIDATION_TTL_SECONDS, max_size=2048)
+_link_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_link_client() -> httpx.AsyncClient:
+	# One pooled client for all link probes instead of a new connection per notification
+	global _link_client
+	if _link_client is None or _link_client.is_closed:
+		_link_client = httpx.AsyncClient(
+			timeout=httpx.Timeout(LINK_VALIDATION_TIMEOUT_SECONDS),
+			limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+		)
+	return _link_client
+
+
+async def close_link_validation_client():
+	global _link_client
+	if _link_client is not None:
+		await _link_client.aclose()
+		_link_client = None
+
+
+def normalize_link(link: str) -> str:
 	normalized_link = link.strip()
 	if not normalized_link.startswith("http://") and not normalized_link.startswith("https://"):
 		normalized_link = f"https://{normalized_link.lstrip('/')}"
-	file_ext_pattern = re.compile(r"\.(pdf|docx?|xlsx?|pptx?|zip|rar|jpg|jpeg|png|gif|mp4|mp3|avi|mov|txt|csv|exe|dll|js|css|html|php|py|java|c|cpp|h|json|xml|svg|webp|ico|tar|gz|7z|apk|bin|msi|bat|sh|ps1|rtf|md|log|bak|tmp|dat|db)$", re.IGNORECASE)
-	if file_ext_pattern.search(normalized_link.split('?')[0]):
+	return normalized_link
+
+
+def _link_cache_key(normalized_link: str) -> str:
+	# Scheme and host are case-insensitive and fragments never reach the server
+	url = httpx.URL(normalized_link.split('#')[0])
+	return str(url.copy_with(scheme=url.scheme.lower(), host=url.host.lower()))
+
+
+async def _probe_link(normalized_link: str) -> bool:
+	client = _get_link_client()
+	try:
+		resp = await client.head(normalized_link)
+		if 200 <= resp.status_code < 400:
+			return True
+	except httpx.HTTPError:
+		pass
+	# Many servers reject or mishandle HEAD; confirm with a GET without downloading the body
+	async with client.stream("GET", normalized_link) as resp:
+		return 200 <= resp.status_code < 400
+
+
+async def validate_link(link: str) -> str:
+	normalized_link = normalize_link(link)
+	if _FILE_EXT_PATTERN.search(normalized_link.split('?')[0]):
 		return "Direct file links are not allowed."
 	try:
-		async with httpx.AsyncClient(timeout=5.0) as client:
-			resp = await client.get(normalized_link)
-			if resp.status_code < 200 or resp.status_code >= 400:
-				return f"Link is not reachable: {normalized_link}"
-	except Exception as e:
+		cache_key = _link_cache_key(normalized_link)
+	except Exception:
 		return "Link validation failed. Please check the URL and try again."
-	return None
+	cached = _link_validation_cache.get(cache_key)
+	if cached is not None:
+		return cached or None
+	try:
+		if await _probe_link(normalized_link):
+			error = None
+		else:
+			error = f"Link is not reachable: {normalized_link}"
+	except Exception as e:
+		error = "Link validation failed. Please check the URL and try again."
+	if error:
+		_link_validation_cache.set(cache_key, error, ttl_seconds=LINK_VALIDATION_FAILURE_TTL_SECONDS)
+	else:
+		# Empty string marks "valid" so it is distinguishable from a cache miss
+		_link_validation_cache.set(cache_key, "")
+	return error
+
+
+async def validate_links(links: List[str]) -> Dict[str, Optional[str]]:
+	"""Validate many links concurrently; returns {link: error or None} for each input link."""
+	semaphore = asyncio.Semaphore(LINK_VALIDATION_CONCURRENCY)
+
+	async def _validate(link: str):
+		async with semaphore:
+			return await validate_link(link)
+
+	unique_links = list(dict.fromkeys(link for link in links if link))
+	errors = await asyncio.gather(*(_validate(link) for link in unique_links))
+	return dict(zip(unique_links, errors))
 
 async def register_device_token(token, platform, appVersion, userId=None):
 	# Validate required fields
@@ -185,8 +260,7 @@ async def register_device_token(token, platform, appVersion, userId=None):
 		"platform": platform,
 		"appVersion": appVersion,
 		"userId": userId,
-		"lastSeenAt": datetime.utcnow(),
-		"createdAt": datetime.utcnow(),
+		"last_seen": datetime.utcnow(),
 	}
 	# Add notification_preferences if provided
 	frame = inspect.currentframe()
@@ -211,7 +285,8 @@ async def register_device_token(token, platform, appVersion, userId=None):
 	if notification_preferences is not None:
 		doc["notification_preferences"] = notification_preferences
 
-	await DB.db["deviceTokens"].update_one({"token": token}, {"$set": doc}, upsert=True)
+	# Upsert keeps one row per token and refreshes last_seen (the app registers on every open)
+	await upsert_device_token(DB.db, doc)
 	return {"success": True, "doc": doc}
 
 
@@ -245,52 +320,26 @@ async def send_notification_to_user(userId: str, title: str, body: str, data: di
 		data = {}
 	
 	# Get all device tokens for the user that allow the specific notification type
-	query = {"userId": userId}
-	if actionType:
-		# Check notification preferences based on actionType
-		if actionType == 'bible_plan':
-			query["notification_preferences.Bible Plan Reminders"] = {"$ne": False}
-		elif actionType == 'event':
-			query["notification_preferences.Event Notification"] = {"$ne": False}
-		elif actionType in ['text', 'link', 'route']:
-			query["notification_preferences.App Announcements"] = {"$ne": False}
-	
-	tokens_cursor = DB.db['deviceTokens'].find(query, {'_id': 0, 'token': 1})
-	tokens_docs = await tokens_cursor.to_list(length=100)
-	user_tokens = [doc.get('token') for doc in tokens_docs if doc.get('token')]
+	user_tokens = await get_user_device_tokens(DB.db, userId, actionType)
 	
 	if not user_tokens:
 		return {"success": False, "error": "No eligible device tokens found for user"}
 	
-	responses = []
+	enhanced_data = {
+		**{k: str(v) if v is not None else None for k, v in data.items()},
+		**({"eventId": str(eventId)} if eventId is not None else {}),
+		**({"link": str(link)} if link is not None else {}),
+		**({"route": str(route)} if route is not None else {}),
+		**({"actionType": str(actionType)} if actionType is not None else {})
+	}
+	stats = DeliveryStats()
+	stats.start_batch(len(user_tokens))
 	for token in user_tokens:
-		enhanced_data = {
-			**{k: str(v) if v is not None else None for k, v in data.items()},
-			**({"eventId": str(eventId)} if eventId is not None else {}),
-			**({"link": str(link)} if link is not None else {}),
-			**({"route": str(route)} if route is not None else {}),
-			**({"actionType": str(actionType)} if actionType is not None else {})
-		}
-		
-		message = messaging.Message(
-			notification=messaging.Notification(
-				title=title,
-				body=body,
-			),
-			token=token,
-			data=enhanced_data
-		)
-		
-		try:
-			response = messaging.send(message)
-			responses.append({"token": token, "response": response})
-		except Exception as e:
-			responses.append({"token": token, "error": str(e)})
-			if "not found" in str(e).lower() or "invalid" in str(e).lower() or "expired" in str(e).lower():
-				await DB.db['deviceTokens'].delete_many({"token": token})
+		await deliver_to_token(DB.db, token, title, body, enhanced_data, stats)
 	
-	await log_notification(DB.db, title, body, "mobile", user_tokens, actionType, link, route, eventId)
-	return {"success": True, "results": responses, "sent_to_tokens": len(user_tokens)}
+	delivery = stats.finish().to_doc()
+	await log_notification(DB.db, title, body, "mobile", len(user_tokens), actionType, link, route, eventId, delivery)
+	return {"success": True, "delivery": delivery, "sent_to_tokens": len(user_tokens)}
 
 
 async def get_available_notification_preferences():
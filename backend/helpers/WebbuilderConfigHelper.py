@@ -1,5 +1,6 @@
 from mongo.database import DB
 from models.website_app_config import WebsiteAppConfig
+from helpers.site_cache import invalidate_website_config
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 import logging
@@ -79,6 +80,7 @@ class WebbuilderConfigHelper:
             # Always update metadata
             success &= await DB.set_setting("website_updated_by", updated_by)
             success &= await DB.set_setting("website_updated_at", current_time)
+            invalidate_website_config()
             
             return success
                 
@@ -120,6 +122,7 @@ class WebbuilderConfigHelper:
             # Always update metadata
             success &= await DB.set_setting("website_updated_by", updated_by)
             success &= await DB.set_setting("website_updated_at", current_time)
+            invalidate_website_config()
             
             return success
                 
@@ -0,0 +1,61 @@
+"""
+In-process read-through cache for Bible plan content.
+
+Published plans, templates and single plan documents are read by every app user
+browsing plans, and by the notification scheduler once per subscriber, but only
+change when a mod edits them. Each entry records the cache generation it was
+built at (``version``), its serialized body and a content ETag.
+
+Plan and template writes in models.bible_plan call invalidate_plans() /
+invalidate_templates(); plan_cache is a VersionedTTLCache, so a load racing
+a write is never stored. Each worker keeps its own copy, so another worker may
+serve a stale entry until BIBLE_PLAN_CACHE_TTL_SECONDS elapses.
+"""
+
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from helpers.http_cache import content_etag, json_body
+from helpers.ttl_cache import VersionedTTLCache
+
+BIBLE_PLAN_CACHE_TTL_SECONDS = float(os.getenv("BIBLE_PLAN_CACHE_TTL_SECONDS", "300"))
+
+# Keys: ("published",), ("plan", id), ("templates",), ("template", id), ("template_name", name)
+plan_cache = VersionedTTLCache(ttl_seconds=BIBLE_PLAN_CACHE_TTL_SECONDS, max_size=2048)
+
+
+def invalidate_plans(plan_id: Optional[str] = None) -> None:
+    """Drop the published list and one plan (every plan when ``plan_id`` is None)."""
+    plan_cache.invalidate(("published",))
+    if plan_id is None:
+        plan_cache.invalidate_prefix("plan")
+    else:
+        plan_cache.invalidate(("plan", str(plan_id)))
+
+
+def invalidate_templates() -> None:
+    plan_cache.invalidate_prefix("template")
+
+
+def build_entry(value: Any, version: int) -> Dict[str, Any]:
+    body = json_body(value)
+    return {"version": version, "value": value, "body": body, "etag": content_etag(body)}
+
+
+async def cached_entry(
+    key: Hashable, loader: Callable[[], Awaitable[Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    ``{"version", "value", "body", "etag"}`` for ``key``, loading on a miss.
+    None when the loader finds nothing; misses are not cached.
+    """
+    entry = plan_cache.get(key)
+    if entry is not None:
+        return entry
+    generation = plan_cache.generation
+    value = await loader()
+    if value is None:
+        return None
+    entry = build_entry(value, generation)
+    plan_cache.set_if_current(key, entry, generation)
+    return entry
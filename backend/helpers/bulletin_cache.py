@@ -0,0 +1,89 @@
+"""
+Materialized weekly bulletin feed.
+
+The public bulletins page asks for the same thing all week: published,
+upcoming bulletins plus the services shown for one Monday. That feed is stored
+as one document per week in ``bulletin_week_snapshots`` (``_id`` is the Monday
+as YYYY-MM-DD) holding the serialized BulletinFeedOut body and its ETag, so a
+Sunday-morning burst costs one find_one per request.
+
+A snapshot also stops being served at ``valid_until`` (the next bulletin
+publish_date or expire_at, or the next Monday, whichever comes first) because
+the feed depends on the clock as well as the data. Bulletin and service writes
+call invalidate_weekly_bulletins(), which drops every snapshot. The Mongo TTL
+index on ``expires_at`` bounds how long a snapshot built across a write on
+another worker can live.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from helpers.http_cache import content_etag, json_body
+from helpers.ttl_cache import CacheGeneration
+from mongo.database import DB
+
+SNAPSHOT_COLLECTION = "bulletin_week_snapshots"
+BULLETIN_SNAPSHOT_TTL_SECONDS = int(os.getenv("BULLETIN_SNAPSHOT_TTL_SECONDS", "600"))
+
+# Bumped on every invalidation so a snapshot built across a write on this worker is never stored
+_generation = CacheGeneration()
+
+
+def weekly_snapshot_generation() -> int:
+    return _generation.value
+
+
+def snapshot_key(week_monday: datetime) -> str:
+    return week_monday.strftime("%Y-%m-%d")
+
+
+def build_snapshot(feed: Any, valid_until: datetime, bulletin_count: int, complete: bool) -> Dict[str, Any]:
+    body = json_body(feed).decode("utf-8")
+    return {
+        "body": body,
+        "etag": content_etag(body),
+        "valid_until": valid_until,
+        "bulletin_count": bulletin_count,
+        "complete": complete,
+    }
+
+
+async def load_weekly_snapshot(key: str, now: datetime) -> Optional[Dict[str, Any]]:
+    """
+    The stored snapshot for ``key`` unless it is missing or past ``valid_until``
+    or ``expires_at``; the TTL monitor only removes expired documents about once
+    a minute.
+    """
+    if DB.db is None:
+        return None
+    doc = await DB.db[SNAPSHOT_COLLECTION].find_one({"_id": key})
+    if not doc or doc.get("valid_until") is None or doc["valid_until"] <= now:
+        return None
+    if doc.get("expires_at") is None or doc["expires_at"] <= now:
+        return None
+    return doc
+
+
+async def store_weekly_snapshot(key: str, snapshot: Dict[str, Any], generation: int) -> bool:
+    if DB.db is None or not _generation.is_current(generation):
+        return False
+    doc = dict(snapshot)
+    doc["expires_at"] = datetime.utcnow() + timedelta(seconds=BULLETIN_SNAPSHOT_TTL_SECONDS)
+    try:
+        await DB.db[SNAPSHOT_COLLECTION].replace_one({"_id": key}, doc, upsert=True)
+    except Exception as exc:
+        logging.error(f"Error storing weekly bulletin snapshot {key}: {exc}")
+        return False
+    return True
+
+
+async def invalidate_weekly_bulletins() -> None:
+    _generation.bump()
+    if DB.db is None:
+        return
+    try:
+        await DB.db[SNAPSHOT_COLLECTION].delete_many({})
+    except Exception as exc:
+        logging.warning(f"Error invalidating weekly bulletin snapshots: {exc}")
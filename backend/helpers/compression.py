@@ -0,0 +1,228 @@
+"""
+Response compression for text-like payloads (mostly large JSON lists).
+
+Pure ASGI so streaming responses stay streamed. Only allow-listed content types
+above COMPRESSION_MIN_SIZE are touched; images, video, fonts and anything that
+already carries a Content-Encoding (precompressed frontend assets) pass through.
+Brotli is used when the optional ``brotli`` package is installed, gzip otherwise.
+"""
+
+import os
+import threading
+import zlib
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from helpers.precompressed_static import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # optional; gzip covers every client
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() not in ("0", "false", "no")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# Low qualities are close to gzip -9 in size at a fraction of the CPU cost
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+_COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "application/manifest+json",
+    "image/svg+xml",
+}
+
+
+def is_compressible_type(content_type: str) -> bool:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in _COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+        or media_type.endswith("+xml")
+    )
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._impl = brotli.Compressor(mode=brotli.MODE_TEXT, quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits 16+: gzip container
+            self._impl = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._impl.process(data) + self._impl.flush()
+        return self._impl.compress(data) + self._impl.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._impl.process(data) + self._impl.finish()
+        return self._impl.compress(data) + self._impl.flush(zlib.Z_FINISH)
+
+
+class CompressionMetrics:
+    """Process-wide counters; each worker reports its own numbers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._by_encoding: Dict[str, Dict[str, int]] = {}
+            self._skipped = 0
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int):
+        with self._lock:
+            entry = self._by_encoding.setdefault(encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0})
+            entry["responses"] += 1
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+
+    def record_skipped(self):
+        with self._lock:
+            self._skipped += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            by_encoding = {k: dict(v) for k, v in self._by_encoding.items()}
+            skipped = self._skipped
+        bytes_in = sum(v["bytes_in"] for v in by_encoding.values())
+        bytes_out = sum(v["bytes_out"] for v in by_encoding.values())
+        return {
+            "enabled": COMPRESSION_ENABLED,
+            "min_size": COMPRESSION_MIN_SIZE,
+            "brotli_available": brotli is not None,
+            "compressed_responses": sum(v["responses"] for v in by_encoding.values()),
+            "skipped_small_responses": skipped,
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out,
+            "bytes_saved": bytes_in - bytes_out,
+            "ratio": round(bytes_out / bytes_in, 4) if bytes_in else None,
+            "by_encoding": by_encoding,
+        }
+
+
+compression_metrics = CompressionMetrics()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self.app, encoding, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        # None until the first body message decides; then True/False
+        self.active: Optional[bool] = None
+        self.compressor: Optional[_Compressor] = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    def _eligible(self, headers: Headers) -> bool:
+        return (
+            self.start_message["status"] == 200
+            and "content-encoding" not in headers
+            and "content-range" not in headers
+            and "no-transform" not in headers.get("cache-control", "")
+            and is_compressible_type(headers.get("content-type", ""))
+        )
+
+    async def send_wrapper(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the headers until we know whether the body will be compressed
+            self.start_message = message
+            self.active = None if self._eligible(Headers(raw=message["headers"])) else False
+            return
+
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.active is False:
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.active is None:
+            if not more_body and len(body) < self.minimum_size:
+                compression_metrics.record_skipped()
+                self.active = False
+                await self._flush_start()
+                await self.send(message)
+                return
+            self.active = True
+            self.compressor = _Compressor(self.encoding)
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            # A different representation: keep validators usable but weak
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            if "accept-ranges" in headers:
+                del headers["Accept-Ranges"]
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                compressed = self.compressor.finish(body)
+                headers["Content-Length"] = str(len(compressed))
+                compression_metrics.record(self.encoding, len(body), len(compressed))
+                await self._flush_start()
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            await self._flush_start()
+
+        self.bytes_in += len(body)
+        chunk = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+        self.bytes_out += len(chunk)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        if not more_body:
+            compression_metrics.record(self.encoding, self.bytes_in, self.bytes_out)
+
+    async def _flush_start(self):
+        if self.start_message is not None:
+            message, self.start_message = self.start_message, None
+            await self.send(message)
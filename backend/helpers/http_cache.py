@@ -0,0 +1,52 @@
+"""
+Shared helpers for serving cached JSON/HTML with content ETags.
+
+Cached entries store their serialized body and a strong ETag built from it;
+etag_response() answers If-None-Match (including ``*`` and weak validators)
+with 304 before sending the body.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional, Union
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def json_body(value: Any) -> bytes:
+    """Compact UTF-8 JSON for ``value``, encoded the way FastAPI would."""
+    return json.dumps(jsonable_encoder(value), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def content_etag(body: Union[bytes, str]) -> str:
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """RFC 9110 weak comparison of If-None-Match against ``etag``; ``*`` matches any current representation."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return "*" in candidates or any(t.removeprefix("W/") == etag for t in candidates)
+
+
+def etag_response(
+    request: Request,
+    body: Union[bytes, str],
+    etag: str,
+    *,
+    media_type: str = "application/json",
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    ``body`` with its ETag and ``Cache-Control: no-cache`` (clients keep a copy but
+    revalidate), or an empty 304 when the client already holds this version.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache", **(headers or {})}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,135 @@
+"""
+Thumbnail and responsive-variant generation for uploaded images.
+
+generate_derivatives runs inside a worker process (see get_derivative_pool), so it
+only takes and returns plain, picklable values and never touches the database.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from PIL import Image, ImageOps, features
+
+# Raster formats Pillow can decode reliably; everything else (svg, pdf, ico, ...) is served as-is
+DERIVATIVE_SOURCE_EXTENSIONS = {"jpg", "jpeg", "png", "webp", "bmp", "tif", "tiff", "avif"}
+
+THUMBNAIL_SIZE = (320, 320)
+VARIANT_WIDTHS = (480, 960, 1600)
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+
+# Skip decompression-bomb sized inputs instead of tying up a worker
+MAX_SOURCE_PIXELS = 80_000_000
+
+DERIVATIVE_WORKERS = int(os.getenv("ASSET_DERIVATIVE_WORKERS", str(max(1, min(2, os.cpu_count() or 1)))))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def variant_formats() -> List[str]:
+    """Formats to emit, best compression first. AVIF needs a Pillow build with libavif."""
+    return (["avif"] if features.check("avif") else []) + ["webp"]
+
+
+def _save(img: Image.Image, path: str, fmt: str) -> int:
+    if fmt == "avif":
+        img.save(path, format="AVIF", quality=AVIF_QUALITY)
+    else:
+        img.save(path, format="WEBP", quality=WEBP_QUALITY, method=4)
+    return os.path.getsize(path)
+
+
+def generate_derivatives(src_path: str, out_dir: str, stem: str, extension: str) -> Optional[Dict[str, Any]]:
+    """
+    Write a thumbnail and width-bounded variants of ``src_path`` into ``out_dir``.
+
+    Files are named ``<stem>.thumb.webp`` and ``<stem>.w<width>.<fmt>``; only bare
+    file names are returned so folder moves (which move ``out_dir`` wholesale)
+    keep the record valid. Returns None for inputs that cannot be processed.
+    """
+    if extension.lower() not in DERIVATIVE_SOURCE_EXTENSIONS:
+        return None
+    try:
+        with Image.open(src_path) as opened:
+            if opened.width * opened.height > MAX_SOURCE_PIXELS:
+                return None
+            if getattr(opened, "n_frames", 1) > 1:
+                # Animated images would lose their animation
+                return None
+            img = ImageOps.exif_transpose(opened)
+            img.load()
+    except Exception:
+        return None
+
+    if img.mode not in ("RGB", "RGBA"):
+        has_alpha = img.mode in ("LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+
+    os.makedirs(out_dir, exist_ok=True)
+    width, height = img.size
+
+    thumb = img.copy()
+    thumb.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+    thumb_file = f"{stem}.thumb.webp"
+    thumb_bytes = _save(thumb, os.path.join(out_dir, thumb_file), "webp")
+
+    variants: List[Dict[str, Any]] = []
+    formats = variant_formats()
+    widths = [w for w in VARIANT_WIDTHS if w < width]
+    if width <= VARIANT_WIDTHS[-1]:
+        # Small originals also get a full-width copy in the modern formats
+        widths.append(width)
+    for target_width in widths:
+        target_height = max(1, round(height * target_width / width))
+        resized = img if target_width == width else img.resize((target_width, target_height), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            file_name = f"{stem}.w{target_width}.{fmt}"
+            size = _save(resized, os.path.join(out_dir, file_name), fmt)
+            variants.append({
+                "file": file_name,
+                "width": target_width,
+                "height": target_height,
+                "format": fmt,
+                "bytes": size,
+            })
+
+    return {
+        "width": width,
+        "height": height,
+        "thumbnail": {
+            "file": thumb_file,
+            "width": thumb.width,
+            "height": thumb.height,
+            "format": "webp",
+            "bytes": thumb_bytes,
+        },
+        "variants": variants,
+    }
+
+
+def derivative_files(derivatives: Optional[Dict[str, Any]]) -> List[str]:
+    """Every file name recorded in a derivatives document."""
+    if not derivatives:
+        return []
+    files = [v["file"] for v in derivatives.get("variants") or [] if v.get("file")]
+    thumb = (derivatives.get("thumbnail") or {}).get("file")
+    if thumb:
+        files.append(thumb)
+    return files
+
+
+def get_derivative_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: the server process is multi-threaded, so forking it is unsafe
+        _pool = ProcessPoolExecutor(max_workers=DERIVATIVE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_derivative_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
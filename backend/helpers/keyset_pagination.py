@@ -0,0 +1,219 @@
+"""
+Keyset ("seek") pagination for Mongo list endpoints.
+
+A page is fetched with ``sort`` plus a filter that starts strictly after the last
+row of the previous page, so deep pages cost the same as the first one. The
+position is handed to clients as an opaque cursor: the last row's sort values
+(BSON-typed, so datetimes and ObjectIds round-trip) in urlsafe base64.
+
+Sort specs must end in a unique field; paginate() appends ``_id`` when missing.
+Endpoints whose body is a bare list return the cursor in NEXT_CURSOR_HEADER.
+
+Totals are optional (``count_mode``):
+- "exact": count_documents on every call
+- "cached": exact, but reused for COUNT_CACHE_TTL_SECONDS per (collection, filter);
+  inserts and deletes on a paginated collection call invalidate_counts()
+- "estimated": collection metadata when unfiltered, otherwise counted up to ESTIMATED_COUNT_CAP
+- "none": no total
+"""
+
+import base64
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bson import json_util
+
+from helpers.ttl_cache import TTLCache
+
+SortSpec = Sequence[Tuple[str, int]]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# count_documents(..., limit=cap) for "estimated" totals: exact below the cap, "cap+" above it
+ESTIMATED_COUNT_CAP = 1000
+
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("KEYSET_COUNT_CACHE_TTL_SECONDS", "30"))
+_count_cache = TTLCache(ttl_seconds=COUNT_CACHE_TTL_SECONDS, max_size=512)
+
+
+def _get_path(doc: Dict[str, Any], path: str) -> Any:
+    value: Any = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def with_tiebreaker(sort: SortSpec) -> List[Tuple[str, int]]:
+    sort = list(sort)
+    if not any(field == "_id" for field, _ in sort):
+        sort.append(("_id", sort[-1][1] if sort else 1))
+    return sort
+
+
+def encode_cursor(doc: Dict[str, Any], sort: SortSpec) -> str:
+    values = [_get_path(doc, field) for field, _ in sort]
+    raw = json_util.dumps(values, json_options=json_util.CANONICAL_JSON_OPTIONS)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], sort: SortSpec) -> Optional[List[Any]]:
+    """Sort values from ``cursor``; None for a missing, malformed or mismatched cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        values = json_util.loads(raw)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        return None
+    if not isinstance(values, list) or len(values) != len(sort):
+        return None
+    return values
+
+
+def _after(field: str, direction: int, value: Any) -> Optional[Dict[str, Any]]:
+    """Predicate for "strictly after ``value``" on one field; nulls sort first in Mongo."""
+    if value is None:
+        return {field: {"$ne": None}} if direction == 1 else None
+    if direction == 1:
+        return {field: {"$gt": value}}
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+
+def keyset_filter(sort: SortSpec, values: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Rows that sort after ``values``:
+    (a > x) or (a == x and b > y) or (a == x and b == y and c > z) ...
+    Each field honours its own direction, so mixed asc/desc specs work.
+    """
+    branches: List[Dict[str, Any]] = []
+    for i, (field, direction) in enumerate(sort):
+        after = _after(field, direction, values[i])
+        if after is None:
+            continue
+        prefix = [{f: v} for (f, _), v in zip(sort[:i], values[:i])]
+        branches.append({"$and": prefix + [after]} if prefix else after)
+    # Nothing can follow the last row (e.g. every key is null on a desc sort)
+    return {"$or": branches} if branches else {"_id": {"$exists": False}}
+
+
+def invalidate_counts(collection_name: str) -> None:
+    """Drop cached totals for ``collection_name``; called after inserts and deletes."""
+    _count_cache.invalidate_prefix(collection_name + "\x00")
+
+
+async def _cached_count(collection, key_source: Any, count) -> int:
+    key = collection.name + "\x00" + json_util.dumps(key_source, json_options=json_util.CANONICAL_JSON_OPTIONS)
+    total = _count_cache.get(key)
+    if total is None:
+        total = await count()
+        _count_cache.set(key, total)
+    return total
+
+
+async def count_total(collection, filt: Dict[str, Any], mode: str = "exact") -> Tuple[Optional[int], bool]:
+    """``(total, is_estimate)`` for a find() filter under ``mode`` (see module docstring)."""
+    if mode == "none":
+        return None, False
+    if mode == "estimated":
+        if not filt:
+            return await collection.estimated_document_count(), True
+        total = await collection.count_documents(filt, limit=ESTIMATED_COUNT_CAP)
+        return total, total >= ESTIMATED_COUNT_CAP
+    if mode == "cached":
+        return await _cached_count(collection, filt, lambda: collection.count_documents(filt)), False
+    return await collection.count_documents(filt), False
+
+
+async def count_pipeline_total(collection, pipeline: List[Dict[str, Any]], mode: str = "exact") -> Tuple[Optional[int], bool]:
+    """count_total() for rows produced by an aggregation ``pipeline`` (filtering stages only)."""
+    if mode == "none":
+        return None, False
+
+    async def count(stages: List[Dict[str, Any]]) -> int:
+        rows = await collection.aggregate(stages + [{"$count": "n"}]).to_list(length=1)
+        return rows[0]["n"] if rows else 0
+
+    if mode == "estimated":
+        total = await count(list(pipeline) + [{"$limit": ESTIMATED_COUNT_CAP}])
+        return total, total >= ESTIMATED_COUNT_CAP
+    if mode == "cached":
+        return await _cached_count(collection, pipeline, lambda: count(list(pipeline))), False
+    return await count(list(pipeline)), False
+
+
+async def paginate(
+    collection,
+    filt: Dict[str, Any],
+    sort: SortSpec,
+    limit: int,
+    *,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    One page of ``collection``. With a valid ``cursor`` the page starts after it;
+    without one, ``skip`` keeps page-number callers working. Returns
+    ``(docs, next_cursor)``; next_cursor is None on the last page.
+    """
+    sort = with_tiebreaker(sort)
+    limit = max(1, limit)
+    query = dict(filt)
+    values = decode_cursor(cursor, sort)
+    if values is not None:
+        query = {"$and": [filt, keyset_filter(sort, values)]} if filt else keyset_filter(sort, values)
+        skip = 0
+
+    added: List[str] = []
+    if projection is not None and any(v for k, v in projection.items() if k != "_id"):
+        # Inclusion projection: sort fields are needed for the next cursor, stripped again below
+        added = [field for field, _ in sort if not projection.get(field)]
+        projection = {**projection, **{field: 1 for field in added}}
+
+    find = collection.find(query, projection).sort(sort)
+    if skip:
+        find = find.skip(skip)
+    docs = await find.limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = encode_cursor(docs[limit - 1], sort) if len(docs) > limit else None
+    docs = docs[:limit]
+    for doc in docs:
+        for field in added:
+            doc.pop(field.split(".", 1)[0], None)
+    return docs, next_cursor
+
+
+async def paginate_pipeline(
+    collection,
+    pipeline: List[Dict[str, Any]],
+    sort: SortSpec,
+    limit: int,
+    *,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    stages: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    paginate() for aggregations: ``pipeline`` filters, then the keyset match, sort
+    and limit run, and ``stages`` (lookups, shaping) only touch the returned page.
+    ``stages`` must keep the sort fields so the next cursor can be read back.
+    """
+    sort = with_tiebreaker(sort)
+    limit = max(1, limit)
+    full = list(pipeline)
+    values = decode_cursor(cursor, sort)
+    if values is not None:
+        full.append({"$match": keyset_filter(sort, values)})
+        skip = 0
+    full.append({"$sort": {field: direction for field, direction in sort}})
+    if skip:
+        full.append({"$skip": skip})
+    full.append({"$limit": limit + 1})
+    full.extend(stages or [])
+
+    docs = await collection.aggregate(full).to_list(length=limit + 1)
+    next_cursor = encode_cursor(docs[limit - 1], sort) if len(docs) > limit else None
+    return docs[:limit], next_cursor
@@ -0,0 +1,90 @@
+"""
+StaticFiles variant for the built Vite frontend.
+
+- Content-hashed files (``index-BXk3a9_z.js``) are cached for a year as
+  ``immutable``; anything else must be revalidated.
+- When the client accepts it, a precompressed ``.br``/``.gz`` sibling written at
+  build time (frontend/web/churchlink/scripts/precompress-dist.js) is served
+  instead of the original, so nothing is compressed per request.
+"""
+
+import mimetypes
+import os
+import re
+from typing import Dict, List, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Vite's default asset names: <name>-<8+ char base64url hash>.<ext>
+_HASHED_NAME = re.compile(r"-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+
+# Preference order when the client accepts several
+_ENCODINGS: List[Tuple[str, str]] = [("br", ".br"), ("gzip", ".gz")]
+
+
+def is_hashed_asset(path: str) -> bool:
+    return bool(_HASHED_NAME.search(os.path.basename(path)))
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}; codings with q=0 are dropped."""
+    accepted: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted[coding] = q
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if is_hashed_asset(full_path) else REVALIDATE_CACHE_CONTROL,
+        }
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+
+        response = None
+        has_sibling = False
+        for coding, suffix in _ENCODINGS:
+            try:
+                sibling_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            has_sibling = True
+            if coding in accepted or "*" in accepted:
+                media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+                response = FileResponse(
+                    full_path + suffix,
+                    status_code=status_code,
+                    stat_result=sibling_stat,
+                    media_type=media_type,
+                    headers={**headers, "Content-Encoding": coding},
+                )
+                break
+
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if has_sibling:
+            response.headers["Vary"] = "Accept-Encoding"
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,22 @@
+"""
+In-process cache for the public sermon feed.
+
+list_sermons() pages are cached per (filters, page position) as hydrated
+SermonOut lists without per-user favorite flags; callers apply those on a copy.
+Sermon writes, ministry renames/deletes (ministry_refs) and the YouTube metadata
+job call invalidate_sermon_feed(). Each worker keeps its own copy, so another
+worker may serve a stale page until SERMON_FEED_CACHE_TTL_SECONDS elapses.
+"""
+
+import os
+
+from helpers.ttl_cache import VersionedTTLCache
+
+SERMON_FEED_CACHE_TTL_SECONDS = float(os.getenv("SERMON_FEED_CACHE_TTL_SECONDS", "120"))
+
+# (filters..., skip, limit, cursor) -> (sermons, next_cursor)
+sermon_feed_cache = VersionedTTLCache(ttl_seconds=SERMON_FEED_CACHE_TTL_SECONDS, max_size=512)
+
+
+def invalidate_sermon_feed() -> None:
+    sermon_feed_cache.clear()
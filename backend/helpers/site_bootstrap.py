@@ -0,0 +1,105 @@
+"""
+Aggregated first-paint payload for the web and mobile clients.
+
+Everything a cold page view needs (header, footer, website/app/dashboard config,
+localization info and the home page) is gathered concurrently, serialized once
+and cached in helpers.site_cache until one of the underlying mod routes writes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from helpers.AppConfigHelper import AppConfigHelper
+from helpers.DashboardAppConfigHelper import DashboardAppConfigHelper
+from helpers.WebbuilderConfigHelper import WebbuilderConfigHelper
+from helpers.http_cache import json_body
+from helpers.site_cache import bootstrap_cache, get_published_page
+from models.footer import get_footer_items
+from models.header import get_header
+from models.localization_info import get_localization_info
+
+
+async def _header():
+    header = await get_header()
+    return header.model_dump() if header else None
+
+
+async def _footer():
+    footer = await get_footer_items()
+    return footer.model_dump() if footer else None
+
+
+async def _dashboard_pages():
+    config = await DashboardAppConfigHelper.get_config()
+    if not config:
+        return []
+    return sorted(config.get("pages", []), key=lambda x: x.get("index", 0))
+
+
+async def _localization():
+    namespaces = ("header", "footer")
+    entries = await asyncio.gather(*(get_localization_info(ns) for ns in namespaces))
+    return {
+        ns: {"locales": entry.get("locales", ["en"]), "default_locale": entry.get("default_locale", "en")}
+        for ns, entry in zip(namespaces, entries)
+    }
+
+
+async def _home_page():
+    entry = await get_published_page("/")
+    return entry["page"] if entry else None
+
+
+_SECTIONS = {
+    "header": _header,
+    "footer": _footer,
+    "website_config": WebbuilderConfigHelper.get_website_config,
+    "app_tabs": AppConfigHelper.get_tab_configuration,
+    "dashboard_pages": _dashboard_pages,
+    "localization": _localization,
+    "home_page": _home_page,
+}
+
+
+async def build_site_bootstrap() -> Tuple[Dict[str, Any], bool]:
+    """
+    Run every section loader concurrently. A failing section is returned as null
+    and the second value is False so the partial blob is not cached.
+    """
+    names = list(_SECTIONS)
+    results = await asyncio.gather(*(_SECTIONS[n]() for n in names), return_exceptions=True)
+    payload: Dict[str, Any] = {}
+    complete = True
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            logging.error(f"Site bootstrap section {name!r} failed: {result}")
+            payload[name] = None
+            complete = False
+        else:
+            payload[name] = result
+    return payload, complete
+
+
+async def get_site_bootstrap() -> Dict[str, Any]:
+    """The cached blob as ``{"version", "body", "etag"}``; rebuilt after any invalidation."""
+    cached: Optional[Dict[str, Any]] = bootstrap_cache.get("bootstrap")
+    if cached is not None:
+        return cached
+
+    generation = bootstrap_cache.generation
+    payload, complete = await build_site_bootstrap()
+    payload = jsonable_encoder(payload)
+    content = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+    version = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+    body = json_body({"version": version, **payload})
+    entry = {"version": version, "body": body, "etag": f'"{version}"'}
+
+    # Only cache complete blobs, and only if nothing was invalidated while we were reading
+    if complete:
+        bootstrap_cache.set_if_current("bootstrap", entry, generation)
+    return entry
@@ -0,0 +1,87 @@
+"""
+In-process caches for data read on every public page view.
+
+Entries expire after SITE_CACHE_TTL_SECONDS and are dropped immediately by the
+mod routes that change the underlying documents. Each worker process holds its
+own copy, so another worker may serve a stale entry until the TTL elapses.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+
+from helpers.http_cache import content_etag, json_body
+from helpers.ttl_cache import TTLCache, VersionedTTLCache
+from mongo.database import DB
+
+_MISSING = object()
+
+SITE_CACHE_TTL_SECONDS = float(os.getenv("SITE_CACHE_TTL_SECONDS", "300"))
+
+# Single entry: the SPA shell's site-wide meta defaults
+website_config_cache = TTLCache(ttl_seconds=SITE_CACHE_TTL_SECONDS, max_size=1)
+
+# Normalized slug -> published page entry (None for "no visible page")
+published_page_cache = TTLCache(ttl_seconds=SITE_CACHE_TTL_SECONDS, max_size=2048)
+
+# Single entry: the serialized /site/bootstrap blob (see helpers.site_bootstrap)
+bootstrap_cache = VersionedTTLCache(ttl_seconds=SITE_CACHE_TTL_SECONDS, max_size=1)
+
+
+def invalidate_bootstrap() -> None:
+    bootstrap_cache.clear()
+
+
+def invalidate_website_config() -> None:
+    website_config_cache.clear()
+    invalidate_bootstrap()
+
+
+def invalidate_pages() -> None:
+    """Drop every cached page entry; page mutations are keyed by id, not slug."""
+    published_page_cache.clear()
+    invalidate_bootstrap()
+
+
+async def invalidate_bootstrap_on_write(request: Request):
+    """
+    Router dependency for mod routes whose data is part of the bootstrap blob.
+    Invalidates around the handler: before, so a concurrent build is discarded,
+    and after, once the write has landed.
+    """
+    is_write = request.method not in ("GET", "HEAD", "OPTIONS")
+    if is_write:
+        invalidate_bootstrap()
+    yield
+    if is_write:
+        invalidate_bootstrap()
+
+
+async def _load_published_page(slug: str) -> Optional[Dict[str, Any]]:
+    if slug == "/":
+        # Root may be stored as "/" or legacy "home"; one query, "/" wins
+        docs = await DB.db["pages"].find({"slug": {"$in": ["/", "home"]}, "visible": True}).to_list(length=2)
+        docs.sort(key=lambda d: d.get("slug") != "/")
+        return docs[0] if docs else None
+    return await DB.db["pages"].find_one({"slug": slug, "visible": True})
+
+
+async def get_published_page(slug: str) -> Optional[Dict[str, Any]]:
+    """
+    Visible page for a normalized slug as ``{"page", "body", "etag"}``: the JSON-ready
+    document, its serialized bytes and a content ETag. None when no visible page exists.
+    """
+    cached = published_page_cache.get(slug, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    doc = await _load_published_page(slug)
+    entry = None
+    if doc:
+        doc["_id"] = str(doc["_id"])
+        page = jsonable_encoder(doc)
+        body = json_body(page)
+        entry = {"page": page, "body": body, "etag": content_etag(body)}
+    published_page_cache.set(slug, entry)
+    return entry
@@ -0,0 +1,104 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiry and LRU eviction.
+
+    Not shared between worker processes; callers that need cross-process
+    consistency must invalidate explicitly on writes.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """Drop every string key (or tuple key whose first item) starts with ``prefix``."""
+        for key in list(self._entries.keys()):
+            head = key[0] if isinstance(key, tuple) and key else key
+            if isinstance(head, str) and head.startswith(prefix):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CacheGeneration:
+    """
+    Counter bumped on every invalidation. A loader reads ``value`` before it
+    starts and only stores its result if the value is unchanged, so data read
+    across a concurrent write is never cached.
+    """
+
+    def __init__(self):
+        self.value = 0
+
+    def bump(self) -> None:
+        self.value += 1
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self.value
+
+
+class VersionedTTLCache(TTLCache):
+    """TTLCache whose invalidations bump a CacheGeneration; use set_if_current for loaded values."""
+
+    def __init__(self, ttl_seconds: float, max_size: int = 1024):
+        super().__init__(ttl_seconds, max_size)
+        self._generation = CacheGeneration()
+
+    @property
+    def generation(self) -> int:
+        return self._generation.value
+
+    def set_if_current(self, key: Hashable, value: Any, generation: int, ttl_seconds: Optional[float] = None) -> bool:
+        """Store ``value`` unless the cache was invalidated since ``generation`` was read."""
+        if not self._generation.is_current(generation):
+            return False
+        self.set(key, value, ttl_seconds)
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        self._generation.bump()
+        super().invalidate(key)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        self._generation.bump()
+        super().invalidate_prefix(prefix)
+
+    def clear(self) -> None:
+        self._generation.bump()
+        super().clear()
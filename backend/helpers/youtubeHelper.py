@@ -1,11 +1,14 @@
 from dotenv import load_dotenv
 import os
+import re
 import httpx
 from googleapiclient.discovery import build
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
 from mongo.database import DB
 from firebase_admin import messaging
+from helpers.sermon_cache import invalidate_sermon_feed
 import logging
 
 load_dotenv()
@@ -36,6 +39,32 @@ def get_callback_url(public_domain):
 NOTIF_SUB_DELAY = 86400
 HUB_URL = "https://pubsubhubbub.appspot.com/subscribe"
 
+# videos.list accepts at most 50 ids per call
+VIDEO_METADATA_BATCH_SIZE = 50
+SERMON_METADATA_INTERVAL = int(os.getenv("SERMON_METADATA_INTERVAL_SECONDS", "1800"))
+# Videos YouTube did not return (private/removed) are retried after this long
+SERMON_METADATA_RETRY = timedelta(days=1)
+
+_ISO_DURATION = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+_THUMBNAIL_PREFERENCE = ("maxres", "standard", "high", "medium", "default")
+
+
+def parse_iso8601_duration(value):
+    """Seconds in a YouTube contentDetails.duration ("PT1H2M3S"); None if unparseable."""
+    match = _ISO_DURATION.match(value or "")
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def best_thumbnail_url(thumbnails):
+    for size in _THUMBNAIL_PREFERENCE:
+        url = (thumbnails or {}).get(size, {}).get("url")
+        if url:
+            return url
+    return None
+
 
 
 
@@ -131,6 +160,81 @@ class YoutubeHelper:
             retDict["isStreaming"] = True
         return retDict
 
+    #Returns {video_id: {"duration_seconds", "thumbnail_url"}} for up to 50 ids in one videos.list call.
+    #Ids YouTube does not know about (private/removed videos) are missing from the result.
+    @staticmethod
+    def fetchVideoMetadata(videoIDs, youtubeClient):
+        request = youtubeClient.videos().list(
+            part="contentDetails,snippet",
+            id=",".join(videoIDs[:VIDEO_METADATA_BATCH_SIZE]),
+            maxResults=VIDEO_METADATA_BATCH_SIZE,
+        )
+        response = request.execute()
+        metadata = {}
+        for item in response.get("items", []):
+            metadata[item["id"]] = {
+                "duration_seconds": parse_iso8601_duration(item.get("contentDetails", {}).get("duration")),
+                "thumbnail_url": best_thumbnail_url(item.get("snippet", {}).get("thumbnails")),
+            }
+        return metadata
+
+    #Fills in duration_seconds/thumbnail_url on sermons missing them, 50 videos per API call.
+    #Values set by editors are never overwritten. Returns the number of sermons updated.
+    @staticmethod
+    async def prefetchSermonMetadata():
+        api_key = settings["YOUTUBE_API_KEY"]
+        if not api_key:
+            return 0
+        youtubeClient = get_youtube_client(api_key)
+        retry_before = datetime.utcnow() - SERMON_METADATA_RETRY
+        cursor = DB.db["sermons"].find(
+            {
+                "video_id": {"$nin": [None, ""]},
+                "$or": [{"duration_seconds": None}, {"thumbnail_url": None}],
+                "youtube_metadata_checked_at": {"$not": {"$gt": retry_before}},
+            },
+            {"video_id": 1, "duration_seconds": 1, "thumbnail_url": 1},
+        )
+        sermons = await cursor.to_list(length=None)
+
+        updated = 0
+        for start in range(0, len(sermons), VIDEO_METADATA_BATCH_SIZE):
+            batch = sermons[start:start + VIDEO_METADATA_BATCH_SIZE]
+            video_ids = list({doc["video_id"] for doc in batch})
+            # googleapiclient is blocking; keep it off the event loop
+            metadata = await asyncio.to_thread(YoutubeHelper.fetchVideoMetadata, video_ids, youtubeClient)
+
+            now = datetime.utcnow()
+            operations = []
+            for doc in batch:
+                fields = {"youtube_metadata_checked_at": now}
+                found = metadata.get(doc["video_id"], {})
+                for field in ("duration_seconds", "thumbnail_url"):
+                    if doc.get(field) is None and found.get(field) is not None:
+                        fields[field] = found[field]
+                if len(fields) > 1:
+                    updated += 1
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+            if operations:
+                await DB.db["sermons"].bulk_write(operations, ordered=False)
+
+        if updated:
+            invalidate_sermon_feed()
+        return updated
+
+    @staticmethod
+    async def sermonMetadataLoop():
+        while True:
+            try:
+                updated = await YoutubeHelper.prefetchSermonMetadata()
+                if updated:
+                    logging.info(f"Stored YouTube metadata on {updated} sermons")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Error prefetching sermon YouTube metadata: {e}")
+            await asyncio.sleep(SERMON_METADATA_INTERVAL)
+
     #This function sends the request to subscribe to the pubsubhub notifications.
     @staticmethod
     async def subscribeToMainNotifications():
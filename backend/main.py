@@ -11,10 +11,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from firebase.firebase_credentials import get_firebase_credentials
 from firebase_admin import credentials
 from helpers.BiblePlanScheduler import initialize_bible_plan_notifications
+from helpers.EmailOutbox import EmailOutbox
+from helpers.compression import CompressionMiddleware
 from helpers.EventPublisherLoop import EventPublisher
+from helpers.NotificationHelper import close_link_validation_client
+from helpers.image_derivatives import shutdown_derivative_pool
+from helpers.keyset_pagination import NEXT_CURSOR_HEADER
+from controllers.assets_controller import ensure_folder_catalog
+from models.search_index import ensure_search_index
 from helpers.PayPalHelperV2 import PayPalHelperV2
 from helpers.youtubeHelper import YoutubeHelper
 from mongo.database import DB as DatabaseManager
+from mongo.device_tokens import device_token_gc_loop
 from mongo.firebase_sync import FirebaseSyncer
 from mongo.roles import RoleHandler
 from mongo.scheduled_notifications import scheduled_notification_loop
@@ -61,6 +69,7 @@ from routes.common_routes.notification_routes import (
     private_notification_router,
     public_notification_router,
 )
+from routes.common_routes.search_routes import mod_search_router, public_search_router
 from routes.common_routes.sermon_routes import (
     private_sermon_router,
     public_sermon_router,
@@ -94,7 +103,7 @@ from routes.form_routes.form_translations_routes import form_translations_router
 from routes.form_routes.mod_forms_routes import mod_forms_router
 from routes.form_routes.private_forms_routes import private_forms_router
 from routes.form_routes.public_forms_routes import public_forms_router
-from routes.frontend_routes import frontend_router
+from routes.frontend_routes import frontend_router, mount_static_files
 from routes.legal_routes import (
     admin_legal_router,
     user_legal_router,
@@ -116,6 +125,8 @@ from routes.permissions_routes.permissions_routes import (
     permissions_view_router,
 )
 from routes.refund_request_routes import admin_refund_router, refund_private_router
+from routes.server_metrics_routes import server_metrics_mod_router
+from routes.site_bootstrap_routes import site_bootstrap_public_router
 from routes.transactions_routes import admin_transactions_router, transactions_router
 from routes.translator_routes import translator_router
 from routes.webbuilder_config_routes import (
@@ -227,6 +238,9 @@ async def lifespan(app: FastAPI):
         await DatabaseManager.init_db()
         logger.info("MongoDB connected")
 
+        await ensure_folder_catalog()
+        await ensure_search_index()
+
         # Initialize PayPal helper (singleton) once on startup
         paypal = await PayPalHelperV2.get_instance()
         await paypal.start()
@@ -261,6 +275,33 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Header/footer titles migration failed; will retry next startup. Error: {e}")
 
+        # Run one-time migration to replace stored notification token lists with counts
+        try:
+            from datetime import datetime, timezone
+
+            from scripts.notification_recipients_migration import (
+                run_notification_recipients_migration,
+            )
+
+            migrations_coll = DatabaseManager.db["migrations"]
+            existing = await migrations_coll.find_one({
+                "name": "notification_recipients",
+                "completed_at": {"$exists": True}
+            })
+
+            if existing:
+                logger.info("Skipping notification recipients migration; already completed previously")
+            else:
+                migrated = await run_notification_recipients_migration()
+                await migrations_coll.update_one(
+                    {"name": "notification_recipients"},
+                    {"$set": {"name": "notification_recipients", "completed_at": datetime.now(timezone.utc).isoformat()}},
+                    upsert=True,
+                )
+                logger.info(f"Notification recipients migration completed and recorded ({migrated} documents)")
+        except Exception as e:
+            logger.error(f"Notification recipients migration failed; will retry next startup. Error: {e}")
+
         if not BYPASS_FIREBASE_SYNC:
             logger.info("Running initial Firebase -> Mongo sync")
             await FirebaseSyncer.SyncDBToFirebase()
@@ -274,8 +315,11 @@ async def lifespan(app: FastAPI):
         # Background tasks
         logger.info("Starting background tasks")
         youtubeSubscriptionCheck = asyncio.create_task(YoutubeHelper.youtubeSubscriptionLoop())
+        sermonMetadataTask = asyncio.create_task(YoutubeHelper.sermonMetadataLoop())
         eventPublishingLoop = asyncio.create_task(EventPublisher.runEventPublishLoop())
         scheduledNotifTask = asyncio.create_task(scheduled_notification_loop(DatabaseManager.db))
+        deviceTokenGcTask = asyncio.create_task(device_token_gc_loop(DatabaseManager.db))
+        emailOutboxTask = asyncio.create_task(EmailOutbox.runOutboxLoop())
         
         # Initialize Bible Plan Notification System
         logger.info("Initializing Bible plan notifications")
@@ -287,8 +331,14 @@ async def lifespan(app: FastAPI):
         # Cleanup
         logger.info("Shutting down background tasks and closing DB")
         youtubeSubscriptionCheck.cancel()
+        sermonMetadataTask.cancel()
         eventPublishingLoop.cancel()
         scheduledNotifTask.cancel()
+        deviceTokenGcTask.cancel()
+        emailOutboxTask.cancel()
+        await EmailOutbox.close()
+        await close_link_validation_client()
+        shutdown_derivative_pool()
         DatabaseManager.close_db()
 
         # Stop PayPal helper
@@ -324,10 +374,14 @@ app.add_middleware(
     expose_headers=[
         "Content-Type",
         "Content-Length",
+        NEXT_CURSOR_HEADER,
     ],
     max_age=600,
 )
 
+# gzip/brotli for large JSON and text bodies; see helpers/compression.py for tuning env vars
+app.add_middleware(CompressionMiddleware)
+
 #nice looking docs
 @app.get("/scalar", include_in_schema=False)
 async def scalar_html():
@@ -370,6 +424,8 @@ public_router.include_router(user_legal_router)
 public_router.include_router(public_event_router)
 public_router.include_router(public_forms_router)
 public_router.include_router(webbuilder_config_public_router)
+public_router.include_router(site_bootstrap_public_router)
+public_router.include_router(public_search_router)
 public_router.include_router(paypal_central_webhook_router)
 public_router.include_router(donation_router)
 
@@ -415,6 +471,8 @@ mod_router.include_router(member_mod_router)
 mod_router.include_router(mod_assets_router)
 mod_router.include_router(mod_event_router)
 mod_router.include_router(admin_legal_router)
+mod_router.include_router(server_metrics_mod_router)
+mod_router.include_router(mod_search_router)
 
 #####################################################
 # Perm Routers - Protected by various permissions
@@ -488,6 +546,9 @@ app.include_router(finance_management_protected_router)
 app.include_router(admin_refund_management_router)
 app.include_router(media_management_protected_router)
 
+# Hashed build assets, matched before the frontend catch-all
+mount_static_files(app)
+
 # Frontend serving - MUST be last to catch all non-API routes
 app.include_router(frontend_router)
 
@@ -0,0 +1,145 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import InsertOne
+
+from mongo.database import DB
+from models.image_data import COLLECTION_NAME as IMAGE_COLLECTION_NAME, rewrite_folder_expr
+
+# Catalog of media-library folders so browsing never has to scan the filesystem.
+# One document per folder, keyed by its normalized path ('' = Home):
+#   {path, parent, name, file_count, folder_count, created_at, updated_at}
+COLLECTION_NAME = "asset_folders"
+
+async def _get_collection():
+    return DB.db[COLLECTION_NAME]
+
+def parent_of(path: str) -> str:
+    return path.rsplit("/", 1)[0] if "/" in path else ""
+
+def _new_folder_doc(path: str, file_count: int = 0, folder_count: int = 0) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    return {
+        "path": path,
+        "parent": parent_of(path) if path else None,
+        "name": path.rsplit("/", 1)[-1],
+        "file_count": file_count,
+        "folder_count": folder_count,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+def _descendants_query(path: str) -> Dict[str, Any]:
+    return {"path": {"$regex": f"^{re.escape(path + '/')}"}}
+
+async def _inc(path: Optional[str], files: int = 0, folders: int = 0) -> None:
+    if path is None or (files == 0 and folders == 0):
+        return
+    col = await _get_collection()
+    await col.update_one(
+        {"path": path},
+        {"$inc": {"file_count": files, "folder_count": folders}, "$set": {"updated_at": datetime.utcnow()}},
+    )
+
+async def get_folder(path: str) -> Optional[Dict[str, Any]]:
+    col = await _get_collection()
+    return await col.find_one({"path": path})
+
+async def ensure_folder(path: str) -> bool:
+    """Create the catalog entry for ``path`` and any missing ancestors. Returns True if ``path`` was new."""
+    col = await _get_collection()
+    parts = path.split("/") if path else []
+    created = False
+    for depth in range(len(parts) + 1):
+        current = "/".join(parts[:depth])
+        res = await col.update_one({"path": current}, {"$setOnInsert": _new_folder_doc(current)}, upsert=True)
+        created = res.upserted_id is not None
+        if created and current:
+            await _inc(parent_of(current), folders=1)
+    return created
+
+async def list_child_folders(parent: str) -> List[str]:
+    col = await _get_collection()
+    cursor = col.find({"parent": parent}, {"_id": 0, "name": 1}).sort("name", 1)
+    return [d["name"] async for d in cursor]
+
+async def adjust_file_count(path: str, delta: int) -> None:
+    await _inc(path, files=delta)
+
+async def move_folder_subtree(old_path: str, new_path: str) -> None:
+    """Rename/move a folder and everything below it (paths and parent links) in place."""
+    col = await _get_collection()
+    old_parent, new_parent = parent_of(old_path), parent_of(new_path)
+    await ensure_folder(new_parent)
+    await col.update_many(
+        _descendants_query(old_path),
+        [{"$set": {
+            "path": rewrite_folder_expr("$path", old_path, new_path),
+            "parent": rewrite_folder_expr("$parent", old_path, new_path),
+            "updated_at": "$$NOW",
+        }}],
+    )
+    await col.update_one(
+        {"path": old_path},
+        {"$set": {
+            "path": new_path,
+            "parent": new_parent,
+            "name": new_path.rsplit("/", 1)[-1],
+            "updated_at": datetime.utcnow(),
+        }},
+    )
+    if old_parent != new_parent:
+        await _inc(old_parent, folders=-1)
+        await _inc(new_parent, folders=1)
+
+async def delete_folder_subtree(path: str) -> None:
+    col = await _get_collection()
+    res = await col.delete_many({"$or": [{"path": path}, _descendants_query(path)]})
+    if res.deleted_count:
+        await _inc(parent_of(path), folders=-1)
+
+async def merge_folder_into_parent(path: str) -> None:
+    """Delete ``path`` while keeping its contents: children move up one level with their counts."""
+    col = await _get_collection()
+    doc = await col.find_one({"path": path})
+    parent = parent_of(path)
+    await col.update_many(
+        _descendants_query(path),
+        [{"$set": {
+            "path": rewrite_folder_expr("$path", path, parent),
+            "parent": rewrite_folder_expr("$parent", path, parent),
+            "updated_at": "$$NOW",
+        }}],
+    )
+    await col.delete_one({"path": path})
+    if doc:
+        await _inc(parent, files=doc.get("file_count", 0), folders=doc.get("folder_count", 0) - 1)
+
+async def rebuild_folder_catalog(folder_paths: Iterable[str]) -> int:
+    """
+    Recreate the catalog from the given folder paths (e.g. a filesystem walk)
+    plus every folder referenced by image_data, with counts computed server-side.
+    """
+    col = await _get_collection()
+    file_counts: Dict[str, int] = {}
+    async for row in DB.db[IMAGE_COLLECTION_NAME].aggregate([{"$group": {"_id": "$folder", "count": {"$sum": 1}}}]):
+        file_counts[row["_id"] or ""] = row["count"]
+
+    paths = {""}
+    for path in list(folder_paths) + list(file_counts.keys()):
+        parts = path.split("/") if path else []
+        for depth in range(1, len(parts) + 1):
+            paths.add("/".join(parts[:depth]))
+
+    folder_counts: Dict[str, int] = {}
+    for path in paths:
+        if path:
+            folder_counts[parent_of(path)] = folder_counts.get(parent_of(path), 0) + 1
+
+    await col.delete_many({})
+    await col.bulk_write(
+        [InsertOne(_new_folder_doc(p, file_counts.get(p, 0), folder_counts.get(p, 0))) for p in sorted(paths)],
+        ordered=False,
+    )
+    return len(paths)
@@ -1,10 +1,26 @@
-from typing import Optional, List, Literal
-from datetime import datetime
+import os
+from typing import Optional, List, Literal, Tuple
+from datetime import datetime, timedelta, timezone
 from pydantic import BaseModel, Field, model_validator
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from helpers.keyset_pagination import paginate
 from mongo.database import DB
 from models.base.ssbc_base_model import MongoBaseModel
 
+# Deleted notes are kept as tombstones this long so offline clients can sync the deletion
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("BIBLE_NOTE_TOMBSTONE_DAYS", "90"))
+# Watermarks are handed out this far in the past so writes racing a sync are not missed
+SYNC_CLOCK_SKEW = timedelta(seconds=5)
+MAX_SYNC_PAGE = 500
+MAX_SYNC_BATCH = 500
+# Mongo duplicate key error code
+DUPLICATE_KEY_ERROR = 11000
+
+# Notes that have not been deleted (tombstones carry deleted=True)
+_LIVE = {"deleted": {"$ne": True}}
+
 # Bible books list for validation
 BIBLE_BOOKS = [
     # Old Testament
@@ -25,6 +41,27 @@ BIBLE_BOOKS = [
     "Jude", "Revelation"
 ]
 
+# Absolute verse ordinals: (book, chapter, verse) -> one integer in canonical order,
+# so a passage (even across chapters) is one contiguous ord_start/ord_end range.
+VERSE_SLOTS = 1000    # > longest chapter (Psalm 119: 176 verses)
+CHAPTER_SLOTS = 1000  # > most chapters in a book (Psalms: 150)
+_BOOK_NUMBERS = {book: i + 1 for i, book in enumerate(BIBLE_BOOKS)}
+
+
+def verse_ordinal(book: str, chapter: int, verse: int) -> int:
+    """Ordinal of a verse; verse 0 / chapter 0 address the start of a chapter / book."""
+    verse = max(0, min(verse, VERSE_SLOTS - 1))
+    chapter = max(0, min(chapter, CHAPTER_SLOTS - 1))
+    return (_BOOK_NUMBERS[book] * CHAPTER_SLOTS + chapter) * VERSE_SLOTS + verse
+
+
+def note_ordinals(book: str, chapter: int, verse_start: int, verse_end: Optional[int]) -> dict:
+    """ord_start/ord_end stored on each note; a note lies within one chapter."""
+    return {
+        "ord_start": verse_ordinal(book, chapter, verse_start),
+        "ord_end": verse_ordinal(book, chapter, verse_end or verse_start),
+    }
+
 
 class BibleNoteBase(BaseModel):
     book: str = Field(..., description="Bible book name")
@@ -79,6 +116,64 @@ class BibleNoteOut(BaseModel):
     user_id: str
     created_at: datetime
     updated_at: datetime
+    client_id: Optional[str] = None
+
+
+class BibleNoteSyncOut(BaseModel):
+    notes: List[BibleNoteOut] = Field(default_factory=list, description="Notes created or updated since the watermark")
+    deleted_ids: List[str] = Field(default_factory=list, description="Notes deleted since the watermark")
+    watermark: datetime = Field(..., description="Pass back as `since` on the next sync")
+    next_cursor: Optional[str] = Field(None, description="More changes are pending; repeat with this cursor")
+    full_resync: bool = Field(False, description="The local copy must be replaced, not merged")
+
+
+class BibleNoteChange(BaseModel):
+    """One offline edit. Creates carry a client_id so a retried batch does not duplicate notes."""
+    op: Literal["create", "update", "delete"]
+    id: Optional[str] = Field(None, description="Server note id (update/delete)")
+    client_id: Optional[str] = Field(None, max_length=64, description="Client-generated id (create)")
+    base_updated_at: Optional[datetime] = Field(
+        None, description="updated_at the client edited from; newer server copies are reported as conflicts"
+    )
+    create: Optional[BibleNoteCreate] = None
+    update: Optional[BibleNoteUpdate] = None
+
+    @model_validator(mode='after')
+    def validate_change(self):
+        if self.op == "create" and (self.create is None or not self.client_id):
+            raise ValueError("create requires `create` and `client_id`")
+        if self.op != "create" and not (self.id and ObjectId.is_valid(self.id)):
+            raise ValueError(f"{self.op} requires a valid `id`")
+        if self.op == "update" and self.update is None:
+            raise ValueError("update requires `update`")
+        return self
+
+
+class BibleNoteChangeBatch(BaseModel):
+    changes: List[BibleNoteChange] = Field(..., max_length=MAX_SYNC_BATCH)
+
+
+class BibleNoteChangeResult(BaseModel):
+    op: Literal["create", "update", "delete"]
+    status: Literal["applied", "conflict", "not_found", "failed"]
+    id: Optional[str] = None
+    client_id: Optional[str] = None
+    # Server-side write error when status is "failed"
+    error: Optional[str] = None
+    # Current server copy: the saved note, or the newer one on conflict
+    note: Optional[BibleNoteOut] = None
+
+
+def _now() -> datetime:
+    """Naive UTC truncated to Mongo's millisecond precision, so written values compare equal on read."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
 
 # CRUD Operations
@@ -86,6 +181,7 @@ class BibleNoteOut(BaseModel):
 async def create_bible_note(note_data: BibleNoteCreate, user_id: str) -> Optional[BibleNoteOut]:
     """Create a new Bible note"""
     try:
+        now = _now()
         note_doc = {
             "book": note_data.book,
             "chapter": note_data.chapter,
@@ -93,9 +189,10 @@ async def create_bible_note(note_data: BibleNoteCreate, user_id: str) -> Optiona
             "verse_end": note_data.verse_end,
             "note": note_data.note,
             "highlight_color": note_data.highlight_color,
+            **note_ordinals(note_data.book, note_data.chapter, note_data.verse_start, note_data.verse_end),
             "user_id": user_id,
-            "created_at": datetime.now(),
-            "updated_at": datetime.now()
+            "created_at": now,
+            "updated_at": now
         }
         
         result = await DB.db.bible_notes.insert_one(note_doc)
@@ -121,7 +218,7 @@ async def get_bible_notes_by_user(
 ) -> List[BibleNoteOut]:
     """Get Bible notes for a specific user with optional filters"""
     try:
-        query = {"user_id": user_id}
+        query = {"user_id": user_id, **_LIVE}
         
         if book:
             query["book"] = book
@@ -165,19 +262,12 @@ async def get_bible_notes_by_reference(
     try:
         validate_book_name(book)
         
-        query = {"user_id": user_id, "book": book}
-        
-        if chapter_start and chapter_end:
-            query["chapter"] = {"$gte": chapter_start, "$lte": chapter_end}
-        elif chapter:
-            query["chapter"] = chapter
-        
-        if chapter:
-            verse_query = _build_verse_overlap_query(verse, verse_start, verse_end)
-            if verse_query:
-                query.update(verse_query)
+        lo, hi = passage_ordinal_range(
+            book, chapter, verse, verse_start, verse_end, chapter_start, chapter_end
+        )
+        query = {"user_id": user_id, **_overlap_query(lo, hi), **_LIVE}
         
-        cursor = DB.db.bible_notes.find(query).sort([("chapter", 1), ("verse_start", 1)])
+        cursor = DB.db.bible_notes.find(query).sort([("ord_start", 1)])
         notes = await cursor.to_list(length=None)
         
         return [_convert_db_note_to_output(note) for note in notes]
@@ -191,7 +281,8 @@ async def get_bible_note_by_id(note_id: str, user_id: str) -> Optional[BibleNote
     try:
         note = await DB.db.bible_notes.find_one({
             "_id": ObjectId(note_id),
-            "user_id": user_id
+            "user_id": user_id,
+            **_LIVE,
         })
         
         return _convert_db_note_to_output(note) if note else None
@@ -203,7 +294,7 @@ async def get_bible_note_by_id(note_id: str, user_id: str) -> Optional[BibleNote
 async def update_bible_note(note_id: str, user_id: str, update_data: BibleNoteUpdate) -> Optional[BibleNoteOut]:
     """Update a Bible note"""
     try:
-        update_doc = {"updated_at": datetime.now()}
+        update_doc = {"updated_at": _now()}
         
         if update_data.note is not None:
             update_doc["note"] = update_data.note
@@ -211,7 +302,7 @@ async def update_bible_note(note_id: str, user_id: str, update_data: BibleNoteUp
             update_doc["highlight_color"] = update_data.highlight_color
         
         result = await DB.db.bible_notes.update_one(
-            {"_id": ObjectId(note_id), "user_id": user_id},
+            {"_id": ObjectId(note_id), "user_id": user_id, **_LIVE},
             {"$set": update_doc}
         )
         
@@ -224,13 +315,13 @@ async def update_bible_note(note_id: str, user_id: str, update_data: BibleNoteUp
 
 
 async def delete_bible_note(note_id: str, user_id: str) -> bool:
-    """Delete a Bible note"""
+    """Delete a Bible note, leaving a tombstone for delta sync"""
     try:
-        result = await DB.db.bible_notes.delete_one({
-            "_id": ObjectId(note_id),
-            "user_id": user_id
-        })
-        return result.deleted_count > 0
+        result = await DB.db.bible_notes.update_one(
+            {"_id": ObjectId(note_id), "user_id": user_id, **_LIVE},
+            {"$set": _tombstone_fields(_now()), "$unset": {"note": ""}},
+        )
+        return result.modified_count > 0
     except Exception as e:
         print(f"Error deleting Bible note: {e}")
         return False
@@ -248,7 +339,8 @@ async def search_bible_notes(
     try:
         search_filter = {
             "user_id": user_id,
-            "note": {"$regex": query, "$options": "i"}  # Case-insensitive search
+            "note": {"$regex": query, "$options": "i"},  # Case-insensitive search
+            **_LIVE,
         }
         
         if book:
@@ -264,6 +356,142 @@ async def search_bible_notes(
         print(f"Error searching Bible notes: {e}")
         return []
 
+def _tombstone_fields(now: datetime) -> dict:
+    return {
+        "deleted": True,
+        "updated_at": now,
+        # TTL index on purge_at removes the tombstone once no client can still need it
+        "purge_at": now + timedelta(days=TOMBSTONE_RETENTION_DAYS),
+    }
+
+
+async def sync_bible_notes(
+    user_id: str,
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = MAX_SYNC_PAGE,
+) -> BibleNoteSyncOut:
+    """
+    Changes to a user's notes since ``since`` (a previous watermark), oldest first.
+    Without ``since``, or when it predates tombstone retention, every note is
+    returned with full_resync=True.
+    """
+    started = _now()
+    full_resync = since is None
+    if since is not None:
+        since = _as_naive_utc(since)
+        if since < started - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+            full_resync = True
+
+    # Tombstones are included even on a full sync: a note deleted while the pages
+    # are being read moves past the cursor and is reported on a later page
+    query: dict = {"user_id": user_id}
+    if not full_resync:
+        query["updated_at"] = {"$gte": since}
+
+    docs, next_cursor = await paginate(
+        DB.db.bible_notes,
+        query,
+        [("updated_at", 1)],
+        max(1, min(limit, MAX_SYNC_PAGE)),
+        cursor=cursor,
+    )
+
+    out = BibleNoteSyncOut(watermark=started - SYNC_CLOCK_SKEW, next_cursor=next_cursor, full_resync=full_resync)
+    for doc in docs:
+        if doc.get("deleted"):
+            out.deleted_ids.append(str(doc["_id"]))
+        else:
+            out.notes.append(_convert_db_note_to_output(doc))
+    return out
+
+
+def _change_filter(change: BibleNoteChange, user_id: str) -> dict:
+    filt = {"_id": ObjectId(change.id), "user_id": user_id, **_LIVE}
+    if change.base_updated_at is not None:
+        filt["updated_at"] = {"$lte": _as_naive_utc(change.base_updated_at)}
+    return filt
+
+
+async def apply_bible_note_changes(user_id: str, changes: List[BibleNoteChange]) -> List[BibleNoteChangeResult]:
+    """
+    Apply a batch of offline edits in one bulk write, then report per-change
+    results. Changes carrying ``base_updated_at`` only apply when the server copy
+    has not moved on since; otherwise the newer server copy is returned as a conflict.
+    """
+    now = _now()
+    ops: List[UpdateOne] = []
+    for change in changes:
+        if change.op == "create":
+            fields = change.create.model_dump()
+            fields.update(note_ordinals(fields["book"], fields["chapter"], fields["verse_start"], fields["verse_end"]))
+            ops.append(UpdateOne(
+                {"user_id": user_id, "client_id": change.client_id},
+                {"$setOnInsert": {**fields, "user_id": user_id, "client_id": change.client_id,
+                                  "created_at": now, "updated_at": now}},
+                upsert=True,
+            ))
+        elif change.op == "update":
+            fields = {k: v for k, v in change.update.model_dump().items() if v is not None}
+            ops.append(UpdateOne(_change_filter(change, user_id), {"$set": {**fields, "updated_at": now}}))
+        else:
+            ops.append(UpdateOne(
+                _change_filter(change, user_id),
+                {"$set": _tombstone_fields(now), "$unset": {"note": ""}},
+            ))
+
+    # An ordered bulk write stops at the first error; record it and resume after it
+    failed: dict = {}
+    start = 0
+    while start < len(ops):
+        try:
+            await DB.db.bible_notes.bulk_write(ops[start:], ordered=True)
+            break
+        except BulkWriteError as exc:
+            write_errors = exc.details.get("writeErrors") or []
+            if not write_errors:
+                raise
+            error = write_errors[0]
+            index = start + error["index"]
+            # A concurrent retry of the same create won the unique (user_id, client_id) race: still applied
+            if not (error.get("code") == DUPLICATE_KEY_ERROR and changes[index].op == "create"):
+                failed[index] = error.get("errmsg") or "write failed"
+            start = index + 1
+
+    # Read back every touched note once to classify each change
+    ids = [ObjectId(c.id) for c in changes if c.op != "create"]
+    client_ids = [c.client_id for c in changes if c.op == "create"]
+    docs = await DB.db.bible_notes.find({
+        "user_id": user_id,
+        "$or": [{"_id": {"$in": ids}}, {"client_id": {"$in": client_ids}}],
+    }).to_list(length=None)
+    by_id = {str(d["_id"]): d for d in docs}
+    by_client_id = {d["client_id"]: d for d in docs if d.get("client_id")}
+
+    results: List[BibleNoteChangeResult] = []
+    for index, change in enumerate(changes):
+        if index in failed:
+            results.append(BibleNoteChangeResult(
+                op=change.op, client_id=change.client_id, id=change.id, status="failed", error=failed[index],
+            ))
+            continue
+        doc = by_client_id.get(change.client_id) if change.op == "create" else by_id.get(change.id)
+        result = BibleNoteChangeResult(op=change.op, client_id=change.client_id, id=change.id, status="not_found")
+        if doc is not None and not (change.op == "update" and doc.get("deleted")):
+            result.id = str(doc["_id"])
+            if change.op == "delete":
+                # Deleting an already-deleted note is not a conflict
+                result.status = "applied" if doc.get("deleted") else "conflict"
+            else:
+                # A retried create finds its earlier insert: still applied
+                applied = change.op == "create" or (doc.get("updated_at") == now and not doc.get("deleted"))
+                result.status = "applied" if applied else "conflict"
+            if not doc.get("deleted"):
+                result.note = _convert_db_note_to_output(doc)
+        results.append(result)
+    return results
+
+
 def _convert_db_note_to_output(note_doc: dict) -> BibleNoteOut:
     """Convert database document to BibleNoteOut model"""
     return BibleNoteOut(
@@ -276,24 +504,64 @@ def _convert_db_note_to_output(note_doc: dict) -> BibleNoteOut:
         highlight_color=note_doc["highlight_color"],
         user_id=note_doc["user_id"],
         created_at=note_doc["created_at"],
-        updated_at=note_doc["updated_at"]
+        updated_at=note_doc["updated_at"],
+        client_id=note_doc.get("client_id"),
     )
 
 
-def _build_verse_overlap_query(verse: Optional[int], verse_start: Optional[int], verse_end: Optional[int]) -> dict:
-    """Build MongoDB query for verse overlap detection"""
-    if verse_start and verse_end:
-        return {
-            "$or": [
-                {"verse_start": {"$lte": verse_end}, "verse_end": {"$gte": verse_start}},
-                {"verse_end": None, "verse_start": {"$gte": verse_start, "$lte": verse_end}}
-            ]
-        }
-    elif verse:
-        return {
-            "$or": [
-                {"verse_start": verse, "verse_end": None},
-                {"verse_start": {"$lte": verse}, "verse_end": {"$gte": verse}}
-            ]
-        }
-    return {}
+def passage_ordinal_range(
+    book: str,
+    chapter: Optional[int] = None,
+    verse: Optional[int] = None,
+    verse_start: Optional[int] = None,
+    verse_end: Optional[int] = None,
+    chapter_start: Optional[int] = None,
+    chapter_end: Optional[int] = None,
+) -> Tuple[int, int]:
+    """Inclusive ordinal range of a reference: a verse, verse range, chapter, chapter range or whole book."""
+    last = VERSE_SLOTS - 1
+    if chapter_start and chapter_end:
+        lo, hi = verse_ordinal(book, chapter_start, 0), verse_ordinal(book, chapter_end, last)
+    elif chapter:
+        lo, hi = verse_ordinal(book, chapter, 0), verse_ordinal(book, chapter, last)
+    else:
+        return verse_ordinal(book, 0, 0), verse_ordinal(book, CHAPTER_SLOTS - 1, last)
+
+    if chapter:
+        if verse_start and verse_end:
+            lo, hi = verse_ordinal(book, chapter, verse_start), verse_ordinal(book, chapter, verse_end)
+        elif verse:
+            lo = hi = verse_ordinal(book, chapter, verse)
+    return lo, hi
+
+
+def _overlap_query(lo: int, hi: int) -> dict:
+    """
+    Notes overlapping [lo, hi]. A note never spans more than VERSE_SLOTS ordinals,
+    so ord_start is bounded on both sides and the (user_id, ord_start, ord_end)
+    index answers it with a single range scan.
+    """
+    return {
+        "ord_start": {"$gte": lo - (VERSE_SLOTS - 1), "$lte": hi},
+        "ord_end": {"$gte": lo},
+    }
+
+
+async def prepare_bible_notes_collection(db) -> None:
+    """Backfill ord_start/ord_end on notes written before they were stored."""
+    coll = db["bible_notes"]
+    ops = []
+    cursor = coll.find(
+        {"ord_start": {"$exists": False}, "deleted": {"$ne": True}},
+        {"book": 1, "chapter": 1, "verse_start": 1, "verse_end": 1},
+    )
+    async for doc in cursor:
+        if doc.get("book") not in _BOOK_NUMBERS:
+            continue
+        ords = note_ordinals(doc["book"], doc.get("chapter") or 0, doc.get("verse_start") or 0, doc.get("verse_end"))
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": ords}))
+        if len(ops) >= 500:
+            await coll.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        await coll.bulk_write(ops, ordered=False)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict, model_validator
 from bson import ObjectId
@@ -8,6 +8,7 @@ from pymongo.errors import DuplicateKeyError
 from fastapi import HTTPException, status
 
 from mongo.database import DB
+from helpers.bible_plan_cache import cached_entry, invalidate_plans, invalidate_templates
 from models.base.ssbc_base_model import MongoBaseModel
 from models.bible_note import BIBLE_BOOKS
 
@@ -152,6 +153,7 @@ async def create_reading_plan(
             )
 
         if result.inserted_id:
+            invalidate_plans(str(result.inserted_id))
             created = await DB.db.bible_plans.find_one({"_id": result.inserted_id})
             if created:
                 return _convert_plan_doc_to_out(created)
@@ -187,14 +189,17 @@ async def list_reading_plans(
         )
 
 
-async def get_reading_plan_by_id(
-    plan_id: str, user_id: str
-) -> Optional[ReadingPlanOut]:
+async def _load_reading_plan(plan_id: str) -> Optional[ReadingPlanOut]:
+    if not ObjectId.is_valid(plan_id):
+        return None
+    doc = await DB.db.bible_plans.find_one({"_id": ObjectId(plan_id)})
+    return _convert_plan_doc_to_out(doc) if doc else None
+
+
+async def get_reading_plan_entry(plan_id: str) -> Optional[Dict[str, Any]]:
+    """Cached plan entry (see helpers.bible_plan_cache); callers check access on ``value``."""
     try:
-        doc = await DB.db.bible_plans.find_one(
-            {"_id": ObjectId(plan_id), "user_id": user_id}
-        )
-        return _convert_plan_doc_to_out(doc) if doc else None
+        return await cached_entry(("plan", plan_id), lambda: _load_reading_plan(plan_id))
     except HTTPException:
         raise
     except Exception as e:
@@ -204,6 +209,19 @@ async def get_reading_plan_by_id(
         )
 
 
+async def get_cached_reading_plan(plan_id: str) -> Optional[ReadingPlanOut]:
+    """Any plan by id, regardless of owner or visibility, from the plan cache."""
+    entry = await get_reading_plan_entry(plan_id)
+    return entry["value"] if entry else None
+
+
+async def get_reading_plan_by_id(
+    plan_id: str, user_id: str
+) -> Optional[ReadingPlanOut]:
+    plan = await get_cached_reading_plan(plan_id)
+    return plan if plan and plan.user_id == user_id else None
+
+
 async def get_reading_plans_from_user(user_id: str) -> List[ReadingPlanOut]:
     try:
         cursor = DB.db.bible_plans.find({"user_id": user_id}).sort([("created_at", -1)])
@@ -248,6 +266,7 @@ async def update_reading_plan(
         )
 
         if result.matched_count:
+            invalidate_plans(plan_id)
             doc = await DB.db.bible_plans.find_one({"_id": ObjectId(plan_id)})
             return _convert_plan_doc_to_out(doc) if doc else None
         return None
@@ -270,6 +289,8 @@ async def delete_reading_plan(plan_id: str, user_id: str) -> bool:
         result = await DB.db.bible_plans.delete_one(
             {"_id": ObjectId(plan_id), "user_id": user_id}
         )
+        if result.deleted_count:
+            invalidate_plans(plan_id)
         return result.deleted_count > 0
     except HTTPException:
         raise
@@ -340,24 +361,28 @@ async def duplicate_reading_plan(
         )
 
 
-async def get_all_bible_plan_templates() -> List[ReadingPlanTemplateOut]:
+def _convert_template_doc_to_out(doc: dict) -> ReadingPlanTemplateOut:
+    readings = {
+        k: [BiblePassage(**p) for p in v]
+        for k, v in doc.get("readings", {}).items()
+    }
+    return ReadingPlanTemplateOut(
+        id=str(doc.get("_id")),
+        name=doc["name"],
+        duration=doc["duration"],
+        readings=readings,
+    )
+
+
+async def _load_bible_plan_templates() -> List[ReadingPlanTemplateOut]:
+    result = await DB.db.bible_plan_templates.find({}).to_list(length=None)
+    return [_convert_template_doc_to_out(doc) for doc in result]
+
+
+async def get_all_bible_plan_templates_entry() -> Dict[str, Any]:
+    """Cached template list entry (see helpers.bible_plan_cache)"""
     try:
-        result = await DB.db.bible_plan_templates.find({}).to_list(length=None)
-        out: List[ReadingPlanTemplateOut] = []
-        for doc in result:
-            readings = {
-                k: [BiblePassage(**p) for p in v]
-                for k, v in doc.get("readings", {}).items()
-            }
-            out.append(
-                ReadingPlanTemplateOut(
-                    id=str(doc.get("_id")),
-                    name=doc["name"],
-                    duration=doc["duration"],
-                    readings=readings,
-                )
-            )
-        return out
+        return await cached_entry(("templates",), _load_bible_plan_templates)
     except HTTPException:
         raise
     except Exception as e:
@@ -367,22 +392,21 @@ async def get_all_bible_plan_templates() -> List[ReadingPlanTemplateOut]:
         )
 
 
-async def get_bible_plan_template_by_name(
+async def get_all_bible_plan_templates() -> List[ReadingPlanTemplateOut]:
+    return (await get_all_bible_plan_templates_entry())["value"]
+
+
+async def _load_template_by_name(template_name: str) -> Optional[ReadingPlanTemplateOut]:
+    doc = await DB.db.bible_plan_templates.find_one({"name": template_name})
+    return _convert_template_doc_to_out(doc) if doc else None
+
+
+async def get_bible_plan_template_by_name_entry(
     template_name: str,
-) -> Optional[ReadingPlanTemplateOut]:
+) -> Optional[Dict[str, Any]]:
     try:
-        doc = await DB.db.bible_plan_templates.find_one({"name": template_name})
-        if not doc:
-            return None
-        readings = {
-            k: [BiblePassage(**p) for p in v]
-            for k, v in doc.get("readings", {}).items()
-        }
-        return ReadingPlanTemplateOut(
-            id=str(doc.get("_id")),
-            name=doc["name"],
-            duration=doc["duration"],
-            readings=readings,
+        return await cached_entry(
+            ("template_name", template_name), lambda: _load_template_by_name(template_name)
         )
     except HTTPException:
         raise
@@ -393,22 +417,24 @@ async def get_bible_plan_template_by_name(
         )
 
 
-async def get_bible_plan_template_by_id(
-    template_id: str,
+async def get_bible_plan_template_by_name(
+    template_name: str,
 ) -> Optional[ReadingPlanTemplateOut]:
+    entry = await get_bible_plan_template_by_name_entry(template_name)
+    return entry["value"] if entry else None
+
+
+async def _load_template_by_id(template_id: str) -> Optional[ReadingPlanTemplateOut]:
+    doc = await DB.db.bible_plan_templates.find_one({"_id": ObjectId(template_id)})
+    return _convert_template_doc_to_out(doc) if doc else None
+
+
+async def get_bible_plan_template_by_id_entry(
+    template_id: str,
+) -> Optional[Dict[str, Any]]:
     try:
-        doc = await DB.db.bible_plan_templates.find_one({"_id": ObjectId(template_id)})
-        if not doc:
-            return None
-        readings = {
-            k: [BiblePassage(**p) for p in v]
-            for k, v in doc.get("readings", {}).items()
-        }
-        return ReadingPlanTemplateOut(
-            id=str(doc.get("_id")),
-            name=doc["name"],
-            duration=doc["duration"],
-            readings=readings,
+        return await cached_entry(
+            ("template", template_id), lambda: _load_template_by_id(template_id)
         )
     except HTTPException:
         raise
@@ -419,12 +445,23 @@ async def get_bible_plan_template_by_id(
         )
 
 
-async def get_published_reading_plans() -> List[ReadingPlanOut]:
-    """Get all published Bible plans (visible=True) for public access"""
+async def get_bible_plan_template_by_id(
+    template_id: str,
+) -> Optional[ReadingPlanTemplateOut]:
+    entry = await get_bible_plan_template_by_id_entry(template_id)
+    return entry["value"] if entry else None
+
+
+async def _load_published_reading_plans() -> List[ReadingPlanOut]:
+    cursor = DB.db.bible_plans.find({"visible": True}).sort([("name", -1)])
+    docs = await cursor.to_list(length=None)
+    return [_convert_plan_doc_to_out(d) for d in docs]
+
+
+async def get_published_reading_plans_entry() -> Dict[str, Any]:
+    """Cached published plan list entry (see helpers.bible_plan_cache)"""
     try:
-        cursor = DB.db.bible_plans.find({"visible": True}).sort([("name", -1)])
-        docs = await cursor.to_list(length=None)
-        return [_convert_plan_doc_to_out(d) for d in docs]
+        return await cached_entry(("published",), _load_published_reading_plans)
     except HTTPException:
         raise
     except Exception as e:
@@ -434,6 +471,87 @@ async def get_published_reading_plans() -> List[ReadingPlanOut]:
         )
 
 
+async def get_published_reading_plans() -> List[ReadingPlanOut]:
+    """Get all published Bible plans (visible=True) for public access"""
+    return (await get_published_reading_plans_entry())["value"]
+
+
+def _accessible_plans_query(plan_ids: List[str], user_id: str) -> Optional[dict]:
+    """Plans in ``plan_ids`` the user owns or that are published; None if no id is valid."""
+    oids = [ObjectId(pid) for pid in plan_ids if ObjectId.is_valid(pid)]
+    if not oids:
+        return None
+    return {
+        "_id": {"$in": oids},
+        "$or": [{"user_id": user_id}, {"visible": True}],
+    }
+
+
+async def get_accessible_plans_by_ids(plan_ids: List[str], user_id: str) -> Dict[str, dict]:
+    """Full plan documents keyed by id, fetched with a single $in query"""
+    query = _accessible_plans_query(plan_ids, user_id)
+    if query is None:
+        return {}
+    docs = await DB.db.bible_plans.find(query).to_list(length=None)
+    return {str(d["_id"]): d for d in docs}
+
+
+async def get_accessible_plan_summaries_by_ids(plan_ids: List[str], user_id: str) -> Dict[str, dict]:
+    """
+    Plan metadata keyed by id, without ``readings``. Each summary carries
+    ``reading_days``: the day keys that have at least one passage, so rest days
+    can be told apart without shipping the reading list.
+    """
+    query = _accessible_plans_query(plan_ids, user_id)
+    if query is None:
+        return {}
+    non_empty_days = {
+        "$filter": {
+            "input": {"$objectToArray": {"$ifNull": ["$readings", {}]}},
+            "as": "r",
+            "cond": {"$gt": [{"$size": {"$ifNull": ["$$r.v", []]}}, 0]},
+        }
+    }
+    pipeline = [
+        {"$match": query},
+        {"$project": {
+            "name": 1,
+            "duration": 1,
+            "user_id": 1,
+            "visible": 1,
+            "created_at": 1,
+            "updated_at": 1,
+            "reading_days": {"$map": {"input": non_empty_days, "as": "r", "in": "$$r.k"}},
+        }},
+    ]
+    docs = await DB.db.bible_plans.aggregate(pipeline).to_list(length=None)
+    return {str(d["_id"]): d for d in docs}
+
+
+async def get_plan_readings_for_days(days_by_plan: Dict[str, List[int]]) -> Dict[str, Dict[str, list]]:
+    """
+    Raw readings for the requested days of each plan, in one query projecting only
+    ``readings.<day>`` keys. Days without readings are left out.
+    """
+    oids = [ObjectId(pid) for pid in days_by_plan if ObjectId.is_valid(pid)]
+    wanted = sorted({day for days in days_by_plan.values() for day in days})
+    if not oids or not wanted:
+        return {}
+    projection = {f"readings.{day}": 1 for day in wanted}
+    docs = await DB.db.bible_plans.find({"_id": {"$in": oids}}, projection).to_list(length=None)
+
+    result: Dict[str, Dict[str, list]] = {}
+    for doc in docs:
+        plan_id = str(doc["_id"])
+        readings = doc.get("readings") or {}
+        result[plan_id] = {
+            str(day): readings[str(day)]
+            for day in days_by_plan.get(plan_id, [])
+            if readings.get(str(day))
+        }
+    return result
+
+
 async def create_template_from_plan(
     plan_id: str, user_id: str
 ) -> Optional[ReadingPlanTemplateOut]:
@@ -473,20 +591,12 @@ async def create_template_from_plan(
             )
 
         if result.inserted_id:
+            invalidate_templates()
             created = await DB.db.bible_plan_templates.find_one(
                 {"_id": result.inserted_id}
             )
             if created:
-                readings = {
-                    k: [BiblePassage(**p) for p in v]
-                    for k, v in created.get("readings", {}).items()
-                }
-                return ReadingPlanTemplateOut(
-                    id=str(created.get("_id")),
-                    name=created["name"],
-                    duration=created["duration"],
-                    readings=readings,
-                )
+                return _convert_template_doc_to_out(created)
 
         return None
     except HTTPException:
@@ -526,19 +636,11 @@ async def update_bible_plan_template(
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Template not found"
             )
+        invalidate_templates()
 
         updated = await DB.db.bible_plan_templates.find_one({"_id": tid})
         if updated:
-            readings = {
-                k: [BiblePassage(**p) for p in v]
-                for k, v in updated.get("readings", {}).items()
-            }
-            return ReadingPlanTemplateOut(
-                id=str(updated.get("_id")),
-                name=updated["name"],
-                duration=updated["duration"],
-                readings=readings,
-            )
+            return _convert_template_doc_to_out(updated)
         return None
     except DuplicateKeyError:
         raise HTTPException(
@@ -565,6 +667,8 @@ async def delete_bible_plan_template(template_id: str) -> bool:
 
     try:
         result = await DB.db.bible_plan_templates.delete_one({"_id": tid})
+        if result.deleted_count:
+            invalidate_templates()
         return result.deleted_count > 0
     except HTTPException:
         raise
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -23,13 +23,148 @@ class UserBiblePlanSubscription(BaseModel):
     start_date: datetime
     notification_time: Optional[str] = None
     notification_enabled: bool = True
+    # Built from the stored bitset + passage detail; kept in this shape for clients
     progress: List[UserBiblePlanProgress] = Field(default_factory=list)
     subscribed_at: datetime = Field(default_factory=datetime.now)
+    # Stored completion bitset, for server-side day calculations
+    progress_bits: Dict[str, int] = Field(default_factory=dict, exclude=True)
 
 
 _COLLECTION_NAME = "bible_plan_tracker"
 
 
+############################
+# Progress bitset
+############################
+
+# Completed days are stored as ``progress_bits``: {"<word>": int}, where day d is
+# bit (d - 1) % DAYS_PER_WORD of word (d - 1) // DAYS_PER_WORD. 63 days per word
+# keeps every word non-negative inside a signed int64, which $bit can update
+# atomically. Ticked passages are stored sparsely per day in
+# ``passage_progress``: {"<day>": [passage ids]}.
+DAYS_PER_WORD = 63
+_WORD_MASK = (1 << DAYS_PER_WORD) - 1
+
+
+def day_bit(day: int) -> Tuple[str, int]:
+    """(word key, mask) for ``day`` (1-based)."""
+    word, offset = divmod(day - 1, DAYS_PER_WORD)
+    return str(word), 1 << offset
+
+
+def is_day_completed(bits: Dict[str, int], day: int) -> bool:
+    if day < 1:
+        return False
+    word, mask = day_bit(day)
+    return bool(int(bits.get(word) or 0) & mask)
+
+
+def completed_days(bits: Dict[str, int]) -> List[int]:
+    days: List[int] = []
+    for word in sorted(bits, key=int):
+        value = int(bits[word] or 0)
+        base = int(word) * DAYS_PER_WORD
+        while value:
+            low = value & -value
+            days.append(base + low.bit_length())
+            value ^= low
+    return days
+
+
+def last_completed_day(bits: Dict[str, int]) -> int:
+    """Highest completed day, 0 when none."""
+    best = 0
+    for word, value in bits.items():
+        value = int(value or 0)
+        if value:
+            best = max(best, int(word) * DAYS_PER_WORD + value.bit_length())
+    return best
+
+
+def bits_from_progress(progress: List[dict]) -> Dict[str, int]:
+    """Bitset for a legacy ``progress`` array."""
+    bits: Dict[str, int] = {}
+    for entry in progress or []:
+        day = entry.get("day")
+        if isinstance(day, int) and day >= 1 and entry.get("is_completed"):
+            word, mask = day_bit(day)
+            bits[word] = bits.get(word, 0) | mask
+    return bits
+
+
+def _legacy_passage_progress(progress: List[dict]) -> Dict[str, List[str]]:
+    return {
+        str(entry["day"]): list(entry["completed_passages"])
+        for entry in progress or []
+        if isinstance(entry.get("day"), int) and entry.get("completed_passages")
+    }
+
+
+def progress_state(doc: Dict[str, Any]) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+    """(progress_bits, passage_progress) of a tracker document, converting the legacy array shape."""
+    if "progress_bits" in doc:
+        return dict(doc.get("progress_bits") or {}), dict(doc.get("passage_progress") or {})
+    legacy = doc.get("progress") or []
+    return bits_from_progress(legacy), _legacy_passage_progress(legacy)
+
+
+def progress_entries(bits: Dict[str, int], passages: Dict[str, List[str]]) -> List[dict]:
+    """The per-day ``progress`` list clients expect, for touched days only."""
+    done = set(completed_days(bits))
+    days = sorted(done | {int(day) for day in passages})
+    return [
+        {
+            "day": day,
+            "completed_passages": list(passages.get(str(day)) or []),
+            "is_completed": day in done,
+        }
+        for day in days
+    ]
+
+
+def progress_update(updates: List[UserBiblePlanProgress]) -> Dict[str, Any]:
+    """
+    Update document applying ``updates`` in place: one $bit per touched word and a
+    $set/$unset per touched day, so concurrent writers never overwrite each other.
+    """
+    # Later entries for the same day win, for the completion bit and the passages alike
+    latest: Dict[int, UserBiblePlanProgress] = {}
+    for upd in updates:
+        latest[upd.day] = upd
+
+    set_masks: Dict[str, int] = {}
+    clear_masks: Dict[str, int] = {}
+    to_set: Dict[str, Any] = {}
+    to_unset: Dict[str, str] = {}
+    for upd in latest.values():
+        word, mask = day_bit(upd.day)
+        target = set_masks if upd.is_completed else clear_masks
+        target[word] = target.get(word, 0) | mask
+        path = f"passage_progress.{upd.day}"
+        if upd.completed_passages:
+            to_set[path] = list(upd.completed_passages)
+        else:
+            to_unset[path] = ""
+
+    bit_ops: Dict[str, Dict[str, int]] = {}
+    for word in set(set_masks) | set(clear_masks):
+        ops: Dict[str, int] = {}
+        if word in clear_masks:
+            ops["and"] = _WORD_MASK & ~clear_masks[word]
+        if word in set_masks:
+            ops["or"] = set_masks[word]
+        bit_ops[f"progress_bits.{word}"] = ops
+
+    update: Dict[str, Any] = {}
+    if bit_ops:
+        update["$bit"] = bit_ops
+    if to_set:
+        update["$set"] = to_set
+    if to_unset:
+        update["$unset"] = to_unset
+    return update
+
+
 def _subscription_from_doc(doc: dict) -> UserBiblePlanSubscription:
     payload = {
         k: v
@@ -40,13 +175,38 @@ def _subscription_from_doc(doc: dict) -> UserBiblePlanSubscription:
             "start_date",
             "notification_time",
             "notification_enabled",
-            "progress",
             "subscribed_at",
         }
     }
+    bits, passages = progress_state(doc)
+    payload["progress"] = progress_entries(bits, passages)
+    payload["progress_bits"] = bits
     return UserBiblePlanSubscription(**payload)
 
 
+async def _migrate_legacy_progress(collection, doc: dict) -> None:
+    """Move one tracker document from the ``progress`` array to the bitset fields."""
+    bits, passages = progress_state(doc)
+    await collection.update_one(
+        {"_id": doc["_id"], "progress_bits": {"$exists": False}},
+        {
+            "$set": {"progress_bits": bits, "passage_progress": passages},
+            "$unset": {"progress": ""},
+        },
+    )
+
+
+async def prepare_bible_plan_tracker_collection(db) -> None:
+    """Convert tracker documents still holding a ``progress`` array (startup hook)."""
+    collection = db[_COLLECTION_NAME]
+    cursor = collection.find(
+        {"progress_bits": {"$exists": False}},
+        {"progress": 1},
+    )
+    async for doc in cursor:
+        await _migrate_legacy_progress(collection, doc)
+
+
 async def get_user_bible_plans(uid: str) -> List[UserBiblePlanSubscription]:
     cursor = DB.db[_COLLECTION_NAME].find({"uid": uid}).sort("subscribed_at", -1)
     docs = await cursor.to_list(length=None)
@@ -56,8 +216,10 @@ async def get_user_bible_plans(uid: str) -> List[UserBiblePlanSubscription]:
 async def insert_user_bible_plan(
     uid: str, subscription: UserBiblePlanSubscription
 ) -> bool:
-    doc = subscription.model_dump()
+    doc = subscription.model_dump(exclude={"progress"})
     doc["uid"] = uid
+    doc["progress_bits"] = bits_from_progress([p.model_dump() for p in subscription.progress])
+    doc["passage_progress"] = _legacy_passage_progress([p.model_dump() for p in subscription.progress])
     result = await DB.db[_COLLECTION_NAME].insert_one(doc)
     return bool(result.inserted_id)
 
@@ -67,26 +229,33 @@ async def delete_user_bible_plan(uid: str, plan_id: str) -> bool:
     return result.deleted_count > 0
 
 
-async def update_user_bible_plan_progress(
-    uid: str, plan_id: str, progress: List[dict]
+async def apply_user_bible_plan_progress(
+    uid: str, plan_id: str, updates: List[UserBiblePlanProgress]
 ) -> bool:
     """
-    Update the stored progress entries for a user's Bible plan.
+    Apply per-day progress updates to a user's Bible plan atomically.
 
-    Replaces the plan's `progress` array with the provided list of progress entries.
+    Only the bitset words and passage entries of the touched days are written, so
+    two devices ticking different days (or passages) at once both keep their changes.
 
     Parameters:
         uid (str): User identifier owning the plan.
         plan_id (str): Identifier of the Bible plan to update.
-        progress (List[dict]): List of progress objects for the plan (each entry represents a day's progress).
+        updates (List[UserBiblePlanProgress]): New state of each touched day.
 
     Returns:
         bool: `True` if a document matching `uid` and `plan_id` was found, `False` otherwise.
     """
-    result = await DB.db[_COLLECTION_NAME].update_one(
-        {"uid": uid, "plan_id": plan_id},
-        {"$set": {"progress": progress}},
-    )
+    collection = DB.db[_COLLECTION_NAME]
+    query = {"uid": uid, "plan_id": plan_id}
+    if not updates:
+        return await collection.count_documents(query, limit=1) > 0
+
+    legacy = await collection.find_one({**query, "progress_bits": {"$exists": False}})
+    if legacy:
+        await _migrate_legacy_progress(collection, legacy)
+
+    result = await collection.update_one(query, progress_update(updates))
     return result.matched_count > 0
 
 
@@ -133,9 +302,11 @@ async def reset_user_bible_plan(
         {"uid": uid, "plan_id": plan_id},
         {
             "$set": {
-                "progress": [],
+                "progress_bits": {},
+                "passage_progress": {},
                 "start_date": start_date or datetime.now(),
-            }
+            },
+            "$unset": {"progress": ""},
         },
     )
     return result.matched_count > 0
@@ -2,17 +2,29 @@ from __future__ import annotations
 
 import os
 import re
-from datetime import datetime, timezone
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 from bson import ObjectId
 from helpers.MongoHelper import serialize_objectid_deep
+from helpers.bulletin_cache import (
+    build_snapshot,
+    invalidate_weekly_bulletins,
+    load_weekly_snapshot,
+    snapshot_key,
+    store_weekly_snapshot,
+    weekly_snapshot_generation,
+)
+from helpers.keyset_pagination import paginate, with_tiebreaker
 from helpers.timezone_utils import (
     get_local_now,
     normalize_to_local_midnight,
+    normalize_to_local_week_start,
     strip_timezone_for_mongo,
 )
 from models.ministry import validate_ministry_ids, get_ministry_refs_from_ids
+from models.search_index import search_ref_ids, sync_search_entry
+from models.service_bulletin import list_services
 from mongo.database import DB
 from pydantic import BaseModel, Field, HttpUrl
 from pymongo.errors import DuplicateKeyError
@@ -76,6 +88,8 @@ class BulletinFeedOut(BaseModel):
         default_factory=list
     )  # List[ServiceBulletinOut] to avoid circular import
     bulletins: List[BulletinOut] = Field(default_factory=list)
+    # Keyset cursor for the next page of bulletins; None on the last page
+    next_cursor: Optional[str] = None
 
 
 def _build_image_urls(image_id: Optional[str]) -> tuple[Optional[str], Optional[str]]:
@@ -229,6 +243,8 @@ async def create_bulletin(bulletin: BulletinCreate) -> Optional[BulletinOut]:
     if not inserted_id:
         return None
 
+    await sync_search_entry("bulletin", inserted_id)
+    await invalidate_weekly_bulletins()
     return await get_bulletin_by_id(str(inserted_id))
 
 
@@ -356,6 +372,8 @@ async def update_bulletin(bulletin_id: str, updates: BulletinUpdate) -> bool:
 
     try:
         result = await DB.db["bulletins"].update_one({"_id": object_id}, update_doc)
+        await sync_search_entry("bulletin", object_id)
+        await invalidate_weekly_bulletins()
         return result.matched_count > 0
     except DuplicateKeyError:
         return False
@@ -372,6 +390,8 @@ async def delete_bulletin(bulletin_id: str) -> bool:
 
     try:
         result = await DB.db["bulletins"].delete_one({"_id": object_id})
+        await sync_search_entry("bulletin", object_id)
+        await invalidate_weekly_bulletins()
         return result.deleted_count > 0
     except Exception:
         return False
@@ -388,10 +408,13 @@ async def list_bulletins(
     published: Optional[bool] = None,
     upcoming_only: bool = False,
     skip_expiration_filter: bool = False,
-) -> List[BulletinOut]:
+    cursor: Optional[str] = None,
+) -> Tuple[List[BulletinOut], Optional[str]]:
     """
     List bulletins with optional filters.
-    - query_text: text search across headline and summary
+    Returns (bulletins, next_cursor); ``cursor`` takes precedence over ``skip``
+    and ``limit=0`` returns everything.
+    - query_text: word-prefix search across headline and body (shared search index)
     - week_start/week_end: filter by exact publish_date range (used for services, not bulletins)
     - upcoming_only: filter for publish_date <= today (bulletins that have been published)
     - skip_expiration_filter: if True, show expired bulletins too (for admin dashboard)
@@ -400,14 +423,10 @@ async def list_bulletins(
     """
     query: dict = {}
 
-    # Add regex-based partial search if query_text is provided (allows "a" to match "abc")
     if query_text:
-        import re
-        escaped_query = re.escape(query_text)
-        query["$or"] = [
-            {"headline": {"$regex": escaped_query, "$options": "i"}},
-            {"body": {"$regex": escaped_query, "$options": "i"}},
-        ]
+        matching_ids = await search_ref_ids("bulletin", query_text)
+        if matching_ids is not None:
+            query["_id"] = {"$in": matching_ids}
 
     if ministry_id:
         query["ministries"] = {"$in": [ministry_id]}
@@ -451,20 +470,20 @@ async def list_bulletins(
             query = expiration_filter
 
     if DB.db is None:
-        return []
+        return [], None
 
     # Sort by publish_date descending if searching, otherwise by order ascending (drag-and-drop order)
-    if query_text:
-        cursor = DB.db["bulletins"].find(query).sort([("publish_date", -1)])
-    else:
-        cursor = DB.db["bulletins"].find(query).sort([("order", 1)])
+    sort = [("publish_date", -1)] if query_text else [("order", 1)]
 
-    if skip:
-        cursor = cursor.skip(skip)
     if limit:
-        cursor = cursor.limit(limit)
-
-    documents = await cursor.to_list(length=limit or None)
+        documents, next_cursor = await paginate(
+            DB.db["bulletins"], query, sort, limit, cursor=cursor, skip=skip
+        )
+    else:
+        find = DB.db["bulletins"].find(query).sort(with_tiebreaker(sort))
+        if skip:
+            find = find.skip(skip)
+        documents, next_cursor = await find.to_list(length=None), None
     
     # Collect all unique ministry IDs from all documents
     all_ministry_ids = set()
@@ -497,7 +516,58 @@ async def list_bulletins(
 
         bulletin = BulletinOut(**serialized)
         bulletins.append(bulletin)
-    return bulletins
+    return bulletins, next_cursor
+
+
+# Bulletins held by a weekly snapshot; requests for a smaller page than the feed holds use list_bulletins
+WEEKLY_SNAPSHOT_BULLETIN_LIMIT = 500
+
+
+async def _next_feed_change(now: datetime, next_monday: datetime) -> datetime:
+    """When the upcoming-only feed changes without a write: a publish_date or expire_at passes, or the week rolls over."""
+    candidates = [next_monday]
+    for field in ("publish_date", "expire_at"):
+        document = await DB.db["bulletins"].find_one(
+            {"published": True, field: {"$gt": now}},
+            sort=[(field, 1)],
+            projection={field: 1},
+        )
+        if document and isinstance(document.get(field), datetime):
+            candidates.append(document[field])
+    return min(candidates)
+
+
+async def get_weekly_feed_snapshot(week_monday: datetime) -> Optional[Dict[str, Any]]:
+    """
+    The materialized public feed for the week starting ``week_monday`` (the
+    local Monday from normalize_to_local_week_start, not stripped to UTC):
+    published, upcoming bulletins plus that week's published services, as
+    served by GET /bulletins/. Built on a miss; see helpers.bulletin_cache.
+    """
+    if DB.db is None:
+        return None
+
+    local_now = get_local_now()
+    now = strip_timezone_for_mongo(local_now)
+    key = snapshot_key(week_monday)
+    snapshot = await load_weekly_snapshot(key, now)
+    if snapshot is not None:
+        return snapshot
+
+    generation = weekly_snapshot_generation()
+    bulletins, next_cursor = await list_bulletins(
+        limit=WEEKLY_SNAPSHOT_BULLETIN_LIMIT, published=True, upcoming_only=True
+    )
+    services = await list_services(skip=0, limit=100, week_start=week_monday, published=True)
+    next_monday = strip_timezone_for_mongo(normalize_to_local_week_start(local_now)) + timedelta(days=7)
+    snapshot = build_snapshot(
+        BulletinFeedOut(services=services, bulletins=bulletins),
+        valid_until=await _next_feed_change(now, next_monday),
+        bulletin_count=len(bulletins),
+        complete=next_cursor is None,
+    )
+    await store_weekly_snapshot(key, snapshot, generation)
+    return snapshot
 
 
 async def search_bulletins(
@@ -508,19 +578,12 @@ async def search_bulletins(
     ministry_id: Optional[str] = None,
     published: Optional[bool] = None,
 ) -> List[BulletinOut]:
-    """Text search across bulletin headlines and body using regex for partial matching"""
-    # Use regex for partial matching across headline and body
-    # This allows "a" to match "abc" (case-insensitive substring search)
-    import re
-    escaped_query = re.escape(query_text)
-    search_conditions = [
-        {"headline": {"$regex": escaped_query, "$options": "i"}},
-        {"body": {"$regex": escaped_query, "$options": "i"}},
-    ]
-
-    # Build query combining search with filters
-    query_parts = [{"$or": search_conditions}]
-    
+    """Word-prefix search across bulletin headlines and body via the shared search index"""
+    query_parts: List[dict] = []
+    matching_ids = await search_ref_ids("bulletin", query_text)
+    if matching_ids is not None:
+        query_parts.append({"_id": {"$in": matching_ids}})
+
     if ministry_id:
         query_parts.append({"ministries": {"$in": [ministry_id]}})
     if published is not None:
@@ -610,6 +673,7 @@ async def reorder_bulletins(bulletin_ids: List[str]) -> bool:
                 {"_id": object_id},
                 {"$set": {"order": idx, "updated_at": strip_timezone_for_mongo(get_local_now())}},
             )
+        await invalidate_weekly_bulletins()
         return True
     except Exception as exc:
         print(f"Error reordering bulletins: {exc}")
@@ -6,8 +6,10 @@ from bson.objectid import ObjectId
 from pydantic import BaseModel, Field
 import logging
 
+from helpers.keyset_pagination import count_pipeline_total, invalidate_counts, paginate_pipeline
 from mongo.database import DB
 from helpers.MongoHelper import serialize_objectid_deep
+from models.search_index import search_ref_ids, sync_search_entry
 
 # ------------------------------
 # Models
@@ -457,6 +459,7 @@ async def create_event(event: EventUpdate) -> Optional[Event]:
         # Use the helper method to insert
         inserted_id = await DB.insert_document("events", event_data)
         if inserted_id is not None:
+            await sync_search_entry("event", inserted_id)
             # Fetch the created event to return it as EventOut
             event_data = await DB.db["events"].find_one({"_id": inserted_id})
             if event_data is not None:
@@ -550,6 +553,7 @@ async def update_event(event_id: str, event: EventUpdate) -> Dict[str, Any]:
             {"_id": ObjectId(event_id)},
             {"$set": event_data},
         )
+        await sync_search_entry("event", event_id)
         if result.modified_count > 0:
             return {'success':True, 'msg':'Event update success!'}
         else:
@@ -566,6 +570,8 @@ async def delete_event(event_id: str) -> Dict[str, Any]:
     """
     try:
         result = await DB.db["events"].delete_one({"_id": ObjectId(event_id)})
+        invalidate_counts("events")
+        await sync_search_entry("event", event_id)
         if result.deleted_count > 0:
             return {'success':True, 'msg':"Successfully deleted event!"}
         else:
@@ -637,15 +643,17 @@ async def search_events(
     gender: Optional[Literal["all", "male", "female"]] = None,
     preferred_lang: Optional[str] = None,  # used for BOTH default locale and search
     sort_by_date_asc: bool = True,
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
 ) -> Dict[str, Any]:
     """
     Powerful event search with pagination & filters.
 
     Search behavior:
-    - Search is performed ONLY within the chosen default locale fields:
+    - Every word of `query` must prefix-match a word of the event's `title`,
+      `description` or `location_info` in any of its locales (shared search index).
+    - The default locale used for the projected fields is
       `preferred_lang` -> "en" -> first defined locale (if any).
-    - It checks `title` and `description` for a case-insensitive
-      regex match of `query`.
 
     Filters:
     - ministries: at least one overlap
@@ -653,6 +661,9 @@ async def search_events(
     - gender: event.gender == 'all' or equals the requested gender
     - age overlap: event [min_age, max_age] intersects with requested [min_age, max_age],
       with missing event bounds treated as open-ended.
+
+    Pass the previous response's ``next_cursor`` to page by keyset on
+    (updated_on, _id); ``page`` still works when no cursor is given.
     """
     page = max(1, int(page))
     limit = max(1, min(int(limit), 200))
@@ -672,6 +683,11 @@ async def search_events(
     if ministries:
         base_match["ministries"] = {"$in": ministries}
 
+    if query:
+        matching_ids = await search_ref_ids("event", query)
+        if matching_ids is not None:
+            base_match["_id"] = {"$in": matching_ids}
+
     # Gender: include 'all' as wildcard or exact gender match
     if gender is not None:
         base_match["$or"] = [{"gender": "all"}, {"gender": gender}]
@@ -697,10 +713,13 @@ async def search_events(
     if age_expr:
         pipeline.append({"$match": age_expr})
 
+    # Locale resolution below only runs on the returned page
+    page_stages: List[Dict[str, Any]] = []
+
     # Compute the default locale key up-front:
     # preferred_lang -> "en" -> first available locale (if any).
     # Note: localizations may be an empty dict; guard for that.
-    pipeline += [
+    page_stages += [
         {
             "$addFields": {
                 "_loc_kv": {"$objectToArray": {"$ifNull": ["$localizations", {}]}}
@@ -762,33 +781,8 @@ async def search_events(
         },
     ]
 
-    # Search ONLY within the chosen default locale's fields (title/description)
-    if query:
-        pipeline.append({
-            "$match": {
-                "$expr": {
-                    "$or": [
-                        {
-                            "$regexMatch": {
-                                "input": {"$ifNull": ["$_default_locale.title", ""]},
-                                "regex": query,
-                                "options": "i",
-                            }
-                        },
-                        {
-                            "$regexMatch": {
-                                "input": {"$ifNull": ["$_default_locale.description", ""]},
-                                "regex": query,
-                                "options": "i",
-                            }
-                        },
-                    ]
-                }
-            }
-        })
-
-    # Project ReadModEvent-compatible defaults and paginate
-    pipeline += [
+    # Project ReadModEvent-compatible defaults
+    page_stages += [
     {
         "$set": {
             "default_title": {"$ifNull": ["$_default_locale.title", ""]},
@@ -806,26 +800,20 @@ async def search_events(
             "_default_pair",
         ]
     },
-    {"$sort": {"updated_on": 1 if sort_by_date_asc else -1}},
-    {
-        "$facet": {
-            "data": [
-                {"$skip": skip},
-                {"$limit": limit},
-                {"$addFields": {"id": {"$toString": "$_id"}}},
-            ],
-            "meta": [{"$count": "total"}],
-        }
-    },
+    {"$addFields": {"id": {"$toString": "$_id"}}},
 ]
 
-    agg = await DB.db["events"].aggregate(pipeline).to_list(length=1)
-    if not agg:
-        return {"items": [], "page": page, "limit": limit, "total": 0, "pages": 0}
-
-    facet = agg[0]
-    data = facet.get("data", [])
-    total = (facet.get("meta") or [{}])[0].get("total", 0)
+    events_coll = DB.db["events"]
+    total, total_is_estimate = await count_pipeline_total(events_coll, pipeline, count_mode)
+    data, next_cursor = await paginate_pipeline(
+        events_coll,
+        pipeline,
+        [("updated_on", 1 if sort_by_date_asc else -1)],
+        limit,
+        cursor=cursor,
+        skip=skip,
+        stages=page_stages,
+    )
     pages = (total + limit - 1) // limit if total else 0
 
     for d in data:
@@ -838,7 +826,9 @@ async def search_events(
         "page": page,
         "limit": limit,
         "total": total,
+        "total_is_estimate": total_is_estimate,
         "pages": pages,
+        "next_cursor": next_cursor,
     }
 
 # Simple fetch-by-id that returns a ReadModEvent with default localization resolved.
@@ -5,6 +5,7 @@ from bson.objectid import ObjectId
 import logging
 import asyncio
 from models.event import EventCore, EventLocalization
+from helpers.keyset_pagination import count_total, invalidate_counts, paginate
 from mongo.database import DB
 import calendar
 
@@ -729,6 +730,7 @@ async def push_event_instances(event_doc: dict):
                     "overrides_date_updated_on": event_doc.get("updated_on"),
                 }
                 await instances.insert_one(doc)
+                invalidate_counts("event_instances")
                 return 1
 
             # Recurring: maintain rolling window of future instances
@@ -782,6 +784,7 @@ async def push_event_instances(event_doc: dict):
                 await instances.insert_one(docs[0])
             else:
                 await instances.insert_many(docs)
+            invalidate_counts("event_instances")
 
             return len(docs)
         except Exception:
@@ -890,9 +893,12 @@ async def search_assembled_event_instances(
     status: Literal["all", "upcoming", "passed"] = "all",
     sort_by_series_index_asc: bool = True,
     preferred_lang: Optional[str] = None,
+    cursor: Optional[str] = None,
+    count_mode: str = "exact",
 ) -> Dict[str, Any]:
     """
     Server-side pagination for EventInstances assembled with their parent Event fields.
+    Pass the previous response's ``next_cursor`` to page by keyset instead of ``page``.
 
     Changes:
     - Status uses scheduled_date (not target_date)
@@ -920,17 +926,19 @@ async def search_assembled_event_instances(
     elif status == "passed":
         filt["scheduled_date"] = {"$lt": now}
 
-    total = await instances_coll.count_documents(filt)
+    total, total_is_estimate = await count_total(instances_coll, filt, count_mode)
 
-    cursor = (
-        instances_coll.find(filt)
-        .sort("series_index", 1 if sort_by_series_index_asc else -1)
-        .skip(skip)
-        .limit(limit)
+    docs, next_cursor = await paginate(
+        instances_coll,
+        filt,
+        [("series_index", 1 if sort_by_series_index_asc else -1)],
+        limit,
+        cursor=cursor,
+        skip=skip,
     )
 
     items: List[Dict[str, Any]] = []
-    async for inst in cursor:
+    for inst in docs:
         items.append(
             _assemble_event_instance_for_admin(
                 instance_doc=inst,
@@ -940,13 +948,15 @@ async def search_assembled_event_instances(
             )
         )
 
-    pages = (total + limit - 1) // limit if limit else 0
+    pages = (total + limit - 1) // limit if total else 0
     return {
         "items": items,
         "page": page,
         "limit": limit,
         "total": total,
+        "total_is_estimate": total_is_estimate,
         "pages": pages,
+        "next_cursor": next_cursor,
         "sort_by_series_index_asc": sort_by_series_index_asc,
         "status": status,
         "preferred_lang": preferred_lang,
@@ -1667,6 +1677,7 @@ async def delete_event_instances_from_event_id(event_id: str):
     try:
         coll = DB.db["event_instances"]
         res = await coll.delete_many({"event_id": str(event_id)})
+        invalidate_counts("event_instances")
         return {"success": True, "deleted": getattr(res, "deleted_count", 0)}
     except Exception as e:
         logging.exception("delete_event_instances_from_event_id failed")
@@ -6,11 +6,13 @@ from datetime import datetime, timezone
 from typing import Any, List, Literal, Optional, Tuple
 
 from bson import ObjectId
+from helpers.keyset_pagination import paginate
 from helpers.slug_validator import validate_slug
 from models.base.ssbc_base_model import MongoBaseModel
 from models.ministry import (
     validate_ministry_ids,
 )
+from models.search_index import search_ref_ids, sync_search_entry
 from mongo.database import DB
 from pydantic import BaseModel, Field, field_validator
 
@@ -258,6 +260,7 @@ async def create_form(form: FormCreate, user_id: str) -> Optional[FormOut]:
         }
         result = await DB.db.forms.insert_one(doc)
         if result.inserted_id:
+            await sync_search_entry("form", result.inserted_id)
             created = await DB.db.forms.find_one({"_id": result.inserted_id})
             if created:
                 return _doc_to_out(created)
@@ -267,29 +270,44 @@ async def create_form(form: FormCreate, user_id: str) -> Optional[FormOut]:
         return None
 
 
-async def list_forms(user_id: str, skip: int = 0, limit: int = 100) -> List[FormOut]:
+FORM_LIST_SORT = [("created_at", -1)]
+
+
+async def _find_forms_page(
+    query: dict, skip: int, limit: int, cursor: Optional[str]
+) -> Tuple[List[FormOut], Optional[str]]:
+    docs, next_cursor = await paginate(
+        DB.db.forms, query, FORM_LIST_SORT, limit, cursor=cursor, skip=skip
+    )
+    return [_doc_to_out(d) for d in docs], next_cursor
+
+
+async def list_forms(
+    user_id: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Tuple[List[FormOut], Optional[str]]:
+    """Newest-first page of a user's forms plus the cursor for the next page (None on the last)."""
     try:
-        cursor = (
-            DB.db.forms.find({"user_id": user_id})
-            .skip(skip)
-            .limit(limit)
-            .sort([("created_at", -1)])
-        )
-        docs = await cursor.to_list(length=limit)
-        return [_doc_to_out(d) for d in docs]
+        return await _find_forms_page({"user_id": user_id}, skip, limit, cursor)
     except Exception as e:
         logger.error(f"Error listing forms: {e}")
-        return []
+        return [], None
 
 
-async def list_all_forms(skip: int = 0, limit: int = 100) -> List[FormOut]:
+async def list_all_forms(
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Tuple[List[FormOut], Optional[str]]:
     try:
-        cursor = DB.db.forms.find({}).skip(skip).limit(limit).sort([("created_at", -1)])
-        docs = await cursor.to_list(length=limit)
-        return [_doc_to_out(d) for d in docs]
+        return await _find_forms_page({}, skip, limit, cursor)
     except Exception as e:
         logger.error(f"Error listing all forms: {e}")
-        return []
+        return [], None
+
+
+async def _apply_name_search(query: dict, name: str) -> None:
+    """Word-prefix match on title/description through the shared search index."""
+    matching_ids = await search_ref_ids("form", name)
+    if matching_ids is not None:
+        query["_id"] = {"$in": matching_ids}
 
 
 async def search_forms(
@@ -298,23 +316,18 @@ async def search_forms(
     ministry: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-) -> List[FormOut]:
+    cursor: Optional[str] = None,
+) -> Tuple[List[FormOut], Optional[str]]:
     try:
         query: dict = {"user_id": user_id}
         if name:
-            # case-insensitive partial match on title
-            query["title"] = {"$regex": name, "$options": "i"}
+            await _apply_name_search(query, name)
         if ministry:
             query["ministries"] = {"$in": [ministry]}
-
-        cursor = (
-            DB.db.forms.find(query).skip(skip).limit(limit).sort([("created_at", -1)])
-        )
-        docs = await cursor.to_list(length=limit)
-        return [_doc_to_out(d) for d in docs]
+        return await _find_forms_page(query, skip, limit, cursor)
     except Exception as e:
         logger.error(f"Error searching forms: {e}")
-        return []
+        return [], None
 
 
 async def search_all_forms(
@@ -322,22 +335,18 @@ async def search_all_forms(
     ministry: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-) -> List[FormOut]:
+    cursor: Optional[str] = None,
+) -> Tuple[List[FormOut], Optional[str]]:
     try:
         query: dict = {}
         if name:
-            query["title"] = {"$regex": name, "$options": "i"}
+            await _apply_name_search(query, name)
         if ministry:
             query["ministries"] = {"$in": [ministry]}
-
-        cursor = (
-            DB.db.forms.find(query).skip(skip).limit(limit).sort([("created_at", -1)])
-        )
-        docs = await cursor.to_list(length=limit)
-        return [_doc_to_out(d) for d in docs]
+        return await _find_forms_page(query, skip, limit, cursor)
     except Exception as e:
         logger.error(f"Error searching all forms: {e}")
-        return []
+        return [], None
 
 
 async def list_visible_forms(skip: int = 0, limit: int = 100) -> List[FormOut]:
@@ -382,7 +391,7 @@ async def search_visible_forms(
             ],
         }
         if name:
-            query["title"] = {"$regex": name, "$options": "i"}
+            await _apply_name_search(query, name)
         if ministry:
             query["ministries"] = {"$in": [ministry]}
 
@@ -981,6 +990,7 @@ async def update_form(
             {"_id": ObjectId(form_id), "user_id": user_id}, {"$set": update_doc}
         )
         if result.matched_count:
+            await sync_search_entry("form", form_id)
             doc = await DB.db.forms.find_one({"_id": ObjectId(form_id)})
             return _doc_to_out(doc) if doc else None
         return None
@@ -999,6 +1009,7 @@ async def delete_form(form_id: str, user_id: str) -> bool:
         result = await DB.db.forms.delete_one({"_id": form_obj_id, "user_id": user_id})
         if result.deleted_count > 0:
             await DB.db.form_responses.delete_one({"form_id": form_obj_id})
+            await sync_search_entry("form", form_obj_id)
             return True
         return False
     except Exception as e:
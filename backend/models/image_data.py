@@ -5,19 +5,79 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field, field_validator
 from bson import ObjectId
+from pymongo import UpdateOne
 
+from helpers.keyset_pagination import count_total, decode_cursor, encode_cursor, invalidate_counts, paginate
 from mongo.database import DB
 
 COLLECTION_NAME = "image_data"
+ASSETS_PATH_PREFIX = "data/assets/"
 
 async def _get_collection():
     return DB.db[COLLECTION_NAME]
 
+def folder_of_path(path: str) -> str:
+    """Normalized folder ('' = Home, 'a/b' otherwise) of a 'data/assets/...' document path."""
+    norm = path.replace("\\", "/")
+    if not norm.startswith(ASSETS_PATH_PREFIX):
+        return ""
+    return os.path.dirname(norm[len(ASSETS_PATH_PREFIX):]).strip("/")
+
+def _folder_of_prefix(prefix: str) -> str:
+    return prefix[len(ASSETS_PATH_PREFIX):].strip("/") if prefix.startswith(ASSETS_PATH_PREFIX) else ""
+
+def tokenize_name(name: Optional[str]) -> List[str]:
+    """Lower-cased word tokens of an asset name; search prefix-matches these."""
+    if not name:
+        return []
+    return sorted({t for t in re.split(r"[\W_]+", name.lower()) if t})
+
+def _substr_from(expr: Any, start: int) -> Dict[str, Any]:
+    return {"$substrCP": [expr, start, {"$max": [0, {"$subtract": [{"$strLenCP": expr}, start]}]}]}
+
+def rewrite_folder_expr(field_expr: str, old_folder: str, new_folder: str) -> Dict[str, Any]:
+    """
+    Aggregation expression mapping a folder value equal to/under ``old_folder``
+    onto ``new_folder`` ('a/x' -> 'b/x'), for update_many pipelines.
+    """
+    # keep the "/<sub>" part ('' for old_folder itself)
+    sub = _substr_from(field_expr, len(old_folder))
+    if new_folder:
+        # $literal: a name starting with "$" would otherwise be read as a field path
+        return {"$concat": [{"$literal": new_folder}, sub]}
+    return {"$let": {"vars": {"sub": sub}, "in": _substr_from("$$sub", 1)}}
+
+def _subtree_query(folder: str) -> Dict[str, Any]:
+    """Documents in ``folder`` or any folder below it (anchored, so the folder index is used)."""
+    if folder == "":
+        return {}
+    return {"$or": [{"folder": folder}, {"folder": {"$regex": f"^{re.escape(folder + '/')}"}}]}
+
+async def prepare_image_data_collection(db) -> None:
+    """Backfill the ``folder`` and ``name_tokens`` fields on documents written before they existed."""
+    col = db[COLLECTION_NAME]
+    batch: List[UpdateOne] = []
+    missing = {"$or": [{"folder": {"$exists": False}}, {"name_tokens": {"$exists": False}}]}
+    async for doc in col.find(missing, {"path": 1, "name": 1}):
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+            "folder": folder_of_path(doc.get("path") or ""),
+            "name_tokens": tokenize_name(doc.get("name")),
+        }}))
+        if len(batch) >= 1000:
+            await col.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        await col.bulk_write(batch, ordered=False)
+
 class ImageData(BaseModel):
     name: str
     description: Optional[str] = None
     extension: str
     path: str
+    # sha256 of the original bytes; doubles as the stable ETag for serving
+    content_hash: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
 
 class ImageDataInDB(ImageData):
     id: str = Field(..., alias="_id")
@@ -48,6 +108,8 @@ class ImageResponse(BaseModel):
     path: str
     public_url: str
     thumb_url: str
+    width: Optional[int] = None
+    height: Optional[int] = None
 
 class ImageUpdateRequest(BaseModel):
     new_name: Optional[str] = None
@@ -115,20 +177,71 @@ class FolderResponse(BaseModel):
     action: str
     details: Optional[Dict[str, Any]] = None
 
-async def create_image_data_with_id(_id: ObjectId, payload: ImageData) -> str:
-    col = await _get_collection()
-    doc = {
+def _new_image_doc(_id: ObjectId, payload: ImageData) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    return {
         "_id": _id,
         "name": payload.name,
+        "name_tokens": tokenize_name(payload.name),
         "description": payload.description,
         "extension": payload.extension,
         "path": payload.path,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
+        "folder": folder_of_path(payload.path),
+        "content_hash": payload.content_hash,
+        "width": payload.width,
+        "height": payload.height,
+        "derivatives_status": "pending",
+        "created_at": now,
+        "updated_at": now,
     }
-    await col.insert_one(doc)
+
+async def create_image_data_with_id(_id: ObjectId, payload: ImageData) -> str:
+    col = await _get_collection()
+    await col.insert_one(_new_image_doc(_id, payload))
+    invalidate_counts(COLLECTION_NAME)
     return str(_id)
 
+async def create_image_data_many(items: List[Tuple[ObjectId, ImageData]]) -> List[Dict[str, Any]]:
+    """Insert several image documents in one round trip; returns the inserted docs."""
+    if not items:
+        return []
+    col = await _get_collection()
+    docs = [_new_image_doc(_id, payload) for _id, payload in items]
+    await col.insert_many(docs, ordered=False)
+    invalidate_counts(COLLECTION_NAME)
+    return docs
+
+async def find_images_by_content_hashes(hashes: List[str]) -> List[Dict[str, Any]]:
+    if not hashes:
+        return []
+    col = await _get_collection()
+    return [d async for d in col.find({"content_hash": {"$in": list(set(hashes))}})]
+
+async def set_image_derivatives(id_str: str, derivatives: Optional[Dict[str, Any]]) -> bool:
+    """Record generated thumbnail/variants (or their absence) on an image document."""
+    col = await _get_collection()
+    try:
+        _id = ObjectId(id_str)
+    except Exception:
+        return False
+    updates: Dict[str, Any] = {
+        "derivatives": derivatives,
+        "derivatives_status": "ready" if derivatives else "none",
+        # Bump so cached responses (keyed on updated_at) pick up the new variants
+        "updated_at": datetime.utcnow(),
+    }
+    if derivatives:
+        updates["width"] = derivatives.get("width")
+        updates["height"] = derivatives.get("height")
+    res = await col.update_one({"_id": _id}, {"$set": updates})
+    return res.modified_count > 0
+
+async def list_images_missing_derivatives(limit: int) -> List[Dict[str, Any]]:
+    col = await _get_collection()
+    # "pending" covers uploads whose background job was lost to a restart
+    cursor = col.find({"derivatives_status": {"$nin": ["ready", "none"]}}).limit(limit)
+    return [d async for d in cursor]
+
 async def get_image_data(id_str: str) -> Optional[Dict[str, Any]]:
     col = await _get_collection()
     try:
@@ -141,37 +254,65 @@ async def get_image_data(id_str: str) -> Optional[Dict[str, Any]]:
     doc["_id"] = str(doc["_id"])
     return doc
 
+# Newest first; _id breaks ties between uploads in the same millisecond
+LIST_SORT = [("created_at", -1), ("_id", -1)]
+
+def encode_list_cursor(doc: Dict[str, Any]) -> str:
+    """Opaque keyset cursor for the (created_at, _id) position of ``doc``."""
+    return encode_cursor(doc, LIST_SORT)
+
+def decode_list_cursor(cursor: str) -> Optional[Tuple[datetime, ObjectId]]:
+    values = decode_cursor(cursor, LIST_SORT)
+    return tuple(values) if values else None
+
+def name_search_query(name_q: str) -> Dict[str, Any]:
+    """Every query word must prefix-match a name token (anchored, so the multikey index is used)."""
+    tokens = tokenize_name(name_q)
+    if not tokens:
+        return {}
+    clauses = [{"name_tokens": {"$regex": f"^{re.escape(t)}"}} for t in tokens]
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
 # *** New: advanced listing with filtering + pagination ***
 async def list_image_data_advanced(
     *,
-    folder_prefix: Optional[str],  # '' for root; None for no folder filtering
+    folder: Optional[str],  # '' for root; None for no folder filtering
     name_q: Optional[str],
     page: int,
     page_size: int,
-    order: int = -1,  # newest first
-) -> Tuple[List[Dict[str, Any]], int]:
+    include_subfolders: bool = False,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
+    count_mode: str = "exact",
+) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+    """
+    Newest-first listing. With ``cursor`` (the previous page's ``next_cursor``)
+    pages are fetched by keyset on (created_at, _id) instead of skip; ``page``
+    is only used for skip-based access when no cursor is given.
+    Returns (docs, total or None, next_cursor or None).
+    """
     col = await _get_collection()
-    query: Dict[str, Any] = {}
+    clauses: List[Dict[str, Any]] = []
 
-    if folder_prefix is not None:
-        prefix = "data/assets/" if folder_prefix == "" else f"data/assets/{folder_prefix.strip('/')}/"
-        query["path"] = {"$regex": f"^{prefix}"}
+    if folder is not None:
+        clauses.append(_subtree_query(folder) if include_subfolders else {"folder": folder})
 
     if name_q:
-        # name substring match (case-insensitive) - escape to prevent regex injection
-        escaped_name = re.escape(name_q)
-        query["name"] = {"$regex": escaped_name, "$options": "i"}
+        clauses.append(name_search_query(name_q))
+
+    query: Dict[str, Any] = {"$and": [c for c in clauses if c]} if any(clauses) else {}
+    total = (await count_total(col, query, count_mode))[0] if with_total else None
 
-    total = await col.count_documents(query)
-    skip = max(0, (page - 1) * page_size)
-    cursor = col.find(query).sort("created_at", order).skip(skip).limit(page_size)
+    docs, next_cursor = await paginate(
+        col, query, LIST_SORT, page_size, cursor=cursor, skip=max(0, (page - 1) * page_size)
+    )
 
     results: List[Dict[str, Any]] = []
-    async for d in cursor:
+    for d in docs:
         d["_id"] = str(d["_id"])
         results.append(d)
 
-    return results, total
+    return results, total, next_cursor
 
 async def update_image_data(id_str: str, updates: Dict[str, Any]) -> bool:
     col = await _get_collection()
@@ -182,6 +323,8 @@ async def update_image_data(id_str: str, updates: Dict[str, Any]) -> bool:
     updates = {k: v for k, v in updates.items() if v is not None}
     if not updates:
         return True
+    if "name" in updates:
+        updates["name_tokens"] = tokenize_name(updates["name"])
     updates["updated_at"] = datetime.utcnow()
     res = await col.update_one({"_id": _id}, {"$set": updates})
     return res.modified_count > 0
@@ -193,23 +336,27 @@ async def delete_image_data(id_str: str) -> bool:
     except Exception:
         return False
     res = await col.delete_one({"_id": _id})
+    invalidate_counts(COLLECTION_NAME)
     return res.deleted_count > 0
 
 async def bulk_repath_prefix(old_prefix: str, new_prefix: str) -> int:
+    """
+    Rewrite ``old_prefix`` to ``new_prefix`` on every path (and folder) under it
+    with a single server-side update_many pipeline.
+    """
     col = await _get_collection()
-    cursor = col.find({"path": {"$regex": f"^{old_prefix}"}})
-    docs = [d async for d in cursor]
-    modified = 0
-    for d in docs:
-        _id = d["_id"]
-        path = d["path"]
-        new_path = new_prefix + path[len(old_prefix):]
-        res = await col.update_one({"_id": ObjectId(_id) if isinstance(_id, str) else _id},
-                                   {"$set": {"path": new_path, "updated_at": datetime.utcnow()}})
-        modified += res.modified_count
-    return modified
+    res = await col.update_many(
+        {"path": {"$regex": f"^{re.escape(old_prefix)}"}},
+        [{"$set": {
+            "path": {"$concat": [{"$literal": new_prefix}, _substr_from("$path", len(old_prefix))]},
+            "folder": rewrite_folder_expr("$folder", _folder_of_prefix(old_prefix), _folder_of_prefix(new_prefix)),
+            "updated_at": "$$NOW",
+        }}],
+    )
+    return res.modified_count
 
 async def bulk_delete_by_prefix(prefix: str) -> int:
     col = await _get_collection()
-    res = await col.delete_many({"path": {"$regex": f"^{prefix}"}})
+    res = await col.delete_many({"path": {"$regex": f"^{re.escape(prefix)}"}})
+    invalidate_counts(COLLECTION_NAME)
     return res.deleted_count
@@ -4,6 +4,7 @@ from typing import Optional, List, Literal, Dict, Tuple, Any
 from datetime import datetime, timezone
 
 from pydantic import BaseModel, Field
+from helpers.keyset_pagination import count_pipeline_total, invalidate_counts, paginate_pipeline
 from mongo.database import DB
 
 class MembershipRequestItem(BaseModel):
@@ -49,6 +50,9 @@ class MRSearchParams(BaseModel):
     sortBy: Literal["created_on", "resolved", "approved"] = "created_on"
     sortDir: Literal["asc", "desc"] = "asc"
     status: Literal["pending", "approved", "rejected"] = "pending"
+    # Opaque next_cursor from the previous page; when set, page is ignored
+    cursor: Optional[str] = None
+    countMode: Literal["exact", "cached", "estimated", "none"] = "exact"
 
 def _sort_keys_for_params(params: MRSearchParams) -> List[Tuple[str, int]]:
     d = 1 if params.sortDir == "asc" else -1
@@ -98,6 +102,7 @@ async def _create_new(uid: str, payload: MembershipRequestIn) -> Dict[str, Any]:
         message=(payload.message or "").strip()
     ).model_dump()
     res = await DB.db["membership_requests"].insert_one(new_doc)
+    invalidate_counts("membership_requests")
     ok = getattr(res, "inserted_id", None) is not None
     return {"success": bool(ok), "msg": "Created new membership request" if ok else "Failed to create membership request"}
 
@@ -161,8 +166,7 @@ async def search_membership_requests(params: MRSearchParams) -> Dict[str, Any]:
     if term and params.searchField == "message":
         match_pre_lookup["message"] = {"$regex": term, "$options": "i"}
 
-    pipeline: List[Dict[str, Any]] = [
-        {"$match": match_pre_lookup},
+    lookup_user: List[Dict[str, Any]] = [
         {"$lookup": {
             "from": "users",
             "localField": "uid",
@@ -172,7 +176,12 @@ async def search_membership_requests(params: MRSearchParams) -> Dict[str, Any]:
         {"$unwind": {"path": "$user", "preserveNullAndEmptyArrays": True}},
     ]
 
+    pipeline: List[Dict[str, Any]] = [{"$match": match_pre_lookup}]
+    # The user join is only needed before paging when filtering on user fields
+    page_stages: List[Dict[str, Any]] = []
+
     if term and params.searchField in ("name", "email"):
+        pipeline.extend(lookup_user)
         if params.searchField == "email":
             pipeline.append({"$match": {"user.email": {"$regex": term, "$options": "i"}}})
         else:
@@ -193,52 +202,49 @@ async def search_membership_requests(params: MRSearchParams) -> Dict[str, Any]:
                     ]
                 }
             })
+    else:
+        page_stages.extend(lookup_user)
+
+    page_stages.append({"$project": {
+        "uid": 1,
+        "message": 1,
+        "resolved": 1,
+        "approved": 1,
+        "reason":1,
+        "muted": 1,
+        "created_on": 1,
+        "responded_to": 1,
+        "history": 1,
+        "first_name": "$user.first_name",
+        "last_name": "$user.last_name",
+        "email": "$user.email",
+    }})
+
+    total, total_is_estimate = await count_pipeline_total(coll, pipeline, params.countMode)
+
+    page_size = max(1, params.pageSize)
+    docs, next_cursor = await paginate_pipeline(
+        coll,
+        pipeline,
+        _sort_keys_for_params(params),
+        page_size,
+        cursor=params.cursor,
+        skip=max(0, params.page) * page_size,
+        stages=page_stages,
+    )
+    for doc in docs:
+        doc.pop("_id", None)
 
-    sort_keys = _sort_keys_for_params(params)
-    if sort_keys:
-        pipeline.append({"$sort": {k: v for k, v in sort_keys}})
-
-    pipeline.extend([
-        {"$facet": {
-            "total": [{"$count": "count"}],
-            "items": [
-                {"$skip": max(0, params.page) * max(1, params.pageSize)},
-                {"$limit": max(1, params.pageSize)},
-                {"$project": {
-                    "_id": 0,
-                    "uid": 1,
-                    "message": 1,
-                    "resolved": 1,
-                    "approved": 1,
-                    "reason":1,
-                    "muted": 1,
-                    "created_on": 1,
-                    "responded_to": 1,
-                    "history": 1,
-                    "first_name": "$user.first_name",
-                    "last_name": "$user.last_name",
-                    "email": "$user.email",
-                }}
-            ]
-        }},
-        {"$project": {
-            "items": 1,
-            "total": {"$ifNull": [{"$arrayElemAt": ["$total.count", 0]}, 0]}
-        }}
-    ])
-
-    agg = coll.aggregate(pipeline)
-    result = [doc async for doc in agg]
-    bucket = result[0] if result else {"items": [], "total": 0}
-
-    items: List[MembershipRequestOut] = [MembershipRequestOut(**i) for i in bucket.get("items", [])]
+    items: List[MembershipRequestOut] = [MembershipRequestOut(**i) for i in docs]
 
     return {
         "success": True,
         "items": [i.model_dump() for i in items],
-        "total": int(bucket.get("total", 0)),
+        "total": total,
+        "totalIsEstimate": total_is_estimate,
         "page": params.page,
         "pageSize": params.pageSize,
+        "next_cursor": next_cursor,
     }
 
 
@@ -296,4 +302,5 @@ async def delete_membership_request(uid: str) -> Dict[str, Any]:
     res = await DB.db["membership_requests"].delete_one({"uid": uid})
     if res.deleted_count == 0:
         return {"success": False, "msg": "Membership request not found"}
+    invalidate_counts("membership_requests")
     return {"success": True, "msg": "Membership request deleted"}
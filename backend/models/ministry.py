@@ -5,6 +5,8 @@ from datetime import datetime
 from typing import List, Optional
 
 from bson import ObjectId
+from helpers.bulletin_cache import invalidate_weekly_bulletins
+from helpers.sermon_cache import invalidate_sermon_feed
 from mongo.database import DB
 from pydantic import BaseModel, Field, field_validator
 
@@ -166,6 +168,9 @@ async def update_ministry(ministry_id: str, update: MinistryUpdate) -> MinistryO
             exc,
         )
 
+    # Sermon feed pages and weekly bulletin snapshots embed ministry names (ministry_refs)
+    invalidate_sermon_feed()
+    await invalidate_weekly_bulletins()
     updated = await DB.db["ministries"].find_one({"_id": oid})
     return _doc_to_out(updated)
 
@@ -496,5 +501,7 @@ async def _remove_ministry_from_references(ministry_id: str) -> None:
         return
     await DB.db["events"].update_many({}, {"$pull": {"ministries": ministry_id}})
     await DB.db["sermons"].update_many({}, {"$pull": {"ministry": ministry_id}})
+    invalidate_sermon_feed()
     await DB.db["bulletins"].update_many({}, {"$pull": {"ministries": ministry_id}})
+    await invalidate_weekly_bulletins()
     await DB.db["forms"].update_many({}, {"$pull": {"ministries": ministry_id}})
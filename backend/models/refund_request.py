@@ -6,6 +6,7 @@ from datetime import datetime, timezone
 from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from helpers.keyset_pagination import count_total, invalidate_counts, paginate
 from mongo.database import DB
 
 
@@ -69,6 +70,9 @@ class RefundRequestSearchParams(BaseModel):
     status: Literal["pending", "resolved", "unresolved", "all"] = "pending"
     txn_kind: Optional[RefundTxnKind] = None
     uid: Optional[str] = None  # optional filter; user routes will set this
+    # Opaque next_cursor from the previous page; when set, page is ignored
+    cursor: Optional[str] = None
+    countMode: Literal["exact", "cached", "estimated", "none"] = "exact"
 
 
 # -----------------------------
@@ -142,6 +146,7 @@ async def create_or_update_refund_request_doc(uid: str, payload: RefundRequestIn
             message=message,
         ).model_dump()
         res = await coll.insert_one(new_doc)
+        invalidate_counts("refund_requests")
         ok = getattr(res, "inserted_id", None) is not None
         return {
             "success": bool(ok),
@@ -224,29 +229,18 @@ async def search_refund_requests(params: RefundRequestSearchParams) -> Dict[str,
     if status_match:
         match.update(status_match)
 
-    pipeline: List[Dict[str, Any]] = [
-        {"$match": match},
-        {"$sort": {"created_on": -1}},
-        {
-            "$facet": {
-                "total": [{"$count": "count"}],
-                "items": [
-                    {
-                        "$skip": max(0, params.page) * max(1, params.pageSize)
-                    },
-                    {"$limit": max(1, params.pageSize)},
-                ],
-            }
-        },
-    ]
+    total, total_is_estimate = await count_total(coll, match, params.countMode)
 
-    agg = await coll.aggregate(pipeline).to_list(length=1)
-    bucket = agg[0] if agg else {"items": [], "total": []}
-
-    total_arr = bucket.get("total") or []
-    total = total_arr[0].get("count", 0) if total_arr else 0
+    page_size = max(1, params.pageSize)
+    items_raw, next_cursor = await paginate(
+        coll,
+        match,
+        [("created_on", -1)],
+        page_size,
+        cursor=params.cursor,
+        skip=max(0, params.page) * page_size,
+    )
 
-    items_raw = bucket.get("items", []) or []
     items: List[RefundRequestOut] = [
         _to_out_from_doc(doc) for doc in items_raw
     ]
@@ -254,8 +248,10 @@ async def search_refund_requests(params: RefundRequestSearchParams) -> Dict[str,
     return {
         "items": [i.model_dump() for i in items],
         "total": total,
+        "totalIsEstimate": total_is_estimate,
         "page": params.page,
         "pageSize": params.pageSize,
+        "next_cursor": next_cursor,
     }
 
 
@@ -321,4 +317,5 @@ async def delete_refund_request(id: str) -> Dict[str, Any]:
     res = await coll.delete_one({"_id": oid})
     if res.deleted_count == 0:
         return {"success": False, "msg": "Refund request not found"}
+    invalidate_counts("refund_requests")
     return {"success": True, "msg": "Refund request deleted"}
@@ -0,0 +1,372 @@
+import logging
+import re
+import unicodedata
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo import DeleteMany, InsertOne, ReplaceOne
+
+from helpers.timezone_utils import get_local_now, strip_timezone_for_mongo
+from mongo.database import DB
+
+# Inverted index shared by every content search (sermons, bulletins, events, forms, pages).
+# One document per (type, ref_id, locale); locale is "" for content that is not localized:
+#   {type, ref_id, locale, title, snippet, slug, title_tokens, tokens,
+#    visible, date, starts_at, expires_at, updated_at}
+# Queries match every search word as a prefix of some entry token, which the multikey
+# "tokens" index answers with bounded range scans instead of collection-wide regexes.
+COLLECTION_NAME = "search_index"
+
+SEARCH_TYPES = ("sermon", "bulletin", "event", "form", "page")
+
+# Upper bound on ids handed back to a module search as an ``_id: {$in: ...}`` prefilter;
+# broader matches keep the best-ranked ids (same score as global_search)
+SEARCH_MAX_CANDIDATES = 5000
+
+MAX_TOKENS_PER_ENTRY = 1000
+MAX_TOKEN_LENGTH = 40
+SNIPPET_LENGTH = 200
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+_TAG_RE = re.compile(r"<[^>]+>")
+
+async def _get_collection():
+    return DB.db[COLLECTION_NAME]
+
+def fold_text(text: Optional[str]) -> str:
+    """Lowercase and strip accents so "Oración" and "oracion" index the same."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def tokenize_text(*texts: Optional[str]) -> List[str]:
+    """Unique, sorted word tokens across ``texts``."""
+    tokens = set()
+    for text in texts:
+        for token in _TOKEN_RE.findall(fold_text(_TAG_RE.sub(" ", text or ""))):
+            tokens.add(token[:MAX_TOKEN_LENGTH])
+    return sorted(tokens)
+
+def _snippet(text: Optional[str]) -> str:
+    plain = " ".join(_TAG_RE.sub(" ", text or "").split())
+    return plain if len(plain) <= SNIPPET_LENGTH else plain[:SNIPPET_LENGTH].rsplit(" ", 1)[0] + "…"
+
+def _entry(
+    type_: str,
+    ref_id: Any,
+    *,
+    title: Optional[str],
+    texts: Iterable[Optional[str]],
+    snippet_source: Optional[str] = None,
+    locale: str = "",
+    visible: bool = True,
+    date: Optional[datetime] = None,
+    starts_at: Optional[datetime] = None,
+    expires_at: Optional[datetime] = None,
+    slug: Optional[str] = None,
+) -> Dict[str, Any]:
+    title_tokens = tokenize_text(title)
+    tokens = sorted(set(title_tokens) | set(tokenize_text(*texts)))
+    if len(tokens) > MAX_TOKENS_PER_ENTRY:
+        # Title words always survive the cap
+        rest = [t for t in tokens if t not in set(title_tokens)]
+        tokens = sorted(set(title_tokens) | set(rest[: MAX_TOKENS_PER_ENTRY - len(title_tokens)]))
+    return {
+        "type": type_,
+        "ref_id": str(ref_id),
+        "locale": locale,
+        "title": title or "",
+        "snippet": _snippet(snippet_source),
+        "slug": slug,
+        "title_tokens": title_tokens,
+        "tokens": tokens,
+        "visible": bool(visible),
+        "date": date,
+        "starts_at": starts_at,
+        "expires_at": expires_at,
+        "updated_at": datetime.utcnow(),
+    }
+
+#
+# --- Per-type entry builders (source document -> index entries) ---
+#
+
+def _sermon_entries(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [_entry(
+        "sermon", doc["_id"],
+        title=doc.get("title"),
+        texts=[doc.get("description"), doc.get("summary"), doc.get("speaker"), " ".join(doc.get("tags") or [])],
+        snippet_source=doc.get("summary") or doc.get("description"),
+        visible=doc.get("published", False),
+        date=doc.get("date_posted"),
+    )]
+
+def _bulletin_entries(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [_entry(
+        "bulletin", doc["_id"],
+        title=doc.get("headline"),
+        texts=[doc.get("body")],
+        snippet_source=doc.get("body"),
+        visible=doc.get("published", False),
+        date=doc.get("publish_date"),
+        starts_at=doc.get("publish_date"),
+        expires_at=doc.get("expire_at"),
+    )]
+
+def _event_entries(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    entries = []
+    for locale, loc in (doc.get("localizations") or {}).items():
+        if not isinstance(loc, dict):
+            continue
+        entries.append(_entry(
+            "event", doc["_id"],
+            locale=locale,
+            title=loc.get("title"),
+            texts=[loc.get("description"), loc.get("location_info")],
+            snippet_source=loc.get("description"),
+            visible=not doc.get("hidden", False),
+            date=doc.get("date"),
+        ))
+    return entries
+
+def _form_entries(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [_entry(
+        "form", doc["_id"],
+        title=doc.get("title"),
+        texts=[doc.get("description")],
+        snippet_source=doc.get("description"),
+        visible=doc.get("visible", False),
+        date=doc.get("created_at"),
+        expires_at=doc.get("expires_at"),
+        slug=doc.get("slug"),
+    )]
+
+def _page_strings(value: Any, out: List[str]) -> None:
+    """Human-readable strings from web-builder section props (skips urls, colors, ids)."""
+    if isinstance(value, str):
+        stripped = value.strip()
+        if stripped and not stripped.startswith(("http://", "https://", "/", "#", "data:")) and any(c.isalpha() for c in stripped):
+            out.append(stripped)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _page_strings(v, out)
+    elif isinstance(value, list):
+        for v in value:
+            _page_strings(v, out)
+
+def _page_entries(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    strings: List[str] = []
+    _page_strings([s.get("props") for s in doc.get("sections") or [] if isinstance(s, dict)], strings)
+    return [_entry(
+        "page", doc["_id"],
+        title=doc.get("title"),
+        texts=strings,
+        snippet_source=" ".join(strings[:5]),
+        visible=doc.get("visible", False),
+        date=doc.get("updated_at") or doc.get("created_at"),
+        slug=doc.get("slug"),
+    )]
+
+# type -> (source collection, entry builder)
+_SOURCES: Dict[str, tuple[str, Callable[[Dict[str, Any]], List[Dict[str, Any]]]]] = {
+    "sermon": ("sermons", _sermon_entries),
+    "bulletin": ("bulletins", _bulletin_entries),
+    "event": ("events", _event_entries),
+    "form": ("forms", _form_entries),
+    "page": ("pages", _page_entries),
+}
+
+def build_entries(type_: str, doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return _SOURCES[type_][1](doc)
+
+#
+# --- Maintenance ---
+#
+
+async def index_document(type_: str, doc: Dict[str, Any]) -> None:
+    """Replace every entry for ``doc`` (stale locales included) with freshly built ones."""
+    col = await _get_collection()
+    ref_id = str(doc["_id"])
+    entries = build_entries(type_, doc)
+    ops: List[Any] = [DeleteMany({"type": type_, "ref_id": ref_id, "locale": {"$nin": [e["locale"] for e in entries]}})]
+    ops += [ReplaceOne({"type": type_, "ref_id": ref_id, "locale": e["locale"]}, e, upsert=True) for e in entries]
+    await col.bulk_write(ops, ordered=True)
+
+async def remove_document(type_: str, ref_id: Any) -> None:
+    col = await _get_collection()
+    await col.delete_many({"type": type_, "ref_id": str(ref_id)})
+
+async def sync_search_entry(type_: str, ref_id: Any) -> None:
+    """
+    Re-read one source document and bring its entries up to date (or drop them if it
+    is gone). Called after every create/update/delete; never raises, since a stale
+    search entry must not fail the write that triggered it.
+    """
+    if DB.db is None or not ref_id:
+        return
+    try:
+        collection, _ = _SOURCES[type_]
+        doc = await DB.db[collection].find_one({"_id": ObjectId(str(ref_id))})
+        if doc is None:
+            await remove_document(type_, ref_id)
+        else:
+            await index_document(type_, doc)
+    except Exception as e:
+        logging.error(f"Failed to sync search entry {type_}:{ref_id}: {e}")
+
+async def rebuild_search_index(types: Iterable[str] = SEARCH_TYPES, batch_size: int = 500) -> Dict[str, int]:
+    """Drop and rebuild the entries for ``types`` from their source collections."""
+    col = await _get_collection()
+    counts: Dict[str, int] = {}
+    for type_ in types:
+        collection, builder = _SOURCES[type_]
+        await col.delete_many({"type": type_})
+        ops: List[InsertOne] = []
+        counts[type_] = 0
+        async for doc in DB.db[collection].find({}):
+            for entry in builder(doc):
+                ops.append(InsertOne(entry))
+            counts[type_] += 1
+            if len(ops) >= batch_size:
+                await col.bulk_write(ops, ordered=False)
+                ops = []
+        if ops:
+            await col.bulk_write(ops, ordered=False)
+    return counts
+
+async def ensure_search_index() -> None:
+    """Build the index on first start (or after the collection was dropped)."""
+    col = await _get_collection()
+    if await col.estimated_document_count() > 0:
+        return
+    counts = await rebuild_search_index()
+    logging.info(f"Built search index: {counts}")
+
+#
+# --- Queries ---
+#
+
+def _token_clauses(query: str) -> List[Dict[str, Any]]:
+    return [{"tokens": {"$regex": f"^{re.escape(t)}"}} for t in tokenize_text(query)]
+
+def _window(now: datetime) -> List[Dict[str, Any]]:
+    return [
+        {"$or": [{"starts_at": None}, {"starts_at": {"$lte": now}}]},
+        {"$or": [{"expires_at": None}, {"expires_at": {"$gt": now}}]},
+    ]
+
+def _public_clause() -> Dict[str, Any]:
+    """Visible and inside its publish window. Bulletin dates are stored as naive local time."""
+    bulletin_now = strip_timezone_for_mongo(get_local_now())
+    utc_now = datetime.now(timezone.utc)
+    return {
+        "visible": True,
+        "$or": [
+            {"type": "bulletin", "$and": _window(bulletin_now)},
+            {"type": {"$ne": "bulletin"}, "$and": _window(utc_now)},
+        ],
+    }
+
+async def search_ref_ids(
+    type_: str,
+    query: str,
+    *,
+    visible_only: bool = False,
+    limit: int = SEARCH_MAX_CANDIDATES,
+) -> Optional[List[ObjectId]]:
+    """
+    Source ``_id``s of ``type_`` whose entries match every word of ``query`` as a prefix,
+    for use as an ``{"_id": {"$in": ids}}`` prefilter. None if ``query`` has no words.
+
+    When more than ``limit`` items match, the ``limit`` best-ranked ones are returned
+    (title hits and exact words first, then newest) rather than an arbitrary subset.
+    """
+    clauses = _token_clauses(query)
+    if not clauses:
+        return None
+    if DB.db is None:
+        return []
+    match: Dict[str, Any] = {"type": type_, "$and": clauses}
+    if visible_only:
+        match.update(_public_clause())
+    col = await _get_collection()
+    ids = await col.distinct("ref_id", match)
+    if len(ids) > limit:
+        logging.warning(
+            "Search for %r matched %d %s items; keeping the %d best-ranked", query, len(ids), type_, limit
+        )
+        ranked = await col.aggregate([
+            {"$match": match},
+            {"$addFields": {"score": _score_expr(tokenize_text(query), None)}},
+            {"$group": {"_id": "$ref_id", "score": {"$max": "$score"}, "date": {"$max": "$date"}}},
+            {"$sort": {"score": -1, "date": -1, "_id": 1}},
+            {"$limit": limit},
+        ], allowDiskUse=True).to_list(length=limit)
+        ids = [row["_id"] for row in ranked]
+    return [ObjectId(i) for i in ids if ObjectId.is_valid(i)]
+
+def _score_expr(tokens: List[str], locale: Optional[str]) -> Dict[str, Any]:
+    """Per word: 3 for a title prefix hit, else 1 (body); +1 when the word matches exactly."""
+    parts: List[Any] = []
+    for token in tokens:
+        title_hit = {"$anyElementTrue": [{"$map": {
+            "input": "$title_tokens",
+            "as": "t",
+            "in": {"$eq": [{"$indexOfCP": ["$$t", token]}, 0]},
+        }}]}
+        parts.append({"$cond": [title_hit, 3, 1]})
+        parts.append({"$cond": [{"$in": [token, "$tokens"]}, 1, 0]})
+    if locale:
+        # Prefer the caller's locale when an item is indexed in several
+        parts.append({"$cond": [{"$eq": ["$locale", locale]}, 0.5, 0]})
+    return {"$add": parts}
+
+async def global_search(
+    query: str,
+    *,
+    types: Optional[List[str]] = None,
+    locale: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+) -> Dict[str, Any]:
+    """
+    Ranked public search across every content type.
+
+    Returns ``{"items", "total", "facets"}``; facets count matches per type before the
+    ``types`` filter is applied so clients can show "Sermons (4) · Events (2)" tabs.
+    """
+    tokens = tokenize_text(query)
+    empty = {"items": [], "total": 0, "facets": {t: 0 for t in SEARCH_TYPES}}
+    if not tokens or DB.db is None:
+        return empty
+
+    col = await _get_collection()
+    selected = [t for t in (types or []) if t in SEARCH_TYPES]
+    pipeline = [
+        {"$match": {"$and": _token_clauses(query) + [_public_clause()]}},
+        {"$addFields": {"score": _score_expr(tokens, locale)}},
+        {"$sort": {"score": -1, "date": -1}},
+        # One hit per item: keep its best-scoring locale
+        {"$group": {"_id": {"type": "$type", "ref_id": "$ref_id"}, "doc": {"$first": "$$ROOT"}}},
+        {"$replaceRoot": {"newRoot": "$doc"}},
+        {"$facet": {
+            "facets": [{"$group": {"_id": "$type", "count": {"$sum": 1}}}],
+            "items": ([{"$match": {"type": {"$in": selected}}}] if selected else []) + [
+                {"$sort": {"score": -1, "date": -1, "ref_id": 1}},
+                {"$skip": max(0, skip)},
+                {"$limit": max(1, min(limit, 100))},
+                {"$project": {
+                    "_id": 0, "type": 1, "id": "$ref_id", "locale": 1, "title": 1,
+                    "snippet": 1, "slug": 1, "date": 1, "score": 1,
+                }},
+            ],
+        }},
+    ]
+    result = await col.aggregate(pipeline, allowDiskUse=True).to_list(length=1)
+    if not result:
+        return empty
+    facets = {t: 0 for t in SEARCH_TYPES}
+    for row in result[0]["facets"]:
+        facets[row["_id"]] = row["count"]
+    total = sum(facets[t] for t in (selected or SEARCH_TYPES))
+    return {"items": result[0]["items"], "total": total, "facets": facets}
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple
 from urllib.parse import parse_qs, urlparse
 
 from bson import ObjectId
 from helpers.MongoHelper import serialize_objectid_deep
+from helpers.keyset_pagination import paginate, with_tiebreaker
+from helpers.sermon_cache import invalidate_sermon_feed, sermon_feed_cache
 from models.ministry import validate_ministry_ids, get_ministry_refs_from_ids
+from models.search_index import search_ref_ids, sync_search_entry
 from mongo.database import DB
 from pydantic import BaseModel, Field, HttpUrl, computed_field
 
@@ -145,6 +148,8 @@ async def create_sermon(sermon: SermonCreate) -> Optional[SermonOut]:
     if not inserted_id:
         return None
 
+    invalidate_sermon_feed()
+    await sync_search_entry("sermon", inserted_id)
     return await get_sermon_by_id(str(inserted_id))
 
 
@@ -216,6 +221,8 @@ async def update_sermon(sermon_id: str, updates: SermonUpdate) -> bool:
         result = await DB.db["sermons"].update_one(
             {"_id": object_id}, {"$set": update_payload}
         )
+        invalidate_sermon_feed()
+        await sync_search_entry("sermon", object_id)
         return result.modified_count > 0
     except Exception as exc:
         print(f"Error updating sermon {sermon_id}: {exc}")
@@ -233,12 +240,24 @@ async def delete_sermon(sermon_id: str) -> bool:
 
     try:
         result = await DB.db["sermons"].delete_one({"_id": object_id})
+        invalidate_sermon_feed()
+        await sync_search_entry("sermon", object_id)
         return result.deleted_count > 0
     except Exception as exc:
         print(f"Error deleting sermon {sermon_id}: {exc}")
         return False
 
 
+SERMON_LIST_SORT = [("date_posted", -1)]
+
+
+def _with_favorites(sermons: List[SermonOut], favorite_ids: Optional[Set[str]]) -> List[SermonOut]:
+    """Per-user copies of cached feed entries."""
+    if favorite_ids is None:
+        return list(sermons)
+    return [s.model_copy(update={"is_favorited": s.id in favorite_ids}) for s in sermons]
+
+
 async def list_sermons(
     *,
     skip: int = 0,
@@ -251,7 +270,25 @@ async def list_sermons(
     published: Optional[bool] = None,
     favorite_ids: Optional[Set[str]] = None,
     favorites_only: Optional[bool] = None,
-) -> List[SermonOut]:
+    cursor: Optional[str] = None,
+) -> Tuple[List[SermonOut], Optional[str]]:
+    """
+    Newest-first page of sermons plus the cursor for the next page (None on the last).
+    ``cursor`` takes precedence over ``skip``; ``limit=0`` returns everything.
+    Pages not restricted to a user's favorites are served from helpers.sermon_cache.
+    """
+    cache_key = None
+    if not (favorites_only and favorite_ids):
+        cache_key = (
+            ministry_id, speaker, tuple(tags or ()), date_after, date_before,
+            published, skip, limit, cursor,
+        )
+        cached = sermon_feed_cache.get(cache_key)
+        if cached is not None:
+            sermons, next_cursor = cached
+            return _with_favorites(sermons, favorite_ids), next_cursor
+    generation = sermon_feed_cache.generation
+
     query: dict = {}
 
     if ministry_id:
@@ -272,15 +309,17 @@ async def list_sermons(
         query["_id"] = {"$in": [ObjectId(fid) for fid in favorite_ids]}
 
     if DB.db is None:
-        return []
+        return [], None
 
-    cursor = DB.db["sermons"].find(query).sort("date_posted", -1)
-    if skip:
-        cursor = cursor.skip(skip)
     if limit:
-        cursor = cursor.limit(limit)
-
-    documents = await cursor.to_list(length=limit or None)
+        documents, next_cursor = await paginate(
+            DB.db["sermons"], query, SERMON_LIST_SORT, limit, cursor=cursor, skip=skip
+        )
+    else:
+        find = DB.db["sermons"].find(query).sort(with_tiebreaker(SERMON_LIST_SORT))
+        if skip:
+            find = find.skip(skip)
+        documents, next_cursor = await find.to_list(length=None), None
     
     # Collect all unique ministry IDs from all documents
     all_ministry_ids = set()
@@ -299,8 +338,6 @@ async def list_sermons(
     for document in documents:
         document["id"] = str(document.pop("_id"))
         serialized = serialize_objectid_deep(document)
-        if favorite_ids is not None:
-            serialized["is_favorited"] = serialized.get("id") in favorite_ids
         
         # Hydrate ministry_refs from pre-fetched map (O(1) lookup)
         ministry_ids = serialized.get("ministry", [])
@@ -309,7 +346,10 @@ async def list_sermons(
         ]
         
         sermons.append(SermonOut(**serialized))
-    return sermons
+
+    if cache_key is not None:
+        sermon_feed_cache.set_if_current(cache_key, (sermons, next_cursor), generation)
+    return _with_favorites(sermons, favorite_ids), next_cursor
 
 
 async def search_sermons(
@@ -324,17 +364,15 @@ async def search_sermons(
     favorite_ids: Optional[Set[str]] = None,
     favorites_only: Optional[bool] = None,
 ) -> List[SermonOut]:
-    # Use regex for partial matching across title, description, and summary
-    # This allows "a" to match "abc" (case-insensitive substring search)
-    import re
-    escaped_query = re.escape(query_text)
-    query: dict = {
-        "$or": [
-            {"title": {"$regex": escaped_query, "$options": "i"}},
-            {"description": {"$regex": escaped_query, "$options": "i"}},
-            {"summary": {"$regex": escaped_query, "$options": "i"}},
-        ]
-    }
+    if DB.db is None:
+        return []
+
+    # Word-prefix match over title, description, summary, speaker and tags via the
+    # shared search index ("serv" matches "Sunday Service")
+    query: dict = {}
+    matching_ids = await search_ref_ids("sermon", query_text)
+    if matching_ids is not None:
+        query["_id"] = {"$in": matching_ids}
 
     if ministry_id:
         query["ministry"] = {"$in": [ministry_id]}
@@ -346,12 +384,12 @@ async def search_sermons(
         query["published"] = published
 
     if favorites_only and favorite_ids:
-        query["_id"] = {"$in": [ObjectId(fid) for fid in favorite_ids]}
-
-    if DB.db is None:
-        return []
+        favorite_oids = {ObjectId(fid) for fid in favorite_ids}
+        if matching_ids is not None:
+            favorite_oids &= set(matching_ids)
+        query["_id"] = {"$in": list(favorite_oids)}
 
-    # Sort by date_posted descending (most recent first) instead of text score
+    # Sort by date_posted descending (most recent first) instead of relevance
     cursor = DB.db["sermons"].find(query).sort([("date_posted", -1)])
     if skip:
         cursor = cursor.skip(skip)
@@ -9,11 +9,23 @@ from pydantic import BaseModel, Field, field_validator
 from pymongo.errors import DuplicateKeyError
 
 from helpers.MongoHelper import serialize_objectid_deep
+from helpers.bulletin_cache import invalidate_weekly_bulletins
 from helpers.timezone_utils import normalize_to_local_week_start, strip_timezone_for_mongo, get_local_now
 from mongo.database import DB
 
 # Valid days of the week
 VALID_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+# Stored on each service as day_sort (Monday=0, Sunday=6) so list_services can sort with an index
+DAY_SORT = {day: index for index, day in enumerate(VALID_DAYS)}
+
+
+async def prepare_service_bulletins_collection(db) -> None:
+	"""Backfill day_sort on services written before it was stored."""
+	for day, index in DAY_SORT.items():
+		await db["service_bulletins"].update_many(
+			{"day_of_week": day, "day_sort": {"$ne": index}},
+			{"$set": {"day_sort": index}},
+		)
 
 
 class ServiceBulletinBase(BaseModel):
@@ -115,6 +127,7 @@ async def create_service(service: ServiceBulletinCreate) -> Optional[ServiceBull
 	# Normalize display_week to Monday 00:00 in local timezone
 	# This ensures week boundaries match the church's local timezone, not UTC
 	payload["display_week"] = strip_timezone_for_mongo(normalize_to_local_week_start(service.display_week))
+	payload["day_sort"] = DAY_SORT[service.day_of_week]
 
 	# Ensure new services append to the end of the ordering sequence
 	order_value = payload.get("order")
@@ -148,6 +161,7 @@ async def create_service(service: ServiceBulletinCreate) -> Optional[ServiceBull
 	if not inserted_id:
 		return None
 
+	await invalidate_weekly_bulletins()
 	return await get_service_by_id(str(inserted_id))
 
 
@@ -218,6 +232,8 @@ async def update_service(service_id: str, updates: ServiceBulletinUpdate) -> boo
 	# Normalize display_week to Monday 00:00 in local timezone if provided
 	if "display_week" in update_payload:
 		update_payload["display_week"] = strip_timezone_for_mongo(normalize_to_local_week_start(update_payload["display_week"]))
+	if update_payload.get("day_of_week") in DAY_SORT:
+		update_payload["day_sort"] = DAY_SORT[update_payload["day_of_week"]]
 
 	update_payload["updated_at"] = datetime.utcnow()
 
@@ -226,6 +242,7 @@ async def update_service(service_id: str, updates: ServiceBulletinUpdate) -> boo
 			{"_id": object_id},
 			{"$set": update_payload}
 		)
+		await invalidate_weekly_bulletins()
 		# Return True if document was found (matched_count > 0), regardless of whether values changed
 		return result.matched_count > 0
 	except DuplicateKeyError:
@@ -249,6 +266,7 @@ async def delete_service(service_id: str) -> bool:
 
 	try:
 		result = await DB.db["service_bulletins"].delete_one({"_id": object_id})
+		await invalidate_weekly_bulletins()
 		return result.deleted_count > 0
 	except Exception as exc:
 		print(f"Error deleting service bulletin {service_id}: {exc}")
@@ -322,48 +340,20 @@ async def list_services(
 	if DB.db is None:
 		return []
 
-	# Sort by order ascending, then by day of week (Monday=0, Sunday=6), then by time_of_day
-	# MongoDB sort with custom day order via aggregation pipeline
-	day_order = {
-		"Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3,
-		"Friday": 4, "Saturday": 5, "Sunday": 6
-	}
-	
-	# Use aggregation pipeline to add sortable day field
-	pipeline = [
-		{"$match": query},
-		{
-			"$addFields": {
-				"day_sort_value": {
-					"$switch": {
-						"branches": [
-							{"case": {"$eq": ["$day_of_week", "Monday"]}, "then": 0},
-							{"case": {"$eq": ["$day_of_week", "Tuesday"]}, "then": 1},
-							{"case": {"$eq": ["$day_of_week", "Wednesday"]}, "then": 2},
-							{"case": {"$eq": ["$day_of_week", "Thursday"]}, "then": 3},
-							{"case": {"$eq": ["$day_of_week", "Friday"]}, "then": 4},
-							{"case": {"$eq": ["$day_of_week", "Saturday"]}, "then": 5},
-							{"case": {"$eq": ["$day_of_week", "Sunday"]}, "then": 6},
-						],
-						"default": 7
-					}
-				}
-			}
-		},
-		{"$sort": {"order": 1, "day_sort_value": 1, "time_of_day": 1}},
-	]
-	
+	# Sort by order ascending, then by day of week (day_sort: Monday=0, Sunday=6), then by time_of_day
+	cursor = DB.db["service_bulletins"].find(query).sort(
+		[("order", 1), ("day_sort", 1), ("time_of_day", 1)]
+	)
 	if skip:
-		pipeline.append({"$skip": skip})
+		cursor = cursor.skip(skip)
 	if limit:
-		pipeline.append({"$limit": limit})
+		cursor = cursor.limit(limit)
 
-	documents = await DB.db["service_bulletins"].aggregate(pipeline).to_list(length=None)
+	documents = await cursor.to_list(length=None)
 	services: List[ServiceBulletinOut] = []
 	for document in documents:
 		document["id"] = str(document.pop("_id"))
-		# Remove the temporary sort field
-		document.pop("day_sort_value", None)
+		document.pop("day_sort", None)
 		serialized = serialize_objectid_deep(document)
 		service = ServiceBulletinOut(**serialized)
 		services.append(service)
@@ -392,6 +382,7 @@ async def reorder_services(service_ids: List[str]) -> bool:
 				{"_id": object_id},
 				{"$set": {"order": idx, "updated_at": datetime.utcnow()}}
 			)
+		await invalidate_weekly_bulletins()
 		return True
 	except Exception as exc:
 		print(f"Error reordering services: {exc}")
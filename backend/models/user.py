@@ -5,10 +5,11 @@ from pydantic import (
 )
 from bson import ObjectId
 from mongo.database import DB
+from helpers.keyset_pagination import invalidate_counts
 # Import the refactored roles functions
 from models.roles_models import get_role_ids_from_names, get_roles_with_permissions
 # Import UserHandler for family member operations
-from mongo.churchuser import UserHandler
+from mongo.churchuser import UserHandler, build_user_search_keys
 from models.base.ssbc_base_model import PydanticObjectId
 
 # Use shared PydanticObjectId from base model
@@ -74,6 +75,7 @@ async def create_user(user_data: UserCreate) -> Optional[UserOut]:
         user_dict = user_data.model_dump(exclude={"roles_in"})
         user_dict["roles"] = role_ids
         user_dict["createdOn"] = datetime.now() # Ensure creation time is set now
+        user_dict["search"] = build_user_search_keys(user_data.first_name, user_data.last_name, user_data.email)
 
         # Use the helper method to insert
         inserted_id = await DB.insert_document("users", user_dict)
@@ -261,6 +263,7 @@ async def delete_user(user_id: str) -> bool:
     try:
         # Use delete_one directly for specific ID deletion
         result = await DB.db["users"].delete_one({"_id": ObjectId(user_id)})
+        invalidate_counts("users")
         if result.deleted_count == 0:
              print(f"User with ID {user_id} not found for deletion.")
         return result.deleted_count > 0
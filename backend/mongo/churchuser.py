@@ -1,10 +1,89 @@
 from bson import ObjectId
+import logging
 import re
+import unicodedata
+from pymongo import UpdateOne
 from mongo.database import DB
 from datetime import datetime
 from mongo.roles import RoleHandler
 from helpers.MongoHelper import serialize_objectid_deep
-from typing import Tuple, List, Dict
+from helpers.keyset_pagination import count_total, paginate
+from typing import Any, Dict, List, Optional
+
+# Edge n-grams longer than this are not stored; longer search words fall back to a prefix regex
+USER_SEARCH_MAX_NGRAM = 15
+
+_SEARCH_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def _search_tokens(text: Optional[str]) -> List[str]:
+    """Lowercased, accent-stripped word tokens ("José-Luis" -> ["jose", "luis"])."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+    return _SEARCH_TOKEN_RE.findall(folded)
+
+
+def _edge_ngrams(tokens: List[str]) -> List[str]:
+    grams = set()
+    for token in tokens:
+        for n in range(1, min(len(token), USER_SEARCH_MAX_NGRAM) + 1):
+            grams.add(token[:n])
+    return sorted(grams)
+
+
+def build_user_search_keys(first_name: Optional[str], last_name: Optional[str], email: Optional[str]) -> Dict[str, Any]:
+    """
+    Maintained ``search`` subdocument for the admin user table:
+    lower-cased email plus edge n-grams of the name and email words, so every
+    keystroke is an equality match on a multikey index instead of a regex scan.
+    """
+    name_tokens = sorted(set(_search_tokens(first_name) + _search_tokens(last_name)))
+    return {
+        "email": (email or "").strip().lower(),
+        "name_tokens": name_tokens,
+        "name_ngrams": _edge_ngrams(name_tokens),
+        "email_ngrams": _edge_ngrams(_search_tokens(email)),
+    }
+
+
+def _token_match(field: str, token: str) -> Dict[str, Any]:
+    if len(token) <= USER_SEARCH_MAX_NGRAM:
+        return {f"search.{field}_ngrams": token}
+    if field == "name":
+        # Each name token is one word, so "^" is a word-prefix match
+        full = {"search.name_tokens": {"$regex": "^" + re.escape(token)}}
+    else:
+        # search.email is the whole address: anchor at the start of any of its words
+        full = {"search.email": {"$regex": r"(?:^|[\W_])" + re.escape(token)}}
+    return {"$and": [{f"search.{field}_ngrams": token[:USER_SEARCH_MAX_NGRAM]}, full]}
+
+
+def user_search_filter(field: str, term: str) -> Dict[str, Any]:
+    """Every word of ``term`` must prefix a word of the name (or email); emails also match by prefix."""
+    tokens = _search_tokens(term)
+    clauses = [_token_match(field, t) for t in tokens]
+    if field == "email":
+        prefix = {"search.email": {"$regex": "^" + re.escape(term.strip().lower())}}
+        return {"$or": [prefix, {"$and": clauses}]} if clauses else prefix
+    if not clauses:
+        return {"_id": {"$exists": False}}
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+async def prepare_users_collection(db) -> None:
+    """Backfill ``search`` keys for users created before they were maintained."""
+    coll = db["users"]
+    ops = []
+    cursor = coll.find({"search": {"$exists": False}}, {"first_name": 1, "last_name": 1, "email": 1})
+    async for doc in cursor:
+        keys = build_user_search_keys(doc.get("first_name"), doc.get("last_name"), doc.get("email"))
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"search": keys}}))
+        if len(ops) >= 500:
+            await coll.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        await coll.bulk_write(ops, ordered=False)
+
 
 class UserHandler:
     @staticmethod
@@ -40,6 +119,7 @@ class UserHandler:
             "people": [],
             "sermon_favorites": [],
             "createdOn": datetime.now(),
+            "search": build_user_search_keys(first_name, last_name, email),
         }
 
     @staticmethod
@@ -98,15 +178,17 @@ class UserHandler:
     
     # Intelligent pagination search for the users in admin dash
     @staticmethod
-    async def search_users_paged(params) -> Tuple[int, List[Dict]]:
+    async def search_users_paged(params) -> Dict[str, Any]:
         """
         Server-side search/pagination/sort for users.
         - params.searchField: "email" | "name"
-        - params.searchTerm: case-insensitive "contains"
+        - params.searchTerm: every word must prefix a word of the field (maintained ``search`` keys)
         - params.sortBy: "email" | "name" | "createdOn" | "uid" | "membership"
         - params.sortDir: "asc" | "desc"
         - params.hasRolesOnly: if True, filter to users with roles != []
-        Returns: (total_count, users_list)
+        - params.cursor: next_cursor of the previous page; takes precedence over params.page
+        - params.countMode: "exact" | "estimated" | "none"
+        Returns: {"total", "total_is_estimate", "users", "next_cursor"}
         """
         db = DB.db["users"]
 
@@ -117,24 +199,7 @@ class UserHandler:
 
         term = (params.searchTerm or "").strip()
         if term:
-            pat = re.escape(term)
-            if params.searchField == "email":
-                filt["email"] = {"$regex": pat, "$options": "i"}
-            else:
-                name_or = [
-                    {"first_name": {"$regex": pat, "$options": "i"}},
-                    {"last_name": {"$regex": pat, "$options": "i"}},
-                    {
-                        "$expr": {
-                            "$regexMatch": {
-                                "input": {"$concat": ["$first_name", " ", "$last_name"]},
-                                "regex": pat,
-                                "options": "i",
-                            }
-                        }
-                    },
-                ]
-                filt["$or"] = name_or
+            filt.update(user_search_filter("email" if params.searchField == "email" else "name", term))
 
         sort_dir = 1 if params.sortDir == "asc" else -1
         if params.sortBy == "email":
@@ -142,37 +207,34 @@ class UserHandler:
         elif params.sortBy == "uid":
             sort_keys = [("uid", sort_dir)]
         elif params.sortBy == "membership":
-            sort_keys = [("membership", sort_dir)]
+            sort_keys = [("membership", sort_dir), ("uid", 1)]
         elif params.sortBy == "name":
             sort_keys = [("last_name", sort_dir), ("first_name", sort_dir), ("email", 1)]
         else:
             sort_keys = [("createdOn", sort_dir), ("uid", 1)]
 
-        total = await db.count_documents(filt)
+        total, total_is_estimate = await count_total(db, filt, getattr(params, "countMode", "exact"))
 
-        skip = max(0, params.page) * max(1, params.pageSize)
         limit = max(1, params.pageSize)
-
-        cursor = (
-            db.find(
-                filt,
-                {
-                    "_id": 0,
-                    "uid": 1,
-                    "first_name": 1,
-                    "last_name": 1,
-                    "email": 1,
-                    "membership": 1,
-                    "roles": 1,
-                    "createdOn": 1,
-                },
-            )
-            .sort(sort_keys)
-            .skip(skip)
-            .limit(limit)
+        users, next_cursor = await paginate(
+            db,
+            filt,
+            sort_keys,
+            limit,
+            cursor=getattr(params, "cursor", None),
+            skip=max(0, params.page) * limit,
+            projection={
+                "_id": 0,
+                "uid": 1,
+                "first_name": 1,
+                "last_name": 1,
+                "email": 1,
+                "membership": 1,
+                "roles": 1,
+                "createdOn": 1,
+            },
         )
-        users = [doc async for doc in cursor]
-        return total, users
+        return {"total": total, "total_is_estimate": total_is_estimate, "users": users, "next_cursor": next_cursor}
 
     @staticmethod
     async def find_all_users():
@@ -344,7 +406,25 @@ class UserHandler:
     
     @staticmethod
     async def update_user(filterQuery, updateData):
-        return await DB.update_document("users", filterQuery, updateData)
+        modified = await DB.update_document("users", filterQuery, updateData)
+        if any(k in updateData for k in ("first_name", "last_name", "email")):
+            await UserHandler.refresh_search_keys(filterQuery)
+        return modified
+
+    @staticmethod
+    async def refresh_search_keys(filterQuery):
+        """Recompute the ``search`` keys after a name or email change."""
+        try:
+            coll = DB.db["users"]
+            ops = [
+                UpdateOne({"_id": doc["_id"]}, {"$set": {"search": build_user_search_keys(
+                    doc.get("first_name"), doc.get("last_name"), doc.get("email"))}})
+                async for doc in coll.find(filterQuery, {"first_name": 1, "last_name": 1, "email": 1})
+            ]
+            if ops:
+                await coll.bulk_write(ops, ordered=False)
+        except Exception as e:
+            logging.error(f"Failed to refresh user search keys: {e}")
 
     @staticmethod
     async def update_roles(uid, roles):
@@ -7,6 +7,8 @@ from datetime import datetime
 from bson import ObjectId
 import logging
 
+from helpers.keyset_pagination import invalidate_counts
+
 # MongoDB connection settings
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "SSBC_DB")
@@ -32,8 +34,13 @@ class DB:
                 # Name sorting + exact first/last lookups
                 ["last_name", "first_name", "email"],
 
-                # Membership-based sorting / filtering
-                ["membership"],
+                # Membership-based sorting / filtering (uid keeps keyset pages stable)
+                ["membership", "uid"],
+
+                # Admin search keys maintained by mongo.churchuser.build_user_search_keys
+                ["search.name_ngrams"],
+                ["search.email"],
+                ["search.email_ngrams"],
 
                 # Direct lookups by phone
                 ["phone"],
@@ -138,7 +145,8 @@ class DB:
         },
         {
             "name": "pages",
-            "indexes": ["title"]
+            # slug: public page lookups (get_page_by_slug / SPA shell meta)
+            "indexes": ["title", "slug"]
         },
         {
             "name": "header-items",
@@ -154,7 +162,14 @@ class DB:
         },
         {
             "name": "bible_notes",
-            "compound_indexes": [["user_id", "book", "chapter", "verse_start"]]
+            "compound_indexes": [
+                ["user_id", "book", "chapter", "verse_start"],
+                # Passage overlap lookups: one bounded range scan on verse ordinals
+                ["user_id", "ord_start", "ord_end"],
+                # Delta sync: changes since a watermark, paged by (updated_at, _id)
+                ["user_id", "updated_at"],
+                # (user_id, client_id) is unique for offline creates; built in init_collections
+            ]
         },
         {
             "name": "settings",
@@ -199,10 +214,16 @@ class DB:
         },
         {
             "name": "deviceTokens",
+            # One registry row per FCM token (duplicates are collapsed before this is built)
+            "indexes": ["token"],
             "compound_indexes": [
                 # Existing one – keep it:
+                # Also serves per-user lookups (send_notification_to_user) through its userId prefix
                 ["userId", "token"],
 
+                # Stale-token GC: last_seen older than N days
+                ["last_seen"],
+
                 # Bible plan reminders – quickly find “devices for user that want reminders”
                 ["userId", "notification_preferences.Bible Plan Reminders"],
             ],
@@ -216,9 +237,25 @@ class DB:
                 # Listing & pagination sort by created_at
                 ["created_at"],
 
-                # Name substring search; this index may or may not be fully used
-                # due to non-prefix regex, but it's cheap and future-proofs a bit
-                ["name"],
+                # Browsing a folder: equality on folder, keyset on (created_at, _id)
+                ["folder", "created_at", "_id"],
+
+                # Name search: anchored prefix regex on the multikey token array
+                ["name_tokens"],
+
+                # Upload de-duplication by content
+                ["content_hash"],
+            ],
+        },
+        {
+            "name": "asset_folders",
+            "indexes": [
+                # One catalog entry per folder ('' = Home)
+                "path",
+            ],
+            "compound_indexes": [
+                # Subfolder listing
+                ["parent", "name"],
             ],
         },
         {
@@ -254,8 +291,17 @@ class DB:
 
                 # Keep this if you want index support for the "max order" query and potential future uses
                 ["order"],
+
+                # list_services sort (day_sort is stored at write time)
+                ["order", "day_sort", "time_of_day"],
             ],
         },
+        {
+            # One materialized public feed per week, keyed by the Monday (helpers/bulletin_cache.py)
+            "name": "bulletin_week_snapshots",
+            "indexes": [],
+            "compound_indexes": [],
+        },
         {
             "name": "donation_transactions",
             "indexes": [
@@ -363,6 +409,21 @@ class DB:
                 #         "created_at": {"$gte": ...},
                 #     })
                 ["sent", "data.actionType", "created_at"],
+
+                # History listing and delivery metrics:
+                #   - get_notification_history sorts sent=True by sent_at
+                #   - get_delivery_metrics scans a sent_at window
+                ["sent", "sent_at"],
+            ],
+        },
+        {
+            "name": "email_outbox",
+            "compound_indexes": [
+                # Outbox sender: claim pending emails whose next_attempt_at is due
+                ["status", "next_attempt_at"],
+
+                # Abandoned-claim recovery: status="sending" with an old locked_at
+                ["status", "locked_at"],
             ],
         },
         {
@@ -391,6 +452,13 @@ class DB:
                 ["form_id"],
             ],
         },
+        {
+            "name": "search_index",
+            "compound_indexes": [
+                # Prefix-regex word matching (models/search_index.py); unique entry key is created below
+                ["tokens"],
+            ],
+        },
 
     ]
 
@@ -435,6 +503,35 @@ class DB:
             if collection_name not in collection_names:
                 await DB.db.create_collection(collection_name)
 
+            if collection_name == "deviceTokens":
+                # Must run before the unique token index is created (local import to avoid circular dependency)
+                from mongo.device_tokens import prepare_device_tokens_collection
+                await prepare_device_tokens_collection(DB.db)
+
+            if collection_name == "pages":
+                # Must run before the unique slug index is created
+                await DB.prepare_pages_collection()
+
+            if collection_name == "users":
+                from mongo.churchuser import prepare_users_collection
+                await prepare_users_collection(DB.db)
+
+            if collection_name == "bible_notes":
+                from models.bible_note import prepare_bible_notes_collection
+                await prepare_bible_notes_collection(DB.db)
+
+            if collection_name == "bible_plan_tracker":
+                from models.bible_plan_tracker import prepare_bible_plan_tracker_collection
+                await prepare_bible_plan_tracker_collection(DB.db)
+
+            if collection_name == "image_data":
+                from models.image_data import prepare_image_data_collection
+                await prepare_image_data_collection(DB.db)
+
+            if collection_name == "service_bulletins":
+                from models.service_bulletin import prepare_service_bulletins_collection
+                await prepare_service_bulletins_collection(DB.db)
+
             # Get existing indexes once per collection
             existing_indexes = await DB.db[collection_name].index_information()
 
@@ -499,12 +596,9 @@ class DB:
                 if not has_index_with_keys([("date_posted", pymongo.DESCENDING)]):
                     await DB.db[collection_name].create_index([("date_posted", pymongo.DESCENDING)])
                 
-                # Text index - check by name since text indexes are special
-                if "sermons_text_index" not in existing_indexes:
-                    await DB.db[collection_name].create_index(
-                        [("title", "text"), ("description", "text")],
-                        name="sermons_text_index"
-                    )
+                # Superseded by the shared search_index collection; drop the unused text index
+                if "sermons_text_index" in existing_indexes:
+                    await DB.db[collection_name].drop_index("sermons_text_index")
                 
                 # Multikey index for ministry array filtering
                 if not has_index_with_keys([("ministry", pymongo.ASCENDING)]):
@@ -514,12 +608,9 @@ class DB:
                     )
 
             if collection_name == "bulletins":
-                # Text index for search_bulletins and list_bulletins(query_text=...)
-                if "bulletins_text_index" not in existing_indexes:
-                    await DB.db[collection_name].create_index(
-                        [("headline", "text"), ("body", "text")],
-                        name="bulletins_text_index",
-                    )
+                # search_bulletins and list_bulletins(query_text=...) use the shared search_index
+                if "bulletins_text_index" in existing_indexes:
+                    await DB.db[collection_name].drop_index("bulletins_text_index")
                 
                 # Multikey index for ministry array filtering
                 if not has_index_with_keys([("ministries", pymongo.ASCENDING)]):
@@ -528,10 +619,63 @@ class DB:
                         name="bulletins_ministries_array_index"
                     )
 
+            if collection_name == "bible_notes":
+                # Tombstones (deleted notes) expire at purge_at; live notes never set it
+                if not has_index_with_keys([("purge_at", pymongo.ASCENDING)]):
+                    await DB.db[collection_name].create_index(
+                        [("purge_at", pymongo.ASCENDING)],
+                        expireAfterSeconds=0,
+                        name="bible_notes_tombstone_ttl",
+                    )
+
+                # Idempotent offline creates: concurrent retries of one client_id cannot both insert
+                if "bible_notes_client_id_unique" not in existing_indexes:
+                    await DB.db[collection_name].create_index(
+                        [("user_id", pymongo.ASCENDING), ("client_id", pymongo.ASCENDING)],
+                        unique=True,
+                        partialFilterExpression={"client_id": {"$exists": True}},
+                        name="bible_notes_client_id_unique",
+                    )
+
+            if collection_name == "bulletin_week_snapshots":
+                # Caps how long a snapshot built across a write can be served
+                if not has_index_with_keys([("expires_at", pymongo.ASCENDING)]):
+                    await DB.db[collection_name].create_index(
+                        [("expires_at", pymongo.ASCENDING)],
+                        expireAfterSeconds=0,
+                        name="bulletin_week_snapshots_ttl",
+                    )
+
+            if collection_name == "search_index":
+                # One entry per (type, ref_id, locale); upserts in models/search_index.py key on it
+                entry_key = [("type", pymongo.ASCENDING), ("ref_id", pymongo.ASCENDING), ("locale", pymongo.ASCENDING)]
+                if not has_index_with_keys(entry_key, unique=True):
+                    await DB.db[collection_name].create_index(entry_key, unique=True, name="search_index_entry_unique")
+
             # Import migration data if collection is empty
             await DB.import_migration_data(collection_name)
         await DB.run_post_init_hooks()
 
+    @staticmethod
+    async def prepare_pages_collection():
+        """
+        Legacy data may hold several pages with the same slug. Keep the most
+        recently updated one live; the others get a unique "-duplicate-<id>" slug
+        and are hidden, so nothing is deleted and an admin can sort them out.
+        """
+        duplicates = DB.db["pages"].aggregate([
+            {"$sort": {"updated_at": -1}},
+            {"$group": {"_id": "$slug", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ])
+        async for group in duplicates:
+            for page_id in group["ids"][1:]:
+                new_slug = f"{(group['_id'] or '').strip('/') or 'home'}-duplicate-{page_id}"
+                await DB.db["pages"].update_one(
+                    {"_id": page_id}, {"$set": {"slug": new_slug, "visible": False}}
+                )
+                logging.warning(f"Page {page_id} shared slug {group['_id']!r}; renamed to {new_slug!r} and hidden")
+
     @staticmethod
     def convert_mongodb_extended_json(data):
         """Convert MongoDB extended JSON format ($oid, $date) to Python objects"""
@@ -627,6 +771,7 @@ class DB:
         try:
             collection = DB.db[collection_name]
             result = await collection.insert_one(document)
+            invalidate_counts(collection_name)
             return result.inserted_id
         except Exception as e:
             logging.error(f"Error inserting document into {collection_name}: {e}")
@@ -680,6 +825,8 @@ class DB:
             collection = DB.db[collection_name]
             # Using delete_many as per the provided helper function
             result = await collection.delete_many(delete_query)
+            if result.deleted_count:
+                invalidate_counts(collection_name)
             return result.deleted_count
         except Exception as e:
             print(f"Error deleting documents from {collection_name}: {e}")
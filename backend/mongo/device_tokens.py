@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from firebase_admin import messaging
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from mongo.notification_metrics import classify_fcm_error, is_stale_token_error
+
+DEVICE_TOKENS_COLLECTION = "deviceTokens"
+
+# FCM accepts at most 500 tokens per multicast request
+FCM_MULTICAST_LIMIT = 500
+
+# Tokens not seen (app not opened) for this many days get dry-run validated by the GC job
+DEVICE_TOKEN_STALE_DAYS = int(os.getenv("DEVICE_TOKEN_STALE_DAYS", "60"))
+DEVICE_TOKEN_GC_INTERVAL_HOURS = float(os.getenv("DEVICE_TOKEN_GC_INTERVAL_HOURS", "24"))
+
+# Notification preference key that gates each action type
+PREFERENCE_BY_ACTION_TYPE = {
+    "bible_plan": "Bible Plan Reminders",
+    "event": "Event Notification",
+    "text": "App Announcements",
+    "link": "App Announcements",
+    "route": "App Announcements",
+}
+
+
+async def upsert_device_token(db: AsyncIOMotorDatabase, doc: dict) -> None:
+    """
+    Register or refresh a device token. The mobile app calls this on every open,
+    so ``last_seen`` doubles as the "app opened" heartbeat used by the GC job.
+    """
+    now = datetime.utcnow()
+    fields = {k: v for k, v in doc.items() if k not in ("createdAt", "last_seen")}
+    fields["last_seen"] = now
+    await db[DEVICE_TOKENS_COLLECTION].update_one(
+        {"token": doc["token"]},
+        {"$set": fields, "$setOnInsert": {"createdAt": now}},
+        upsert=True,
+    )
+
+
+async def get_user_device_tokens(db: AsyncIOMotorDatabase, user_id: str, actionType: Optional[str] = None, limit: int = 100) -> List[str]:
+    """Tokens for one user, optionally filtered to devices that allow ``actionType``."""
+    query = {"userId": user_id}
+    preference = PREFERENCE_BY_ACTION_TYPE.get(actionType) if actionType else None
+    if preference:
+        query[f"notification_preferences.{preference}"] = {"$ne": False}
+    cursor = db[DEVICE_TOKENS_COLLECTION].find(query, {"_id": 0, "token": 1})
+    docs = await cursor.to_list(length=limit)
+    return [doc["token"] for doc in docs if doc.get("token")]
+
+
+def audience_query(target_audience: str) -> dict:
+    """Device token filter for a scheduled notification's target audience."""
+    if target_audience == "logged_in":
+        return {"userId": {"$nin": [None, ""]}}
+    if target_audience == "anonymous":
+        return {"userId": {"$in": [None, ""]}}
+    return {}
+
+
+async def remove_device_tokens(db: AsyncIOMotorDatabase, tokens: Iterable[str]) -> int:
+    tokens = [t for t in tokens if t]
+    if not tokens:
+        return 0
+    result = await db[DEVICE_TOKENS_COLLECTION].delete_many({"token": {"$in": tokens}})
+    return result.deleted_count
+
+
+async def prepare_device_tokens_collection(db: AsyncIOMotorDatabase) -> None:
+    """
+    One-off cleanup run before the unique ``token`` index is created:
+    backfills ``last_seen`` from the legacy ``lastSeenAt`` field and keeps only
+    the most recently seen document for each duplicated token. Once the unique
+    index exists there is nothing left to clean up, so it returns immediately.
+    """
+    coll = db[DEVICE_TOKENS_COLLECTION]
+    for info in (await coll.index_information()).values():
+        if info.get("unique") and info.get("key") == [("token", 1)]:
+            return
+
+    await coll.update_many(
+        {"last_seen": {"$exists": False}},
+        [
+            {"$set": {"last_seen": {"$ifNull": ["$lastSeenAt", {"$ifNull": ["$createdAt", "$$NOW"]}]}}},
+            {"$unset": "lastSeenAt"},
+        ],
+    )
+
+    duplicates = coll.aggregate([
+        {"$sort": {"last_seen": -1}},
+        {"$group": {"_id": "$token", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ], allowDiskUse=True)
+    removed = 0
+    async for group in duplicates:
+        result = await coll.delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+    if removed:
+        logging.info(f"Removed {removed} duplicate device token documents")
+
+
+async def _dry_run_validate(tokens: List[str]) -> List[str]:
+    """Dry-run a multicast to ``tokens``; returns the ones FCM reports as permanently invalid."""
+    message = messaging.MulticastMessage(tokens=tokens, data={"type": "token_validation"})
+    # The Admin SDK is blocking; keep it off the event loop
+    batch = await asyncio.to_thread(messaging.send_each_for_multicast, message, True)
+    stale = []
+    for token, response in zip(tokens, batch.responses):
+        if not response.success and is_stale_token_error(classify_fcm_error(response.exception), response.exception):
+            stale.append(token)
+    return stale
+
+
+async def collect_stale_device_tokens(db: AsyncIOMotorDatabase, older_than_days: int = DEVICE_TOKEN_STALE_DAYS, batch_size: int = FCM_MULTICAST_LIMIT) -> dict:
+    """
+    Dry-run validate every token not seen for ``older_than_days`` and prune the
+    ones FCM rejects. Tokens that validate are stamped so they are not re-checked
+    until they go stale again.
+    """
+    batch_size = max(1, min(batch_size, FCM_MULTICAST_LIMIT))
+    now = datetime.utcnow()
+    cutoff = now - timedelta(days=older_than_days)
+    coll = db[DEVICE_TOKENS_COLLECTION]
+    query = {
+        "last_seen": {"$lt": cutoff},
+        "$or": [{"last_validated_at": {"$exists": False}}, {"last_validated_at": {"$lt": cutoff}}],
+    }
+    cursor = coll.find(query, {"_id": 0, "token": 1}).batch_size(batch_size)
+
+    checked = pruned = 0
+    batch: List[str] = []
+
+    async def _flush(tokens: List[str]):
+        nonlocal checked, pruned
+        stale = await _dry_run_validate(tokens)
+        pruned += await remove_device_tokens(db, stale)
+        stale_set = set(stale)
+        alive = [t for t in tokens if t not in stale_set]
+        if alive:
+            await coll.update_many({"token": {"$in": alive}}, {"$set": {"last_validated_at": now}})
+        checked += len(tokens)
+
+    async for doc in cursor:
+        if doc.get("token"):
+            batch.append(doc["token"])
+        if len(batch) >= batch_size:
+            await _flush(batch)
+            batch = []
+    if batch:
+        await _flush(batch)
+
+    return {"checked": checked, "pruned": pruned, "older_than_days": older_than_days}
+
+
+async def device_token_gc_loop(db: AsyncIOMotorDatabase):
+    """Background loop that periodically prunes stale device tokens."""
+    logging.info("Device token GC loop started")
+    while True:
+        try:
+            result = await collect_stale_device_tokens(db)
+            logging.info(f"Device token GC finished: {result}")
+            await asyncio.sleep(DEVICE_TOKEN_GC_INTERVAL_HOURS * 3600)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logging.error("Device token GC loop error:", exc_info=True)
+            await asyncio.sleep(3600)
@@ -0,0 +1,158 @@
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from firebase_admin import exceptions as firebase_exceptions
+from firebase_admin import messaging
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+NOTIFICATIONS_COLLECTION = "notifications"
+
+# Ordered most-specific first; the first isinstance match wins.
+_FCM_ERROR_CLASSES = [
+    (messaging.UnregisteredError, "unregistered"),
+    (messaging.SenderIdMismatchError, "sender_id_mismatch"),
+    (messaging.QuotaExceededError, "quota_exceeded"),
+    (messaging.ThirdPartyAuthError, "third_party_auth"),
+    (firebase_exceptions.InvalidArgumentError, "invalid_argument"),
+    (firebase_exceptions.NotFoundError, "not_found"),
+    (firebase_exceptions.UnavailableError, "unavailable"),
+    (firebase_exceptions.InternalError, "internal"),
+]
+
+# Error classes that mean the token will never work again and should be pruned.
+STALE_TOKEN_ERROR_CLASSES = {"unregistered", "not_found"}
+
+
+def classify_fcm_error(error: Exception) -> str:
+    """Map an FCM send exception onto a short, stable error class label."""
+    for exc_type, label in _FCM_ERROR_CLASSES:
+        if isinstance(error, exc_type):
+            return label
+    # Older SDK versions surface everything as a generic error; fall back to the message
+    message = str(error).lower()
+    if "not found" in message:
+        return "not_found"
+    if "invalid" in message:
+        return "invalid_argument"
+    if "expired" in message:
+        return "expired"
+    return "other"
+
+
+def is_stale_token_error(error_class: str, error: Optional[Exception] = None) -> bool:
+    """
+    True when the failure means the device token itself is dead. FCM also
+    returns invalid_argument for a malformed message, so that class only counts
+    when the error detail names the registration token.
+    """
+    if error_class in STALE_TOKEN_ERROR_CLASSES:
+        return True
+    if error_class == "invalid_argument" and error is not None:
+        return "registration token" in str(error).lower()
+    return False
+
+
+class DeliveryStats:
+    """
+    Compact per-notification delivery counters.
+
+    One instance is filled in while a notification is being sent and written once
+    onto the history document, replacing the per-token response lists.
+    """
+
+    def __init__(self):
+        self.attempted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.errors: Dict[str, int] = {}
+        self.tokens_pruned = 0
+        self.batches = 0
+        self._started = time.monotonic()
+        self.duration_ms: Optional[float] = None
+
+    def start_batch(self, size: int):
+        self.batches += 1
+        self.attempted += size
+
+    def record_success(self, count: int = 1):
+        self.succeeded += count
+
+    def record_failure(self, error: Exception) -> str:
+        """Count a failed send and return its error class."""
+        error_class = classify_fcm_error(error)
+        self.failed += 1
+        self.errors[error_class] = self.errors.get(error_class, 0) + 1
+        return error_class
+
+    def record_pruned(self, count: int):
+        self.tokens_pruned += count
+
+    def finish(self) -> "DeliveryStats":
+        self.duration_ms = round((time.monotonic() - self._started) * 1000, 2)
+        return self
+
+    def to_doc(self) -> dict:
+        if self.duration_ms is None:
+            self.finish()
+        return {
+            "attempted": self.attempted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "errors": dict(self.errors),
+            "tokens_pruned": self.tokens_pruned,
+            "batches": self.batches,
+            "duration_ms": self.duration_ms,
+        }
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_delivery_docs(docs: List[dict]) -> dict:
+    """Fold a list of ``delivery`` sub-documents into throughput and latency figures."""
+    totals = {"attempted": 0, "succeeded": 0, "failed": 0, "tokens_pruned": 0, "batches": 0}
+    errors: Dict[str, int] = {}
+    durations: List[float] = []
+
+    for delivery in docs:
+        for key in totals:
+            totals[key] += int(delivery.get(key) or 0)
+        for error_class, count in (delivery.get("errors") or {}).items():
+            errors[error_class] = errors.get(error_class, 0) + int(count or 0)
+        if delivery.get("duration_ms") is not None:
+            durations.append(float(delivery["duration_ms"]))
+
+    durations.sort()
+    total_seconds = sum(durations) / 1000.0
+    return {
+        "notifications": len(docs),
+        **totals,
+        "errors": errors,
+        "success_rate": round(totals["succeeded"] / totals["attempted"], 4) if totals["attempted"] else None,
+        "throughput_per_second": round(totals["attempted"] / total_seconds, 2) if total_seconds > 0 else None,
+        "latency_ms": {
+            "p50": percentile(durations, 50),
+            "p90": percentile(durations, 90),
+            "p95": percentile(durations, 95),
+            "p99": percentile(durations, 99),
+            "max": durations[-1] if durations else None,
+        },
+    }
+
+
+async def get_delivery_metrics(db: AsyncIOMotorDatabase, days: int = 7, limit: int = 5000) -> dict:
+    """Aggregate delivery stats for notifications sent in the last ``days`` days."""
+    since = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    cursor = db[NOTIFICATIONS_COLLECTION].find(
+        {"sent": True, "sent_at": {"$gte": since}, "delivery": {"$exists": True}},
+        {"_id": 0, "delivery": 1},
+    ).sort("sent_at", -1).limit(limit)
+    docs = [doc["delivery"] for doc in await cursor.to_list(length=limit)]
+    return {"since": since, "days": days, **summarize_delivery_docs(docs)}
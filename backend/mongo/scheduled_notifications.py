@@ -5,6 +5,8 @@ from typing import Optional, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from firebase_admin import messaging
+from mongo.device_tokens import DEVICE_TOKENS_COLLECTION, audience_query, remove_device_tokens
+from mongo.notification_metrics import DeliveryStats, is_stale_token_error
 
 NOTIFICATIONS_COLLECTION = "notifications"
 
@@ -37,14 +39,39 @@ async def get_due_notifications(db: AsyncIOMotorDatabase) -> List[dict]:
     })
     return await cursor.to_list(length=100)
 
-async def mark_as_sent(db: AsyncIOMotorDatabase, notification_id: str) -> bool:
-    """Mark a notification as sent."""
+async def mark_as_sent(db: AsyncIOMotorDatabase, notification_id: str, delivery: Optional[dict] = None) -> bool:
+    """Mark a notification as sent, recording its delivery stats if provided."""
+    update = {"sent": True, "sent_at": datetime.utcnow().isoformat()}
+    if delivery is not None:
+        update["delivery"] = delivery
     result = await db[NOTIFICATIONS_COLLECTION].update_one(
         {"_id": ObjectId(notification_id)},
-        {"$set": {"sent": True, "sent_at": datetime.utcnow().isoformat()}}
+        {"$set": update}
     )
     return result.modified_count > 0
 
+async def deliver_to_token(db: AsyncIOMotorDatabase, token: str, title, body, data: dict, stats: DeliveryStats):
+    """Send one message and fold the outcome into ``stats``; prunes stale tokens."""
+    message = messaging.Message(
+        notification=messaging.Notification(
+            title=title,
+            body=body,
+        ),
+        token=token,
+        data=data
+    )
+    try:
+        messaging.send(message)
+        stats.record_success()
+    except Exception as e:
+        error_class = stats.record_failure(e)
+        logging.error(f"FCM error ({error_class}) for token {token}: {e}")
+
+        # If token is invalid, remove it from database
+        if is_stale_token_error(error_class, e):
+            logging.info(f"Removing invalid FCM token: {token}")
+            stats.record_pruned(await remove_device_tokens(db, [token]))
+
 async def scheduled_notification_loop(db: AsyncIOMotorDatabase):
     """Background loop to process and send scheduled notifications."""
     logging.info("Scheduled notification loop started")
@@ -63,77 +90,32 @@ async def scheduled_notification_loop(db: AsyncIOMotorDatabase):
                 data = notif.get("data", {})
                 send_to_all = notif.get("send_to_all", True)
                 token = notif.get("token")
-                responses = []
+                # Enhanced data payload for deep linking - ensure all values are strings
+                enhanced_data = {k: str(v) if v is not None else None for k, v in data.items()}
+                stats = DeliveryStats()
                 if send_to_all:
-                    token_query = {}
-                    target_audience = notif.get("target_audience", "all")
-                    if target_audience == "logged_in":
-                        token_query["user_id"] = {"$exists": True}
-                    elif target_audience == "anonymous":
-                        token_query["user_id"] = {"$exists": False}
+                    token_query = audience_query(notif.get("target_audience", "all"))
                     projection = {'_id': 0, 'token': 1}
                     batch_size = 1000
-                    tokens_cursor = db['deviceTokens'].find(token_query, projection)
-                    sent_count = 0
+                    tokens_cursor = db[DEVICE_TOKENS_COLLECTION].find(token_query, projection)
                     while True:
                         batch = [doc['token'] for doc in await tokens_cursor.to_list(length=batch_size) if doc.get('token')]
                         if not batch:
                             break
-                        logging.info(f"Sending to tokens batch: {batch}")
+                        stats.start_batch(len(batch))
+                        logging.info(f"Sending batch {stats.batches} of {len(batch)} tokens")
                         for t in batch:
-                            # Enhanced data payload for deep linking - ensure all values are strings
-                            enhanced_data = {k: str(v) if v is not None else None for k, v in data.items()}
-                            
-                            message = messaging.Message(
-                                notification=messaging.Notification(
-                                    title=title,
-                                    body=body,
-                                ),
-                                token=t,
-                                data=enhanced_data
-                            )
-                            try:
-                                response = messaging.send(message)
-                                logging.info(f"FCM response for token {t}: {response}")
-                                responses.append({"token": t, "response": response})
-                            except Exception as e:
-                                logging.error(f"FCM error for token {t}: {e}")
-                                responses.append({"token": t, "error": str(e)})
-                                
-                                # If token is invalid, remove it from database
-                                if "not found" in str(e).lower() or "invalid" in str(e).lower() or "expired" in str(e).lower():
-                                    logging.info(f"Removing invalid FCM token: {t}")
-                                    await db['deviceTokens'].delete_many({"token": t})
-                        sent_count += len(batch)
+                            await deliver_to_token(db, t, title, body, enhanced_data, stats)
                         # If less than batch_size, we're done
                         if len(batch) < batch_size:
                             break
                 elif token:
-                    # Enhanced data payload for deep linking - ensure all values are strings
-                    enhanced_data = {k: str(v) if v is not None else None for k, v in data.items()}
-                    
-                    message = messaging.Message(
-                        notification=messaging.Notification(
-                            title=title,
-                            body=body,
-                        ),
-                        token=token,
-                        data=enhanced_data
-                    )
-                    try:
-                        response = messaging.send(message)
-                        logging.info(f"FCM response for token {token}: {response}")
-                        responses.append({"token": token, "response": response})
-                    except Exception as e:
-                        logging.error(f"FCM error for token {token}: {e}")
-                        responses.append({"token": token, "error": str(e)})
-                        
-                        # If token is invalid, remove it from database
-                        if "not found" in str(e).lower() or "invalid" in str(e).lower() or "expired" in str(e).lower():
-                            logging.info(f"Removing invalid FCM token: {token}")
-                            await db['deviceTokens'].delete_many({"token": token})
+                    stats.start_batch(1)
+                    await deliver_to_token(db, token, title, body, enhanced_data, stats)
                 # Mark as sent
-                await mark_as_sent(db, str(notif["_id"]))
+                delivery = stats.finish().to_doc()
+                logging.info(f"Notification {notif.get('_id')} delivered: {delivery}")
+                await mark_as_sent(db, str(notif["_id"]), delivery)
             await asyncio.sleep(10)  # Check every 10 seconds
         except Exception:
             logging.error("Scheduled notification loop error:", exc_info=True)
@@ -146,12 +128,13 @@ async def get_notification_history(db: AsyncIOMotorDatabase, limit=100) -> list:
     return await cursor.to_list(length=limit)
 
 # Log a sent notification to history (for live/instant notifications)
-async def log_notification(db: AsyncIOMotorDatabase, title, body, platform, tokens, actionType=None, link=None, route=None, eventId=None):
+# Only the recipient count and compact delivery stats are stored, never the raw token list.
+async def log_notification(db: AsyncIOMotorDatabase, title, body, platform, recipient_count, actionType=None, link=None, route=None, eventId=None, delivery: Optional[dict] = None):
     doc = {
         "title": title,
         "body": body,
         "platform": platform,
-        "recipients": tokens,
+        "recipient_count": recipient_count,
         "actionType": actionType,
         "link": link,
         "route": route,
@@ -159,4 +142,6 @@ async def log_notification(db: AsyncIOMotorDatabase, title, body, platform, toke
         "sent": True,
         "sent_at": datetime.utcnow().isoformat(),
     }
-    await db[NOTIFICATIONS_COLLECTION].insert_one(doc)
\ No newline at end of file
+    if delivery is not None:
+        doc["delivery"] = delivery
+    await db[NOTIFICATIONS_COLLECTION].insert_one(doc)
@@ -10,8 +10,15 @@ from models.bible_note import (
     update_bible_note,
     delete_bible_note,
     search_bible_notes,
+    sync_bible_notes,
+    apply_bible_note_changes,
+    BibleNoteSyncOut,
+    BibleNoteChangeBatch,
+    BibleNoteChangeResult,
+    MAX_SYNC_PAGE,
     BIBLE_BOOKS
 )
+from datetime import datetime
 from typing import Optional, List
 
 
@@ -79,6 +86,32 @@ async def search_notes(
         highlight_color=highlight_color
     )
 
+# Private Route
+@bible_note_router.get("/sync", summary="Get note changes since a watermark", response_model=BibleNoteSyncOut)
+async def get_note_changes(
+    request: Request,
+    since: Optional[datetime] = Query(None, description="watermark from the previous sync; omit for a full sync"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page of this sync"),
+    limit: int = Query(MAX_SYNC_PAGE, ge=1, le=MAX_SYNC_PAGE),
+) -> BibleNoteSyncOut:
+    """
+    Delta sync for offline clients: notes created/updated and ids deleted since
+    `since`. Keep paging with `next_cursor` (same `since`) until it is null, then
+    store the last page's `watermark`.
+    """
+    return await sync_bible_notes(request.state.uid, since=since, cursor=cursor, limit=limit)
+
+
+# Private Route
+@bible_note_router.post("/sync", summary="Upload a batch of offline note edits")
+async def upload_note_changes(
+    request: Request,
+    batch: BibleNoteChangeBatch,
+) -> List[BibleNoteChangeResult]:
+    """Apply offline creates/updates/deletes in order; one result per change."""
+    return await apply_bible_note_changes(request.state.uid, batch.changes)
+
+
 # Private Route
 @bible_note_router.get("/books", summary="Get list of Bible books")
 async def get_bible_books() -> List[str]:
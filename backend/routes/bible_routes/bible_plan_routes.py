@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Request, HTTPException, status
+from fastapi.responses import Response
 from typing import List
 from bson import ObjectId
 
-from mongo.database import DB
-from models.bible_plan import _convert_plan_doc_to_out
+from helpers.http_cache import etag_response
 
 from models.bible_plan import (
     ReadingPlanCreate,
@@ -16,10 +16,11 @@ from models.bible_plan import (
     delete_reading_plan,
     get_all_reading_plans,
     duplicate_reading_plan,
-    get_all_bible_plan_templates,
-    get_bible_plan_template_by_name,
-    get_bible_plan_template_by_id,
-    get_published_reading_plans,
+    get_all_bible_plan_templates_entry,
+    get_bible_plan_template_by_name_entry,
+    get_bible_plan_template_by_id_entry,
+    get_published_reading_plans_entry,
+    get_reading_plan_entry,
     create_template_from_plan,
     update_bible_plan_template,
     delete_bible_plan_template,
@@ -31,14 +32,30 @@ mod_bible_plan_router = APIRouter(prefix="/bible-plans", tags=["Bible Plans"])
 private_bible_plan_router = APIRouter(prefix="/bible-plans", tags=["Bible Plans Private"])
 
 
+async def _accessible_plan_response(plan_id: str, request: Request) -> Response:
+    uid = request.state.uid
+    try:
+        ObjectId(plan_id)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Bible plan ID")
+
+    entry = await get_reading_plan_entry(plan_id)
+    plan = entry["value"] if entry else None
+    # Allow if owner or if plan is published (visible=True); fake 404 to avoid leaking existence to non-owners
+    if not plan or not (plan.user_id == uid or plan.visible):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
+    return etag_response(request, entry["body"], entry["etag"])
+
+
 # SPECIFIC ROUTES (must come before generic /{plan_id} routes)
 # ============================================================
 
 # Get all published Bible plans (visible=True)
 @public_bible_plan_router.get("/published", response_model=List[ReadingPlanOut])
-async def list_published_plans() -> List[ReadingPlanOut]:
-    """Get all published Bible plans that are visible to users"""
-    return await get_published_reading_plans()
+async def list_published_plans(request: Request) -> List[ReadingPlanOut]:
+    """Get all published Bible plans that are visible to users (cached, with ETag revalidation)"""
+    entry = await get_published_reading_plans_entry()
+    return etag_response(request, entry["body"], entry["etag"])
 
 
 # Create a new Bible plan
@@ -58,31 +75,31 @@ async def list_all_plans(request: Request) -> List[ReadingPlanOut]:
 
 # Get all Bible plan templates
 @mod_bible_plan_router.get("/templates", response_model=List[ReadingPlanTemplateOut])
-async def list_bible_plan_templates():
+async def list_bible_plan_templates(request: Request):
     """Get all available Bible plan templates"""
     try:
-        templates = await get_all_bible_plan_templates()
-        return templates
+        entry = await get_all_bible_plan_templates_entry()
+        return etag_response(request, entry["body"], entry["etag"])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch templates: {str(e)}")
 
 # Get Bible plan template by ID
 @mod_bible_plan_router.get("/templates/id/{template_id}", response_model=ReadingPlanTemplateOut)
-async def get_bible_plan_template_by_id_endpoint(template_id: str):
-    template = await get_bible_plan_template_by_id(template_id)
-    if not template:
+async def get_bible_plan_template_by_id_endpoint(template_id: str, request: Request):
+    entry = await get_bible_plan_template_by_id_entry(template_id)
+    if not entry:
         raise HTTPException(status_code=404, detail=f"Template with id '{template_id}' not found")
-    return template
+    return etag_response(request, entry["body"], entry["etag"])
 
 # Get Bible plan template by name
 @mod_bible_plan_router.get("/templates/{template_name}", response_model=ReadingPlanTemplateOut)
-async def get_bible_plan_template(template_name: str):
+async def get_bible_plan_template(template_name: str, request: Request):
     """Get a specific Bible plan template by name"""
     try:
-        template = await get_bible_plan_template_by_name(template_name)
-        if not template:
+        entry = await get_bible_plan_template_by_name_entry(template_name)
+        if not entry:
             raise HTTPException(status_code=404, detail=f"Template with name '{template_name}' not found")
-        return template
+        return etag_response(request, entry["body"], entry["etag"])
     except HTTPException:
         raise
     except Exception as e:
@@ -135,22 +152,7 @@ async def create_template_from_plan_endpoint(plan_id: str, request: Request) ->
 @private_bible_plan_router.get("/by-id/{plan_id}", response_model=ReadingPlanOut)
 async def get_plan_private(plan_id: str, request: Request) -> ReadingPlanOut:
     """Allow the authenticated owner of a plan to fetch it (no mod role required)."""
-    uid = request.state.uid
-    try:
-        pid = ObjectId(plan_id)
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Bible plan ID")
-
-    doc = await DB.db.bible_plans.find_one({"_id": pid})
-    if not doc:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
-
-    # Allow if owner or if plan is published (visible=True)
-    if doc.get("user_id") == uid or doc.get("visible", False):
-        return _convert_plan_doc_to_out(doc)
-
-    # Fake 404 to avoid leaking existence of plan to non-owners
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
+    return await _accessible_plan_response(plan_id, request)
 
 @mod_bible_plan_router.put("/by-id/{plan_id}", response_model=ReadingPlanOut)
 async def update_plan(plan_id: str, update: ReadingPlanUpdate, request: Request) -> ReadingPlanOut:
@@ -186,22 +188,7 @@ async def remove_plan(plan_id: str, request: Request) -> dict:
 @private_bible_plan_router.get("/{plan_id:regex(^[0-9a-f]{24}$)}", response_model=ReadingPlanOut)
 async def get_plan(plan_id: str, request: Request) -> ReadingPlanOut:
     """Fetch a Bible plan by its ID."""
-    uid = request.state.uid
-    try:
-        pid = ObjectId(plan_id)
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Bible plan ID")
-
-    doc = await DB.db.bible_plans.find_one({"_id": pid})
-    if not doc:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
-
-    # Allow if owner or if plan is published (visible=True)
-    if doc.get("user_id") == uid or doc.get("visible", False):
-        return _convert_plan_doc_to_out(doc)
-
-    # Fake 404 to avoid leaking existence of plan to non-owners
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
+    return await _accessible_plan_response(plan_id, request)
 
 # Update plan by ID (generic endpoint)
 @mod_bible_plan_router.put("/{plan_id:regex(^[0-9a-f]{24}$)}", response_model=ReadingPlanOut)
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Request, HTTPException, status, Body
-from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Request, HTTPException, status, Body, Query
+from typing import Any, Dict, List, Literal, Optional, Tuple
 from datetime import datetime
 from bson import ObjectId
 from bson.errors import InvalidId
@@ -9,15 +9,25 @@ from mongo.database import DB
 from models.bible_plan_tracker import (
     UserBiblePlanSubscription,
     UserBiblePlanProgress,
+    apply_user_bible_plan_progress,
+    day_bit,
     get_user_bible_plans,
     insert_user_bible_plan,
     delete_user_bible_plan,
-    update_user_bible_plan_progress,
+    is_day_completed,
+    last_completed_day,
+    progress_state,
     update_user_bible_plan_notifications,
     find_user_plan,
     reset_user_bible_plan,
 )
-from models.bible_plan import _convert_plan_doc_to_out, ReadingPlanOut
+from models.bible_plan import (
+    _convert_plan_doc_to_out,
+    ReadingPlanOut,
+    get_accessible_plan_summaries_by_ids,
+    get_accessible_plans_by_ids,
+    get_plan_readings_for_days,
+)
 from pydantic import BaseModel
 
 # Auth-protected router for user Bible plan operations
@@ -35,20 +45,11 @@ def _is_rest_day(readings_by_day: Dict[str, Any], day: int) -> bool:
 
 
 def _next_sequential_day(
-    progress: List[dict],
+    progress_bits: Dict[str, int],
     readings_by_day: Dict[str, Any],
     plan_duration: int,
 ) -> int:
-    progress_by_day = {}
-    for entry in progress:
-        day_value = entry.get("day")
-        if isinstance(day_value, int):
-            progress_by_day[day_value] = entry
-
-    max_known_day = max(
-        plan_duration,
-        max(progress_by_day.keys(), default=0),
-    )
+    max_known_day = max(plan_duration, last_completed_day(progress_bits))
 
     day_pointer = 1
     while day_pointer <= max_known_day:
@@ -56,8 +57,7 @@ def _next_sequential_day(
             day_pointer += 1
             continue
 
-        entry = progress_by_day.get(day_pointer)
-        if entry and entry.get("is_completed"):
+        if is_day_completed(progress_bits, day_pointer):
             day_pointer += 1
             continue
         break
@@ -81,45 +81,103 @@ async def get_my_bible_plans(request: Request) -> List[UserBiblePlanSubscription
     return subscriptions
 
 
+# Days after the current one returned by the "upcoming" view
+UPCOMING_DAYS_DEFAULT = 3
+UPCOMING_DAYS_MAX = 14
+
+
+def _upcoming_days(
+    progress_bits: Dict[str, int],
+    reading_days: List[str],
+    plan_duration: int,
+    days_ahead: int,
+) -> Tuple[int, List[int]]:
+    """
+    The user's current day and the days whose readings the "upcoming" view ships:
+    the current day plus up to ``days_ahead`` more, clamped to the plan length.
+    ``reading_days`` lists the non-rest days, standing in for the full readings.
+    """
+    readings_stub = {day: [True] for day in reading_days}
+    current_day = _next_sequential_day(progress_bits, readings_stub, plan_duration)
+    last_day = min(current_day + days_ahead, plan_duration)
+    return current_day, list(range(current_day, last_day + 1))
+
+
 class _UserPlanWithDetails(BaseModel):
     plan: ReadingPlanOut
     subscription: UserBiblePlanSubscription
+    # Next day to read; duration + 1 once the plan is finished
+    current_day: Optional[int] = None
 
 
 @auth_bible_plan_router.get("/with-details", response_model=List[_UserPlanWithDetails])
-async def get_my_bible_plans_with_details(request: Request) -> List[_UserPlanWithDetails]:
+async def get_my_bible_plans_with_details(
+    request: Request,
+    view: Literal["full", "upcoming"] = Query(
+        "full",
+        description="full: every reading of each plan; upcoming: only the current day and the next few",
+    ),
+    days_ahead: int = Query(UPCOMING_DAYS_DEFAULT, ge=0, le=UPCOMING_DAYS_MAX),
+) -> List[_UserPlanWithDetails]:
     """
     List the current user's subscribed Bible plans that are accessible to them, with each subscription paired with its plan details.
     
-    Subscriptions with invalid plan IDs, missing plan documents, or other per-plan errors are skipped. A plan is included only if the requesting user is the plan owner or the plan is marked visible.
+    Plans are loaded with one query for all subscriptions. Subscriptions with invalid plan IDs, missing plan documents, or other per-plan errors are skipped. A plan is included only if the requesting user is the plan owner or the plan is marked visible.
+
+    With view="upcoming", ``plan.readings`` only holds the current day and the following ``days_ahead`` days (rest days have no entry), so long plans stay cheap to load on the home screen.
     
     Returns:
-        List[_UserPlanWithDetails]: A list of objects combining the plan's output representation and the user's subscription data.
+        List[_UserPlanWithDetails]: A list of objects combining the plan's output representation, the user's subscription data and the current day.
     """
     uid = request.state.uid
     subscriptions = await get_user_bible_plans(uid)
-
-    results: List[_UserPlanWithDetails] = []
-    for sub in subscriptions:
-        try:
-            try:
-                plan_object_id = ObjectId(sub.plan_id)
-            except InvalidId:
-                # Skip invalid ids silently
+    plan_ids = [sub.plan_id for sub in subscriptions]
+
+    if view == "upcoming":
+        docs = await get_accessible_plan_summaries_by_ids(plan_ids, uid)
+        current_days: Dict[str, int] = {}
+        days_by_plan: Dict[str, List[int]] = {}
+        for sub in subscriptions:
+            doc = docs.get(sub.plan_id)
+            if not doc:
                 continue
-
-            doc = await DB.db.bible_plans.find_one({"_id": plan_object_id})
+            reading_days = doc.get("reading_days") or []
+            plan_duration = doc.get("duration", 0) or len(reading_days)
+            current_days[sub.plan_id], days_by_plan[sub.plan_id] = _upcoming_days(
+                sub.progress_bits, reading_days, plan_duration, days_ahead
+            )
+        readings = await get_plan_readings_for_days(days_by_plan)
+        for plan_id, doc in docs.items():
+            doc["readings"] = readings.get(plan_id, {})
+    else:
+        docs = await get_accessible_plans_by_ids(plan_ids, uid)
+        current_days = {}
+        for sub in subscriptions:
+            doc = docs.get(sub.plan_id)
             if not doc:
-                # Skip missing plans silently
                 continue
+            readings_by_day = doc.get("readings") or {}
+            plan_duration = doc.get("duration", 0) or len(readings_by_day)
+            current_days[sub.plan_id] = _next_sequential_day(
+                sub.progress_bits, readings_by_day, plan_duration
+            )
 
-            # Allow if owner or visible (published)
-            if doc.get("user_id") == uid or doc.get("visible", False):
-                plan_out = _convert_plan_doc_to_out(doc)
-                results.append(_UserPlanWithDetails(plan=plan_out, subscription=sub))
+    results: List[_UserPlanWithDetails] = []
+    for sub in subscriptions:
+        doc = docs.get(sub.plan_id)
+        if not doc:
+            # Skip invalid ids, missing and inaccessible plans silently
+            continue
+        try:
+            plan_out = _convert_plan_doc_to_out(doc)
         except Exception:
             # Skip any problematic plan records without failing the whole list
             continue
+        results.append(_UserPlanWithDetails(
+            plan=plan_out,
+            subscription=sub,
+            current_day=current_days.get(sub.plan_id),
+        ))
 
     return results
 
@@ -215,7 +273,7 @@ async def update_plan_progress_batch(
     """
     Apply multiple daily progress updates to the user's subscribed Bible plan.
     
-    Validates each update entry, enforces the sequential update constraint, persists the combined progress list, and returns a success message on completion.
+    Validates each update entry, enforces the sequential update constraint, and writes only the touched days (atomic bitset and per-day passage updates), so concurrent devices do not overwrite each other.
     
     Parameters:
         request (Request): FastAPI request with authenticated user in request.state.uid.
@@ -248,7 +306,7 @@ async def update_plan_progress_batch(
         if not plan_doc:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bible plan not found")
 
-        progress = existing.get("progress", [])
+        progress_bits, _ = progress_state(existing)
         readings_by_day = plan_doc.get("readings", {})
         plan_duration = plan_doc.get("duration", 0) or len(readings_by_day)
 
@@ -266,14 +324,14 @@ async def update_plan_progress_batch(
 
         days_sorted = sorted(combined_updates.keys())
 
-        progress_by_day = {entry.get("day"): i for i, entry in enumerate(progress)}
+        applied_updates: List[UserBiblePlanProgress] = []
         applied_days: List[int] = []
         skipped_days: List[int] = []
 
         for day in days_sorted:
             update = combined_updates[day]
 
-            allowed_day = _next_sequential_day(progress, readings_by_day, plan_duration)
+            allowed_day = _next_sequential_day(progress_bits, readings_by_day, plan_duration)
             if day > allowed_day:
                 skipped_days.append(day)
                 continue
@@ -298,18 +356,16 @@ async def update_plan_progress_batch(
                 is_completed=is_completed
             )
 
-            if day in progress_by_day:
-                idx = progress_by_day[day]
-                progress[idx] = new_progress.model_dump()
-            else:
-                progress.append(new_progress.model_dump())
-                progress_by_day[day] = len(progress) - 1
+            applied_updates.append(new_progress)
+
+            # Mirror the change locally so later days in this batch see it
+            word, mask = day_bit(day)
+            current = progress_bits.get(word, 0)
+            progress_bits[word] = current | mask if is_completed else current & ~mask
 
             applied_days.append(day)
 
-        progress.sort(key=lambda entry: entry.get("day", 0))
-        
-        updated = await update_user_bible_plan_progress(uid, plan_id, progress)
+        updated = await apply_user_bible_plan_progress(uid, plan_id, applied_updates)
 
         if not updated:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to update progress")
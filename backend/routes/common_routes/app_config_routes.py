@@ -3,15 +3,16 @@ App Configuration Routes
 Provides endpoints for getting and managing app configuration like tab structure
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from typing import List, Dict, Any
 from helpers.AppConfigHelper import AppConfigHelper
+from helpers.site_cache import invalidate_bootstrap_on_write
 
 # Public routes - accessible by Flutter app and other clients
 app_config_public_router = APIRouter(prefix="/app", tags=["App Configuration - Public"])
 
 # Private routes - admin/management only
-app_config_private_router = APIRouter(prefix="/app", tags=["App Configuration - Private"])
+app_config_private_router = APIRouter(prefix="/app", tags=["App Configuration - Private"], dependencies=[Depends(invalidate_bootstrap_on_write)])
 
 #
 # --- Public Routes ---
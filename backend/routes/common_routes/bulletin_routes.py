@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import date, datetime, time
 from typing import List, Optional, Union
 
-from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from fastapi.security import HTTPBearer
 from firebase_admin import auth as firebase_auth
 from bson import ObjectId
@@ -23,11 +23,14 @@ from controllers.service_bulletin_functions import (
 	process_publish_toggle as process_service_publish_toggle,
 	process_reorder_services,
 )
+from helpers.http_cache import etag_response
+from helpers.keyset_pagination import NEXT_CURSOR_HEADER
 from models.bulletin import (
 	BulletinCreate,
 	BulletinFeedOut,
 	BulletinUpdate,
 	get_bulletin_by_id,
+	get_weekly_feed_snapshot,
 	list_bulletins,
 	search_bulletins,
 )
@@ -122,6 +125,7 @@ async def get_current_week(request: Request):
 
 @public_bulletin_router.get("/", response_model=BulletinFeedOut)
 async def get_bulletins(
+	request: Request,
 	skip: int = Query(0, ge=0, description="Number of records to skip"),
 	limit: int = Query(100, ge=1, le=500, description="Max number of records to return"),
 	ministry_id: Optional[str] = None,
@@ -131,14 +135,18 @@ async def get_bulletins(
 	published: Optional[bool] = True,
 	upcoming_only: bool = False,
 	skip_expiration_filter: bool = False,
+	cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides skip"),
 ):
 	"""
 	List bulletins with optional filters.
 	Always returns BulletinFeedOut with both services and bulletins arrays.
+	Pass next_cursor back as ``cursor`` to fetch the following page of bulletins.
 	
 	IMPORTANT: week_start/week_end are used ONLY for services, NOT for bulletins.
 	Bulletins use upcoming_only for date-based filtering (publish_date <= today).
 	Bulletins are sorted by order field (ascending) for drag-and-drop reordering.
+	The default weekly view (published, upcoming_only, first page, no ministry or
+	text filter) is served from the week's materialized snapshot.
 	"""
 	# Validate date range if both provided
 	if week_start and week_end and week_end < week_start:
@@ -146,12 +154,26 @@ async def get_bulletins(
 			status_code=status.HTTP_400_BAD_REQUEST,
 			detail="week_end cannot be before week_start",
 		)
+	is_weekly_view = (
+		published is True
+		and upcoming_only
+		and not skip_expiration_filter
+		and (week_start or week_end)
+		and not (skip or cursor or ministry_id or query)
+	)
+	if is_weekly_view:
+		# Local Monday: list_services normalizes it again by date, so it must not be shifted to UTC first
+		week_monday = normalize_to_local_week_start(_combine_date_and_time(week_start or week_end))
+		snapshot = await get_weekly_feed_snapshot(week_monday)
+		if snapshot and snapshot["complete"] and snapshot["bulletin_count"] <= limit:
+			return etag_response(request, snapshot["body"], snapshot["etag"])
+
 	# For bulletins: ignore week_start/week_end when upcoming_only is True (date-based filtering)
 	# Only use week filters for bulletins when explicitly querying a specific date range
 	bulletin_week_start = None if upcoming_only else week_start
 	bulletin_week_end = None if upcoming_only else week_end
 	
-	bulletins = await list_bulletins(
+	bulletins, next_cursor = await list_bulletins(
 		skip=skip,
 		limit=limit,
 		ministry_id=ministry_id,
@@ -161,6 +183,7 @@ async def get_bulletins(
 		published=published,
 		upcoming_only=upcoming_only,
 		skip_expiration_filter=skip_expiration_filter,
+		cursor=cursor,
 	)
 	
 	# Always return unified feed response with both services and bulletins
@@ -173,7 +196,7 @@ async def get_bulletins(
 		published=published,
 	)
 	
-	return BulletinFeedOut(services=services, bulletins=bulletins)
+	return BulletinFeedOut(services=services, bulletins=bulletins, next_cursor=next_cursor)
 
 
 @public_bulletin_router.get("/search")
@@ -213,6 +236,7 @@ async def get_bulletin_detail(bulletin_id: str, request: Request):
 @bulletin_editing_router.get("/editing/list")
 async def list_all_bulletins_for_editing(
 	request: Request,
+	response: Response,
 	skip: int = Query(0, ge=0, description="Number of records to skip"),
 	limit: int = Query(100, ge=1, le=500, description="Max number of records to return"),
 	ministry_id: Optional[str] = None,
@@ -221,6 +245,7 @@ async def list_all_bulletins_for_editing(
 	published: Optional[bool] = None,
 	upcoming_only: bool = False,
 	skip_expiration_filter: bool = False,
+	cursor: Optional[str] = Query(None, description=f"{NEXT_CURSOR_HEADER} from the previous page; overrides skip"),
 ):
 	"""List ALL bulletins (published and unpublished) for admin editing, sorted by order field"""
 	# Validate date range if both provided
@@ -230,7 +255,7 @@ async def list_all_bulletins_for_editing(
 			detail="week_end cannot be before week_start",
 		)
 	
-	return await list_bulletins(
+	bulletins, next_cursor = await list_bulletins(
 		skip=skip,
 		limit=limit,
 		ministry_id=ministry_id,
@@ -239,7 +264,11 @@ async def list_all_bulletins_for_editing(
 		published=published,  # None allows both published and unpublished
 		upcoming_only=upcoming_only,
 		skip_expiration_filter=skip_expiration_filter,
+		cursor=cursor,
 	)
+	if next_cursor:
+		response.headers[NEXT_CURSOR_HEADER] = next_cursor
+	return bulletins
 
 
 @bulletin_editing_router.post("/")
@@ -3,15 +3,16 @@ Dashboard App Configuration Routes
 Provides endpoints for getting and managing dashboard page configurations.
 """
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List, Dict, Any
 from helpers.DashboardAppConfigHelper import DashboardAppConfigHelper
+from helpers.site_cache import invalidate_bootstrap_on_write
 
 # Public routes - accessible by Flutter app and other clients
 dashboard_app_config_public_router = APIRouter(prefix="/app", tags=["App Configuration - Public"])
 
 # Private routes - admin/management only
-dashboard_app_config_private_router = APIRouter(prefix="/app", tags=["App Configuration - Private"])
+dashboard_app_config_private_router = APIRouter(prefix="/app", tags=["App Configuration - Private"], dependencies=[Depends(invalidate_bootstrap_on_write)])
 
 #
 # --- Public Routes ---
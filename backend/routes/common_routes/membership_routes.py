@@ -82,6 +82,8 @@ async def search_membership_requests_route(
     sortBy: Literal["created_on", "resolved", "approved"] = Query("created_on"),
     sortDir: Literal["asc", "desc"] = Query("asc"),
     status: Literal["pending", "approved", "rejected"] = Query("pending"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
+    countMode: Literal["exact", "cached", "estimated", "none"] = Query("exact"),
 ):
     params = MRSearchParams(
         page=page,
@@ -91,5 +93,7 @@ async def search_membership_requests_route(
         sortBy=sortBy,
         sortDir=sortDir,
         status=status,
+        cursor=cursor,
+        countMode=countMode,
     )
     return await search_mr(params)
@@ -2,13 +2,16 @@ from fastapi import APIRouter, Body, Request
 from helpers.NotificationHelper import (
     update_notification_settings as helper_update_notification_settings,
     notification_history as helper_notification_history,
+    notification_delivery_metrics as helper_notification_delivery_metrics,
     send_push_notification as helper_send_push_notification,
     api_schedule_notification as helper_api_schedule_notification,
     api_get_scheduled_notifications as helper_api_get_scheduled_notifications,
     api_remove_scheduled_notification as helper_api_remove_scheduled_notification,
     register_device_token as helper_register_device_token,
     fetch_device_notification_preferences as helper_fetch_device_notification_preferences,
-    update_device_notification_preferences as helper_update_device_notification_preferences
+    update_device_notification_preferences as helper_update_device_notification_preferences,
+    validate_links as helper_validate_links,
+    prune_stale_device_tokens as helper_prune_stale_device_tokens
 )
 
 from mongo.database import DB
@@ -85,6 +88,11 @@ async def get_notification_settings():
 async def notification_history(limit: int = 100):
     return await helper_notification_history(limit)
 
+@private_notification_router.get('/metrics')
+async def notification_delivery_metrics(days: int = 7):
+    """Delivery throughput, latency percentiles and error classes for recent sends."""
+    return await helper_notification_delivery_metrics(max(1, min(days, 90)))
+
 @private_notification_router.post('/send')
 async def send_push_notification(
     title: str = Body(...),
@@ -114,6 +122,20 @@ async def api_schedule_notification(
 ):
     return await helper_api_schedule_notification(title, body, scheduled_time, send_to_all, token, data, eventId, link, route, actionType)
 
+@private_notification_router.post('/tokens/gc')
+async def prune_stale_device_tokens(older_than_days: int = Body(default=60, embed=True)):
+    """Run the stale device token GC now instead of waiting for the daily job."""
+    return await helper_prune_stale_device_tokens(max(1, older_than_days))
+
+@private_notification_router.post('/validate-links')
+async def validate_links(links: list[str] = Body(..., embed=True)):
+    """Validate a batch of notification links in one call; results are cached per URL."""
+    results = await helper_validate_links(links[:100])
+    return {
+        "success": all(error is None for error in results.values()),
+        "results": [{"link": link, "valid": error is None, "error": error} for link, error in results.items()],
+    }
+
 @private_notification_router.get('/scheduled')
 async def api_get_scheduled_notifications():
     return await helper_api_get_scheduled_notifications()
@@ -0,0 +1,38 @@
+"""
+Search Routes
+Global content search across sermons, bulletins, events, forms and pages
+"""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Query
+
+from models.search_index import SEARCH_TYPES, global_search, rebuild_search_index
+
+public_search_router = APIRouter(prefix="/search", tags=["Search - Public"])
+mod_search_router = APIRouter(prefix="/search", tags=["Search - Mod"])
+
+
+# Public Router
+@public_search_router.get("")
+async def search_all(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[List[str]] = Query(default=None, description=f"Any of: {', '.join(SEARCH_TYPES)}"),
+    locale: Optional[str] = None,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+):
+    """
+    Ranked search over published content. Every word is matched as a word prefix;
+    title hits rank above body hits. ``facets`` holds per-type match counts
+    regardless of ``types`` so clients can render filter tabs.
+    """
+    return await global_search(q, types=types, locale=locale, skip=skip, limit=limit)
+
+
+# Mod Router
+@mod_search_router.post("/reindex")
+async def reindex_search(types: Optional[List[str]] = Query(default=None)):
+    """Rebuild index entries from the source collections (all types by default)."""
+    selected = [t for t in (types or SEARCH_TYPES) if t in SEARCH_TYPES]
+    return {"success": True, "indexed": await rebuild_search_index(selected)}
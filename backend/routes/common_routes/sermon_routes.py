@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import date, datetime, time
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from fastapi.security import HTTPBearer
 from firebase_admin import auth as firebase_auth  # type: ignore[import]
 from bson import ObjectId  # type: ignore[import]
@@ -17,6 +17,7 @@ from controllers.sermon_functions import (
 	register_sermon_favorite,
 	remove_sermon_favorite,
 )
+from helpers.keyset_pagination import NEXT_CURSOR_HEADER
 from models.sermon import (
 	SermonCreate,
 	SermonUpdate,
@@ -87,6 +88,7 @@ async def _collect_favorite_sermon_ids(request: Request) -> Optional[set[str]]:
 @public_sermon_router.get("/")
 async def get_sermons(
 	request: Request,
+	response: Response,
 	skip: int = 0,
 	limit: int = 100,
 	ministry_id: Optional[str] = None,
@@ -96,9 +98,10 @@ async def get_sermons(
 	date_before: Optional[date] = None,
 	published: Optional[bool] = True,
 	favorites_only: Optional[bool] = None,
+	cursor: Optional[str] = Query(None, description=f"{NEXT_CURSOR_HEADER} from the previous page; overrides skip"),
 ):
 	favorite_ids = await _collect_favorite_sermon_ids(request)
-	return await list_sermons(
+	sermons, next_cursor = await list_sermons(
 		skip=skip,
 		limit=limit,
 		ministry_id=ministry_id,
@@ -109,7 +112,11 @@ async def get_sermons(
 		published=published,
 		favorite_ids=favorite_ids,
 		favorites_only=favorites_only,
+		cursor=cursor,
 	)
+	if next_cursor:
+		response.headers[NEXT_CURSOR_HEADER] = next_cursor
+	return sermons
 
 
 @public_sermon_router.get("/search")
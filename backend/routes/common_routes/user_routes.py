@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Optional
 from fastapi import APIRouter, HTTPException, status, Query, Body, Request
 
 # Import models and functions from models/user.py
@@ -98,14 +98,17 @@ async def process_search_users(
     page: int = Query(0, ge=0),
     pageSize: int = Query(25, ge=1, le=200),
     searchField: Literal["email", "name"] = Query("email"),
-    searchTerm: str = Query("", description="Case-insensitive contains"),
+    searchTerm: str = Query("", description="Each word matches the start of a name/email word"),
     sortBy: Literal["email", "name", "createdOn", "uid", "membership"] = Query("createdOn"),
-    sortDir: Literal["asc", "desc"] = Query("asc")
+    sortDir: Literal["asc", "desc"] = Query("asc"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    countMode: Literal["exact", "cached", "estimated", "none"] = Query("exact"),
 ):
     params = UsersSearchParams(
         page=page, pageSize=pageSize,
         searchField=searchField, searchTerm=searchTerm,
-        sortBy=sortBy, sortDir=sortDir
+        sortBy=sortBy, sortDir=sortDir,
+        cursor=cursor, countMode=countMode,
     )
     return await search_users_paged(params)
 
@@ -117,14 +120,17 @@ async def process_search_logical_users(
     page: int = Query(0, ge=0),
     pageSize: int = Query(25, ge=1, le=200),
     searchField: Literal["email", "name"] = Query("name"),
-    searchTerm: str = Query("", description="Case-insensitive contains"),
+    searchTerm: str = Query("", description="Each word matches the start of a name/email word"),
     sortBy: Literal["email", "name", "createdOn", "uid", "membership"] = Query("name"),
-    sortDir: Literal["asc", "desc"] = Query("asc")
+    sortDir: Literal["asc", "desc"] = Query("asc"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    countMode: Literal["exact", "cached", "estimated", "none"] = Query("exact"),
 ):
     params = UsersSearchParams(
         page=page, pageSize=pageSize,
         searchField=searchField, searchTerm=searchTerm,
         sortBy=sortBy, sortDir=sortDir,
+        cursor=cursor, countMode=countMode,
         hasRolesOnly=True
     )
     return await search_logical_users_paged(params)
@@ -26,6 +26,8 @@ async def get_admin_panel_events(
     gender: Optional[Literal["all", "male", "female"]] = Query(None),
     preferred_lang: Optional[str] = Query(None),
     sort_by_date_asc: bool = Query(True),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
+    countMode: Literal["exact", "cached", "estimated", "none"] = Query("exact"),
 ):
     # Normalize ministries to support both repeated params and single comma-separated string
     mins: Optional[List[str]] = ministries
@@ -48,6 +50,8 @@ async def get_admin_panel_events(
         gender=gender,
         preferred_lang=preferred_lang,
         sort_by_date_asc=sort_by_date_asc,
+        cursor=cursor,
+        count_mode=countMode,
     )
 
 # Mod Route: Get Admin Panel by ID
@@ -85,6 +89,8 @@ async def get_admin_event_instances(
     status: Literal["all", "upcoming", "passed"] = Query("all"),
     sort_by_series_index_asc: bool = Query(True),
     preferred_lang: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
+    countMode: Literal["exact", "cached", "estimated", "none"] = Query("exact"),
 ):
     return await search_assembled_event_instances(
         event_id=event_id,
@@ -93,6 +99,8 @@ async def get_admin_event_instances(
         status=status,
         sort_by_series_index_asc=sort_by_series_index_asc,
         preferred_lang=preferred_lang,
+        cursor=cursor,
+        count_mode=countMode,
     )
 
 @mod_event_router.get("/admin-instance-assembly/{instance_id}", summary="Get assembled admin view for a single event instance")
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from typing import List
 
+from helpers.keyset_pagination import NEXT_CURSOR_HEADER
+
 from models.form import (
 	FormOut,
 	get_form_by_id_unrestricted,
@@ -17,19 +19,33 @@ private_forms_router = APIRouter(prefix="/forms", tags=["Forms"])
 
 
 @private_forms_router.get("/", response_model=List[FormOut])
-async def list_user_forms(request: Request, skip: int = 0, limit: int = Query(100, le=500)) -> List[FormOut]:
-	return await list_all_forms(skip=skip, limit=limit)
+async def list_user_forms(
+	request: Request,
+	response: Response,
+	skip: int = 0,
+	limit: int = Query(100, le=500),
+	cursor: str | None = Query(None, description=f"{NEXT_CURSOR_HEADER} from the previous page; overrides skip"),
+) -> List[FormOut]:
+	forms, next_cursor = await list_all_forms(skip=skip, limit=limit, cursor=cursor)
+	if next_cursor:
+		response.headers[NEXT_CURSOR_HEADER] = next_cursor
+	return forms
 
 
 @private_forms_router.get("/search", response_model=List[FormOut])
 async def search_user_forms(
 	request: Request,
+	response: Response,
 	name: str | None = None,
 	ministry: str | None = None,
 	skip: int = 0,
 	limit: int = Query(100, le=500),
+	cursor: str | None = Query(None, description=f"{NEXT_CURSOR_HEADER} from the previous page; overrides skip"),
 ) -> List[FormOut]:
-	return await search_all_forms(name=name, ministry=ministry, skip=skip, limit=limit)
+	forms, next_cursor = await search_all_forms(name=name, ministry=ministry, skip=skip, limit=limit, cursor=cursor)
+	if next_cursor:
+		response.headers[NEXT_CURSOR_HEADER] = next_cursor
+	return forms
 
 
 @private_forms_router.get("/{form_id}", response_model=FormOut)
@@ -18,10 +18,12 @@ from typing import Optional
 from urllib.parse import unquote
 
 from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import FileResponse
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from mongo.database import DB
+from helpers.http_cache import content_etag, etag_response
+from helpers.precompressed_static import PrecompressedStaticFiles
+from helpers.site_cache import get_published_page, website_config_cache
 
 logger = logging.getLogger(__name__)
 frontend_router = APIRouter()
@@ -40,6 +42,12 @@ jinja_env = Environment(
     ),
 )
 
+# Compiled once; the template only changes on deploy
+index_template = jinja_env.get_template("index.html")
+
+# Parsed Vite tags, refreshed only when dist/index.html is rebuilt
+_vite_assets = {"mtime_ns": None, "tags": ""}
+
 
 def _normalize_slug(raw_slug: str) -> str:
     """Normalize slug (handles double-encoding and home/root)"""
@@ -50,7 +58,16 @@ def _normalize_slug(raw_slug: str) -> str:
 
 
 async def get_website_config() -> dict:
-    """Fetch website configuration from MongoDB"""
+    """Fetch website configuration from MongoDB (cached; see helpers.site_cache)"""
+    cached = website_config_cache.get("config")
+    if cached is not None:
+        return cached
+    config = await _load_website_config()
+    website_config_cache.set("config", config)
+    return config
+
+
+async def _load_website_config() -> dict:
     try:
         config = await DB.db["website_app_config"].find_one({})
         if config:
@@ -73,19 +90,23 @@ async def get_website_config() -> dict:
     }
 
 
-async def get_page_data(slug: str) -> Optional[dict]:
-    """Fetch page data from MongoDB by slug"""
-    try:
-        decoded = _normalize_slug(slug)
-
-        # Try exact match first
-        page = await DB.db["pages"].find_one({"slug": decoded, "visible": True})
+async def get_page_meta(slug: str) -> Optional[dict]:
+    """Title/description/og_image of a visible page (served from the published page cache)"""
+    page = await get_page_data(slug)
+    if not page:
+        return None
+    return {
+        "title": page.get("title"),
+        "meta_description": page.get("meta_description"),
+        "og_image": page.get("og_image"),
+    }
 
-        # Fallback: if root not found, try "home"
-        if not page and decoded == "/":
-            page = await DB.db["pages"].find_one({"slug": "home", "visible": True})
 
-        return page
+async def get_page_data(slug: str) -> Optional[dict]:
+    """Fetch visible page data by slug via the shared published page cache"""
+    try:
+        entry = await get_published_page(_normalize_slug(slug))
+        return entry["page"] if entry else None
     except Exception as e:
         print(f"Error fetching page data: {e}")
         return None
@@ -111,6 +132,19 @@ def extract_vite_assets(dist_index_path: Path) -> str:
         return ""
 
 
+def get_vite_assets() -> str:
+    """Vite tags from dist/index.html, re-parsed only when the file's mtime changes"""
+    dist_index = FRONTEND_DIST_DIR / "index.html"
+    try:
+        mtime_ns = dist_index.stat().st_mtime_ns
+    except OSError:
+        return ""
+    if _vite_assets["mtime_ns"] != mtime_ns:
+        _vite_assets["tags"] = extract_vite_assets(dist_index)
+        _vite_assets["mtime_ns"] = mtime_ns
+    return _vite_assets["tags"]
+
+
 def make_absolute_url(url: str, base_url: str) -> str:
     """Convert relative URL to absolute URL for social media"""
     if not url:
@@ -191,13 +225,13 @@ async def serve_frontend(request: Request, full_path: str = ""):
     else:
         logger.debug(f"Checking MongoDB for web-builder page: /{full_path}")
 
-    # Fetch page data only if NOT an app route
-    page_data = None if is_app_route else await get_page_data(full_path)
+    # Fetch page meta only if NOT an app route
+    page_data = None if is_app_route else await get_page_meta(full_path)
 
     # Determine meta tag values
     if page_data:
         # Page-specific meta tags
-        title = page_data.get("title", website_config["title"])
+        title = page_data.get("title") or website_config["title"]
         meta_description = (
             page_data.get("meta_description") or website_config["meta_description"]
         )
@@ -225,13 +259,8 @@ async def serve_frontend(request: Request, full_path: str = ""):
     # Current page URL for og:url
     og_url = f"{base_url}/{full_path}".rstrip("/")
 
-    # Extract Vite build assets
-    dist_index = FRONTEND_DIST_DIR / "index.html"
-    vite_assets = extract_vite_assets(dist_index) if dist_index.exists() else ""
-
     # Render template with Jinja2
-    template = jinja_env.get_template("index.html")
-    html_content = template.render(
+    html_content = index_template.render(
         title=title,
         meta_description=meta_description,
         favicon_url=favicon_url,
@@ -243,23 +272,27 @@ async def serve_frontend(request: Request, full_path: str = ""):
         twitter_title=title,
         twitter_description=meta_description,
         twitter_image=og_image,
-        vite_assets=vite_assets,
+        vite_assets=get_vite_assets(),
     )
 
-    return HTMLResponse(content=html_content)
+    # The shell is small; hashing it is cheaper than any conditional lookup.
+    # no-cache: clients may store it but must revalidate (new deploys change the asset tags)
+    return etag_response(request, html_content, content_etag(html_content), media_type="text/html")
 
 
 # Mount static files for assets
 def mount_static_files(app):
     """
-    Mount static files from the dist folder.
-    Call this from main.py after including the router.
+    Mount the hashed Vite build output at /assets with immutable caching and
+    precompressed .br/.gz variants. Call this from main.py BEFORE including
+    frontend_router, whose catch-all route would otherwise match first.
     """
-    if FRONTEND_DIST_DIR.exists():
+    assets_dir = FRONTEND_DIST_DIR / "assets"
+    if assets_dir.is_dir():
         app.mount(
             "/assets",
-            StaticFiles(directory=str(FRONTEND_DIST_DIR / "assets")),
+            PrecompressedStaticFiles(directory=str(assets_dir)),
             name="assets",
         )
-        # Mount other static files at root
-        app.mount("/", StaticFiles(directory=str(FRONTEND_DIST_DIR)), name="static")
+    else:
+        logger.warning(f"Frontend assets not found at {assets_dir}; /assets is served by the catch-all route")
@@ -1,8 +1,10 @@
 from typing import Any, Dict, List, Tuple
 
-from fastapi import APIRouter, Body, HTTPException, Path
+from fastapi import APIRouter, Body, Depends, HTTPException, Path
 from pydantic import BaseModel
 
+from helpers.site_cache import invalidate_bootstrap_on_write
+
 from models.footer import Footer, FooterItem, FooterSubItem
 from models.footer import (
     add_item,
@@ -20,7 +22,7 @@ from models.localization_info import (
 )
 
 public_footer_router = APIRouter(prefix="/footer", tags=["public footer"])
-mod_footer_router = APIRouter(prefix="/footer", tags=["mod footer/editing"])
+mod_footer_router = APIRouter(prefix="/footer", tags=["mod footer/editing"], dependencies=[Depends(invalidate_bootstrap_on_write)])
 
 
 class OpResult(BaseModel):
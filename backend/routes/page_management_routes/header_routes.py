@@ -1,8 +1,10 @@
 from typing import Any, Dict, Tuple
 
-from fastapi import APIRouter, Body, HTTPException, Path
+from fastapi import APIRouter, Body, Depends, HTTPException, Path
 from pydantic import BaseModel
 
+from helpers.site_cache import invalidate_bootstrap_on_write
+
 from models.header import (
     Header,
     HeaderItem,
@@ -23,7 +25,7 @@ from models.localization_info import (
 from urllib.parse import urlparse
 
 public_header_router = APIRouter(prefix="/header", tags=["public header"])
-mod_header_router = APIRouter(prefix="/header", tags=["mod header"])
+mod_header_router = APIRouter(prefix="/header", tags=["mod header"], dependencies=[Depends(invalidate_bootstrap_on_write)])
 
 
 class OpResult(BaseModel):
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Body, Path, HTTPException
+from fastapi import APIRouter, Body, Path, HTTPException, Request
 from mongo.database import DB
 from models.page_models import Page
+from models.search_index import sync_search_entry
 from helpers.slug_validator import validate_slug
+from helpers.site_cache import get_published_page, invalidate_pages
+from helpers.http_cache import etag_response
 from bson import ObjectId, errors as bson_errors
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 from urllib.parse import unquote
 
@@ -40,27 +45,28 @@ async def create_page(page: Page = Body(...)):
     page_data["created_at"] = datetime.utcnow()
     page_data["updated_at"] = datetime.utcnow()
     page_data["visible"] = True
-    result = await DB.db["pages"].insert_one(page_data)
+    try:
+        result = await DB.db["pages"].insert_one(page_data)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Slug already exists. Please choose a different slug.")
+    invalidate_pages()
+    await sync_search_entry("page", result.inserted_id)
     return {"_id": str(result.inserted_id)}
 
 
 # Public Router - Get page by slug (moved under /slug to avoid conflict with list endpoint)
 @public_page_router.get("/slug/{slug:path}")
-async def get_page_by_slug(slug: str):
+async def get_page_by_slug(slug: str, request: Request):
     # Normalize and safely decode slug (handles double-encoding)
     decoded = _normalize_slug(slug)
 
-    # Try exact match first
-    page = await DB.db["pages"].find_one({"slug": decoded, "visible": True})
-
-    # Fallback: if root not found, try "home"
-    if not page and decoded == "/":
-        page = await DB.db["pages"].find_one({"slug": "home", "visible": True})
-
-    if not page:
+    # Cached published JSON (root falls back to "home"); invalidated by the mod routes below
+    entry = await get_published_page(decoded)
+    if not entry:
         raise HTTPException(status_code=404, detail="Page not found")
-    page["_id"] = str(page["_id"])
-    return page
+
+    # no-cache: clients keep a copy but revalidate, so publishes show up immediately
+    return etag_response(request, entry["body"], entry["etag"])
 
 
 # Public Router - List visible pages only
@@ -96,10 +102,15 @@ async def update_page_sections(page_id: str = Path(...), data: dict = Body(...))
     except bson_errors.InvalidId:
         raise HTTPException(status_code=400, detail="Invalid page ID format")
 
-    result = await DB.db["pages"].update_one({"_id": object_id}, {"$set": data})
+    try:
+        result = await DB.db["pages"].update_one({"_id": object_id}, {"$set": data})
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Slug already exists. Please choose a different slug.")
 
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Page not found")
+    invalidate_pages()
+    await sync_search_entry("page", object_id)
 
     return {"matched": result.matched_count, "modified": result.modified_count}
 
@@ -211,10 +222,12 @@ async def publish_staging_page(slug: str):
         publish_fields.setdefault("title", decoded)
         publish_fields["updated_at"] = datetime.utcnow()
 
-        await DB.db["pages"].update_one(
+        published = await DB.db["pages"].find_one_and_update(
             {"slug": decoded},
             {"$set": publish_fields, "$setOnInsert": {"created_at": datetime.utcnow()}},
             upsert=True,
+            projection={"_id": 1},
+            return_document=ReturnDocument.AFTER,
         )
 
         # Remove staging version after publish (try both normalized and home for root)
@@ -222,6 +235,8 @@ async def publish_staging_page(slug: str):
         if decoded == "/":
             await DB.db["pages_staging"].delete_one({"slug": "home"})
 
+        invalidate_pages()
+        await sync_search_entry("page", published["_id"])
         return {"published": True}
     except HTTPException:
         # Re-raise explicit HTTP errors
@@ -243,6 +258,8 @@ async def delete_page(page_id: str = Path(...)):
 
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Page not found")
+    invalidate_pages()
+    await sync_search_entry("page", object_id)
 
     return {"deleted": result.deleted_count}
 
@@ -283,6 +300,8 @@ async def toggle_page_visibility(page_id: str = Path(...), visible: bool = Body(
 
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Page not found")
+    invalidate_pages()
+    await sync_search_entry("page", object_id)
 
     return {"matched": result.matched_count, "modified": result.modified_count}
 
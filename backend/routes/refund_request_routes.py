@@ -48,12 +48,14 @@ async def list_my_refund_requests_route(
     pageSize: int = Query(25, ge=1, le=200),
     status: Literal["pending", "resolved", "unresolved", "all"] = Query("pending"),
     txn_kind: Optional[Literal["event", "form"]] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
 ):
     params = RefundRequestSearchParams(
         page=page,
         pageSize=pageSize,
         status=status,
         txn_kind=txn_kind,
+        cursor=cursor,
     )
     return await list_my_refund_requests(request=request, params=params)
 
@@ -70,6 +72,8 @@ async def admin_search_refund_requests_route(
     status: Literal["pending", "resolved", "unresolved", "all"] = Query("pending"),
     txn_kind: Optional[Literal["event", "form"]] = Query(None),
     uid: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides page"),
+    countMode: Literal["exact", "cached", "estimated", "none"] = Query("exact"),
 ):
     params = RefundRequestSearchParams(
         page=page,
@@ -77,6 +81,8 @@ async def admin_search_refund_requests_route(
         status=status,
         txn_kind=txn_kind,
         uid=uid,
+        cursor=cursor,
+        countMode=countMode,
     )
     return await admin_search_refund_requests(params=params)
 
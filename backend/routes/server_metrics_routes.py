@@ -0,0 +1,16 @@
+"""
+Server Metrics Routes
+In-process counters for the worker that answers the request
+"""
+
+from fastapi import APIRouter
+
+from helpers.compression import compression_metrics
+
+server_metrics_mod_router = APIRouter(prefix="/server-metrics", tags=["Server Metrics"])
+
+
+@server_metrics_mod_router.get("/compression")
+async def get_compression_metrics():
+    """Responses compressed by CompressionMiddleware and the bytes saved since this worker started."""
+    return compression_metrics.snapshot()
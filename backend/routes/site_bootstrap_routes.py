@@ -0,0 +1,23 @@
+"""
+Site Bootstrap Routes
+One public call that returns everything a client needs for first paint
+"""
+
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from helpers.http_cache import etag_response
+from helpers.site_bootstrap import get_site_bootstrap
+
+site_bootstrap_public_router = APIRouter(prefix="/site", tags=["Site Bootstrap - Public"])
+
+
+@site_bootstrap_public_router.get("/bootstrap")
+async def get_bootstrap(request: Request) -> Response:
+    """
+    Header, footer, website/app/dashboard config, localization info and the
+    home page in one response. ``version`` (also the ETag) changes whenever any
+    of them does, so clients can revalidate with If-None-Match.
+    """
+    entry = await get_site_bootstrap()
+    return etag_response(request, entry["body"], entry["etag"])
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from mongo.database import DB
+from mongo.scheduled_notifications import NOTIFICATIONS_COLLECTION
+
+
+# History documents written before delivery stats stored the raw token list under
+# "recipients". Collapse it to "recipient_count" and drop the list in the same
+# pipeline update, so no document is left holding both fields.
+RECIPIENTS_MIGRATION: List[Dict[str, Any]] = [
+    {
+        "$set": {
+            "recipient_count": {
+                "$ifNull": [
+                    "$recipient_count",
+                    {"$cond": [{"$isArray": "$recipients"}, {"$size": "$recipients"}, 0]},
+                ]
+            }
+        }
+    },
+    {"$unset": "recipients"},
+]
+
+
+async def run_notification_recipients_migration() -> int:
+    result = await DB.db[NOTIFICATIONS_COLLECTION].update_many(
+        {"recipients": {"$exists": True}},
+        RECIPIENTS_MIGRATION,
+    )
+    return result.modified_count
@@ -188,3 +188,30 @@ async def test_delete_asset_removes_thumbnail(async_client, admin_headers):
 	finally:
 		# Clean up test folder (asset should already be deleted by the test)
 		await _cleanup_test_folder(async_client, admin_headers, folder)
+
+
+async def test_rename_folder_repaths_assets(async_client, admin_headers):
+	folder = f"tests_{uuid.uuid4().hex[:6]}"
+	renamed = f"{folder}_renamed"
+	try:
+		created = await async_client.post("/api/v1/assets/folders/create", json={"path": folder}, headers=admin_headers)
+		if created.status_code not in (200, 201):
+			pytest.skip(f"Folder creation requires admin roles; skipping. Got {created.status_code}")
+		uploaded = await _upload_image(async_client, admin_headers, folder=folder)
+		if uploaded is None:
+			pytest.skip("Upload not available")
+
+		resp = await async_client.patch("/api/v1/assets/folders/rename",
+			json={"path": folder, "new_name": renamed},
+			headers=admin_headers)
+		assert resp.status_code == 200
+		assert resp.json()["details"]["docs_repathed"] == 1
+
+		listing = await async_client.get("/api/v1/assets/", params={"folder": renamed}, headers=admin_headers)
+		assert listing.status_code == 200
+		files = listing.json().get("files", [])
+		assert [f["id"] for f in files] == [uploaded["id"]]
+		assert files[0]["folder"] == renamed
+	finally:
+		await _cleanup_test_folder(async_client, admin_headers, folder)
+		await _cleanup_test_folder(async_client, admin_headers, renamed)
@@ -70,7 +70,7 @@ async def test_allows_updating_first_day(monkeypatch, progress_app):
     fake_find = AsyncMock(return_value={"progress": []})
     fake_update = AsyncMock(return_value=True)
     monkeypatch.setattr(user_bible_plan_routes, "find_user_plan", fake_find)
-    monkeypatch.setattr(user_bible_plan_routes, "update_user_bible_plan_progress", fake_update)
+    monkeypatch.setattr(user_bible_plan_routes, "apply_user_bible_plan_progress", fake_update)
     _set_plan_doc(
         monkeypatch,
         readings={"1": [{"id": "verse-1"}]},
@@ -100,7 +100,7 @@ async def test_blocks_future_day_before_previous_complete(monkeypatch, progress_
     )
     fake_update = AsyncMock(return_value=True)
     monkeypatch.setattr(user_bible_plan_routes, "find_user_plan", fake_find)
-    monkeypatch.setattr(user_bible_plan_routes, "update_user_bible_plan_progress", fake_update)
+    monkeypatch.setattr(user_bible_plan_routes, "apply_user_bible_plan_progress", fake_update)
     _set_plan_doc(
         monkeypatch,
         readings={
@@ -133,7 +133,7 @@ async def test_allows_next_day_after_completion(monkeypatch, progress_app):
     )
     fake_update = AsyncMock(return_value=True)
     monkeypatch.setattr(user_bible_plan_routes, "find_user_plan", fake_find)
-    monkeypatch.setattr(user_bible_plan_routes, "update_user_bible_plan_progress", fake_update)
+    monkeypatch.setattr(user_bible_plan_routes, "apply_user_bible_plan_progress", fake_update)
     _set_plan_doc(
         monkeypatch,
         readings={
@@ -166,7 +166,7 @@ async def test_rest_day_unlocks_next_day(monkeypatch, progress_app):
     )
     fake_update = AsyncMock(return_value=True)
     monkeypatch.setattr(user_bible_plan_routes, "find_user_plan", fake_find)
-    monkeypatch.setattr(user_bible_plan_routes, "update_user_bible_plan_progress", fake_update)
+    monkeypatch.setattr(user_bible_plan_routes, "apply_user_bible_plan_progress", fake_update)
     _set_plan_doc(
         monkeypatch,
         readings={
@@ -43,7 +43,10 @@ async def test_reset_user_bible_plan_updates_progress():
     assert result is True
     update_mock.assert_awaited_once_with(
         {"uid": "uid-123", "plan_id": "plan-456"},
-        {"$set": {"progress": [], "start_date": new_start}},
+        {
+            "$set": {"progress_bits": {}, "passage_progress": {}, "start_date": new_start},
+            "$unset": {"progress": ""},
+        },
     )
 
 
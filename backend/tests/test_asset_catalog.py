@@ -0,0 +1,154 @@
+"""
+Unit tests for asset name tokenization, keyset cursors and folder helpers.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+
+import models.asset_folders as asset_folders
+import models.image_data as image_data
+from models.asset_folders import merge_folder_into_parent, move_folder_subtree, parent_of
+from models.image_data import (
+    bulk_repath_prefix,
+    decode_list_cursor,
+    encode_list_cursor,
+    folder_of_path,
+    name_search_query,
+    tokenize_name,
+)
+
+
+def _eval(expr, doc, variables=None):
+    """Just enough of the aggregation expression language for the repath pipelines."""
+    variables = variables or {}
+    if isinstance(expr, str):
+        if expr.startswith("$$"):
+            return variables[expr[2:]]
+        return doc.get(expr[1:]) if expr.startswith("$") else expr
+    if not isinstance(expr, dict):
+        return expr
+    (op, arg), = expr.items()
+    if op == "$literal":
+        return arg
+    if op == "$let":
+        inner = {**variables, **{k: _eval(v, doc, variables) for k, v in arg["vars"].items()}}
+        return _eval(arg["in"], doc, inner)
+    args = [_eval(a, doc, variables) for a in (arg if isinstance(arg, list) else [arg])]
+    if op == "$concat":
+        return None if None in args else "".join(args)
+    if op == "$substrCP":
+        return args[0][args[1]:args[1] + args[2]]
+    if op == "$strLenCP":
+        return len(args[0])
+    if op == "$subtract":
+        return args[0] - args[1]
+    if op == "$max":
+        return max(args)
+    raise NotImplementedError(op)
+
+
+class FakePipelineCollection:
+    """Applies update_many pipelines' $set stages to every document (the tests pass only matching ones)."""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def update_many(self, query, pipeline):
+        for doc in self.docs:
+            for stage in pipeline:
+                values = {k: _eval(v, doc) for k, v in stage["$set"].items() if v != "$$NOW"}
+                doc.update(values)
+        return SimpleNamespace(modified_count=len(self.docs))
+
+
+class FakeFolderCollection(FakePipelineCollection):
+    async def update_one(self, query, update, upsert=False):
+        return SimpleNamespace(upserted_id=None)
+
+    async def find_one(self, query):
+        return None
+
+    async def delete_one(self, query):
+        pass
+
+
+class TestNameTokens:
+    def test_tokenize_splits_and_lowercases(self):
+        assert tokenize_name("Easter_Service 2024-Choir.final") == ["2024", "choir", "easter", "final", "service"]
+        assert tokenize_name("") == []
+        assert tokenize_name(None) == []
+
+    def test_search_query_prefix_matches_every_word(self):
+        assert name_search_query("Choir") == {"name_tokens": {"$regex": "^choir"}}
+        assert name_search_query("easter choir") == {"$and": [
+            {"name_tokens": {"$regex": "^choir"}},
+            {"name_tokens": {"$regex": "^easter"}},
+        ]}
+        assert name_search_query("  --  ") == {}
+
+
+class TestListCursor:
+    def test_round_trip(self):
+        oid = ObjectId()
+        created_at = datetime(2024, 5, 1, 12, 30, 15, 123000)
+        cursor = encode_list_cursor({"_id": oid, "created_at": created_at})
+        assert decode_list_cursor(cursor) == (created_at, oid)
+
+    def test_garbage_cursor_is_ignored(self):
+        assert decode_list_cursor("not-a-cursor") is None
+
+
+class TestFolderPaths:
+    def test_folder_of_path(self):
+        assert folder_of_path("data/assets/a/b/x.png") == "a/b"
+        assert folder_of_path("data/assets/x.png") == ""
+
+    def test_parent_of(self):
+        assert parent_of("a/b/c") == "a/b"
+        assert parent_of("a") == ""
+
+
+class TestRepath:
+    @pytest.mark.asyncio
+    async def test_dollar_prefixed_names_are_literal(self, monkeypatch):
+        docs = [
+            {"path": "data/assets/a/x.png", "folder": "a"},
+            {"path": "data/assets/a/s/y.png", "folder": "a/s"},
+        ]
+
+        async def fake_collection():
+            return FakePipelineCollection(docs)
+
+        monkeypatch.setattr(image_data, "_get_collection", fake_collection)
+        await bulk_repath_prefix("data/assets/a/", "data/assets/$b/")
+        assert docs == [
+            {"path": "data/assets/$b/x.png", "folder": "$b"},
+            {"path": "data/assets/$b/s/y.png", "folder": "$b/s"},
+        ]
+
+
+class TestFolderCatalogRepath:
+    @pytest.fixture
+    def folders(self, monkeypatch):
+        docs = []
+
+        async def fake_collection():
+            return FakeFolderCollection(docs)
+
+        monkeypatch.setattr(asset_folders, "_get_collection", fake_collection)
+        return docs
+
+    @pytest.mark.asyncio
+    async def test_move_to_dollar_prefixed_name(self, folders):
+        folders.extend([{"path": "a/s", "parent": "a"}, {"path": "a/s/t", "parent": "a/s"}])
+        await move_folder_subtree("a", "$b")
+        assert folders == [{"path": "$b/s", "parent": "$b"}, {"path": "$b/s/t", "parent": "$b/s"}]
+
+    @pytest.mark.asyncio
+    async def test_merge_into_dollar_prefixed_parent(self, folders):
+        folders.append({"path": "$p/a/s", "parent": "$p/a"})
+        await merge_folder_into_parent("$p/a")
+        assert folders == [{"path": "$p/s", "parent": "$p"}]
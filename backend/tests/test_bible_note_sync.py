@@ -0,0 +1,106 @@
+"""
+Unit tests for Bible note delta-sync models and time helpers.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+import models.bible_note as bible_note_model
+from models.bible_note import (
+    MAX_SYNC_BATCH,
+    BibleNoteChange,
+    BibleNoteChangeBatch,
+    _as_naive_utc,
+    _now,
+    apply_bible_note_changes,
+)
+
+_NOTE = {"book": "John", "chapter": 3, "verse_start": 16, "note": "Loved", "highlight_color": "blue"}
+
+
+class TestBibleNoteChange:
+    def test_create_needs_client_id(self):
+        assert BibleNoteChange(op="create", client_id="local-1", create=_NOTE).create.book == "John"
+        with pytest.raises(ValidationError):
+            BibleNoteChange(op="create", create=_NOTE)
+
+    def test_update_and_delete_need_a_valid_id(self):
+        oid = str(ObjectId())
+        assert BibleNoteChange(op="delete", id=oid).id == oid
+        assert BibleNoteChange(op="update", id=oid, update={"note": "x"}).update.note == "x"
+        with pytest.raises(ValidationError):
+            BibleNoteChange(op="delete", id="not-an-id")
+        with pytest.raises(ValidationError):
+            BibleNoteChange(op="update", id=oid)
+
+    def test_batch_size_is_capped(self):
+        change = {"op": "delete", "id": str(ObjectId())}
+        with pytest.raises(ValidationError):
+            BibleNoteChangeBatch(changes=[change] * (MAX_SYNC_BATCH + 1))
+
+
+class TestSyncTime:
+    def test_now_is_naive_utc_milliseconds(self):
+        now = _now()
+        assert now.tzinfo is None
+        assert now.microsecond % 1000 == 0
+        assert abs(now - datetime.now(timezone.utc).replace(tzinfo=None)) < timedelta(seconds=5)
+
+    def test_aware_watermarks_are_normalized(self):
+        aware = datetime(2025, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=-5)))
+        assert _as_naive_utc(aware) == datetime(2025, 1, 1, 17, 0)
+        assert _as_naive_utc(datetime(2025, 1, 1)) == datetime(2025, 1, 1)
+
+
+class FakeNotes:
+    def __init__(self, errors, docs):
+        self.errors = list(errors)
+        self.docs = docs
+        self.calls = []
+
+    async def bulk_write(self, ops, ordered=True):
+        self.calls.append(len(ops))
+        if self.errors:
+            raise BulkWriteError({"writeErrors": [self.errors.pop(0)]})
+
+    def find(self, query):
+        docs = self.docs
+        return SimpleNamespace(to_list=lambda length=None: _resolved(docs))
+
+
+async def _resolved(value):
+    return value
+
+
+class TestApplyChanges:
+    @pytest.mark.asyncio
+    async def test_write_errors_map_to_per_change_results(self, monkeypatch):
+        update_id, delete_id = str(ObjectId()), str(ObjectId())
+        now = datetime(2025, 1, 1)
+        created = {"_id": ObjectId(), "client_id": "local-1", "user_id": "u1", "created_at": now, "updated_at": now, **_NOTE}
+        deleted = {"_id": ObjectId(delete_id), "user_id": "u1", "deleted": True, "updated_at": now}
+        notes = FakeNotes(
+            errors=[
+                {"index": 0, "code": 11000, "errmsg": "duplicate key"},
+                {"index": 0, "code": 121, "errmsg": "Document failed validation"},
+            ],
+            docs=[created, deleted],
+        )
+        monkeypatch.setattr(bible_note_model.DB, "db", SimpleNamespace(bible_notes=notes))
+
+        results = await apply_bible_note_changes("u1", [
+            BibleNoteChange(op="create", client_id="local-1", create=_NOTE),
+            BibleNoteChange(op="update", id=update_id, update={"note": "x"}),
+            BibleNoteChange(op="delete", id=delete_id),
+        ])
+
+        # Resumes after each failed op instead of dropping the rest of the batch
+        assert notes.calls == [3, 2, 1]
+        assert [r.status for r in results] == ["applied", "failed", "applied"]
+        assert results[0].id == str(created["_id"])
+        assert results[1].error == "Document failed validation"
@@ -0,0 +1,48 @@
+"""
+Unit tests for Bible note verse ordinals and the single-range overlap query.
+"""
+
+from models.bible_note import (
+    _overlap_query,
+    note_ordinals,
+    passage_ordinal_range,
+    verse_ordinal,
+)
+
+
+def _overlaps(note: dict, lo: int, hi: int) -> bool:
+    """Evaluate _overlap_query against stored ordinals the way Mongo would."""
+    q = _overlap_query(lo, hi)
+    return (
+        q["ord_start"]["$gte"] <= note["ord_start"] <= q["ord_start"]["$lte"]
+        and note["ord_end"] >= q["ord_end"]["$gte"]
+    )
+
+
+class TestVerseOrdinals:
+    def test_canonical_order(self):
+        assert verse_ordinal("Genesis", 50, 26) < verse_ordinal("Exodus", 1, 1)
+        assert verse_ordinal("Psalms", 119, 176) < verse_ordinal("Psalms", 120, 1)
+        assert verse_ordinal("John", 3, 16) < verse_ordinal("John", 3, 17)
+
+    def test_note_ordinals_single_verse(self):
+        ords = note_ordinals("John", 3, 16, None)
+        assert ords["ord_start"] == ords["ord_end"] == verse_ordinal("John", 3, 16)
+
+    def test_passage_ranges(self):
+        assert passage_ordinal_range("John", 3, verse=16) == (verse_ordinal("John", 3, 16),) * 2
+        lo, hi = passage_ordinal_range("John", chapter_start=3, chapter_end=4)
+        assert lo == verse_ordinal("John", 3, 0) and hi == verse_ordinal("John", 4, 999)
+        lo, hi = passage_ordinal_range("John")
+        assert lo < verse_ordinal("John", 1, 1) and hi > verse_ordinal("John", 21, 25)
+        assert hi < verse_ordinal("Acts", 1, 1)
+
+    def test_overlap_matches_previous_semantics(self):
+        note = note_ordinals("John", 3, 14, 18)
+        assert _overlaps(note, *passage_ordinal_range("John", 3, verse=16))
+        assert _overlaps(note, *passage_ordinal_range("John", 3, verse_start=18, verse_end=20))
+        assert not _overlaps(note, *passage_ordinal_range("John", 3, verse_start=19, verse_end=20))
+        assert _overlaps(note, *passage_ordinal_range("John", chapter_start=2, chapter_end=3))
+        assert not _overlaps(note, *passage_ordinal_range("John", 4))
+        # Long notes at the end of the previous chapter do not leak into the next one
+        assert not _overlaps(note_ordinals("Psalms", 119, 1, 176), *passage_ordinal_range("Psalms", 120))
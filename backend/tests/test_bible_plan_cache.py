@@ -0,0 +1,72 @@
+"""
+Unit tests for the Bible plan read-through cache and its invalidation.
+"""
+
+import json
+
+import pytest
+
+from helpers import bible_plan_cache
+from helpers.bible_plan_cache import cached_entry, invalidate_plans, invalidate_templates
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    bible_plan_cache.plan_cache.clear()
+    yield
+    bible_plan_cache.plan_cache.clear()
+
+
+def _loader(state, key="value"):
+    async def load():
+        state["calls"] += 1
+        return state[key]
+    return load
+
+
+class TestPlanCache:
+    @pytest.mark.asyncio
+    async def test_entry_is_reused_until_invalidated(self):
+        state = {"calls": 0, "value": [{"name": "Gospels"}]}
+        first = await cached_entry(("published",), _loader(state))
+        assert json.loads(first["body"]) == [{"name": "Gospels"}]
+        assert first["etag"].startswith('"')
+
+        assert await cached_entry(("published",), _loader(state)) is first
+        assert state["calls"] == 1
+
+        state["value"] = [{"name": "Psalms"}]
+        invalidate_plans("abc")
+        second = await cached_entry(("published",), _loader(state))
+        assert second["etag"] != first["etag"]
+        assert second["version"] > first["version"]
+
+    @pytest.mark.asyncio
+    async def test_plan_invalidation_is_scoped(self):
+        state = {"calls": 0, "value": {"id": "a"}}
+        await cached_entry(("plan", "a"), _loader(state))
+        await cached_entry(("plan", "b"), _loader(state))
+        await cached_entry(("templates",), _loader(state))
+        invalidate_plans("a")
+        assert ("plan", "a") not in bible_plan_cache.plan_cache
+        assert ("plan", "b") in bible_plan_cache.plan_cache
+        invalidate_templates()
+        assert ("templates",) not in bible_plan_cache.plan_cache
+        assert ("plan", "b") in bible_plan_cache.plan_cache
+
+    @pytest.mark.asyncio
+    async def test_load_racing_a_write_is_not_stored(self):
+        async def load():
+            invalidate_plans("a")
+            return {"id": "a"}
+
+        entry = await cached_entry(("plan", "a"), load)
+        assert entry["value"] == {"id": "a"}
+        assert ("plan", "a") not in bible_plan_cache.plan_cache
+
+    @pytest.mark.asyncio
+    async def test_missing_documents_are_not_cached(self):
+        state = {"calls": 0, "value": None}
+        assert await cached_entry(("plan", "x"), _loader(state)) is None
+        assert await cached_entry(("plan", "x"), _loader(state)) is None
+        assert state["calls"] == 2
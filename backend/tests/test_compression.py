@@ -0,0 +1,92 @@
+"""
+Unit tests for the response compression middleware.
+"""
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from helpers.compression import CompressionMiddleware, compression_metrics, is_compressible_type
+
+ITEMS = [{"id": i, "title": f"Sunday service {i}", "location": "Main sanctuary"} for i in range(200)]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    async def big():
+        return JSONResponse(ITEMS, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" + b"\x00" * 5000, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for item in ITEMS:
+                yield (json.dumps(item) + "\n").encode()
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    compression_metrics.reset()
+    return TestClient(app)
+
+
+def raw_get(client, path, encoding="gzip"):
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as resp:
+        return resp, b"".join(resp.iter_raw())
+
+
+class TestCompressionMiddleware:
+    def test_large_json_is_gzipped(self, client):
+        resp, raw = raw_get(client, "/big")
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert resp.headers["etag"] == 'W/"abc"'
+        assert int(resp.headers["content-length"]) == len(raw)
+        assert json.loads(gzip.decompress(raw)) == ITEMS
+
+        metrics = compression_metrics.snapshot()
+        assert metrics["compressed_responses"] == 1
+        assert metrics["bytes_saved"] > 0
+
+    def test_small_and_binary_bodies_pass_through(self, client):
+        resp, raw = raw_get(client, "/small")
+        assert "content-encoding" not in resp.headers
+        assert json.loads(raw) == {"ok": True}
+
+        resp, raw = raw_get(client, "/image")
+        assert "content-encoding" not in resp.headers
+        assert raw.startswith(b"\x89PNG")
+        assert compression_metrics.snapshot()["skipped_small_responses"] == 1
+
+    def test_streaming_response(self, client):
+        resp, raw = raw_get(client, "/stream")
+        assert resp.headers["content-encoding"] == "gzip"
+        assert "content-length" not in resp.headers
+        lines = gzip.decompress(raw).decode().splitlines()
+        assert [json.loads(line) for line in lines] == ITEMS
+
+    def test_client_without_gzip(self, client):
+        resp, raw = raw_get(client, "/big", encoding="identity")
+        assert "content-encoding" not in resp.headers
+        assert json.loads(raw) == ITEMS
+
+    def test_compressible_types(self):
+        assert is_compressible_type("application/json")
+        assert is_compressible_type("text/html; charset=utf-8")
+        assert is_compressible_type("application/problem+json")
+        assert is_compressible_type("image/svg+xml")
+        assert not is_compressible_type("image/webp")
+        assert not is_compressible_type("application/octet-stream")
@@ -0,0 +1,173 @@
+"""
+Unit tests for the email outbox: claiming, retry backoff and the SMTP session pool.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+import helpers.EmailOutbox as outbox_module
+from helpers.EmailOutbox import (
+    OUTBOX_COLLECTION,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETRY_MAX_SECONDS,
+    EmailOutbox,
+    SMTPConnectionPool,
+    _retry_delay,
+)
+
+
+def _matches(doc, query):
+    for field, cond in query.items():
+        value = doc.get(field)
+        if isinstance(cond, dict):
+            if "$lte" in cond and not (value is not None and value <= cond["$lte"]):
+                return False
+            if "$in" in cond and value not in cond["$in"]:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+def _apply(doc, update):
+    doc.update(update.get("$set", {}))
+    for field, amount in update.get("$inc", {}).items():
+        doc[field] = doc.get(field, 0) + amount
+    for field in update.get("$unset", {}):
+        doc.pop(field, None)
+
+
+class FakeOutbox:
+    """Just enough of a Motor collection for the outbox; each call is atomic like a single Mongo op."""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def find_one_and_update(self, query, update, sort=None, return_document=None):
+        await asyncio.sleep(0)  # let concurrent claimers interleave between operations
+        due = sorted((d for d in self.docs if _matches(d, query)), key=lambda d: d["next_attempt_at"])
+        if not due:
+            return None
+        _apply(due[0], update)
+        return dict(due[0])
+
+    async def update_many(self, query, update):
+        for doc in self.docs:
+            if _matches(doc, query):
+                _apply(doc, update)
+
+    async def update_one(self, query, update):
+        for doc in self.docs:
+            if _matches(doc, query):
+                _apply(doc, update)
+                return
+
+
+def _pending(**overrides):
+    doc = EmailOutbox._new_doc("a@example.com", "Subject", "<p>hi</p>", "hi", "smtp", None)
+    doc["_id"] = ObjectId()
+    doc["next_attempt_at"] = datetime.utcnow() - timedelta(seconds=1)
+    doc.update(overrides)
+    return doc
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    docs = []
+    monkeypatch.setattr(outbox_module.DB, "db", {OUTBOX_COLLECTION: FakeOutbox(docs)})
+    return docs
+
+
+class TestClaim:
+    @pytest.mark.asyncio
+    async def test_concurrent_claims_never_overlap(self, outbox):
+        outbox.extend(_pending() for _ in range(10))
+        outbox.append(_pending(next_attempt_at=datetime.utcnow() + timedelta(hours=1)))
+
+        first, second = await asyncio.gather(EmailOutbox._claim_batch(6), EmailOutbox._claim_batch(6))
+        first_ids = {d["_id"] for d in first}
+        second_ids = {d["_id"] for d in second}
+        assert not first_ids & second_ids
+        assert len(first_ids | second_ids) == 10
+        assert all(d["attempts"] == 1 for d in first + second)
+        assert outbox[-1]["status"] == "pending"
+
+    @pytest.mark.asyncio
+    async def test_claimed_emails_are_not_reclaimed(self, outbox):
+        outbox.append(_pending())
+        assert len(await EmailOutbox._claim_batch(5)) == 1
+        assert await EmailOutbox._claim_batch(5) == []
+
+
+class TestRetry:
+    def test_backoff_doubles_and_caps(self):
+        assert _retry_delay(1) == timedelta(seconds=30)
+        assert _retry_delay(2) == timedelta(seconds=60)
+        assert _retry_delay(3) == timedelta(seconds=120)
+        assert _retry_delay(50) == timedelta(seconds=OUTBOX_RETRY_MAX_SECONDS)
+
+    @pytest.mark.asyncio
+    async def test_record_results(self, outbox):
+        sent, retry, refused, exhausted = (
+            _pending(status="sending", attempts=1),
+            _pending(status="sending", attempts=2),
+            _pending(status="sending", attempts=1),
+            _pending(status="sending", attempts=OUTBOX_MAX_ATTEMPTS),
+        )
+        outbox.extend([sent, retry, refused, exhausted])
+        before = datetime.utcnow()
+        await EmailOutbox._record_results(list(outbox), [
+            (sent["_id"], None, False),
+            (retry["_id"], "timeout", False),
+            (refused["_id"], "recipient refused", True),
+            (exhausted["_id"], "timeout", False),
+        ])
+
+        assert sent["status"] == "sent"
+        assert retry["status"] == "pending" and retry["last_error"] == "timeout"
+        assert retry["next_attempt_at"] >= before + _retry_delay(2)
+        assert refused["status"] == "failed"
+        assert exhausted["status"] == "failed"
+
+
+class FakeServer:
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+
+    def noop(self):
+        return (250 if self.alive else 421, b"")
+
+    def quit(self):
+        self.closed = True
+
+
+class TestPool:
+    def test_reuses_live_sessions_and_skips_dead_ones(self, monkeypatch):
+        fresh = []
+        monkeypatch.setattr(SMTPConnectionPool, "_connect", staticmethod(lambda: fresh.append(FakeServer()) or fresh[-1]))
+        pool = SMTPConnectionPool(size=2)
+        live, dead = FakeServer(), FakeServer(alive=False)
+        pool.release(live, 3)
+        pool.release(dead, 1)
+
+        assert pool.acquire() == (live, 3)
+        assert dead.closed
+        server, sent = pool.acquire()
+        assert server is fresh[0] and sent == 0
+
+    def test_recycles_full_or_broken_sessions_and_caps_idle(self, monkeypatch):
+        monkeypatch.setattr(outbox_module, "SMTP_MAX_MESSAGES_PER_CONNECTION", 10)
+        pool = SMTPConnectionPool(size=1)
+        full, broken, kept, extra = FakeServer(), FakeServer(), FakeServer(), FakeServer()
+        pool.release(full, 10)
+        pool.release(broken, 1, broken=True)
+        pool.release(kept, 1)
+        pool.release(extra, 1)
+        assert full.closed and broken.closed and extra.closed
+        assert not kept.closed
+        pool.close_all()
+        assert kept.closed
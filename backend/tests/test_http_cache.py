@@ -0,0 +1,47 @@
+"""
+Unit tests for the shared ETag response helper.
+"""
+
+from starlette.requests import Request
+
+from helpers.http_cache import content_etag, etag_matches, etag_response
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+ETAG = content_etag(b'{"a":1}')
+
+
+class TestEtagMatches:
+    def test_exact_weak_and_list(self):
+        assert etag_matches(_request(ETAG), ETAG)
+        assert etag_matches(_request(f"W/{ETAG}"), ETAG)
+        assert etag_matches(_request(f'"other", {ETAG}'), ETAG)
+
+    def test_star_matches_any(self):
+        assert etag_matches(_request("*"), ETAG)
+
+    def test_missing_or_different(self):
+        assert not etag_matches(_request(), ETAG)
+        assert not etag_matches(_request('"other"'), ETAG)
+
+
+class TestEtagResponse:
+    def test_full_body_then_304(self):
+        full = etag_response(_request(), b'{"a":1}', ETAG)
+        assert full.status_code == 200
+        assert full.body == b'{"a":1}'
+        assert full.headers["etag"] == ETAG
+        assert full.headers["cache-control"] == "no-cache"
+
+        cached = etag_response(_request(ETAG), b'{"a":1}', ETAG)
+        assert cached.status_code == 304
+        assert cached.body == b""
+        assert cached.headers["etag"] == ETAG
+
+    def test_media_type(self):
+        html = etag_response(_request(), "<html></html>", content_etag("<html></html>"), media_type="text/html")
+        assert html.headers["content-type"].startswith("text/html")
@@ -0,0 +1,182 @@
+"""
+Unit tests for upload streaming, thumbnail/variant generation and variant selection.
+"""
+
+import hashlib
+import io
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from helpers.image_derivatives import derivative_files, generate_derivatives, variant_formats
+import controllers.assets_controller as assets_controller
+from controllers.assets_controller import (
+    _should_probe_dimensions,
+    _stream_upload_to_disk,
+    resolve_asset_file_by_id,
+    select_asset_variant,
+    upload_images,
+)
+from models.image_data import UploadImageRequest
+
+
+def _write_image(path, size):
+    Image.new("RGB", size, (200, 30, 30)).save(path, format="PNG")
+
+
+class TestGenerateDerivatives:
+    def test_writes_thumbnail_and_bounded_variants(self, tmp_path):
+        src = tmp_path / "a.png"
+        _write_image(src, (1200, 600))
+        out = tmp_path / "thumbs"
+
+        result = generate_derivatives(str(src), str(out), "abc", "png")
+
+        assert result["width"] == 1200 and result["height"] == 600
+        assert result["thumbnail"]["file"] == "abc.thumb.webp"
+        assert max(result["thumbnail"]["width"], result["thumbnail"]["height"]) <= 320
+        widths = sorted({v["width"] for v in result["variants"]})
+        assert widths == [480, 960, 1200]
+        assert {v["format"] for v in result["variants"]} == set(variant_formats())
+        for name in derivative_files(result):
+            assert (out / name).exists()
+
+    def test_small_original_gets_full_width_copy(self, tmp_path):
+        src = tmp_path / "small.png"
+        _write_image(src, (300, 200))
+        result = generate_derivatives(str(src), str(tmp_path), "s", "png")
+        assert {v["width"] for v in result["variants"]} == {300}
+
+    def test_unsupported_inputs_return_none(self, tmp_path):
+        src = tmp_path / "doc.svg"
+        src.write_text("<svg/>")
+        assert generate_derivatives(str(src), str(tmp_path), "x", "svg") is None
+        bogus = tmp_path / "broken.png"
+        bogus.write_bytes(b"not an image")
+        assert generate_derivatives(str(bogus), str(tmp_path), "y", "png") is None
+
+
+class TestSelectAssetVariant:
+    doc = {
+        "derivatives": {
+            "thumbnail": {"file": "id.thumb.webp"},
+            "variants": [
+                {"file": "id.w480.avif", "width": 480, "format": "avif"},
+                {"file": "id.w480.webp", "width": 480, "format": "webp"},
+                {"file": "id.w960.webp", "width": 960, "format": "webp"},
+            ],
+        }
+    }
+
+    def test_prefers_avif_when_accepted(self):
+        assert select_asset_variant(self.doc, width=400, accept="image/avif,image/webp,*/*") == ("w480.avif", "id.w480.avif")
+
+    def test_picks_smallest_wide_enough_webp(self):
+        assert select_asset_variant(self.doc, width=500, accept="image/webp") == ("w960.webp", "id.w960.webp")
+
+    def test_accept_alone_serves_the_largest_variant(self):
+        assert select_asset_variant(self.doc, accept="image/webp") == ("w960.webp", "id.w960.webp")
+        assert select_asset_variant(self.doc, accept="image/avif,image/webp") == ("w480.avif", "id.w480.avif")
+        assert select_asset_variant(self.doc, accept="image/*") == ("full", None)
+
+    @pytest.mark.asyncio
+    async def test_download_name_uses_the_served_format(self, tmp_path, monkeypatch):
+        doc = dict(self.doc, _id="id", name="photo", extension="jpg", path="data/assets/photo.jpg")
+        served = tmp_path / "id.w960.webp"
+        served.write_bytes(b"webp")
+
+        async def fake_get_image_data(id_str):
+            return doc
+
+        monkeypatch.setattr(assets_controller, "get_image_data", fake_get_image_data)
+        monkeypatch.setattr(assets_controller, "_resolve_asset_file", lambda doc, thumbnail, file: str(served))
+        asset = await resolve_asset_file_by_id("id", accept="image/webp")
+        assert asset["download_name"] == "photo.webp"
+
+        original = tmp_path / "photo.jpg"
+        original.write_bytes(b"jpg")
+        monkeypatch.setattr(assets_controller, "_resolve_asset_file", lambda doc, thumbnail, file: str(original))
+        asset = await resolve_asset_file_by_id("id", accept="image/png")
+        assert asset["download_name"] == "photo.jpg"
+
+    def test_falls_back_to_original(self):
+        assert select_asset_variant(self.doc, width=400, accept="image/png") == ("full", None)
+        assert select_asset_variant(self.doc, width=2000, accept="image/webp") == ("full", None)
+        assert select_asset_variant({}, thumbnail=True) == ("thumb", None)
+        assert select_asset_variant(self.doc, thumbnail=True) == ("thumb.webp", "id.thumb.webp")
+
+
+class TestStreamUpload:
+    def test_hash_and_dimensions_from_stream(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("controllers.assets_controller.UPLOAD_CHUNK_SIZE", 64)
+        buf = io.BytesIO()
+        Image.new("RGB", (640, 480), (1, 2, 3)).save(buf, format="JPEG")
+        payload = buf.getvalue()
+
+        dest = tmp_path / "out.jpg"
+        content_hash, width, height = _stream_upload_to_disk(io.BytesIO(payload), str(dest))
+
+        assert dest.read_bytes() == payload
+        assert content_hash == hashlib.sha256(payload).hexdigest()
+        assert (width, height) == (640, 480)
+
+    def test_non_image_has_no_dimensions(self, tmp_path):
+        content_hash, width, height = _stream_upload_to_disk(io.BytesIO(b"%PDF-1.4 hello"), str(tmp_path / "a.pdf"))
+        assert content_hash == hashlib.sha256(b"%PDF-1.4 hello").hexdigest()
+        assert width is None and height is None
+
+    def test_only_raster_uploads_are_probed(self):
+        assert _should_probe_dimensions("jpg", None)
+        assert _should_probe_dimensions("bin", "image/heic")
+        assert not _should_probe_dimensions("pdf", "application/pdf")
+        assert not _should_probe_dimensions("svg", "image/svg+xml")
+
+    def test_probe_stops_buffering_after_cap(self, tmp_path, monkeypatch):
+        fed = []
+
+        class RecordingParser:
+            image = None
+
+            def feed(self, data):
+                fed.append(len(data))
+
+            def close(self):
+                pass
+
+        monkeypatch.setattr(assets_controller.ImageFile, "Parser", RecordingParser)
+        monkeypatch.setattr(assets_controller, "UPLOAD_CHUNK_SIZE", 1000)
+        monkeypatch.setattr(assets_controller, "DIMENSION_PROBE_MAX_BYTES", 2500)
+        payload = b"x" * 10_000
+        _stream_upload_to_disk(io.BytesIO(payload), str(tmp_path / "a.jpg"))
+        assert sum(fed) == 2500
+
+        fed.clear()
+        _stream_upload_to_disk(io.BytesIO(payload), str(tmp_path / "b.zip"), probe_dimensions=False)
+        assert fed == []
+
+    def test_failed_copy_removes_partial_file(self, tmp_path):
+        class Broken(io.BytesIO):
+            def read(self, size=-1):
+                raise OSError("disk full")
+
+        dest = tmp_path / "a.bin"
+        with pytest.raises(OSError):
+            _stream_upload_to_disk(Broken(b"data"), str(dest))
+        assert not dest.exists()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_leaves_no_files(self, tmp_path, monkeypatch):
+        class Broken(io.BytesIO):
+            def read(self, size=-1):
+                raise OSError("read error")
+
+        monkeypatch.setattr(assets_controller, "_ensure_dirs", lambda folder: (str(tmp_path), str(tmp_path)))
+        files = [
+            SimpleNamespace(filename="a.txt", content_type="text/plain", file=io.BytesIO(b"one")),
+            SimpleNamespace(filename="b.txt", content_type="text/plain", file=Broken(b"two")),
+            SimpleNamespace(filename="c.txt", content_type="text/plain", file=io.BytesIO(b"three")),
+        ]
+        with pytest.raises(OSError):
+            await upload_images(UploadImageRequest(), files)
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,197 @@
+"""
+Unit tests for keyset cursors, pagination helpers and the admin user search keys.
+"""
+
+import re
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+
+from helpers.keyset_pagination import (
+    count_total,
+    decode_cursor,
+    encode_cursor,
+    invalidate_counts,
+    keyset_filter,
+    paginate_pipeline,
+    with_tiebreaker,
+)
+from models.refund_request import delete_refund_request
+from mongo.churchuser import USER_SEARCH_MAX_NGRAM, build_user_search_keys, user_search_filter
+from mongo.database import DB
+
+
+class TestCursor:
+    def test_round_trips_bson_types(self):
+        sort = with_tiebreaker([("createdOn", -1), ("uid", 1)])
+        doc = {"_id": ObjectId(), "createdOn": datetime(2024, 5, 1, 9, 30), "uid": "abc"}
+        values = decode_cursor(encode_cursor(doc, sort), sort)
+        assert values == [doc["createdOn"], "abc", doc["_id"]]
+
+    def test_rejects_garbage_and_mismatched_sort(self):
+        sort = [("email", 1), ("_id", 1)]
+        assert decode_cursor("not a cursor!", sort) is None
+        assert decode_cursor(None, sort) is None
+        cursor = encode_cursor({"email": "a@b.c", "_id": 1}, sort)
+        assert decode_cursor(cursor, [("email", 1)]) is None
+
+    def test_tiebreaker_follows_last_direction(self):
+        assert with_tiebreaker([("a", -1)]) == [("a", -1), ("_id", -1)]
+        assert with_tiebreaker([("a", 1), ("_id", 1)]) == [("a", 1), ("_id", 1)]
+
+
+class TestKeysetFilter:
+    def test_mixed_directions(self):
+        filt = keyset_filter([("last_name", -1), ("email", 1)], ["Smith", "a@b.c"])
+        assert filt == {"$or": [
+            {"$or": [{"last_name": {"$lt": "Smith"}}, {"last_name": None}]},
+            {"$and": [{"last_name": "Smith"}, {"email": {"$gt": "a@b.c"}}]},
+        ]}
+
+    def test_null_values(self):
+        filt = keyset_filter([("membership", 1), ("uid", 1)], [None, "u1"])
+        assert filt == {"$or": [
+            {"membership": {"$ne": None}},
+            {"$and": [{"membership": None}, {"uid": {"$gt": "u1"}}]},
+        ]}
+
+
+class _Aggregate:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs[:length]
+
+
+class _FakeCollection:
+    """Records calls; returns canned rows."""
+
+    name = "things"
+
+    def __init__(self, docs=None):
+        self.docs = docs or []
+        self.pipelines = []
+        self.counts = 0
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return _Aggregate(self.docs)
+
+    async def count_documents(self, filt, **kwargs):
+        self.counts += 1
+        return 42
+
+
+class _FakeWritableCollection(_FakeCollection):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    async def insert_one(self, doc):
+        return SimpleNamespace(inserted_id=ObjectId())
+
+    async def delete_one(self, query):
+        return SimpleNamespace(deleted_count=1)
+
+
+class TestPaginatePipeline:
+    @pytest.mark.asyncio
+    async def test_page_stages_run_after_limit(self):
+        docs = [{"_id": i, "n": i} for i in range(3)]
+        coll = _FakeCollection(docs)
+        shape = {"$project": {"n": 1}}
+        page, next_cursor = await paginate_pipeline(
+            coll, [{"$match": {"a": 1}}], [("n", 1)], 2, skip=4, stages=[shape]
+        )
+        assert page == docs[:2]
+        assert decode_cursor(next_cursor, [("n", 1), ("_id", 1)]) == [1, 1]
+        assert coll.pipelines[0] == [
+            {"$match": {"a": 1}},
+            {"$sort": {"n": 1, "_id": 1}},
+            {"$skip": 4},
+            {"$limit": 3},
+            shape,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_cursor_replaces_skip(self):
+        coll = _FakeCollection([{"_id": 9, "n": 5}])
+        cursor = encode_cursor({"_id": 3, "n": 5}, [("n", 1), ("_id", 1)])
+        page, next_cursor = await paginate_pipeline(coll, [], [("n", 1)], 10, cursor=cursor, skip=20)
+        assert next_cursor is None and len(page) == 1
+        stages = coll.pipelines[0]
+        assert stages[0] == {"$match": keyset_filter([("n", 1), ("_id", 1)], [5, 3])}
+        assert not any("$skip" in stage for stage in stages)
+
+
+class TestCountTotal:
+    @pytest.mark.asyncio
+    async def test_cached_mode_reuses_count_until_invalidated(self):
+        coll = _FakeCollection()
+        invalidate_counts(coll.name)
+        assert await count_total(coll, {"a": 1}, "cached") == (42, False)
+        assert await count_total(coll, {"a": 1}, "cached") == (42, False)
+        assert coll.counts == 1
+        invalidate_counts(coll.name)
+        await count_total(coll, {"a": 1}, "cached")
+        assert coll.counts == 2
+
+    @pytest.mark.asyncio
+    async def test_writes_drop_cached_totals(self, monkeypatch):
+        coll = _FakeWritableCollection("refund_requests")
+        monkeypatch.setattr(DB, "db", {coll.name: coll})
+        invalidate_counts(coll.name)
+        await count_total(coll, {}, "cached")
+        await DB.insert_document(coll.name, {"uid": "u1"})
+        await count_total(coll, {}, "cached")
+        await delete_refund_request(str(ObjectId()))
+        await count_total(coll, {}, "cached")
+        assert coll.counts == 3
+
+    @pytest.mark.asyncio
+    async def test_none_mode_skips_counting(self):
+        coll = _FakeCollection()
+        assert await count_total(coll, {}, "none") == (None, False)
+        assert coll.counts == 0
+
+
+class TestUserSearchKeys:
+    def test_builds_folded_prefixes(self):
+        keys = build_user_search_keys("José", "O'Neil", " Jose.Oneil@Example.com ")
+        assert keys["email"] == "jose.oneil@example.com"
+        assert keys["name_tokens"] == ["jose", "neil", "o"]
+        assert {"j", "jo", "jos", "jose", "n", "ne"} <= set(keys["name_ngrams"])
+        assert {"exa", "oneil", "com"} <= set(keys["email_ngrams"])
+
+    def test_long_words_are_capped(self):
+        keys = build_user_search_keys("Bartholomewsonington", "", "")
+        assert max(len(g) for g in keys["name_ngrams"]) == USER_SEARCH_MAX_NGRAM
+
+    def test_name_filter(self):
+        assert user_search_filter("name", "Jo") == {"search.name_ngrams": "jo"}
+        assert user_search_filter("name", "jo sm") == {"$and": [
+            {"search.name_ngrams": "jo"},
+            {"search.name_ngrams": "sm"},
+        ]}
+        long_term = "bartholomewsonington"
+        assert user_search_filter("name", long_term) == {"$and": [
+            {"search.name_ngrams": long_term[:USER_SEARCH_MAX_NGRAM]},
+            {"search.name_tokens": {"$regex": "^" + long_term}},
+        ]}
+
+    def test_long_email_word_is_anchored_at_a_word_start(self):
+        long_word = "bartholomewsonington"
+        filt = user_search_filter("email", long_word)
+        word_start = filt["$or"][1]["$and"][0]["$and"][1]["search.email"]["$regex"]
+        assert re.search(word_start, "j.bartholomewsonington@example.com")
+        assert not re.search(word_start, "xbartholomewsonington@example.com")
+
+    def test_email_filter_matches_prefix_or_words(self):
+        filt = user_search_filter("email", "Jo.Sm")
+        assert filt == {"$or": [
+            {"search.email": {"$regex": r"^jo\.sm"}},
+            {"$and": [{"search.email_ngrams": "jo"}, {"search.email_ngrams": "sm"}]},
+        ]}
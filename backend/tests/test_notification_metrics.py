@@ -0,0 +1,105 @@
+"""
+Unit tests for compact notification delivery stats and metric summaries.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from firebase_admin import exceptions as firebase_exceptions
+from firebase_admin import messaging
+
+import scripts.notification_recipients_migration as recipients_migration
+
+from mongo.notification_metrics import (
+    DeliveryStats,
+    classify_fcm_error,
+    is_stale_token_error,
+    percentile,
+    summarize_delivery_docs,
+)
+
+
+class TestDeliveryStats:
+    def test_counts_and_error_classes(self):
+        stats = DeliveryStats()
+        stats.start_batch(3)
+        stats.record_success()
+        assert stats.record_failure(messaging.UnregisteredError("gone")) == "unregistered"
+        assert stats.record_failure(RuntimeError("boom")) == "other"
+        stats.record_pruned(1)
+
+        doc = stats.finish().to_doc()
+        assert doc["attempted"] == 3
+        assert doc["succeeded"] == 1
+        assert doc["failed"] == 2
+        assert doc["errors"] == {"unregistered": 1, "other": 1}
+        assert doc["tokens_pruned"] == 1
+        assert doc["batches"] == 1
+        assert doc["duration_ms"] >= 0
+
+    def test_legacy_messages_are_classified(self):
+        assert classify_fcm_error(Exception("Requested entity was not found")) == "not_found"
+        assert classify_fcm_error(Exception("Token expired")) == "expired"
+        assert is_stale_token_error("not_found")
+        assert not is_stale_token_error("unavailable")
+        assert not is_stale_token_error("expired")
+
+    def test_invalid_argument_prunes_only_for_token_errors(self):
+        bad_token = firebase_exceptions.InvalidArgumentError("The registration token is not a valid FCM registration token")
+        bad_payload = firebase_exceptions.InvalidArgumentError("Invalid JSON payload received. Unknown name \"badge\"")
+        assert is_stale_token_error(classify_fcm_error(bad_token), bad_token)
+        assert classify_fcm_error(bad_payload) == "invalid_argument"
+        assert not is_stale_token_error(classify_fcm_error(bad_payload), bad_payload)
+        assert not is_stale_token_error("invalid_argument")
+
+
+class TestSummaries:
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 50) is None
+
+    def test_summarize_delivery_docs(self):
+        docs = [
+            {"attempted": 10, "succeeded": 9, "failed": 1, "errors": {"unregistered": 1},
+             "tokens_pruned": 1, "batches": 1, "duration_ms": 1000},
+            {"attempted": 30, "succeeded": 30, "failed": 0, "errors": {},
+             "tokens_pruned": 0, "batches": 1, "duration_ms": 1000},
+        ]
+        summary = summarize_delivery_docs(docs)
+        assert summary["notifications"] == 2
+        assert summary["attempted"] == 40
+        assert summary["errors"] == {"unregistered": 1}
+        assert summary["throughput_per_second"] == 20.0
+        assert summary["success_rate"] == 0.975
+        assert summary["latency_ms"]["p50"] == 1000.0
+
+    def test_summarize_empty(self):
+        summary = summarize_delivery_docs([])
+        assert summary["notifications"] == 0
+        assert summary["throughput_per_second"] is None
+
+
+class _FakeNotifications:
+    def __init__(self):
+        self.calls = []
+
+    async def update_many(self, query, update):
+        self.calls.append((query, update))
+        return SimpleNamespace(modified_count=2)
+
+
+class TestRecipientsMigration:
+    @pytest.mark.asyncio
+    async def test_count_is_written_and_token_list_unset_in_one_update(self, monkeypatch):
+        coll = _FakeNotifications()
+        monkeypatch.setattr(recipients_migration.DB, "db", {"notifications": coll}, raising=False)
+
+        assert await recipients_migration.run_notification_recipients_migration() == 2
+
+        assert len(coll.calls) == 1
+        query, pipeline = coll.calls[0]
+        assert query == {"recipients": {"$exists": True}}
+        assert "recipient_count" in pipeline[0]["$set"]
+        assert pipeline[-1] == {"$unset": "recipients"}
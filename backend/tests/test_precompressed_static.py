@@ -0,0 +1,74 @@
+"""
+Unit tests for the precompressed, immutable-cached frontend asset mount.
+"""
+
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from helpers.precompressed_static import (
+    IMMUTABLE_CACHE_CONTROL,
+    PrecompressedStaticFiles,
+    accepted_encodings,
+    is_hashed_asset,
+)
+
+JS = b"console.log('hello');" * 100
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "index-AbCd1234.js").write_bytes(JS)
+    (tmp_path / "index-AbCd1234.js.gz").write_bytes(gzip.compress(JS))
+    (tmp_path / "index-AbCd1234.js.br").write_bytes(b"not-really-brotli")
+    (tmp_path / "logo.svg").write_bytes(b"<svg/>")
+    app = Starlette(routes=[Mount("/assets", PrecompressedStaticFiles(directory=str(tmp_path)))])
+    return TestClient(app)
+
+
+class TestHelpers:
+    def test_is_hashed_asset(self):
+        assert is_hashed_asset("assets/index-BXk3a9_z.js")
+        assert is_hashed_asset("vendor-react-DQ1x-2pA.css")
+        assert not is_hashed_asset("logo.svg")
+        assert not is_hashed_asset("my-logo.svg")
+
+    def test_accepted_encodings(self):
+        assert accepted_encodings("gzip, deflate, br") == {"gzip": 1.0, "deflate": 1.0, "br": 1.0}
+        assert accepted_encodings("br;q=0, gzip;q=0.5") == {"gzip": 0.5}
+        assert accepted_encodings("") == {}
+
+
+class TestPrecompressedStaticFiles:
+    def test_prefers_brotli(self, client):
+        resp = client.get("/assets/index-AbCd1234.js", headers={"Accept-Encoding": "gzip, br"})
+        assert resp.headers["content-encoding"] == "br"
+        assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert resp.headers["content-type"].startswith("text/javascript")
+
+    def test_falls_back_to_gzip(self, client):
+        resp = client.get("/assets/index-AbCd1234.js", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.content == JS
+
+    def test_identity_when_nothing_accepted(self, client):
+        resp = client.get("/assets/index-AbCd1234.js", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in resp.headers
+        assert resp.content == JS
+
+    def test_unhashed_file_is_revalidated(self, client):
+        resp = client.get("/assets/logo.svg")
+        assert resp.headers["cache-control"] == "no-cache"
+        assert "vary" not in resp.headers
+
+    def test_not_modified(self, client):
+        first = client.get("/assets/index-AbCd1234.js", headers={"Accept-Encoding": "gzip"})
+        resp = client.get(
+            "/assets/index-AbCd1234.js",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]},
+        )
+        assert resp.status_code == 304
@@ -0,0 +1,116 @@
+"""
+Unit tests for the Jinja2 refund email templates and the batch render/queue path.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import helpers.RefundEmailHelper as refund_email
+from helpers.RefundEmailHelper import RefundEmailTemplates, send_refund_emails_batch
+
+
+class TestRendering:
+    def test_rejected_renders_html_and_text(self):
+        email = RefundEmailTemplates.refund_rejected("Ann", "Retreat", 25, "RR-1", "Past the deadline")
+        assert email["subject"] == "Refund Request Update - Retreat"
+        assert "Dear Ann," in email["html"] and "$25.00" in email["html"]
+        assert "Past the deadline" in email["text"]
+        assert "<" not in email["text"]
+
+    def test_html_escapes_user_input_but_text_does_not(self):
+        email = RefundEmailTemplates.refund_rejected("<b>Ann</b>", "Tom & Jerry", 10, "RR-2", "<script>x</script>")
+        assert "<script>" not in email["html"]
+        assert "&lt;script&gt;" in email["html"]
+        assert "Tom &amp; Jerry" in email["html"]
+        assert "<b>Ann</b>" in email["text"]
+
+    def test_partial_refund_breakdown(self):
+        email = RefundEmailTemplates.refund_approved(
+            "Ann", "Retreat", 40, "RR-3", original_amount=100, refund_type="partial"
+        )
+        assert email["subject"] == "Partial Refund Approved - Retreat"
+        assert "$60.00" in email["text"]
+
+        full = RefundEmailTemplates.refund_approved("Ann", "Retreat", 100, "RR-4", original_amount=100, refund_type="partial")
+        assert full["subject"] == "Refund Approved - Retreat"
+
+
+class TestBatch:
+    def test_render_batch_addresses_each_recipient(self):
+        emails = RefundEmailTemplates.render_batch("refund_completed", [
+            {"to_email": "a@example.com", "user_name": "Ann", "event_name": "Retreat", "amount": 5, "request_id": "1"},
+            {"to_email": "b@example.com", "user_name": "Bob", "event_name": "Retreat", "amount": 7, "request_id": "2"},
+        ])
+        assert [e["to"] for e in emails] == ["a@example.com", "b@example.com"]
+        assert "Dear Bob," in emails[1]["text"] and "$7.00" in emails[1]["text"]
+
+    @pytest.mark.asyncio
+    async def test_send_batch_queues_one_insert(self, monkeypatch):
+        queued = []
+
+        async def fake_enqueue_many(emails, provider="smtp", category=None):
+            queued.append((emails, category))
+            return {"success": True, "queued": len(emails), "outbox_ids": []}
+
+        monkeypatch.setattr(refund_email.EmailOutbox, "enqueue_many", staticmethod(fake_enqueue_many))
+        result = await send_refund_emails_batch("refund_rejected", [
+            {"to_email": "a@example.com", "user_name": "Ann", "event_name": "Retreat", "amount": 5, "request_id": "1", "reason": "No"},
+        ])
+        assert result["queued"] == 1
+        assert len(queued) == 1 and queued[0][1] == "refund"
+
+    @pytest.mark.asyncio
+    async def test_send_batch_reports_unknown_template(self):
+        result = await send_refund_emails_batch("refund_missing", [{"to_email": "a@example.com"}])
+        assert result["success"] is False
+
+
+class _FakeCursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    async def to_list(self, length=None):
+        return list(self._docs)
+
+
+class _FakeUsers:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        uids = query["uid"]["$in"]
+        return _FakeCursor([d for d in self.docs if d["uid"] in uids])
+
+
+class TestEventDeletionBatch:
+    @pytest.mark.asyncio
+    async def test_deleted_event_refunds_go_out_as_one_batch(self, monkeypatch):
+        import controllers.event_controllers.admin_event_controller as admin_events
+
+        users = _FakeUsers([
+            {"uid": "u1", "email": "a@example.com", "first_name": "Ann", "last_name": "Lee"},
+            {"uid": "u2", "email": "b@example.com", "first_name": "Bob", "last_name": "Ray"},
+        ])
+        monkeypatch.setattr(admin_events.DB, "db", {"users": users}, raising=False)
+
+        batches = []
+
+        async def fake_batch(template, recipients):
+            batches.append((template, recipients))
+            return {"success": True, "queued": len(recipients)}
+
+        monkeypatch.setattr(admin_events, "send_refund_emails_batch", fake_batch)
+
+        event = SimpleNamespace(id="e1", localizations={"en": SimpleNamespace(title="Retreat")})
+        await admin_events._notify_event_refunds(event, {"u1": 10.0, "u2": 7.5})
+
+        assert len(batches) == 1
+        template, recipients = batches[0]
+        assert template == "refund_completed"
+        assert {(r["to_email"], r["amount"], r["event_name"]) for r in recipients} == {
+            ("a@example.com", 10.0, "Retreat"),
+            ("b@example.com", 7.5, "Retreat"),
+        }
+        # Rendering the real template with these recipients must work
+        assert len(RefundEmailTemplates.render_batch(template, recipients)) == 2
@@ -0,0 +1,124 @@
+"""
+Unit tests for the emails queued by refund request submission and admin responses.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+
+import controllers.refund_request_controller as controller
+from models.refund_request import RefundRequestAdminUpdate, RefundRequestIn
+
+
+REQUEST_ID = ObjectId()
+CTX = {"to_email": "ann@example.com", "user_name": "Ann Lee", "event_name": "Retreat", "amount": 25.0}
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    calls = []
+
+    def record(name):
+        async def fake(*args, **kwargs):
+            calls.append((name, args, kwargs))
+            return {"success": True}
+        return fake
+
+    for name in (
+        "send_refund_request_confirmation",
+        "send_admin_refund_alert",
+        "send_refund_approved_notification",
+        "send_refund_rejected_notification",
+    ):
+        monkeypatch.setattr(controller, name, record(name))
+
+    async def fake_context(uid, txn_kind, txn_id):
+        return dict(CTX)
+
+    async def fake_by_id(id):
+        return {"_id": REQUEST_ID, "uid": "u1", "txn_kind": "event", "txn_id": "t1"}
+
+    async def fake_by_user_and_txn(uid, txn_kind, txn_id):
+        return {"_id": REQUEST_ID}
+
+    monkeypatch.setattr(controller, "_refund_email_context", fake_context)
+    monkeypatch.setattr(controller, "_get_refund_request_by_id", fake_by_id)
+    monkeypatch.setattr(controller, "_get_refund_request_by_user_and_txn", fake_by_user_and_txn)
+    return calls
+
+
+class TestSubmission:
+    @pytest.mark.asyncio
+    async def test_submission_queues_confirmation_and_admin_alert(self, sent, monkeypatch):
+        async def fake_validate(uid, txn_kind, txn_id):
+            return {}
+
+        async def fake_create(uid, payload):
+            return {"success": True, "msg": "Created refund request"}
+
+        monkeypatch.setattr(controller, "_load_and_validate_transaction_for_user", fake_validate)
+        monkeypatch.setattr(controller, "create_or_update_refund_request_doc", fake_create)
+
+        request = SimpleNamespace(state=SimpleNamespace(uid="u1"))
+        body = RefundRequestIn(txn_kind="event", txn_id="t1", message="  Cannot attend  ")
+        await controller.create_or_update_refund_request(request, body)
+
+        assert [name for name, _, _ in sent] == ["send_refund_request_confirmation", "send_admin_refund_alert"]
+        assert sent[0][2]["request_id"] == str(REQUEST_ID)
+        assert sent[0][2]["to_email"] == "ann@example.com"
+        assert sent[1][1][0] == [controller.ADMIN_EMAIL]
+        assert sent[1][1][-1] == "Cannot attend"
+
+    @pytest.mark.asyncio
+    async def test_failed_write_sends_nothing(self, sent, monkeypatch):
+        async def fake_validate(uid, txn_kind, txn_id):
+            return {}
+
+        async def fake_create(uid, payload):
+            return {"success": False, "msg": "Failed to create refund request"}
+
+        monkeypatch.setattr(controller, "_load_and_validate_transaction_for_user", fake_validate)
+        monkeypatch.setattr(controller, "create_or_update_refund_request_doc", fake_create)
+
+        request = SimpleNamespace(state=SimpleNamespace(uid="u1"))
+        body = RefundRequestIn(txn_kind="event", txn_id="t1", message="Cannot attend")
+        await controller.create_or_update_refund_request(request, body)
+
+        assert sent == []
+
+
+class TestAdminResponse:
+    @pytest.fixture(autouse=True)
+    def updated(self, monkeypatch):
+        async def fake_update(body):
+            return {"success": True, "msg": "Refund request updated"}
+
+        monkeypatch.setattr(controller, "_update_refund_request_admin", fake_update)
+
+    @pytest.mark.asyncio
+    async def test_resolved_response_queues_approval(self, sent):
+        body = RefundRequestAdminUpdate(id=str(REQUEST_ID), responded=True, resolved=True, reason="Refunded to card")
+        await controller.admin_update_refund_request(body)
+
+        assert len(sent) == 1
+        name, _, kwargs = sent[0]
+        assert name == "send_refund_approved_notification"
+        assert kwargs["admin_notes"] == "Refunded to card"
+        assert kwargs["request_id"] == str(REQUEST_ID)
+
+    @pytest.mark.asyncio
+    async def test_unresolved_response_queues_rejection(self, sent):
+        body = RefundRequestAdminUpdate(id=str(REQUEST_ID), responded=True, resolved=False, reason="Past the deadline")
+        await controller.admin_update_refund_request(body)
+
+        assert [(name, kwargs["reason"]) for name, _, kwargs in sent] == [
+            ("send_refund_rejected_notification", "Past the deadline")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unanswered_update_sends_nothing(self, sent):
+        body = RefundRequestAdminUpdate(id=str(REQUEST_ID), responded=False, resolved=False)
+        await controller.admin_update_refund_request(body)
+
+        assert sent == []
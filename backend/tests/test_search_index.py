@@ -0,0 +1,125 @@
+"""
+Unit tests for search tokenization and index entry builders.
+"""
+
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+import models.search_index as search_index
+from models.search_index import MAX_TOKENS_PER_ENTRY, build_entries, fold_text, search_ref_ids, tokenize_text
+
+
+class TestTokenize:
+    def test_folds_case_and_accents(self):
+        assert fold_text("Oración ÉXITO") == "oracion exito"
+        assert tokenize_text("Oración", "oracion") == ["oracion"]
+
+    def test_splits_on_punctuation_markup_and_underscores(self):
+        assert tokenize_text("<p>Sunday_Service, 2024!</p>") == ["2024", "service", "sunday"]
+        assert tokenize_text(None, "") == []
+
+
+class TestEntryBuilders:
+    def test_sermon_entry(self):
+        oid = ObjectId()
+        posted = datetime(2024, 3, 3)
+        [entry] = build_entries("sermon", {
+            "_id": oid,
+            "title": "Grace Abounds",
+            "description": "A study of Romans",
+            "speaker": "Pastor Lee",
+            "tags": ["grace"],
+            "published": True,
+            "date_posted": posted,
+        })
+        assert entry["ref_id"] == str(oid)
+        assert entry["locale"] == ""
+        assert entry["title_tokens"] == ["abounds", "grace"]
+        assert {"romans", "lee", "study"} <= set(entry["tokens"])
+        assert entry["visible"] is True
+        assert entry["date"] == posted
+
+    def test_event_gets_one_entry_per_locale(self):
+        entries = build_entries("event", {
+            "_id": ObjectId(),
+            "hidden": True,
+            "localizations": {
+                "en": {"title": "Youth Camp", "description": "Summer retreat", "location_info": "Lake"},
+                "es": {"title": "Campamento Juvenil", "description": "Retiro", "location_info": ""},
+            },
+        })
+        assert {e["locale"]: e["title_tokens"] for e in entries} == {
+            "en": ["camp", "youth"],
+            "es": ["campamento", "juvenil"],
+        }
+        assert all(e["visible"] is False for e in entries)
+
+    def test_bulletin_publish_window(self):
+        publish, expire = datetime(2024, 1, 1), datetime(2024, 2, 1)
+        [entry] = build_entries("bulletin", {
+            "_id": ObjectId(), "headline": "Potluck", "body": "<b>Bring</b> a dish",
+            "published": True, "publish_date": publish, "expire_at": expire,
+        })
+        assert (entry["starts_at"], entry["expires_at"]) == (publish, expire)
+        assert entry["snippet"] == "Bring a dish"
+
+    def test_page_text_skips_urls_and_colors(self):
+        [entry] = build_entries("page", {
+            "_id": ObjectId(), "title": "About", "slug": "about", "visible": True,
+            "sections": [{"type": "hero", "props": {
+                "heading": "Welcome home",
+                "image": "https://example.com/hero.png",
+                "color": "#ffffff",
+                "cards": [{"text": "Our story"}],
+            }}],
+        })
+        assert entry["tokens"] == ["about", "home", "our", "story", "welcome"]
+        assert entry["slug"] == "about"
+
+    def test_token_cap_keeps_title_words(self):
+        body = " ".join(f"word{i}" for i in range(MAX_TOKENS_PER_ENTRY + 50))
+        [entry] = build_entries("form", {"_id": ObjectId(), "title": "Zzz Signup", "description": body})
+        assert len(entry["tokens"]) == MAX_TOKENS_PER_ENTRY
+        assert {"zzz", "signup"} <= set(entry["tokens"])
+
+
+class FakeIndex:
+    def __init__(self, ids):
+        self.ids = ids
+        self.pipelines = []
+
+    async def distinct(self, field, match):
+        return list(self.ids)
+
+    def aggregate(self, pipeline, allowDiskUse=False):
+        self.pipelines.append(pipeline)
+        limit = pipeline[-1]["$limit"]
+        ranked = list(reversed(self.ids))[:limit]
+
+        class Cursor:
+            async def to_list(self, length=None):
+                return [{"_id": i} for i in ranked]
+
+        return Cursor()
+
+
+class TestSearchRefIds:
+    @pytest.mark.asyncio
+    async def test_small_result_sets_skip_ranking(self, monkeypatch):
+        ids = [str(ObjectId()) for _ in range(3)]
+        index = FakeIndex(ids)
+        monkeypatch.setattr(search_index.DB, "db", {search_index.COLLECTION_NAME: index})
+        assert await search_ref_ids("sermon", "grace", limit=5) == [ObjectId(i) for i in ids]
+        assert index.pipelines == []
+
+    @pytest.mark.asyncio
+    async def test_broad_matches_keep_the_best_ranked(self, monkeypatch):
+        ids = [str(ObjectId()) for _ in range(10)]
+        index = FakeIndex(ids)
+        monkeypatch.setattr(search_index.DB, "db", {search_index.COLLECTION_NAME: index})
+        result = await search_ref_ids("sermon", "grace", limit=4)
+        assert result == [ObjectId(i) for i in reversed(ids[-4:])]
+        stages = [next(iter(stage)) for stage in index.pipelines[0]]
+        assert stages == ["$match", "$addFields", "$group", "$sort", "$limit"]
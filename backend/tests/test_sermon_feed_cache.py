@@ -0,0 +1,111 @@
+"""
+Unit tests for the cached sermon feed and the YouTube metadata helpers.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+
+import models.sermon as sermon_model
+from helpers.sermon_cache import invalidate_sermon_feed
+from helpers.youtubeHelper import YoutubeHelper, best_thumbnail_url, parse_iso8601_duration
+
+
+def _sermon_doc():
+    now = datetime(2025, 3, 2, 10, 0)
+    return {
+        "_id": ObjectId(),
+        "title": "Grace",
+        "description": "",
+        "speaker": "Pastor",
+        "ministry": [],
+        "youtube_url": "https://youtu.be/abcdefghijk",
+        "video_id": "abcdefghijk",
+        "date_posted": now,
+        "published": True,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    state = {"calls": 0, "docs": [_sermon_doc()]}
+
+    async def fake_paginate(collection, query, sort, limit, *, cursor=None, skip=0, projection=None):
+        state["calls"] += 1
+        state["query"] = query
+        return [dict(d) for d in state["docs"]], None
+
+    monkeypatch.setattr(sermon_model, "paginate", fake_paginate)
+    monkeypatch.setattr(sermon_model.DB, "db", {"sermons": object()})
+    invalidate_sermon_feed()
+    yield state
+    invalidate_sermon_feed()
+
+
+class TestSermonFeedCache:
+    @pytest.mark.asyncio
+    async def test_pages_are_cached_until_invalidated(self, feed):
+        first, _ = await sermon_model.list_sermons(limit=10, published=True)
+        again, _ = await sermon_model.list_sermons(limit=10, published=True)
+        assert feed["calls"] == 1
+        assert [s.id for s in again] == [s.id for s in first]
+
+        await sermon_model.list_sermons(limit=10, published=False)
+        assert feed["calls"] == 2
+
+        invalidate_sermon_feed()
+        await sermon_model.list_sermons(limit=10, published=True)
+        assert feed["calls"] == 3
+
+    @pytest.mark.asyncio
+    async def test_favorites_are_applied_per_caller(self, feed):
+        sermon_id = str(feed["docs"][0]["_id"])
+        anonymous, _ = await sermon_model.list_sermons(limit=10)
+        mine, _ = await sermon_model.list_sermons(limit=10, favorite_ids={sermon_id})
+        assert feed["calls"] == 1
+        assert anonymous[0].is_favorited is None
+        assert mine[0].is_favorited is True
+
+    @pytest.mark.asyncio
+    async def test_favorites_only_pages_bypass_the_cache(self, feed):
+        sermon_id = str(feed["docs"][0]["_id"])
+        for _ in range(2):
+            await sermon_model.list_sermons(limit=10, favorite_ids={sermon_id}, favorites_only=True)
+        assert feed["calls"] == 2
+        assert "_id" in feed["query"]
+
+
+class TestYoutubeMetadata:
+    def test_parse_duration(self):
+        assert parse_iso8601_duration("PT1H2M3S") == 3723
+        assert parse_iso8601_duration("PT45S") == 45
+        assert parse_iso8601_duration("P1DT1M") == 86460
+        assert parse_iso8601_duration("P0D") == 0
+        assert parse_iso8601_duration("") is None
+        assert parse_iso8601_duration("P") is None
+
+    def test_best_thumbnail(self):
+        thumbs = {"default": {"url": "d"}, "high": {"url": "h"}}
+        assert best_thumbnail_url(thumbs) == "h"
+        assert best_thumbnail_url(None) is None
+
+    def test_fetch_caps_batch_and_maps_items(self):
+        calls = []
+
+        def list_(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(execute=lambda: {"items": [{
+                "id": "v1",
+                "contentDetails": {"duration": "PT10M"},
+                "snippet": {"thumbnails": {"medium": {"url": "m"}}},
+            }]})
+
+        client = SimpleNamespace(videos=lambda: SimpleNamespace(list=list_))
+        ids = [f"v{i}" for i in range(1, 80)]
+        metadata = YoutubeHelper.fetchVideoMetadata(ids, client)
+        assert metadata == {"v1": {"duration_seconds": 600, "thumbnail_url": "m"}}
+        assert len(calls[0]["id"].split(",")) == 50
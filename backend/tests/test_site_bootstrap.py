@@ -0,0 +1,52 @@
+"""
+Unit tests for the cached site bootstrap blob and its invalidation.
+"""
+
+import json
+
+import pytest
+
+import helpers.site_bootstrap as site_bootstrap
+from helpers.site_cache import invalidate_bootstrap
+
+
+@pytest.fixture
+def sections(monkeypatch):
+    state = {"header": 1, "calls": 0}
+
+    async def header():
+        state["calls"] += 1
+        return {"items": [state["header"]]}
+
+    monkeypatch.setattr(site_bootstrap, "_SECTIONS", {"header": header})
+    invalidate_bootstrap()
+    yield state
+    invalidate_bootstrap()
+
+
+class TestSiteBootstrap:
+    @pytest.mark.asyncio
+    async def test_blob_is_cached_until_invalidated(self, sections):
+        first = await site_bootstrap.get_site_bootstrap()
+        assert json.loads(first["body"]) == {"version": first["version"], "header": {"items": [1]}}
+        assert first["etag"] == f'"{first["version"]}"'
+
+        assert await site_bootstrap.get_site_bootstrap() is first
+        assert sections["calls"] == 1
+
+        sections["header"] = 2
+        invalidate_bootstrap()
+        second = await site_bootstrap.get_site_bootstrap()
+        assert second["version"] != first["version"]
+        assert sections["calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_section_is_null_and_not_cached(self, sections, monkeypatch):
+        async def broken():
+            raise RuntimeError("db down")
+
+        monkeypatch.setitem(site_bootstrap._SECTIONS, "footer", broken)
+        entry = await site_bootstrap.get_site_bootstrap()
+        assert json.loads(entry["body"])["footer"] is None
+        await site_bootstrap.get_site_bootstrap()
+        assert sections["calls"] == 2
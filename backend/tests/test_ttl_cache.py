@@ -0,0 +1,63 @@
+"""
+Unit tests for the in-process TTL cache helper.
+"""
+
+import time
+
+from helpers.ttl_cache import TTLCache, VersionedTTLCache
+
+
+class TestTTLCache:
+    def test_get_set_and_expiry(self):
+        cache = TTLCache(ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl_seconds=0.01)
+        assert cache.get("a") == 1
+        time.sleep(0.02)
+        assert cache.get("b") is None
+        assert "b" not in cache
+        assert "a" in cache
+
+    def test_falsy_values_are_cached(self):
+        cache = TTLCache(ttl_seconds=60)
+        cache.set("empty", "")
+        assert cache.get("empty") == ""
+        assert cache.get("missing") is None
+
+    def test_lru_eviction(self):
+        cache = TTLCache(ttl_seconds=60, max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_invalidate_prefix(self):
+        cache = TTLCache(ttl_seconds=60)
+        cache.set("page:home", 1)
+        cache.set(("page:about", "en"), 2)
+        cache.set("config", 3)
+        cache.invalidate_prefix("page:")
+        assert len(cache) == 1
+        assert cache.get("config") == 3
+
+
+class TestVersionedTTLCache:
+    def test_set_if_current_skips_values_read_across_an_invalidation(self):
+        cache = VersionedTTLCache(ttl_seconds=60)
+        generation = cache.generation
+        assert cache.set_if_current("a", 1, generation)
+        cache.invalidate("a")
+        assert not cache.set_if_current("a", 2, generation)
+        assert "a" not in cache
+        assert cache.set_if_current("a", 3, cache.generation)
+        assert cache.get("a") == 3
+
+    def test_clear_and_prefix_bump_the_generation(self):
+        cache = VersionedTTLCache(ttl_seconds=60)
+        start = cache.generation
+        cache.invalidate_prefix("page:")
+        cache.clear()
+        assert cache.generation == start + 2
@@ -0,0 +1,89 @@
+"""
+Unit tests for Bible plan progress bitsets and the "my Bible plans" current-day window.
+"""
+
+from models.bible_plan_tracker import (
+    DAYS_PER_WORD,
+    UserBiblePlanProgress,
+    bits_from_progress,
+    completed_days,
+    is_day_completed,
+    last_completed_day,
+    progress_entries,
+    progress_state,
+    progress_update,
+)
+from routes.bible_routes.user_bible_plan_routes import _next_sequential_day, _upcoming_days
+
+
+def _done(*days):
+    return bits_from_progress([{"day": d, "is_completed": True} for d in days])
+
+
+class TestProgressBits:
+    def test_days_span_words(self):
+        bits = _done(1, DAYS_PER_WORD, DAYS_PER_WORD + 1, 365)
+        assert set(bits) == {"0", "1", "5"}
+        assert all(0 <= v < 2 ** 63 for v in bits.values())
+        assert completed_days(bits) == [1, DAYS_PER_WORD, DAYS_PER_WORD + 1, 365]
+        assert last_completed_day(bits) == 365
+        assert is_day_completed(bits, 365) and not is_day_completed(bits, 364)
+
+    def test_legacy_array_is_converted(self):
+        doc = {"progress": [
+            {"day": 1, "completed_passages": ["a"], "is_completed": True},
+            {"day": 2, "completed_passages": ["b"], "is_completed": False},
+        ]}
+        bits, passages = progress_state(doc)
+        assert completed_days(bits) == [1]
+        assert passages == {"1": ["a"], "2": ["b"]}
+        assert progress_entries(bits, passages) == doc["progress"]
+
+    def test_update_only_touches_changed_days(self):
+        update = progress_update([
+            UserBiblePlanProgress(day=2, completed_passages=["x"], is_completed=True),
+            UserBiblePlanProgress(day=3, is_completed=False),
+            UserBiblePlanProgress(day=70, is_completed=True),
+        ])
+        assert update["$bit"] == {
+            "progress_bits.0": {"and": (2 ** 63 - 1) & ~(1 << 2), "or": 1 << 1},
+            "progress_bits.1": {"or": 1 << 6},
+        }
+        assert update["$set"] == {"passage_progress.2": ["x"]}
+        assert update["$unset"] == {"passage_progress.3": "", "passage_progress.70": ""}
+
+
+    def test_last_entry_for_a_day_wins(self):
+        update = progress_update([
+            UserBiblePlanProgress(day=5, completed_passages=["x"], is_completed=True),
+            UserBiblePlanProgress(day=6, is_completed=False),
+            UserBiblePlanProgress(day=5, is_completed=False),
+            UserBiblePlanProgress(day=6, completed_passages=["y"], is_completed=True),
+        ])
+        assert update["$bit"] == {"progress_bits.0": {"and": (2 ** 63 - 1) & ~(1 << 4), "or": 1 << 5}}
+        assert update["$set"] == {"passage_progress.6": ["y"]}
+        assert update["$unset"] == {"passage_progress.5": ""}
+
+
+class TestUpcomingDays:
+    def test_window_starts_after_completed_days(self):
+        current, days = _upcoming_days(_done(1, 2), ["1", "2", "3", "4", "5", "6"], 6, 2)
+        assert current == 3
+        assert days == [3, 4, 5]
+
+    def test_rest_days_are_skipped_for_current_day(self):
+        # Day 2 has no readings, so finishing day 1 moves straight to day 3
+        current, days = _upcoming_days(_done(1), ["1", "3", "4"], 4, 3)
+        assert current == 3
+        assert days == [3, 4]
+
+    def test_matches_full_readings(self):
+        readings = {"1": [{"id": "a"}], "2": [], "3": [{"id": "b"}]}
+        bits = _done(1)
+        current, _ = _upcoming_days(bits, ["1", "3"], 3, 0)
+        assert current == _next_sequential_day(bits, readings, 3)
+
+    def test_finished_plan_has_no_window(self):
+        current, days = _upcoming_days(_done(1, 2), ["1", "2"], 2, 3)
+        assert current == 3
+        assert days == []
@@ -0,0 +1,144 @@
+"""
+Unit tests for the materialized weekly bulletin feed and the stored service day_sort.
+"""
+
+import json
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+import models.bulletin as bulletin_model
+import models.service_bulletin as service_model
+from helpers import bulletin_cache
+from helpers.bulletin_cache import SNAPSHOT_COLLECTION, invalidate_weekly_bulletins
+from helpers.timezone_utils import normalize_to_local_week_start, strip_timezone_for_mongo
+from routes.common_routes.bulletin_routes import get_bulletins
+
+
+class FakeSnapshots:
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = dict(doc, _id=query["_id"])
+
+    async def delete_many(self, query):
+        self.docs.clear()
+
+
+class FakeServices:
+    def __init__(self):
+        self.updates = []
+
+    async def update_one(self, query, update):
+        self.updates.append(update)
+        return SimpleNamespace(matched_count=1)
+
+    async def update_many(self, query, update):
+        self.updates.append((query, update))
+
+
+WEEK = datetime(2025, 3, 3)
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    state = {"calls": 0, "bulletins": [], "valid_until": datetime.max}
+    snapshots = FakeSnapshots()
+
+    async def fake_list_bulletins(**kwargs):
+        state["calls"] += 1
+        return list(state["bulletins"]), None
+
+    async def fake_list_services(**kwargs):
+        state["week_start"] = kwargs["week_start"]
+        return []
+
+    async def fake_next_change(now, next_monday):
+        return state["valid_until"]
+
+    monkeypatch.setattr(bulletin_model, "list_bulletins", fake_list_bulletins)
+    monkeypatch.setattr(bulletin_model, "list_services", fake_list_services)
+    monkeypatch.setattr(bulletin_model, "_next_feed_change", fake_next_change)
+    monkeypatch.setattr(bulletin_model.DB, "db", {SNAPSHOT_COLLECTION: snapshots})
+    state["snapshots"] = snapshots
+    return state
+
+
+class TestWeeklySnapshot:
+    @pytest.mark.asyncio
+    async def test_snapshot_is_reused_until_invalidated(self, feed):
+        first = await bulletin_model.get_weekly_feed_snapshot(WEEK)
+        assert json.loads(first["body"]) == {"services": [], "bulletins": [], "next_cursor": None}
+        assert first["complete"] and first["bulletin_count"] == 0
+        assert "2025-03-03" in feed["snapshots"].docs
+        assert feed["week_start"] == WEEK
+
+        again = await bulletin_model.get_weekly_feed_snapshot(WEEK)
+        assert again["etag"] == first["etag"]
+        assert feed["calls"] == 1
+
+        await invalidate_weekly_bulletins()
+        assert feed["snapshots"].docs == {}
+        await bulletin_model.get_weekly_feed_snapshot(WEEK)
+        assert feed["calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_snapshot_past_valid_until_is_rebuilt(self, feed):
+        feed["valid_until"] = datetime.min
+        await bulletin_model.get_weekly_feed_snapshot(WEEK)
+        await bulletin_model.get_weekly_feed_snapshot(WEEK)
+        assert feed["calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_snapshot_past_expires_at_is_rebuilt(self, feed):
+        await bulletin_model.get_weekly_feed_snapshot(WEEK)
+        feed["snapshots"].docs["2025-03-03"]["expires_at"] = datetime(2000, 1, 1)
+        await bulletin_model.get_weekly_feed_snapshot(WEEK)
+        assert feed["calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_build_racing_a_write_is_not_stored(self, feed):
+        generation = bulletin_cache.weekly_snapshot_generation()
+        await invalidate_weekly_bulletins()
+        snapshot = bulletin_cache.build_snapshot({}, datetime.max, 0, True)
+        assert not await bulletin_cache.store_weekly_snapshot("2025-03-03", snapshot, generation)
+        assert feed["snapshots"].docs == {}
+
+    @pytest.mark.asyncio
+    async def test_snapshot_uses_the_local_week_east_of_utc(self, feed, monkeypatch):
+        monkeypatch.setenv("LOCAL_TIMEZONE", "Europe/Berlin")
+        await get_bulletins(
+            request=Request({"type": "http", "method": "GET", "path": "/", "headers": []}), skip=0, limit=100, ministry_id=None, query=None,
+            week_start=date(2025, 6, 11), week_end=None, published=True,
+            upcoming_only=True, skip_expiration_filter=False, cursor=None,
+        )
+        assert "2025-06-09" in feed["snapshots"].docs
+        # list_services resolves the same Monday the non-snapshot path does
+        monday = strip_timezone_for_mongo(normalize_to_local_week_start(feed["week_start"]))
+        assert monday == datetime(2025, 6, 8, 22)
+
+
+class TestServiceDaySort:
+    def test_day_sort_follows_the_week(self):
+        assert service_model.DAY_SORT["Monday"] == 0
+        assert service_model.DAY_SORT["Sunday"] == 6
+
+    @pytest.mark.asyncio
+    async def test_update_stores_day_sort(self, monkeypatch):
+        services = FakeServices()
+        monkeypatch.setattr(service_model.DB, "db", {"service_bulletins": services, SNAPSHOT_COLLECTION: FakeSnapshots()})
+        updates = service_model.ServiceBulletinUpdate(day_of_week="Wednesday")
+        assert await service_model.update_service("5f0000000000000000000000", updates)
+        assert services.updates[0]["$set"]["day_sort"] == 2
+
+    @pytest.mark.asyncio
+    async def test_backfill_sets_every_day(self):
+        services = FakeServices()
+        await service_model.prepare_service_bulletins_collection({"service_bulletins": services})
+        assert [update["$set"]["day_sort"] for _, update in services.updates] == list(range(7))
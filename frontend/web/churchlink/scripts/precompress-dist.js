@@ -0,0 +1,50 @@
+// To run: node scripts/precompress-dist (runs automatically as part of `build`)
+//
+// Writes .br and .gz siblings next to every compressible file in dist/ so the
+// backend can serve them without compressing on each request. A sibling is only
+// kept when it is actually smaller than the original.
+
+import fs from 'fs'
+import path from 'path'
+import zlib from 'zlib'
+
+const DIST_DIR = path.resolve('dist')
+const COMPRESSIBLE = new Set(['.js', '.mjs', '.css', '.html', '.svg', '.json', '.txt', '.xml', '.wasm', '.map'])
+const MIN_BYTES = 1024
+
+function* walk(dir) {
+  for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+    const full = path.join(dir, entry.name)
+    if (entry.isDirectory()) yield* walk(full)
+    else if (entry.isFile()) yield full
+  }
+}
+
+function writeIfSmaller(file, data, original) {
+  if (data.length < original.length) fs.writeFileSync(file, data)
+  else if (fs.existsSync(file)) fs.unlinkSync(file)
+}
+
+if (!fs.existsSync(DIST_DIR)) {
+  console.error(`precompress: ${DIST_DIR} does not exist, run vite build first`)
+  process.exit(1)
+}
+
+let count = 0
+for (const file of walk(DIST_DIR)) {
+  if (!COMPRESSIBLE.has(path.extname(file))) continue
+  const original = fs.readFileSync(file)
+  if (original.length < MIN_BYTES) continue
+
+  writeIfSmaller(`${file}.br`, zlib.brotliCompressSync(original, {
+    params: {
+      [zlib.constants.BROTLI_PARAM_MODE]: zlib.constants.BROTLI_MODE_TEXT,
+      [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+      [zlib.constants.BROTLI_PARAM_SIZE_HINT]: original.length,
+    },
+  }), original)
+  writeIfSmaller(`${file}.gz`, zlib.gzipSync(original, { level: zlib.constants.Z_BEST_COMPRESSION }), original)
+  count++
+}
+
+console.log(`precompress: wrote .br/.gz siblings for ${count} files`)
@@ -2,7 +2,6 @@ import React, { useEffect, useMemo, useRef, useState } from 'react';
 import { createPortal } from 'react-dom';
 import {
   listImages,
-  listFolders as listFoldersHelper,
   createFolder as createFolderHelper,
   uploadImages,
   deleteImage,
@@ -95,6 +94,8 @@ const MediaLibrary: React.FC<{
   const [page, setPage] = useState(1);
   const [pageSize, setPageSize] = useState(24);
   const [total, setTotal] = useState(0);
+  // Keyset cursors: pageCursors.current[n] fetches page n (page 1 needs none)
+  const pageCursors = useRef<Record<number, string | undefined>>({});
 
   const fileInputRef = useRef<HTMLInputElement>(null);
 
@@ -127,13 +128,13 @@ const MediaLibrary: React.FC<{
         page,
         page_size: pageSize,
         scope,
+        cursor: pageCursors.current[page],
       });
 
+      pageCursors.current[page + 1] = resp.next_cursor ?? undefined;
       setAssets(resp.files || []);
       setTotal(resp.total || 0);
-
-      const folders = debouncedQ ? [] : await listFoldersHelper(currentFolder);
-      setSubfolders(folders || []);
+      setSubfolders(debouncedQ ? [] : resp.folders || []);
     } catch (err) {
       console.error('Error fetching data:', err);
       setError('Failed to fetch media');
@@ -146,6 +147,7 @@ const MediaLibrary: React.FC<{
   };
 
   useEffect(() => {
+    pageCursors.current = {};
     setPage(1);
   }, [debouncedQ, currentFolder, scope, pageSize]);
 
@@ -317,7 +319,7 @@ const MediaLibrary: React.FC<{
                 <Input
                   value={query}
                   onChange={(e) => setQuery(e.target.value)}
-                  placeholder="Search for image by name"
+                  placeholder="Search names by word start, e.g. \"east\""
                 />
               </div>
               <Select value={scope} onValueChange={(v) => setScope(v as 'current' | 'all')}>
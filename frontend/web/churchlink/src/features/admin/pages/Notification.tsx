@@ -705,7 +705,7 @@ const Notification = () => {
                         )}
                       </td>
                       <td className="p-2 border">
-                        {Array.isArray(n.recipients) ? n.recipients.length : 1}
+                        {n.delivery?.attempted ?? n.recipient_count ?? (Array.isArray(n.recipients) ? n.recipients.length : 1)}
                       </td>
                       <td className="p-2 border text-center">
                         <span title="Successfully sent" style={{ color: "#38a169" }}>
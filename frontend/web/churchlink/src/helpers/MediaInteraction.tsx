@@ -9,6 +9,7 @@ export const listImages = async (params: {
   page?: number;
   page_size?: number;
   scope?: "current" | "all";
+  cursor?: string;
 }): Promise<ListImagesResponse> => {
   const usp = new URLSearchParams();
   if (params.folder !== undefined) usp.set("folder", params.folder);
@@ -16,6 +17,7 @@ export const listImages = async (params: {
   if (params.page != null) usp.set("page", String(params.page));
   if (params.page_size != null) usp.set("page_size", String(params.page_size));
   if (params.scope) usp.set("scope", params.scope);
+  if (params.cursor) usp.set("cursor", params.cursor);
   const res = await api.get(`/v1/assets/?${usp.toString()}`);
   const data = res.data as ListImagesResponse;
   return {
@@ -24,6 +26,7 @@ export const listImages = async (params: {
     total: data.total ?? (res.data?.total ?? (res.data?.files || []).length),
     page: data.page ?? params.page ?? 1,
     page_size: data.page_size ?? params.page_size ?? 60,
+    next_cursor: data.next_cursor ?? null,
   };
 };
 
@@ -37,6 +37,16 @@ export interface ScheduledNotification {
     [k: string]: unknown;
 }
 
+export interface NotificationDeliveryStats {
+    attempted: number;
+    succeeded: number;
+    failed: number;
+    errors: Record<string, number>;
+    tokens_pruned: number;
+    batches: number;
+    duration_ms: number;
+}
+
 export interface HistoryNotification {
     id?: string | number;
     _id?: string;
@@ -47,6 +57,8 @@ export interface HistoryNotification {
     route?: string;
     actionType?: NotificationActionType;
     recipients?: unknown[];
+    recipient_count?: number;
+    delivery?: NotificationDeliveryStats;
     sent_at?: string;
     scheduled_time?: string;
     timestamp?: string;
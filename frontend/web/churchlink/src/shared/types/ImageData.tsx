@@ -7,6 +7,8 @@ export interface ImageResponse {
     path: string;
     public_url: string;
     thumb_url: string;
+    width?: number | null;
+    height?: number | null;
 }
 
 export interface ListImagesResponse {
@@ -15,6 +17,7 @@ export interface ListImagesResponse {
     total: number;
     page: number;
     page_size: number;
+    next_cursor?: string | null;
 }
 
 export interface FolderResponse {